@@ -0,0 +1,68 @@
+"""
+Benchmark da carga em massa de notificações
+Compara a criação uma a uma (um commit por notificação, como no UserRepository)
+com DengueService.bulk_create (validação em lotes e insert do Core por transação)
+
+Uso:
+    python -m benchmarks.bench_bulk --rows 5000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from src.config import TestingConfig, config
+from src.main import create_app
+from src.models.user import db
+from src.services.dengue_service import DengueService
+
+
+def build_records(rows: int):
+    """Gera notificações planas válidas, variando a data de notificação"""
+    records = []
+    for row in range(rows):
+        day = row % 28 + 1
+        records.append({
+            'tp_not': '2', 'id_agravo': 'A90', 'dt_notific': f'2024-02-{day:02d}',
+            'sem_not': '202406', 'nu_ano': '2024', 'sg_uf_not': '13', 'id_municip': '130260',
+            'sg_uf': '13', 'id_mn_resi': '130260', 'febre': '1', 'classi_fin': '10', 'evolucao': '1',
+        })
+    return records
+
+
+def _timed_insert(database_uri: str, insert) -> float:
+    config['benchmark'] = type('BenchmarkConfig', (TestingConfig,), {'SQLALCHEMY_DATABASE_URI': database_uri})
+    app = create_app('benchmark')
+    with app.app_context():
+        db.create_all()
+        started = time.perf_counter()
+        insert(DengueService())
+        seconds = time.perf_counter() - started
+        db.drop_all()
+    return seconds
+
+
+def run(rows: int) -> None:
+    records = build_records(rows)
+
+    with tempfile.TemporaryDirectory() as directory:
+        # SQLite em arquivo: o custo de cada commit (fsync) é o que a carga em massa evita
+        uri = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        single = _timed_insert(uri, lambda service: [service.create_notification(record) for record in records])
+        bulk = _timed_insert(uri, lambda service: service.bulk_create(enumerate(records, start=1)))
+
+    print(f"{'modo':<14}{'tempo (s)':>12}{'registros/s':>14}")
+    print(f"{'um a um':<14}{single:>12.3f}{rows / single:>14.0f}")
+    print(f"{'bulk_create':<14}{bulk:>12.3f}{rows / bulk:>14.0f}")
+    print(f"ganho: {single / bulk:.1f}x")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark da carga em massa de notificações')
+    parser.add_argument('--rows', type=int, default=5_000, help='Quantidade de notificações (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.rows)
+
+
+if __name__ == '__main__':
+    main()
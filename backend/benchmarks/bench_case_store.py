@@ -0,0 +1,77 @@
+"""
+Benchmark do armazenamento particionado de casos
+Compara a leitura do arquivo inteiro seguida de filtro (o concat + .query do notebook)
+com a consulta de uma UF e um ano no dataset particionado
+
+Uso:
+    python -m benchmarks.bench_case_store --rows 2000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from src.store.case_store import CaseStore
+
+UFS = ['11', '12', '13', '14', '15', '16', '17', '21', '22', '23', '24', '25', '26', '27',
+       '28', '29', '31', '32', '33', '35', '41', '42', '43', '50', '51', '52', '53']
+
+
+def build_source(path: str, rows: int, seed: int = 42) -> None:
+    """Gera um dengue_preprocessado.parquet sintético com 2023 e 2024"""
+    rng = np.random.default_rng(seed)
+    year = rng.choice([2023, 2024], size=rows)
+    day = rng.integers(0, 365, rows)
+    dates = (np.array(year - 1970, dtype='datetime64[Y]') + day.astype('timedelta64[D]')).astype('datetime64[D]')
+    table = pa.table({
+        'NU_ANO': pa.array(year.astype(str)),
+        'SG_UF_NOT': pa.array(rng.choice(UFS, size=rows)),
+        'DT_NOTIFIC': pa.array(dates),
+        'ID_MUNICIP': pa.array(rng.integers(110000, 530010, rows).astype(str)),
+        'CLASSI_FIN': pa.array(rng.choice(['5', '10', '11', '12'], size=rows)),
+        'EVOLUCAO': pa.array(rng.choice(['1', '2', '3', '9'], size=rows)),
+        'CS_SEXO': pa.array(rng.choice(['M', 'F', 'I'], size=rows)),
+        'NU_IDADE_N': pa.array(rng.integers(4000, 4090, rows)),
+    })
+    pq.write_table(table, path, row_group_size=100_000)
+
+
+def run(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'dengue_preprocessado.parquet')
+        build_source(source, rows)
+        store = CaseStore(os.path.join(directory, 'casos'))
+        store.write([source])
+
+        started = time.perf_counter()
+        table = pq.read_table(source)
+        full = table.filter(pc.and_(pc.equal(table['SG_UF_NOT'], '53'), pc.equal(table['NU_ANO'], '2024')))
+        full_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        pruned = store.query(year=2024, uf='53')
+        store_seconds = time.perf_counter() - started
+
+        assert full.num_rows == pruned.num_rows
+        files = len(store.files())
+        print(f"{'leitura':<28}{'tempo (s)':>12}{'linhas':>10}")
+        print(f"{'arquivo inteiro + filtro':<28}{full_seconds:>12.3f}{full.num_rows:>10}")
+        print(f"{'dataset year=2024/uf=53':<28}{store_seconds:>12.3f}{pruned.num_rows:>10}")
+        print(f"arquivos lidos: {len(store.files(year=2024, uf='53'))} de {files}; "
+              f"ganho: {full_seconds / store_seconds:.1f}x")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark do armazenamento particionado de casos')
+    parser.add_argument('--rows', type=int, default=2_000_000, help='Quantidade de linhas (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.rows)
+
+
+if __name__ == '__main__':
+    main()
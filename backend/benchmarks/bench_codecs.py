@@ -0,0 +1,68 @@
+"""
+Benchmark dos decodificadores do SINAN
+Compara as versões escalares (aplicadas linha a linha, como o .apply do notebook)
+com as versões vetorizadas de src.codecs.sinan
+
+Uso:
+    python -m benchmarks.bench_codecs --rows 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pyarrow as pa
+
+from src.codecs import scalar, sinan
+
+
+def _timed(function, *args):
+    started = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started
+
+
+def build_columns(rows: int, seed: int = 42):
+    """Gera colunas sintéticas com a distribuição aproximada dos códigos do SINAN"""
+    rng = np.random.default_rng(seed)
+    idade = rng.choice([1, 2, 3, 4], size=rows, p=[0.01, 0.02, 0.05, 0.92]) * 1000 + rng.integers(0, 100, rows)
+    gestante = rng.choice([1, 2, 3, 4, 5, 6, 9], size=rows)
+    escolaridade = rng.integers(0, 11, rows)
+    ibge = rng.integers(1100015, 5300109, rows)
+    return {
+        'idade': pa.array(idade.astype(str)),
+        'gestante': pa.array(gestante),
+        'escolaridade': pa.array(escolaridade),
+        'ibge': pa.array(ibge.astype(str)),
+    }
+
+
+def run(rows: int) -> None:
+    columns = build_columns(rows)
+    cases = [
+        ('decode_idade', 'idade'),
+        ('decode_gestante', 'gestante'),
+        ('decode_escolaridade', 'escolaridade'),
+        ('ibge_to_sinan', 'ibge'),
+    ]
+
+    print(f"{'decodificador':<22}{'escalar (s)':>14}{'vetorizado (s)':>16}{'ganho':>10}")
+    for name, column in cases:
+        values = columns[column]
+        python_values = values.to_pylist()
+        scalar_function = getattr(scalar, name)
+        vector_function = getattr(sinan, name)
+
+        scalar_seconds = _timed(lambda: [scalar_function(value) for value in python_values])
+        vector_seconds = _timed(vector_function, values)
+        print(f"{name:<22}{scalar_seconds:>14.3f}{vector_seconds:>16.3f}{scalar_seconds / vector_seconds:>9.1f}x")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark dos decodificadores do SINAN')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Quantidade de linhas (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark da detecção de duplicadas
+Compara a junção da tabela inteira consigo mesma a cada semana nova (concat + duplicated() do
+pandas sobre todo o histórico) com o DedupIndex, que consulta só as impressões da semana na
+tabela hash em disco, atrás do filtro de Bloom
+
+Uso:
+    python -m benchmarks.bench_dedup --rows 2000000 --week 20000
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.quality.dedup import FINGERPRINT_FIELDS, DedupIndex, fingerprint
+
+
+def build_batch(rows: int, seed: int) -> pa.RecordBatch:
+    """Notificações com os campos da impressão digital, no formato bruto do DBF"""
+    rng = np.random.default_rng(seed)
+    dates = (np.datetime64('2024-01-01') + rng.integers(0, 366, rows)).astype('datetime64[D]')
+    return pa.record_batch({
+        'ID_AGRAVO': pa.array(np.full(rows, 'A90', dtype=object)),
+        'DT_NOTIFIC': pa.array(dates),
+        'ID_MUNICIP': pa.array(rng.integers(110001, 530010, rows).astype(str)),
+        'ID_UNIDADE': pa.array(rng.integers(0, 9_999_999, rows).astype(str)),
+        'DT_SIN_PRI': pa.array(dates - rng.integers(0, 7, rows).astype('timedelta64[D]')),
+        'ANO_NASC': pa.array(rng.integers(1930, 2024, rows).astype(str)),
+        'CS_SEXO': pa.array(np.array(['M', 'F'], dtype=object)[rng.integers(0, 2, rows)]),
+    })
+
+
+def run(rows: int, week: int, batch_size: int) -> None:
+    history = build_batch(rows, seed=42)
+    # Semana nova com 10% de reenvios de notificações já carregadas
+    appended = pa.concat_batches([build_batch(week - week // 10, seed=7), history.slice(0, week // 10)])
+    frame = history.to_pandas()
+    new = appended.to_pandas()
+
+    started = time.perf_counter()
+    joined = pd.concat([frame, new], ignore_index=True)
+    naive = int(joined.duplicated(subset=list(FINGERPRINT_FIELDS)).iloc[len(frame):].sum())
+    naive_seconds = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = DedupIndex(directory)
+        started = time.perf_counter()
+        for start in range(0, rows, batch_size):
+            index.check(fingerprint(history.slice(start, batch_size)))
+        build_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        found = int(index.check(fingerprint(appended)).sum())
+        index_seconds = time.perf_counter() - started
+
+    print(f"histórico de {rows} notificações; semana nova com {week} ({week // 10} reenvios)")
+    print(f"{'detecção':<44}{'duplicadas':>12}{'tempo (s)':>12}")
+    print(f"{'pandas (concat + duplicated no histórico)':<44}{naive:>12}{naive_seconds:>12.3f}")
+    print(f"{'DedupIndex (Bloom + tabela hash em disco)':<44}{found:>12}{index_seconds:>12.3f}")
+    print(f"ganho: {naive_seconds / index_seconds:.0f}x; índice montado em {build_seconds:.1f}s "
+          f"({rows / build_seconds:,.0f} notificações/s)")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark da detecção de duplicadas')
+    parser.add_argument('--rows', type=int, default=2_000_000, help='Notificações no histórico (padrão: %(default)s)')
+    parser.add_argument('--week', type=int, default=20_000, help='Notificações da semana nova (padrão: %(default)s)')
+    parser.add_argument('-b', '--batch-size', type=int, default=100_000, help='Linhas por lote (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.rows, args.week, args.batch_size)
+
+
+if __name__ == '__main__':
+    main()
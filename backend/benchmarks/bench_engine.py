@@ -0,0 +1,109 @@
+"""
+Benchmark dos perfis do engine do banco de dados
+Mede a vazão de leituras (páginas da listagem) e escritas (uma notificação por transação)
+concorrentes em SQLite em arquivo, sem perfil e com os perfis de desenvolvimento e produção
+
+Uso:
+    python -m benchmarks.bench_engine --threads 4 --seconds 3
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+
+from src.config import DevelopmentConfig, ProductionConfig, TestingConfig, config
+from src.main import create_app
+from src.models.dengue_notification import DengueNotification
+from src.models.user import db
+from src.repositories.dengue_repository import DengueRepository
+from src.services.validation_service import ValidationService
+
+PROFILES = {
+    'sem perfil': {'DATABASE_POOL': {}, 'SQLITE_PRAGMAS': {}},
+    'development': {'DATABASE_POOL': DevelopmentConfig.DATABASE_POOL,
+                    'SQLITE_PRAGMAS': DevelopmentConfig.SQLITE_PRAGMAS},
+    'production': {'DATABASE_POOL': ProductionConfig.DATABASE_POOL,
+                   'SQLITE_PRAGMAS': ProductionConfig.SQLITE_PRAGMAS},
+}
+
+VALUES = ValidationService.validate({
+    'tp_not': '2', 'id_agravo': 'A90', 'dt_notific': '2024-02-10', 'sem_not': '202406',
+    'nu_ano': '2024', 'sg_uf_not': '13', 'id_municip': '130260', 'sg_uf': '13',
+    'id_mn_resi': '130260', 'febre': '1', 'classi_fin': '10', 'evolucao': '1',
+})
+
+
+def _worker(app, operation, deadline: float, counts: dict, key: str, lock: threading.Lock) -> None:
+    done = errors = 0
+    with app.app_context():
+        while time.perf_counter() < deadline:
+            try:
+                operation()
+                done += 1
+            except OperationalError:
+                db.session.rollback()
+                errors += 1
+        db.session.remove()
+    with lock:
+        counts[key] += done
+        counts['errors'] += errors
+
+
+def run_profile(name: str, directory: str, threads: int, seconds: float, seed_rows: int) -> dict:
+    uri = f"sqlite:///{os.path.join(directory, name.replace(' ', '_') + '.db')}"
+    config['benchmark'] = type('BenchmarkConfig', (TestingConfig,), {
+        'SQLALCHEMY_DATABASE_URI': uri, **PROFILES[name]
+    })
+    app = create_app('benchmark')
+
+    with app.app_context():
+        db.create_all()
+        DengueRepository.create_many([VALUES] * seed_rows)
+
+    def write():
+        DengueRepository.create(DengueNotification(**VALUES))
+
+    def read():
+        DengueRepository.get_page({}, 50)
+
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    workers = [threading.Thread(target=_worker, args=(app, write, deadline, counts, 'writes', lock))
+               for _ in range(threads)]
+    workers += [threading.Thread(target=_worker, args=(app, read, deadline, counts, 'reads', lock))
+                for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    with app.app_context():
+        db.engine.dispose()
+    return counts
+
+
+def run(threads: int, seconds: float, seed_rows: int) -> None:
+    print(f"{threads} escritores + {threads} leitores por {seconds:g} s, SQLite em arquivo")
+    print(f"{'perfil':<14}{'leituras/s':>12}{'escritas/s':>12}{'erros':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name in PROFILES:
+            counts = run_profile(name, directory, threads, seconds, seed_rows)
+            print(f"{name:<14}{counts['reads'] / seconds:>12.0f}{counts['writes'] / seconds:>12.0f}"
+                  f"{counts['errors']:>8}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark dos perfis do engine do banco de dados')
+    parser.add_argument('--threads', type=int, default=4, help='Escritores e leitores concorrentes (padrão: %(default)s)')
+    parser.add_argument('--seconds', type=float, default=3.0, help='Duração de cada perfil (padrão: %(default)s)')
+    parser.add_argument('--seed-rows', type=int, default=5_000, help='Notificações iniciais (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.threads, args.seconds, args.seed_rows)
+
+
+if __name__ == '__main__':
+    main()
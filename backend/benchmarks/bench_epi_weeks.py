@@ -0,0 +1,98 @@
+"""
+Benchmark do calendário de semanas epidemiológicas
+Compara a leitura das datas anterior do registro de schema (um strptime por formato + coalesce) e a
+do pandas com parse_dates, e a semana epidemiológica calculada linha a linha (apply do pandas) com
+a tabela dia → semana
+
+Uso:
+    python -m benchmarks.bench_epi_weeks --rows 1000000
+"""
+import argparse
+import datetime
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.epi.weeks import check_weeks, epi_week, parse_dates
+
+
+def build_columns(rows: int, seed: int = 42):
+    """DT_NOTIFIC como vem do DBF (AAAAMMDD, com vazios) e SEM_NOT com 2% de divergências"""
+    rng = np.random.default_rng(seed)
+    dates = np.datetime64('2023-01-01') + rng.integers(0, 730, rows)
+    text = np.char.replace(dates.astype(str), '-', '').astype(object)
+    text[rng.random(rows) < 0.01] = ' '
+    weeks = epi_week(pa.array(dates.astype('datetime64[D]'))).to_numpy(zero_copy_only=False)
+    weeks = np.where(rng.random(rows) < 0.02, weeks + 1, weeks).astype(np.int64).astype(str)
+    return pa.array(text, pa.string()), pa.array(weeks, pa.string())
+
+
+def registry_parse(text: pa.Array) -> pa.Array:
+    """Leitura anterior do registro de schema: branco vira nulo e cada formato passa por um strptime"""
+    trimmed = pc.utf8_trim_whitespace(text)
+    text = pc.if_else(pc.equal(trimmed, ''), None, trimmed)
+    parsed = pa.nulls(len(text), type=pa.date32())
+    for date_format in ('%Y%m%d', '%Y-%m-%d'):
+        attempt = pc.strptime(text, format=date_format, unit='s', error_is_null=True).cast(pa.date32())
+        parsed = pc.coalesce(parsed, attempt)
+    return parsed
+
+
+def row_week(day) -> int:
+    """Semana calculada por linha, como um apply sobre a coluna de datas"""
+    if pd.isna(day):
+        return 0
+    day = day.date()
+    for year in (day.year + 1, day.year, day.year - 1):
+        january_4 = datetime.date(year, 1, 4)
+        start = january_4 - datetime.timedelta(days=(january_4.weekday() + 1) % 7)
+        if day >= start:
+            return year * 100 + (day - start).days // 7 + 1
+    return 0
+
+
+def timed(function):
+    started = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - started
+
+
+def run(rows: int) -> None:
+    dates, weeks = build_columns(rows)
+    series = dates.to_pandas()
+
+    _, registry_seconds = timed(lambda: registry_parse(dates))
+    parsed_pandas, pandas_seconds = timed(lambda: pd.to_datetime(series, format='%Y%m%d', errors='coerce'))
+    parsed, parse_seconds = timed(lambda: parse_dates(dates))
+
+    _, apply_seconds = timed(lambda: parsed_pandas.apply(row_week))
+    _, lut_seconds = timed(lambda: epi_week(parsed))
+
+    batch = pa.record_batch({'DT_NOTIFIC': dates, 'SEM_NOT': weeks})
+    report, check_seconds = timed(lambda: check_weeks(batch)['SEM_NOT'])
+
+    print(f"{rows} datas AAAAMMDD")
+    print(f"{'etapa':<46}{'tempo (s)':>12}")
+    print(f"{'leitura: registro anterior (strptime x2)':<46}{registry_seconds:>12.3f}")
+    print(f"{'leitura: pd.to_datetime':<46}{pandas_seconds:>12.3f}")
+    print(f"{'leitura: parse_dates (dias inexistentes nulos)':<46}{parse_seconds:>12.3f}")
+    print(f"{'semana: apply linha a linha':<46}{apply_seconds:>12.3f}")
+    print(f"{'semana: tabela dia → AAAASS':<46}{lut_seconds:>12.3f}")
+    print(f"{'conferência SEM_NOT x DT_NOTIFIC':<46}{check_seconds:>12.3f}")
+    print(f"ganho: {pandas_seconds / parse_seconds:.1f}x na leitura sobre o pandas, "
+          f"{apply_seconds / lut_seconds:.0f}x na semana; "
+          f"{report['mismatched']} divergentes de {report['checked']} conferidas")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark do calendário de semanas epidemiológicas')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Quantidade de datas (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.rows)
+
+
+if __name__ == '__main__':
+    main()
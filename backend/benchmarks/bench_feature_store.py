@@ -0,0 +1,86 @@
+"""
+Benchmark do armazenamento versionado da matriz de atributos
+Compara o dengue_data_preprocessados.pkl do notebook (pickle.dump([X, y]) da matriz densa) com o
+FeatureStore (.npy por memory map), na leitura e na remontagem com as mesmas partições
+
+Uso:
+    python -m benchmarks.bench_feature_store --rows 500000
+"""
+import argparse
+import os
+import pickle
+import shutil
+import tempfile
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.ml.feature_store import FeatureStore
+from src.ml.features import FeatureBuilder
+
+from benchmarks.bench_features import build_batches
+
+
+def run(rows: int) -> None:
+    batches = build_batches(rows, min(rows, 100_000))
+    builder = FeatureBuilder().fit(batches)
+
+    directory = tempfile.mkdtemp(prefix='bench_feature_store_')
+    try:
+        # Partições de origem: o hash lê o conteúdo delas
+        sources = []
+        for position, batch in enumerate(batches):
+            path = os.path.join(directory, 'casos', f'part-{position}.parquet')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            pq.write_table(pa.Table.from_batches([batch]), path)
+            sources.append(path)
+        config = {'vocabulary': builder.to_dict()}
+
+        started = time.perf_counter()
+        X, y = builder.build(batches)
+        build_seconds = time.perf_counter() - started
+
+        pickle_path = os.path.join(directory, 'dengue_data_preprocessados.pkl')
+        with open(pickle_path, 'wb') as f:
+            pickle.dump([X.toarray(), y], f)
+        started = time.perf_counter()
+        with open(pickle_path, 'rb') as f:
+            dense, _ = pickle.load(f)
+        pickle_seconds = time.perf_counter() - started
+        pickle_size = os.path.getsize(pickle_path)
+        del dense
+
+        store = FeatureStore(os.path.join(directory, 'matriz'))
+        store.get_or_build(sources, config, lambda: (X, y))
+        started = time.perf_counter()
+        key, _, reused = FeatureStore(store.root).get_or_build(sources, config, lambda: builder.build(batches))
+        reuse_seconds = time.perf_counter() - started
+        assert reused
+
+        started = time.perf_counter()
+        mapped, mapped_y = FeatureStore(store.root).load()
+        first_row = mapped[0].toarray()
+        load_seconds = time.perf_counter() - started
+        store_size = sum(os.path.getsize(os.path.join(store.path(key), name)) for name in os.listdir(store.path(key)))
+        del mapped, mapped_y, first_row
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"matriz {X.shape[0]} × {X.shape[1]}")
+    print(f"{'etapa':<44}{'tempo (s)':>12}{'disco (MiB)':>14}")
+    print(f"{'pickle.load da matriz densa (notebook)':<44}{pickle_seconds:>12.3f}{pickle_size / 2 ** 20:>14.1f}")
+    print(f"{'FeatureStore.load (mmap, primeira linha)':<44}{load_seconds:>12.3f}{store_size / 2 ** 20:>14.1f}")
+    print(f"{'montagem da matriz (FeatureBuilder.build)':<44}{build_seconds:>12.3f}{'':>14}")
+    print(f"{'get_or_build com partições inalteradas':<44}{reuse_seconds:>12.3f}{'':>14}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark do armazenamento de atributos')
+    parser.add_argument('--rows', type=int, default=500_000, help='Quantidade de casos (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.rows)
+
+
+if __name__ == '__main__':
+    main()
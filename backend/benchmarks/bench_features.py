@@ -0,0 +1,90 @@
+"""
+Benchmark da matriz de atributos do modelo de desfecho
+Compara o caminho do notebook (OneHotEncoder denso + DataFrame + StandardScaler, em float64)
+com o FeatureBuilder (CSR float32 montada lote a lote), em tempo e memória da matriz
+
+Uso:
+    python -m benchmarks.bench_features --rows 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from src.ml.features import FEATURE_COLUMNS, TARGET_COLUMN, FeatureBuilder
+
+
+# Categorias por coluna: UFs, sexo, gestante e os demais campos em 1/2/9 (com nulos)
+_CHOICES = {
+    'TP_NOT': ['2'],
+    'SG_UF_NOT': [f'{uf}' for uf in (11, 12, 13, 14, 15, 16, 17, 21, 22, 23, 24, 25, 26, 27, 28, 29,
+                                     31, 32, 33, 35, 41, 42, 43, 50, 51, 52, 53)],
+    'CS_SEXO': ['M', 'F', 'I'],
+    'CS_GESTANT': ['1', '2', '3', '4', '5', '6', '9'],
+}
+
+
+def build_batches(rows: int, batch_size: int, seed: int = 42):
+    """Gera lotes sintéticos no formato do CaseStore (colunas categóricas como dicionário)"""
+    rng = np.random.default_rng(seed)
+    batches = []
+    for start in range(0, rows, batch_size):
+        size = min(batch_size, rows - start)
+        columns = {}
+        for column in FEATURE_COLUMNS:
+            choices = np.array(_CHOICES.get(column, ['1', '2', '9']) + [None], dtype=object)
+            columns[column] = pa.array(choices[rng.integers(0, len(choices), size)]).dictionary_encode()
+        columns[TARGET_COLUMN] = pa.array(np.where(rng.random(size) < 0.01, '2', '1'))
+        batches.append(pa.record_batch(columns))
+    return batches
+
+
+def notebook_matrix(batches):
+    """Como no notebook: DataFrame inteiro, one-hot denso, DataFrame denso e StandardScaler"""
+    frame = pa.Table.from_batches(batches).select(list(FEATURE_COLUMNS)).to_pandas()
+    frame = frame.astype('category')
+    encoder = OneHotEncoder(sparse_output=False, handle_unknown='ignore')
+    encoded = pd.DataFrame(encoder.fit_transform(frame), columns=encoder.get_feature_names_out())
+    return StandardScaler().fit_transform(encoded)
+
+
+def sparse_matrix(batches):
+    builder = FeatureBuilder().fit(batches)
+    matrix, _ = builder.build(batches, classes=None)
+    return matrix
+
+
+def run(rows: int, batch_size: int) -> None:
+    batches = build_batches(rows, batch_size)
+
+    started = time.perf_counter()
+    dense = notebook_matrix(batches)
+    dense_seconds = time.perf_counter() - started
+    dense_bytes = dense.nbytes
+    del dense
+
+    started = time.perf_counter()
+    sparse = sparse_matrix(batches)
+    sparse_seconds = time.perf_counter() - started
+    sparse_bytes = sparse.data.nbytes + sparse.indices.nbytes + sparse.indptr.nbytes
+
+    print(f"matriz: {sparse.shape[0]} linhas × {sparse.shape[1]} atributos, {sparse.nnz} não nulos")
+    print(f"{'caminho':<36}{'tempo (s)':>12}{'matriz (MiB)':>15}")
+    print(f"{'notebook (denso float64)':<36}{dense_seconds:>12.2f}{dense_bytes / 2 ** 20:>15.1f}")
+    print(f"{'FeatureBuilder (CSR float32)':<36}{sparse_seconds:>12.2f}{sparse_bytes / 2 ** 20:>15.1f}")
+    print(f"memória: {dense_bytes / sparse_bytes:.1f}x menor; tempo: {dense_seconds / sparse_seconds:.1f}x")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark da matriz de atributos')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Quantidade de casos (padrão: %(default)s)')
+    parser.add_argument('--batch-size', type=int, default=100_000, help='Linhas por lote (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.rows, args.batch_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark da imputação pela moda
+Compara o mode() + fillna do notebook sobre o DataFrame de objetos, que recalcula as modas de
+todo o histórico a cada semana nova, com o ModeImputer: tabelas de frequência somadas em
+streaming, atualizadas só com a semana nova e aplicadas aos lotes Arrow
+
+Uso:
+    python -m benchmarks.bench_imputer --rows 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.ml.features import FEATURE_COLUMNS
+from src.ml.imputer import ModeImputer
+
+
+def build_batches(rows: int, batch_size: int, seed: int = 42):
+    """Lotes no formato bruto do DBF: códigos em texto, com ' ' e nulos nos campos vazios"""
+    rng = np.random.default_rng(seed)
+    choices = np.array(['1', '2', '2', '9', ' ', None], dtype=object)
+    batches = []
+    for start in range(0, rows, batch_size):
+        size = min(batch_size, rows - start)
+        batches.append(pa.record_batch({column: pa.array(choices[rng.integers(0, len(choices), size)], pa.string())
+                                        for column in FEATURE_COLUMNS}))
+    return batches
+
+
+def notebook_impute(frame: pd.DataFrame) -> pd.DataFrame:
+    """Como no notebook: ' ' vira NaN e cada coluna recebe a moda calculada sobre o DataFrame inteiro"""
+    frame = frame.replace(' ', np.nan)
+    for column in frame.columns:
+        frame[column] = frame[column].fillna(frame[column].mode()[0])
+    return frame
+
+
+def run(rows: int, batch_size: int, week: int) -> None:
+    batches = build_batches(rows, batch_size)
+    appended = build_batches(week, batch_size, seed=7)
+    frame = pa.Table.from_batches(batches).to_pandas()
+    new = pa.Table.from_batches(appended).to_pandas()
+
+    started = time.perf_counter()
+    notebook_impute(frame)
+    notebook_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    notebook_impute(pd.concat([frame, new], ignore_index=True))
+    notebook_week_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    imputer = ModeImputer().fit(batches)
+    for _ in imputer.transform_batches(batches):
+        pass
+    imputer_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    imputer.fit(appended)
+    for _ in imputer.transform_batches(appended):
+        pass
+    imputer_week_seconds = time.perf_counter() - started
+
+    print(f"{rows} linhas × {len(FEATURE_COLUMNS)} colunas; semana nova com {week} linhas")
+    print(f"{'imputação':<46}{'histórico (s)':>15}{'semana (s)':>12}")
+    print(f"{'notebook (mode() + fillna, tudo de novo)':<46}{notebook_seconds:>15.2f}{notebook_week_seconds:>12.2f}")
+    print(f"{'ModeImputer (contagens somadas em streaming)':<46}{imputer_seconds:>15.2f}{imputer_week_seconds:>12.3f}")
+    print(f"ganho: {notebook_seconds / imputer_seconds:.1f}x no histórico, "
+          f"{notebook_week_seconds / imputer_week_seconds:.0f}x na semana nova")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark da imputação pela moda')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Quantidade de casos (padrão: %(default)s)')
+    parser.add_argument('--week', type=int, default=20_000, help='Casos da semana nova (padrão: %(default)s)')
+    parser.add_argument('-b', '--batch-size', type=int, default=100_000, help='Linhas por lote (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.rows, args.batch_size, args.week)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark do motor de incidência
+Compara o cálculo com pandas após o merge com a tabela de municípios (como no notebook)
+com IncidenceEngine.compute_year e com a consulta memoizada de uma semana
+
+Uso:
+    python -m benchmarks.bench_incidence --rows 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.incidence import IncidenceEngine
+from src.geo.municipios import get_default_index
+
+
+def build_cases(index, rows: int, seed: int = 42):
+    """Gera casos sintéticos (município, semana) de 2024"""
+    rng = np.random.default_rng(seed)
+    codes = np.asarray(index.table['sinan'])[rng.integers(0, len(index), rows)].astype(str)
+    weeks = np.char.add('2024', np.char.zfill(rng.integers(1, 54, rows).astype(str), 2))
+    return codes, weeks
+
+
+def pandas_incidence(index, populacao, codes, weeks) -> pd.DataFrame:
+    municipios = pd.DataFrame({'ID_MUNICIP': np.asarray(index.table['sinan']).astype(str)})
+    municipios['POPULACAO'] = municipios['ID_MUNICIP'].map(populacao)
+    casos = pd.DataFrame({'ID_MUNICIP': codes, 'SEM_NOT': weeks})
+    merged = casos.merge(municipios, on='ID_MUNICIP', how='left')
+    counts = merged.groupby(['ID_MUNICIP', 'SEM_NOT']).size().unstack(fill_value=0)
+    counts = counts.reindex(municipios['ID_MUNICIP'], fill_value=0)
+    population = municipios.set_index('ID_MUNICIP')['POPULACAO']
+    incidencia = counts.div(population, axis=0) * 100_000
+    acumulada = counts.cumsum(axis=1).div(population, axis=0) * 100_000
+    variacao = counts.pct_change(axis=1) * 100
+    return pd.concat({'incidencia': incidencia, 'acumulada': acumulada, 'variacao': variacao}, axis=1)
+
+
+def run(rows: int) -> None:
+    index = get_default_index()
+    rng = np.random.default_rng(7)
+    populacao = {str(code): int(value) for code, value in
+                 zip(index.table['sinan'], rng.integers(1_000, 2_000_000, len(index)))}
+    codes, weeks = build_cases(index, rows)
+
+    started = time.perf_counter()
+    pandas_incidence(index, populacao, codes, weeks)
+    pandas_seconds = time.perf_counter() - started
+
+    engine = IncidenceEngine(index, populacao=populacao)
+    started = time.perf_counter()
+    engine.add_cases(weeks, codes)
+    count_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    engine.compute_year(2024)
+    year_seconds = time.perf_counter() - started
+    engine_seconds = count_seconds + year_seconds
+
+    started = time.perf_counter()
+    engine.week(2024, 30)
+    cached_seconds = time.perf_counter() - started
+
+    new_week = engine.week(2024, 53)
+    started = time.perf_counter()
+    engine.set_week(2024, 53, new_week.codes.astype(str), new_week.casos + 1)
+    engine.week(2024, 53)
+    new_week_seconds = time.perf_counter() - started
+
+    print(f"{'cálculo':<34}{'tempo (s)':>12}")
+    print(f"{'pandas (merge + groupby)':<34}{pandas_seconds:>12.3f}")
+    print(f"{'motor: contagem dos casos':<34}{count_seconds:>12.3f}")
+    print(f"{'motor: ano inteiro (3 indicadores)':<34}{year_seconds:>12.4f}")
+    print(f"{'motor: semana memoizada':<34}{cached_seconds:>12.6f}")
+    print(f"{'motor: nova semana recalculada':<34}{new_week_seconds:>12.4f}")
+    print(f"ganho (contagem + ano inteiro): {pandas_seconds / engine_seconds:.1f}x")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark do motor de incidência')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Quantidade de casos (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.rows)
+
+
+if __name__ == '__main__':
+    main()
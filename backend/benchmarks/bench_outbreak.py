@@ -0,0 +1,114 @@
+"""
+Benchmark do motor de alertas de surto
+Compara o laço por município sobre o DataFrame com merge (como no notebook) com OutbreakEngine:
+uma semana, o ano inteiro em uma passada e a semana nova pelas somas móveis
+
+Uso:
+    python -m benchmarks.bench_outbreak --rows 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.outbreak import HISTORY_YEARS, WINDOW, Z_SCORE, OutbreakEngine
+from src.geo.municipios import get_default_index
+
+
+YEAR = 2024
+WEEK = 30
+
+
+def build_cases(index, rows: int, seed: int = 42):
+    """Gera casos sintéticos (município, semana) de YEAR e dos anos do histórico"""
+    rng = np.random.default_rng(seed)
+    codes = np.asarray(index.table['sinan'])[rng.integers(0, len(index), rows)].astype(str)
+    years = rng.integers(YEAR - HISTORY_YEARS, YEAR + 1, rows).astype(str)
+    weeks = np.char.add(years, np.char.zfill(rng.integers(1, 53, rows).astype(str), 2))
+    return codes, weeks
+
+
+def pandas_alerts(index, codes, weeks) -> pd.DataFrame:
+    """Limiares de uma semana com um laço por município, filtrando o DataFrame a cada volta"""
+    municipios = pd.DataFrame({'ID_MUNICIP': np.asarray(index.table['sinan']).astype(str),
+                               'NOME': [name.decode('utf-8') for name in index.table['nome']]})
+    casos = pd.DataFrame({'ID_MUNICIP': codes, 'SEM_NOT': weeks})
+    merged = casos.merge(municipios, on='ID_MUNICIP', how='left')
+    merged['ANO'] = merged['SEM_NOT'].str[:4].astype(int)
+    merged['SEMANA'] = merged['SEM_NOT'].str[4:].astype(int)
+    target = f'{YEAR}{WEEK:02d}'
+    ordered = sorted(merged['SEM_NOT'].unique())
+    previous = ordered[ordered.index(target) - WINDOW:ordered.index(target)]
+
+    rows = []
+    for municipio in municipios['ID_MUNICIP']:
+        subset = merged[merged['ID_MUNICIP'] == municipio]
+        same_week = subset[(subset['SEMANA'] == WEEK) & (subset['ANO'] < YEAR)].groupby('ANO').size()
+        same_week = same_week.reindex(range(YEAR - HISTORY_YEARS, YEAR), fill_value=0)
+        window = subset.groupby('SEM_NOT').size().reindex(previous, fill_value=0)
+        atual = int((subset['SEM_NOT'] == target).sum())
+        rows.append({
+            'ID_MUNICIP': municipio, 'casos': atual,
+            'q3': same_week.quantile(0.75),
+            'limiar': window.mean() + Z_SCORE * window.std(),
+        })
+    result = pd.DataFrame(rows)
+    result['alerta_quartis'] = result['casos'] > result['q3']
+    result['alerta_media'] = result['casos'] > result['limiar']
+    return result
+
+
+def run(rows: int) -> None:
+    index = get_default_index()
+    codes, weeks = build_cases(index, rows)
+
+    started = time.perf_counter()
+    pandas_alerts(index, codes, weeks)
+    pandas_seconds = time.perf_counter() - started
+
+    # O motor recebe as contagens agregadas, como vêm do cubo de estatísticas
+    cube = pd.DataFrame({'sem_not': weeks, 'id_municip': codes}).value_counts().reset_index(name='total')
+    engine = OutbreakEngine(index)
+    started = time.perf_counter()
+    for year in range(YEAR - HISTORY_YEARS, YEAR + 1):
+        rows_of_year = cube[cube['sem_not'].str.startswith(str(year))]
+        engine.set_year(year, rows_of_year['sem_not'].to_numpy(), rows_of_year['id_municip'].to_numpy(),
+                        rows_of_year['total'].to_numpy())
+    load_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    engine.alerts(YEAR, WEEK, 'quartis')
+    engine.alerts(YEAR, WEEK, 'media')
+    week_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    engine.compute_year(YEAR, 'quartis')
+    engine.compute_year(YEAR, 'media')
+    year_seconds = time.perf_counter() - started
+
+    engine.alerts(YEAR, WEEK, 'media')
+    new_week = engine.alerts(YEAR, WEEK + 1, 'media')
+    started = time.perf_counter()
+    engine.set_week(YEAR, WEEK + 1, new_week.codes.astype(str), new_week.casos + 1)
+    engine.alerts(YEAR, WEEK + 1, 'media')
+    new_week_seconds = time.perf_counter() - started
+
+    print(f"{'cálculo':<38}{'tempo (s)':>12}")
+    print(f"{'pandas (laço por município)':<38}{pandas_seconds:>12.3f}")
+    print(f"{'motor: carga dos anos (cubo)':<38}{load_seconds:>12.3f}")
+    print(f"{'motor: uma semana (2 métodos)':<38}{week_seconds:>12.4f}")
+    print(f"{'motor: ano inteiro (2 métodos)':<38}{year_seconds:>12.4f}")
+    print(f"{'motor: semana nova (somas móveis)':<38}{new_week_seconds:>12.4f}")
+    print(f"ganho (carga + uma semana): {pandas_seconds / (load_seconds + week_seconds):.1f}x")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark do motor de alertas de surto')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Quantidade de casos (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark da pontuação do risco de desfecho
+Compara requisições concorrentes de um registro pontuadas uma a uma (uma chamada ao modelo por
+requisição) com o MicroBatcher, e com a pontuação em lote, em vazão e latência p50/p99; com --http,
+mede POST /predict no Gunicorn configurado por gunicorn.conf.py, com workers sync e com o padrão
+
+Uso:
+    python -m benchmarks.bench_prediction --clients 16 --requests 4000
+    python -m benchmarks.bench_prediction --http --clients 16 --requests 4000
+"""
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.ml.batching import LatencyTracker, MicroBatcher
+from src.ml.features import FeatureBuilder
+from src.ml.model import OutcomeModel
+from src.ml.training import build_estimator
+
+from benchmarks.bench_features import build_batches
+from benchmarks.bench_serving import BACKEND_DIR, free_port, wait_ready
+
+
+def build_model(rows: int) -> OutcomeModel:
+    batches = build_batches(rows, rows)
+    builder = FeatureBuilder().fit(batches)
+    X, y = builder.build(batches)
+    estimator = build_estimator('LinearSVM_SGD', {'alpha': 1e-4})
+    estimator.fit(X, y)
+    return OutcomeModel(builder, estimator, {'model': 'LinearSVM_SGD', 'dense': False})
+
+
+def build_records(rows: int):
+    """Notificações planas (chaves em minúsculo), como no corpo do POST"""
+    table = build_batches(rows, rows, seed=7)[0]
+    columns = {name.lower(): table.column(name).cast('string').to_pylist() for name in table.schema.names}
+    return [{name: values[i] for name, values in columns.items()} for i in range(rows)]
+
+
+def concurrent(call, records, clients: int):
+    """Dispara os registros em clients threads; retorna (segundos, tracker de latência)"""
+    tracker = LatencyTracker(len(records))
+
+    def request(record):
+        started = time.perf_counter()
+        call(record)
+        tracker.record(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        list(pool.map(request, records))
+    return time.perf_counter() - started, tracker
+
+
+def post(port: int, path: str, body: bytes) -> dict:
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        connection.request('POST' if body else 'GET', path, body=body or None,
+                           headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        data = json.loads(response.read())
+    finally:
+        connection.close()
+    if response.status != 200:
+        raise RuntimeError(f"{path}: {response.status} {data.get('error')}")
+    return data['data']
+
+
+def serve(env: dict, records, clients: int, workers: int):
+    """Sobe o Gunicorn com gunicorn.conf.py, dispara os registros e lê o tamanho médio dos lotes"""
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}', 'src.main:app'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    bodies = [json.dumps(record).encode('utf-8') for record in records]
+    try:
+        wait_ready(port)
+        concurrent(lambda body: post(port, '/api/dengue-notifications/predict', body), bodies[:clients * 10], clients)
+        seconds, tracker = concurrent(lambda body: post(port, '/api/dengue-notifications/predict', body),
+                                      bodies, clients)
+        # Cada conexão cai em um worker; terminada a carga, os contadores identificam o worker
+        sizes = {}
+        for _ in range(workers * 4):
+            stats = post(port, '/api/dengue-notifications/predict/latency', b'')['predict']
+            if stats['mean_batch_size'] is not None:
+                sizes[(stats['count'], stats['batches'])] = stats['mean_batch_size']
+        return seconds, tracker, sum(sizes.values()) / max(len(sizes), 1)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def run_http(clients: int, requests: int) -> None:
+    records = build_records(requests)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'modelo.pkl')
+        build_model(20_000).save(path)
+        env = dict(os.environ, FLASK_ENV='production', PREDICTION_MODEL_PATH=path,
+                   DATABASE_URL=f"sqlite:///{os.path.join(directory, 'predicao.db')}")
+        env.pop('GUNICORN_THREADS', None)
+        workers = int(env.get('WEB_CONCURRENCY', (os.cpu_count() or 1) * 2 + 1))
+        results = [('sync (GUNICORN_THREADS=1)', serve(dict(env, GUNICORN_THREADS='1'), records, clients, workers)),
+                   ('padrão do gunicorn.conf.py', serve(env, records, clients, workers))]
+
+    print(f"POST /api/dengue-notifications/predict: {requests} requisições, {clients} clientes, "
+          f"{workers} workers, {os.cpu_count()} CPU(s)")
+    print(f"{'workers':<30}{'req/s':>10}{'p50 (ms)':>12}{'p99 (ms)':>12}{'lote médio':>12}")
+    for name, (seconds, tracker, batch_size) in results:
+        p50, p99 = tracker.percentiles(50, 99)
+        print(f"{name:<30}{requests / seconds:>10.0f}{p50:>12.2f}{p99:>12.2f}{batch_size:>12.2f}")
+
+
+def run(clients: int, requests: int, max_batch_size: int, max_wait_ms: float) -> None:
+    model = build_model(20_000)
+    records = build_records(requests)
+    model.score(records[:1])
+
+    # Sem micro-lote: cada requisição chama o modelo (a transformação e o estimador seguram a GIL)
+    single_seconds, single = concurrent(lambda record: model.score([record]), records, clients)
+
+    batcher = MicroBatcher(model.score, max_batch_size=max_batch_size, max_wait=max_wait_ms / 1000)
+    batched_seconds, batched = concurrent(batcher.submit, records, clients)
+
+    started = time.perf_counter()
+    bulk = [model.score(records[i:i + 1000]) for i in range(0, requests, 1000)]
+    bulk_seconds = time.perf_counter() - started
+    assert sum(len(scores) for scores in bulk) == requests
+
+    stats = batcher.stats()
+    print(f"{requests} requisições, {clients} clientes, lote até {max_batch_size} e espera até {max_wait_ms} ms "
+          f"(tamanho médio dos lotes: {stats['mean_batch_size']})")
+    print(f"{'pontuação':<32}{'req/s':>10}{'p50 (ms)':>12}{'p99 (ms)':>12}")
+    for name, seconds, tracker in (('uma chamada por requisição', single_seconds, single),
+                                   ('micro-lote', batched_seconds, batched)):
+        p50, p99 = tracker.percentiles(50, 99)
+        print(f"{name:<32}{requests / seconds:>10.0f}{p50:>12.2f}{p99:>12.2f}")
+    print(f"{'lote de 1000 (/predict/batch)':<32}{requests / bulk_seconds:>10.0f}"
+          f"{bulk_seconds / len(bulk) * 1000:>12.2f}{'':>12}")
+    print(f"ganho do micro-lote: {single_seconds / batched_seconds:.1f}x na vazão")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark da pontuação de risco')
+    parser.add_argument('--clients', type=int, default=16, help='Requisições simultâneas (padrão: %(default)s)')
+    parser.add_argument('--requests', type=int, default=4000, help='Total de requisições (padrão: %(default)s)')
+    parser.add_argument('--max-batch-size', type=int, default=64, help='Tamanho máximo do lote (padrão: %(default)s)')
+    parser.add_argument('--max-wait-ms', type=float, default=5, help='Espera máxima do lote (padrão: %(default)s)')
+    parser.add_argument('--http', action='store_true', help='Mede o endpoint no Gunicorn de gunicorn.conf.py')
+    args = parser.parse_args(argv)
+    if args.http:
+        run_http(args.clients, args.requests)
+    else:
+        run(args.clients, args.requests, args.max_batch_size, args.max_wait_ms)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark do perfil de qualidade
+Compara as varreduras do notebook sobre o DataFrame de objetos ((dengue == ' ').sum(),
+.str.contains(" ") por coluna, isna().sum() e .unique() por coluna) com o Profile, que lê cada
+lote Arrow uma única vez
+
+Uso:
+    python -m benchmarks.bench_profiler --rows 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.ml.features import FEATURE_COLUMNS
+from src.quality.profiler import Profile
+
+
+def build_batches(rows: int, batch_size: int, seed: int = 42):
+    """Lotes no formato bruto do DBF: texto com ' ' nos campos vazios e alguns códigos fora do domínio"""
+    rng = np.random.default_rng(seed)
+    batches = []
+    for start in range(0, rows, batch_size):
+        size = min(batch_size, rows - start)
+        columns = {'NU_NOTIFIC': pa.array([f'{start + i:07d}' for i in range(size)])}
+        for column in FEATURE_COLUMNS:
+            choices = np.array(['1', '2', '9', ' ', ' ', '8'], dtype=object)
+            columns[column] = pa.array(choices[rng.integers(0, len(choices), size)])
+        columns['ID_MUNICIP'] = pa.array(rng.integers(110001, 530010, size).astype(str))
+        columns['DT_NOTIFIC'] = pa.array((np.datetime64('2024-01-01') + rng.integers(0, 366, size)).astype(str))
+        columns['DT_OBITO'] = pa.array(np.where(rng.random(size) < 0.99, ' ', '2024-03-01').astype(object))
+        batches.append(pa.record_batch(columns))
+    return batches
+
+
+def notebook_profile(frame: pd.DataFrame) -> None:
+    """Como no notebook: uma varredura por pergunta, sobre colunas object"""
+    vazios = (frame == ' ').sum()
+    _ = vazios / len(frame) * 100
+    for column in frame.columns:
+        frame[column].str.contains(' ').sum()
+    frame.isna().sum()
+    for column in frame.columns:
+        frame[column].unique()
+
+
+def run(rows: int, batch_size: int) -> None:
+    batches = build_batches(rows, batch_size)
+    frame = pa.Table.from_batches(batches).to_pandas()
+
+    started = time.perf_counter()
+    notebook_profile(frame)
+    notebook_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    profile = Profile().fit(batches)
+    dropped = profile.columns_to_drop()
+    profile_seconds = time.perf_counter() - started
+
+    print(f"{rows} linhas × {len(frame.columns)} colunas; descartadas (> 50% vazios): {', '.join(dropped)}")
+    print(f"{'perfil':<44}{'tempo (s)':>12}")
+    print(f"{'notebook (pandas, várias varreduras)':<44}{notebook_seconds:>12.2f}")
+    print(f"{'Profile (uma passada, HLL + top-k + domínio)':<44}{profile_seconds:>12.2f}")
+    print(f"ganho: {notebook_seconds / profile_seconds:.1f}x")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark do perfil de qualidade')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Quantidade de casos (padrão: %(default)s)')
+    parser.add_argument('-b', '--batch-size', type=int, default=100_000, help='Linhas por lote (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.rows, args.batch_size)
+
+
+if __name__ == '__main__':
+    main()
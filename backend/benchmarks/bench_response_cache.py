@@ -0,0 +1,54 @@
+"""
+Benchmark do cache de respostas HTTP
+Mede requisições/s de GET /api/users sem cache, com cache e com If-None-Match (304)
+
+Uso:
+    python -m benchmarks.bench_response_cache --users 500 --requests 2000
+"""
+import argparse
+import time
+
+from src.main import create_app
+from src.models.user import User, db
+
+
+def _throughput(client, requests: int, headers=None) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        client.get('/api/users', headers=headers or {})
+    return requests / (time.perf_counter() - started)
+
+
+def run(users: int, requests: int) -> None:
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        db.session.add_all(User(username=f'usuario{i}', email=f'usuario{i}@example.com') for i in range(users))
+        db.session.commit()
+
+        client = app.test_client()
+        cache = app.extensions.pop('response_cache')
+        uncached = _throughput(client, requests)
+
+        app.extensions['response_cache'] = cache
+        cached = _throughput(client, requests)
+        etag = client.get('/api/users').headers['ETag']
+        conditional = _throughput(client, requests, {'If-None-Match': etag})
+
+    print(f"{'modo':<22}{'requisições/s':>16}")
+    print(f"{'sem cache':<22}{uncached:>16.0f}")
+    print(f"{'com cache (200)':<22}{cached:>16.0f}")
+    print(f"{'If-None-Match (304)':<22}{conditional:>16.0f}")
+    print(f"ganho: {cached / uncached:.1f}x (200), {conditional / uncached:.1f}x (304)")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark do cache de respostas HTTP')
+    parser.add_argument('--users', type=int, default=500, help='Usuários cadastrados (padrão: %(default)s)')
+    parser.add_argument('--requests', type=int, default=2000, help='Requisições por modo (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.users, args.requests)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark da serialização das listagens grandes
+Compara o caminho anterior (lista inteira de to_dict + jsonify indentado) com a exportação
+em streaming compacta, medindo bytes, latência e pico de memória alocada (tracemalloc)
+
+Uso:
+    python -m benchmarks.bench_serialization --rows 20000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from src.main import create_app
+from src.models.dengue_notification import DengueNotification
+from src.models.user import db
+from src.services.dengue_service import DengueService
+
+
+def _legacy_to_dict(notification):
+    """to_dict anterior: percorre as colunas e testa isoformat a cada valor"""
+    data = {'id': notification.id}
+    for column in notification.__table__.columns:
+        if column.name == 'id':
+            continue
+        value = getattr(notification, column.name)
+        data[column.name] = value.isoformat() if hasattr(value, 'isoformat') else value
+    return data
+
+
+def _measure(function):
+    """Mede a latência sem rastreamento e, numa segunda execução, o pico de memória"""
+    started = time.perf_counter()
+    size = function()
+    seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, seconds, peak / 1024 / 1024
+
+
+def run(rows: int) -> None:
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        records = [(row, {
+            'tp_not': '2', 'id_agravo': 'A90', 'dt_notific': f'2024-03-{row % 28 + 1:02d}',
+            'sem_not': '202410', 'nu_ano': '2024', 'sg_uf_not': '13', 'id_municip': '130260',
+            'sg_uf': '13', 'id_mn_resi': '130260', 'dt_sin_pri': '2024-03-01', 'cs_sexo': 'F',
+            'febre': '1', 'mialgia': '1', 'classi_fin': '10', 'evolucao': '1',
+        }) for row in range(rows)]
+        DengueService().bulk_create(records)
+        db.session.expunge_all()
+
+        def legacy():
+            app.json.compact = False
+            notifications = DengueNotification.query.order_by(DengueNotification.dt_notific.desc()).all()
+            body = app.json.response({
+                'success': True,
+                'data': [_legacy_to_dict(notification) for notification in notifications],
+                'message': 'Notificações recuperadas com sucesso'
+            }).get_data()
+            db.session.expunge_all()
+            return len(body)
+
+        client = app.test_client()
+
+        def streaming():
+            app.json.compact = True
+            response = client.get('/api/dengue-notifications/export')
+            size = sum(len(chunk) for chunk in response.response)
+            response.close()
+            return size
+
+        legacy_size, legacy_seconds, legacy_peak = _measure(legacy)
+        stream_size, stream_seconds, stream_peak = _measure(streaming)
+
+        # Confere que os dois caminhos entregam os mesmos registros
+        assert len(json.loads(client.get('/api/dengue-notifications/export').data)['data']) == rows
+
+    print(f"{'caminho':<30}{'MB':>10}{'tempo (s)':>12}{'pico (MB)':>12}")
+    print(f"{'to_dict + jsonify indentado':<30}{legacy_size / 1e6:>10.2f}{legacy_seconds:>12.3f}{legacy_peak:>12.1f}")
+    print(f"{'streaming compacto':<30}{stream_size / 1e6:>10.2f}{stream_seconds:>12.3f}{stream_peak:>12.1f}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark da serialização das listagens grandes')
+    parser.add_argument('--rows', type=int, default=20_000, help='Quantidade de notificações (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark do servidor de produção
+Compara a vazão do servidor de desenvolvimento do Flask (flask run, com threads) com o
+Gunicorn configurado por gunicorn.conf.py (preload + workers), na listagem de notificações
+com o cache de respostas desligado
+
+Uso:
+    python -m benchmarks.bench_serving --clients 16 --seconds 5 --workers 4
+"""
+import argparse
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATH = '/api/dengue-notifications?limit=50'
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _seed(env: dict, rows: int) -> None:
+    """Cria o banco e insere as notificações em um processo à parte (a configuração lê o ambiente)"""
+    script = (
+        "from src.main import create_app\n"
+        "from src.models.user import db\n"
+        "from src.services.dengue_service import DengueService\n"
+        "app = create_app('production')\n"
+        "with app.app_context():\n"
+        "    db.create_all()\n"
+        "    record = {'tp_not': '2', 'id_agravo': 'A90', 'dt_notific': '2024-02-10', 'sem_not': '202406',\n"
+        "              'nu_ano': '2024', 'sg_uf_not': '13', 'id_municip': '130260', 'sg_uf': '13',\n"
+        "              'id_mn_resi': '130260', 'febre': '1', 'classi_fin': '10', 'evolucao': '1'}\n"
+        f"    DengueService().bulk_create(enumerate([record] * {rows}, start=1))\n"
+    )
+    subprocess.run([sys.executable, '-c', script], cwd=BACKEND_DIR, env=env, check=True)
+
+
+def wait_ready(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            connection.request('GET', '/health')
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Servidor não respondeu na porta {port}")
+
+
+def _load(port: int, clients: int, seconds: float) -> dict:
+    counts = {'requests': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client():
+        done = errors = 0
+        while time.perf_counter() < deadline:
+            try:
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+                connection.request('GET', PATH)
+                response = connection.getresponse()
+                response.read()
+                connection.close()
+                if response.status == 200:
+                    done += 1
+                else:
+                    errors += 1
+            except OSError:
+                errors += 1
+        with lock:
+            counts['requests'] += done
+            counts['errors'] += errors
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts
+
+
+def _serve(command, env: dict, port: int, clients: int, seconds: float) -> dict:
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready(port)
+        _load(port, clients, 1.0)  # aquecimento
+        return _load(port, clients, seconds)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def run(clients: int, seconds: float, workers: int, rows: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ,
+                   DATABASE_URL=f"sqlite:///{os.path.join(directory, 'serving.db')}",
+                   FLASK_ENV='production',
+                   RESPONSE_CACHE_TTL='0',
+                   WEB_CONCURRENCY=str(workers))
+        _seed(env, rows)
+
+        servers = []
+        port = free_port()
+        servers.append(('flask run', _serve(
+            [sys.executable, '-m', 'flask', '--app', 'src.main:app', 'run', '--port', str(port)],
+            env, port, clients, seconds)))
+        port = free_port()
+        servers.append((f'gunicorn ({workers}w)', _serve(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}',
+             'src.main:app'], env, port, clients, seconds)))
+
+    print(f"GET {PATH}, {clients} clientes por {seconds:g} s, {os.cpu_count()} CPU(s)")
+    print(f"{'servidor':<16}{'req/s':>10}{'erros':>8}")
+    for name, counts in servers:
+        print(f"{name:<16}{counts['requests'] / seconds:>10.0f}{counts['errors']:>8}")
+    print(f"ganho: {servers[1][1]['requests'] / max(servers[0][1]['requests'], 1):.1f}x")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark do servidor de produção')
+    parser.add_argument('--clients', type=int, default=16, help='Clientes concorrentes (padrão: %(default)s)')
+    parser.add_argument('--seconds', type=float, default=5.0, help='Duração por servidor (padrão: %(default)s)')
+    parser.add_argument('--workers', type=int, default=(os.cpu_count() or 1) * 2 + 1,
+                        help='Workers do Gunicorn (padrão: 2 * CPUs + 1 = %(default)s)')
+    parser.add_argument('--rows', type=int, default=1_000, help='Notificações no banco (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.clients, args.seconds, args.workers, args.rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark da inicialização da aplicação
+Mede, em processos novos, o total do `python -X importtime` de src.main, os módulos pesados
+(numpy, pyarrow, pandas, sklearn) carregados na inicialização e o tempo até a primeira resposta
+
+Uso:
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('numpy', 'pyarrow', 'pandas', 'sklearn', 'scipy', 'pydantic')
+
+# Processo que cria a aplicação e responde à primeira requisição, medindo desde o início
+FIRST_RESPONSE = (
+    "import time\n"
+    "started = time.perf_counter()\n"
+    "from src.main import create_app\n"
+    "app = create_app('production')\n"
+    "response = app.test_client().get('/api/users')\n"
+    "elapsed = time.perf_counter() - started\n"
+    "import sys\n"
+    "assert response.status_code == 200, response.status_code\n"
+    "print(elapsed, ','.join(name for name in {heavy!r} if name in sys.modules) or '-')\n"
+)
+
+_IMPORTTIME = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)')
+_REPORTED = HEAVY_MODULES + ('flask', 'sqlalchemy', 'flask_sqlalchemy')
+
+
+def _env(directory: str) -> dict:
+    return dict(os.environ, FLASK_ENV='production',
+                DATABASE_URL=f"sqlite:///{os.path.join(directory, 'startup.db')}")
+
+
+def import_time(env: dict) -> tuple:
+    """Total cumulativo (s) de src.main e o custo cumulativo dos pacotes pesados importados"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import src.main'],
+                            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True)
+    total = 0
+    packages = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if not match:
+            continue
+        cumulative, name = int(match.group(2)), match.group(3)
+        if name == 'src.main':
+            total = cumulative
+        if name in _REPORTED:
+            packages[name] = cumulative
+    return total / 1e6, packages
+
+
+def first_response(env: dict) -> tuple:
+    """Tempo (s) do início do processo até a primeira resposta e os módulos pesados carregados"""
+    script = FIRST_RESPONSE.format(heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, '-c', script], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, check=True)
+    elapsed, loaded = result.stdout.split()[-2:]
+    return float(elapsed), loaded
+
+
+def run(runs: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        env = _env(directory)
+        subprocess.run([sys.executable, '-m', 'flask', '--app', 'src.main:app', 'init-db'],
+                       cwd=BACKEND_DIR, env=env, capture_output=True)
+
+        imports = [import_time(env) for _ in range(runs)]
+        responses = [first_response(env) for _ in range(runs)]
+
+    print(f"mediana de {runs} processos")
+    print(f"import de src.main (-X importtime): {statistics.median(total for total, _ in imports):.3f} s")
+    print(f"até a primeira resposta (GET /api/users): {statistics.median(t for t, _ in responses):.3f} s")
+    print(f"módulos pesados após a primeira resposta: {responses[-1][1]}")
+    print("pacotes importados por src.main (cumulativo, primeira execução):")
+    for name, micros in sorted(imports[0][1].items(), key=lambda item: -item[1]):
+        print(f"  {name:<20}{micros / 1e3:>9.1f} ms")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark da inicialização da aplicação')
+    parser.add_argument('--runs', type=int, default=5, help='Processos medidos (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.runs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark da varredura de modelos do desfecho
+Compara o fluxo do notebook (pickle recarregado e GridSearchCV sequencial por modelo, sobre a matriz
+densa) com run_sweep (pool de processos sobre a matriz mapeada e partições gravadas) e com a retomada
+
+Uso:
+    python -m benchmarks.bench_training --rows 20000 --workers 2
+"""
+import argparse
+import os
+import pickle
+import shutil
+import tempfile
+import time
+
+from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
+
+from src.ml.features import FeatureBuilder
+from src.ml.training import PARAM_GRIDS, build_estimator, expand_grid, run_sweep, save_matrix
+
+from benchmarks.bench_features import build_batches
+
+# Modelos leves para a medição caber em poucos minutos; --models amplia
+DEFAULT_MODELS = ('NaiveBayes', 'LinearSVM_SGD')
+
+
+def notebook_sweep(pickle_path: str, models, splits: int) -> None:
+    """Como no notebook: para cada modelo, recarrega o pickle, separa o teste e roda o GridSearchCV"""
+    for model in models:
+        with open(pickle_path, 'rb') as f:
+            X, y = pickle.load(f)
+        X_tr, _, y_tr, _ = train_test_split(X, y, test_size=0.30, random_state=42, stratify=y)
+        grid = GridSearchCV(build_estimator(model, {}), PARAM_GRIDS[model], scoring='f1_macro',
+                            cv=StratifiedKFold(n_splits=splits, shuffle=True, random_state=42), n_jobs=1)
+        grid.fit(X_tr, y_tr)
+
+
+def run(rows: int, workers: int, models, splits: int) -> None:
+    batches = build_batches(rows, min(rows, 100_000))
+    builder = FeatureBuilder().fit(batches)
+    X, y = builder.build(batches)
+
+    directory = tempfile.mkdtemp(prefix='bench_training_')
+    try:
+        pickle_path = os.path.join(directory, 'dengue_data_preprocessados.pkl')
+        with open(pickle_path, 'wb') as f:
+            pickle.dump([X.toarray(), y], f)
+        matrix_dir = os.path.join(directory, 'matriz')
+        save_matrix(matrix_dir, X, y)
+        combinations = expand_grid(models, ['nenhum'])
+
+        started = time.perf_counter()
+        notebook_sweep(pickle_path, models, splits)
+        notebook_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        run_sweep(matrix_dir, os.path.join(directory, 'treino'), combinations, workers=workers, n_splits=splits)
+        sweep_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        run_sweep(matrix_dir, os.path.join(directory, 'treino'), combinations, workers=workers, n_splits=splits)
+        resume_seconds = time.perf_counter() - started
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"matriz {X.shape[0]} × {X.shape[1]}, {len(combinations)} combinações × {splits} partições, "
+          f"{workers} processo(s), {os.cpu_count()} CPU(s)")
+    print(f"{'varredura':<40}{'tempo (s)':>12}")
+    print(f"{'notebook (pickle + GridSearchCV denso)':<40}{notebook_seconds:>12.2f}")
+    print(f"{'run_sweep (mmap + partições gravadas)':<40}{sweep_seconds:>12.2f}")
+    print(f"{'run_sweep retomado (tudo concluído)':<40}{resume_seconds:>12.2f}")
+    print(f"ganho: {notebook_seconds / sweep_seconds:.1f}x (a varredura também avalia cada combinação no teste)")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark da varredura de modelos')
+    parser.add_argument('--rows', type=int, default=20_000, help='Quantidade de casos (padrão: %(default)s)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Processos (padrão: %(default)s)')
+    parser.add_argument('--models', nargs='*', default=list(DEFAULT_MODELS), help='Modelos (padrão: %(default)s)')
+    parser.add_argument('--splits', type=int, default=5, help='Partições da validação cruzada (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.rows, args.workers, args.models, args.splits)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark da validação do CasoDengue
+Compara a validação registro a registro (model_validate por notificação) com a validação em lote
+pelo TypeAdapter da lista e com a validação colunar de um lote Arrow, em registros/s
+
+Uso:
+    python -m benchmarks.bench_validation --rows 50000
+"""
+import argparse
+import time
+
+import pyarrow as pa
+
+from src.services.dengue_service import DengueService
+from src.services.validation_service import ValidationService
+
+
+def build_records(rows: int, invalid_every: int):
+    """Gera notificações planas, com uma data de notificação inválida a cada invalid_every registros"""
+    records = []
+    for row in range(rows):
+        day = row % 28 + 1
+        records.append({
+            'tp_not': '2', 'id_agravo': 'A90', 'dt_notific': f'2024-02-{day:02d}',
+            'sem_not': '202406', 'nu_ano': '2024', 'sg_uf_not': '13', 'id_municip': '130260',
+            'dt_sin_pri': f'2024-02-{day:02d}', 'nu_idade_n': '4030', 'cs_sexo': 'F',
+            'sg_uf': '13', 'id_mn_resi': '130260', 'febre': '1', 'mialgia': '2',
+            'classi_fin': '10', 'evolucao': '1',
+        })
+        if invalid_every and row % invalid_every == 0:
+            records[-1]['dt_notific'] = f'{day:02d}/02/2024'
+    return records
+
+
+def _timed(function) -> float:
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+
+def run(rows: int, invalid_every: int, chunk_size: int) -> None:
+    records = build_records(rows, invalid_every)
+    batch = pa.RecordBatch.from_pylist(records)
+    service = ValidationService()
+    # Lotes do tamanho usado pela carga em massa (DengueService.BULK_CHUNK_SIZE)
+    chunks = [records[start:start + chunk_size] for start in range(0, rows, chunk_size)]
+    batches = [batch.slice(start, chunk_size) for start in range(0, rows, chunk_size)]
+
+    def one_by_one():
+        for record in records:
+            try:
+                service.validate(record)
+            except ValueError:
+                pass
+
+    # Aquece o índice de municípios e o validador antes de medir
+    service.validate_many(records[:10])
+
+    results = [
+        ('um a um', _timed(one_by_one)),
+        ('TypeAdapter', _timed(lambda: [service.validate_many(chunk) for chunk in chunks])),
+        ('colunar', _timed(lambda: [service.validate_batch(chunk) for chunk in batches])),
+    ]
+
+    print(f"{'modo':<14}{'tempo (s)':>12}{'registros/s':>14}")
+    for name, seconds in results:
+        print(f"{name:<14}{seconds:>12.3f}{rows / seconds:>14.0f}")
+    base = results[0][1]
+    print('ganho: ' + ', '.join(f"{name} {base / seconds:.1f}x" for name, seconds in results[1:]))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark da validação do CasoDengue')
+    parser.add_argument('--rows', type=int, default=50_000, help='Quantidade de notificações (padrão: %(default)s)')
+    parser.add_argument('--invalid-every', type=int, default=100,
+                        help='Um registro inválido a cada N (0 para nenhum; padrão: %(default)s)')
+    parser.add_argument('--chunk-size', type=int, default=DengueService.BULK_CHUNK_SIZE,
+                        help='Registros por lote (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.rows, args.invalid_every, args.chunk_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Configuração do Gunicorn para produção
+Carrega a aplicação uma única vez no processo mestre (preload_app) e a compartilha com os
+workers por copy-on-write; cada worker descarta o pool de conexões herdado logo após o fork
+
+Uso (a partir de backend/):
+    gunicorn src.main:app
+
+Recargas sem derrubar conexões (sinais para o processo mestre):
+    kill -HUP <mestre>             # relê esta configuração e troca os workers aos poucos
+    kill -USR2 <mestre>            # novo código: sobe um novo mestre com a aplicação recarregada,
+    kill -QUIT <mestre antigo>     # e então encerra o antigo após as requisições em andamento
+"""
+import multiprocessing
+import os
+
+# A aplicação é criada ao importar src.main; o ambiente precisa estar definido antes
+os.environ.setdefault('FLASK_ENV', 'production')
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+
+# Modelo de risco (mesmo padrão de Config.PREDICTION_MODEL_PATH)
+PREDICTION_MODEL_PATH = os.environ.get('PREDICTION_MODEL_PATH') or \
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'database', 'modelo.pkl')
+# O micro-lote da pontuação só reúne requisições que estão no mesmo worker ao mesmo tempo: com o
+# modelo exportado, os workers passam a gthread com estas threads (um worker sync atende uma por vez)
+PREDICTION_THREADS = 8
+
+# Workers a partir dos núcleos disponíveis (2 * CPUs + 1), ajustável por WEB_CONCURRENCY
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS',
+                             PREDICTION_THREADS if os.path.exists(PREDICTION_MODEL_PATH) else 1))
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+preload_app = True
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+# Tempo para os workers terminarem as requisições em andamento no HUP/TERM
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Reciclagem periódica dos workers, com jitter para não reiniciarem todos juntos
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.environ.get('GUNICORN_ACCESSLOG')
+errorlog = '-'
+
+
+def when_ready(server):
+    """Aquece no mestre as estruturas somente leitura, herdadas pelos workers sem cópia"""
+    from src.geo.municipios import get_default_index
+    from src.schema.registry import get_registry
+    from src.services.validation_service import get_batch_adapter
+
+    get_default_index()
+    get_registry()
+    get_batch_adapter()
+
+    # Modelo de risco, se já exportado; a thread do micro-lote é criada em cada worker
+    from src.main import app
+    if os.path.exists(app.config['PREDICTION_MODEL_PATH']):
+        from src.ml.model import get_model
+        get_model(app.config['PREDICTION_MODEL_PATH'])
+        if server.cfg.threads <= 1:
+            server.log.warning("Workers sync atendem uma requisição por vez: o micro-lote da pontuação "
+                               "não reúne requisições (use GUNICORN_THREADS > 1)")
+
+
+def post_fork(server, worker):
+    """Cada worker abre as próprias conexões em vez de reutilizar as do mestre"""
+    from src.database.engine import dispose_engines
+    from src.main import app
+
+    dispose_engines(app)
@@ -0,0 +1,413 @@
+"""
+Motor de incidência de dengue por 100 mil habitantes
+Mantém as contagens de casos em uma matriz município × semana por ano e calcula incidência,
+incidência acumulada e variação semanal de forma vetorizada, com memoização por (ano, semana, nível)
+"""
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+
+from src.codecs.sinan import to_int64
+from src.epi.weeks import FIRST_YEAR, LAST_YEAR, weeks_in_year
+from src.geo.municipios import POPULACAO_DESCONHECIDA, MunicipioIndex, get_default_index, read_populacao
+
+
+WEEKS = 53
+PER_INHABITANTS = 100_000
+LEVELS = ('municipio', 'uf', 'brasil')
+
+
+def split_sem_not(sem_not: Union[str, int]) -> Tuple[int, int]:
+    """Separa a semana epidemiológica AAAASS em (ano, semana)"""
+    text = str(sem_not).strip()
+    if len(text) != 6 or not text.isdigit() or not 1 <= int(text[4:]) <= WEEKS:
+        raise ValueError(f"Semana epidemiológica inválida: '{sem_not}'")
+    return int(text[:4]), int(text[4:])
+
+
+def _as_values(values: Any) -> Any:
+    if isinstance(values, (np.ndarray, pa.Array, pa.ChunkedArray)):
+        return values
+    return list(values)
+
+
+def _split_many(sem_not: Iterable[Any]) -> np.ndarray:
+    """Separa uma coluna de semanas em (ano, semana), vetorizado; semanas inválidas viram (0, 0)"""
+    codes = to_int64(_as_values(sem_not)).fill_null(0).to_numpy(zero_copy_only=False)
+    year, week = codes // 100, codes % 100
+    valid = (year >= 1000) & (year <= 9999) & (week >= 1) & (week <= WEEKS)
+    return np.column_stack([np.where(valid, year, 0), np.where(valid, week, 0)]).astype(np.int64)
+
+
+def _nan_to_none(values: np.ndarray) -> List[Optional[float]]:
+    return [None if np.isnan(value) else round(float(value), 4) for value in values]
+
+
+@dataclass
+class WeekIncidence:
+    """Indicadores de uma semana epidemiológica em um nível (um elemento por unidade)"""
+    year: int
+    week: int
+    level: str
+    codes: np.ndarray
+    names: List[str]
+    casos: np.ndarray
+    populacao: np.ndarray
+    incidencia: np.ndarray
+    incidencia_acumulada: np.ndarray
+    variacao_semanal: np.ndarray
+
+    @property
+    def sem_not(self) -> str:
+        return f'{self.year}{self.week:02d}'
+
+    def to_records(self, only_with_cases: bool = False) -> List[Dict[str, Any]]:
+        """Converte para uma lista de dicionários (NaN vira None)"""
+        selected = np.flatnonzero(self.casos > 0) if only_with_cases else np.arange(len(self.codes))
+        populacao = self.populacao[selected]
+        incidencia = _nan_to_none(self.incidencia[selected])
+        acumulada = _nan_to_none(self.incidencia_acumulada[selected])
+        variacao = _nan_to_none(self.variacao_semanal[selected])
+        return [
+            {
+                'codigo': str(self.codes[position]),
+                'nome': self.names[position],
+                'casos': int(self.casos[position]),
+                'populacao': None if np.isnan(populacao[i]) else int(populacao[i]),
+                'incidencia': incidencia[i],
+                'incidencia_acumulada': acumulada[i],
+                'variacao_semanal': variacao[i],
+            }
+            for i, position in enumerate(selected)
+        ]
+
+
+class WeekCounts:
+    """
+    Contagens de casos em uma matriz município × semana por ano, sobre o índice de municípios
+
+    Base dos motores de indicadores: toda alteração das contagens passa por _invalidate, que
+    descarta a memoização da semana alterada e das seguintes.
+    """
+
+    def __init__(self, index: Optional[MunicipioIndex] = None):
+        self.index = index or get_default_index()
+        if self.index is None:
+            raise ValueError("Índice de municípios indisponível")
+
+        self._counts: Dict[int, np.ndarray] = {}
+        self._cache: Dict[Tuple, Any] = {}
+        # Semanas cujas contagens mudaram na origem e precisam ser recarregadas
+        self._stale: set = set()
+        self._lock = threading.RLock()
+        self.ignored = 0
+        # Revisão do cubo (compartilhada entre processos) já refletida nas contagens carregadas
+        self.revision: Optional[int] = None
+
+    def years(self) -> List[int]:
+        return sorted(self._counts)
+
+    def has_year(self, year: int) -> bool:
+        return year in self._counts
+
+    def _accumulate(self, positions: np.ndarray, weeks: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Matriz município × semana com a soma das contagens (bincount em vez de laço)"""
+        flat = positions.astype(np.int64) * WEEKS + (weeks - 1)
+        size = len(self.index) * WEEKS
+        summed = np.bincount(flat, weights=counts, minlength=size)
+        return np.rint(summed).astype(np.int64).reshape(len(self.index), WEEKS)
+
+    def _matrix(self, year: int) -> np.ndarray:
+        if year not in self._counts:
+            self._counts[year] = np.zeros((len(self.index), WEEKS), dtype=np.int64)
+        return self._counts[year]
+
+    def _invalidate(self, year: int, first_week: int) -> None:
+        """Descarta a memoização da semana alterada e das seguintes (acumulada e variação dependem dela)"""
+        for key in [key for key in self._cache if key[0] == year and key[1] >= first_week]:
+            del self._cache[key]
+
+    def _positions(self, id_municip: Iterable[Any]) -> np.ndarray:
+        return self.index.positions(_as_values(id_municip))
+
+    def set_year(self, year: int, sem_not: Iterable[Any], id_municip: Iterable[Any],
+                 casos: Iterable[int]) -> None:
+        """Substitui todas as contagens de um ano (ex.: carregadas do cubo de estatísticas)"""
+        split = _split_many(sem_not)
+        weeks = split[:, 1]
+        positions = self._positions(id_municip)
+        counts = np.asarray(_as_values(casos), dtype=np.int64)
+
+        found = (positions >= 0) & (split[:, 0] == year)
+        matrix = self._accumulate(positions[found], weeks[found], counts[found])
+        with self._lock:
+            self.ignored += int(counts[~found].sum())
+            self._counts[year] = matrix
+            self._stale = {key for key in self._stale if key[0] != year}
+            self._invalidate(year, 1)
+
+    def set_week(self, year: int, week: int, id_municip: Iterable[Any], casos: Iterable[int]) -> None:
+        """
+        Substitui as contagens de uma semana
+
+        Só a memoização dessa semana (e das seguintes, se já calculadas) é descartada: ao chegar a
+        semana mais recente, apenas ela é recalculada.
+        """
+        positions = self._positions(id_municip)
+        counts = np.asarray(_as_values(casos), dtype=np.int64)
+        found = positions >= 0
+
+        column = np.bincount(positions[found], weights=counts[found], minlength=len(self.index))
+        column = np.rint(column).astype(np.int64)
+        with self._lock:
+            self.ignored += int(counts[~found].sum())
+            self._matrix(year)[:, week - 1] = column
+            self._stale.discard((year, week))
+            self._invalidate(year, week)
+
+    def mark_stale(self, sem_not: Iterable[Any]) -> None:
+        """Marca semanas alteradas na origem; só anos já carregados são afetados"""
+        with self._lock:
+            for year, week in _split_many(sem_not).tolist():
+                if year in self._counts:
+                    self._stale.add((year, week))
+                    self._invalidate(year, week)
+
+    def clear(self) -> None:
+        """Descarta todas as contagens e a memoização"""
+        with self._lock:
+            self._counts.clear()
+            self._cache.clear()
+            self._stale.clear()
+            self.ignored = 0
+            self.revision = None
+
+    def stale_weeks(self, year: int) -> List[int]:
+        """Semanas do ano marcadas para recarga"""
+        with self._lock:
+            return sorted(week for stale_year, week in self._stale if stale_year == year)
+
+    def add_cases(self, sem_not: Iterable[Any], id_municip: Iterable[Any],
+                  casos: Optional[Iterable[int]] = None) -> List[Tuple[int, int]]:
+        """
+        Soma casos (ou variações, que podem ser negativas) às contagens
+
+        Returns:
+            Semanas (ano, semana) alteradas
+        """
+        split = _split_many(sem_not)
+        positions = self._positions(id_municip)
+        counts = np.ones(len(split), dtype=np.int64) if casos is None else np.asarray(_as_values(casos), dtype=np.int64)
+        found = (positions >= 0) & (split[:, 0] > 0)
+
+        keys = np.unique(split[found, 0] * 100 + split[found, 1])
+        touched = [(int(key // 100), int(key % 100)) for key in keys]
+        with self._lock:
+            self.ignored += int(counts[~found].sum())
+            for year in np.unique(split[found, 0]):
+                rows = found & (split[:, 0] == year)
+                self._matrix(int(year))[:] += self._accumulate(positions[rows], split[rows, 1], counts[rows])
+            for year in {year for year, _ in touched}:
+                self._invalidate(year, min(week for y, week in touched if y == year))
+        return touched
+
+    def cached_keys(self) -> List[Tuple]:
+        """Chaves (ano, semana, ...) atualmente memoizadas; no motor de incidência, (ano, semana, nível)"""
+        with self._lock:
+            return sorted(self._cache)
+
+
+class IncidenceEngine(WeekCounts):
+    """
+    Motor de incidência sobre o índice de municípios
+
+    A população vem do índice (coluna POPULACAO da planilha) ou do dicionário populacao
+    (código SINAN → habitantes), que tem precedência. Onde a população é desconhecida,
+    as taxas ficam NaN; no nível UF/Brasil, basta um município sem população para a taxa
+    do agregado ficar NaN, em vez de um denominador parcial.
+
+    A variação semanal da semana 1 compara com a última semana epidemiológica (52 ou 53) do ano
+    anterior, que precisa estar carregado (ver history_years); sem ele, fica NaN.
+    """
+
+    def __init__(self, index: Optional[MunicipioIndex] = None, populacao: Optional[Dict[Any, int]] = None):
+        super().__init__(index)
+
+        table = self.index.table
+        population = np.asarray(table['populacao'], dtype=np.float64)
+        population[population == POPULACAO_DESCONHECIDA] = np.nan
+        if populacao:
+            codes = np.fromiter((int(code) for code in populacao), dtype=np.int64, count=len(populacao))
+            positions = self.index.positions(codes)
+            values = np.fromiter(populacao.values(), dtype=np.float64, count=len(populacao))
+            population[positions[positions >= 0]] = values[positions >= 0]
+
+        uf_codes, uf_inverse = np.unique(np.asarray(table['cod_uf'], dtype=np.int16), return_inverse=True)
+        uf_names = {int(code): uf.decode('ascii') for code, uf in zip(table['cod_uf'], table['uf'])}
+
+        # Por nível: código das unidades, nomes, unidade de cada município e população
+        self._levels = {
+            'municipio': (
+                np.asarray(table['sinan']),
+                [name.decode('utf-8') for name in table['nome']],
+                np.arange(len(table)),
+                population,
+            ),
+            'uf': (uf_codes, [uf_names[int(code)] for code in uf_codes], uf_inverse,
+                   self._sum_by(population, uf_inverse, len(uf_codes))),
+            'brasil': (np.array([0]), ['Brasil'], np.zeros(len(table), dtype=np.int64),
+                       np.array([population.sum()])),
+        }
+
+    @staticmethod
+    def history_years(year: int, week: int) -> List[int]:
+        """Anos cujas contagens entram nos indicadores da semana, incluindo o próprio"""
+        return [year - 1, year] if week == 1 else [year]
+
+    def _invalidate(self, year: int, first_week: int) -> None:
+        """Também descarta a semana 1 do ano seguinte, cuja variação depende do fim deste ano"""
+        super()._invalidate(year, first_week)
+        for key in [key for key in self._cache if key[:2] == (year + 1, 1)]:
+            del self._cache[key]
+
+    def _last_week(self, year: int, level: str) -> np.ndarray:
+        """Casos da última semana epidemiológica do ano anterior (zeros se ele não foi carregado)"""
+        previous = year - 1
+        if previous not in self._counts or not FIRST_YEAR <= previous <= LAST_YEAR:
+            return np.zeros(len(self._levels[level][0]), dtype=np.int64)
+        last = int(weeks_in_year([previous])[0])
+        return self._level_counts(self._counts[previous], level)[:, last - 1]
+
+    @staticmethod
+    def _sum_by(values: np.ndarray, groups: np.ndarray, size: int) -> np.ndarray:
+        """Soma linhas (ou elementos) por grupo; NaN em um membro contamina o grupo"""
+        result = np.zeros((size,) + values.shape[1:], dtype=np.float64)
+        np.add.at(result, groups, values)
+        return result
+
+    def _level_counts(self, counts: np.ndarray, level: str) -> np.ndarray:
+        codes, _, groups, _ = self._levels[level]
+        if level == 'municipio':
+            return counts
+        return self._sum_by(counts, groups, len(codes)).astype(np.int64)
+
+    @staticmethod
+    def _rates(counts: np.ndarray, population: np.ndarray) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rates = counts / population.reshape((-1,) + (1,) * (counts.ndim - 1)) * PER_INHABITANTS
+        rates[~np.isfinite(rates)] = np.nan
+        return rates
+
+    @staticmethod
+    def _change(current: np.ndarray, previous: np.ndarray) -> np.ndarray:
+        """Variação percentual em relação à semana anterior (NaN quando a anterior não teve casos)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = (current - previous) / previous * 100.0
+        change[previous == 0] = np.nan
+        return change
+
+    def _build(self, year: int, week: int, level: str, casos: np.ndarray, acumulados: np.ndarray,
+               anteriores: np.ndarray) -> WeekIncidence:
+        codes, names, _, population = self._levels[level]
+        return WeekIncidence(
+            year=year, week=week, level=level, codes=codes, names=names,
+            casos=casos,
+            populacao=population,
+            incidencia=self._rates(casos, population),
+            incidencia_acumulada=self._rates(acumulados, population),
+            variacao_semanal=self._change(casos, anteriores),
+        )
+
+    def week(self, year: int, week: int, level: str = 'municipio') -> WeekIncidence:
+        """Indicadores de uma semana, memoizados por (ano, semana, nível)"""
+        if level not in LEVELS:
+            raise ValueError(f"Nível inválido: '{level}'. Use {', '.join(LEVELS)}")
+        if not 1 <= week <= WEEKS:
+            raise ValueError(f"Semana epidemiológica inválida: {week}")
+
+        key = (year, week, level)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+
+            counts = self._level_counts(self._matrix(year), level)
+            casos = counts[:, week - 1]
+            acumulados = counts[:, :week].sum(axis=1)
+            anteriores = counts[:, week - 2] if week > 1 else self._last_week(year, level)
+
+            result = self._build(year, week, level, casos, acumulados, anteriores)
+            self._cache[key] = result
+            return result
+
+    def compute_year(self, year: int, level: str = 'municipio') -> List[WeekIncidence]:
+        """
+        Calcula todas as semanas de um ano em uma única passada vetorizada
+
+        As matrizes unidade × semana de incidência, acumulada e variação saem de uma só vez;
+        cada semana é guardada na memoização, então consultas seguintes não recalculam nada.
+        """
+        if level not in LEVELS:
+            raise ValueError(f"Nível inválido: '{level}'. Use {', '.join(LEVELS)}")
+
+        with self._lock:
+            counts = self._level_counts(self._matrix(year), level)
+            acumulados = np.cumsum(counts, axis=1)
+            anteriores = np.empty_like(counts)
+            anteriores[:, 0] = self._last_week(year, level)
+            anteriores[:, 1:] = counts[:, :-1]
+
+            codes, names, _, population = self._levels[level]
+            incidencia = self._rates(counts, population)
+            acumulada = self._rates(acumulados, population)
+            variacao = self._change(counts, anteriores)
+
+            results = []
+            for week in range(1, WEEKS + 1):
+                column = week - 1
+                result = WeekIncidence(
+                    year=year, week=week, level=level, codes=codes, names=names,
+                    casos=counts[:, column],
+                    populacao=population,
+                    incidencia=incidencia[:, column],
+                    incidencia_acumulada=acumulada[:, column],
+                    variacao_semanal=variacao[:, column],
+                )
+                self._cache[(year, week, level)] = result
+                results.append(result)
+            return results
+
+
+_default_engine: Optional[IncidenceEngine] = None
+_default_populacao_path: Optional[str] = None
+_default_lock = threading.Lock()
+
+
+def clear_default_engine() -> None:
+    """Descarta as contagens do motor padrão, se já criado (ex.: entre testes)"""
+    if _default_engine is not None:
+        _default_engine.clear()
+
+
+def get_default_engine(populacao_path: Optional[str] = None) -> IncidenceEngine:
+    """
+    Retorna o motor sobre o índice padrão de municípios, criado uma vez por processo
+
+    populacao_path (POPULACAO_PATH na configuração) aponta para a tabela de população lida por
+    read_populacao, com precedência sobre a coluna do índice; é ignorado se o arquivo não existe.
+    Um caminho diferente do usado na criação recria o motor.
+    """
+    global _default_engine, _default_populacao_path
+    if _default_engine is None or _default_populacao_path != populacao_path:
+        with _default_lock:
+            if _default_engine is None or _default_populacao_path != populacao_path:
+                populacao = None
+                if populacao_path and os.path.exists(populacao_path):
+                    populacao = read_populacao(populacao_path)
+                _default_engine = IncidenceEngine(populacao=populacao)
+                _default_populacao_path = populacao_path
+    return _default_engine
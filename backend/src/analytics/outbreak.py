@@ -0,0 +1,293 @@
+"""
+Detecção de surtos por município: canal endêmico (quartis) e limiar móvel (média + 2 desvios)
+Limiares e alertas de todos os municípios saem de uma passada NumPy sobre a matriz município × semana;
+o limiar móvel avança semana a semana pelas somas móveis de casos e de quadrados
+"""
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.analytics.incidence import WEEKS, WeekCounts, _nan_to_none
+from src.epi.weeks import FIRST_YEAR, LAST_YEAR, weeks_in_year
+from src.geo.municipios import MunicipioIndex
+
+
+# 'quartis': canal endêmico com os quartis da mesma semana nos anos anteriores
+# 'media': limiar móvel com a média e o desvio-padrão das semanas imediatamente anteriores
+METHODS = ('quartis', 'media')
+HISTORY_YEARS = 5
+WINDOW = 52
+Z_SCORE = 2.0
+# Casos mínimos na semana para um alerta (evita alertas por um caso isolado em histórico zerado)
+MIN_CASES = 1
+
+# Zonas do diagrama de controle, da menor para a maior contagem
+ZONES = ('sucesso', 'seguranca', 'alerta', 'epidemia')
+
+
+@dataclass
+class WeekAlerts:
+    """Limiares e alertas de uma semana epidemiológica (um elemento por município)"""
+    year: int
+    week: int
+    method: str
+    codes: np.ndarray
+    names: List[str]
+    casos: np.ndarray
+    inferior: np.ndarray
+    centro: np.ndarray
+    superior: np.ndarray
+    zona: np.ndarray
+    alerta: np.ndarray
+
+    @property
+    def sem_not(self) -> str:
+        return f'{self.year}{self.week:02d}'
+
+    def to_records(self, only_alerts: bool = False) -> List[Dict[str, Any]]:
+        """Converte para uma lista de dicionários, opcionalmente só com os municípios em alerta"""
+        selected = np.flatnonzero(self.alerta) if only_alerts else np.arange(len(self.codes))
+        inferior = _nan_to_none(self.inferior[selected])
+        centro = _nan_to_none(self.centro[selected])
+        superior = _nan_to_none(self.superior[selected])
+        return [
+            {
+                'codigo': str(self.codes[position]),
+                'nome': self.names[position],
+                'casos': int(self.casos[position]),
+                'inferior': inferior[i],
+                'centro': centro[i],
+                'superior': superior[i],
+                'zona': ZONES[self.zona[position]],
+                'alerta': bool(self.alerta[position]),
+            }
+            for i, position in enumerate(selected)
+        ]
+
+
+def _classify(casos: np.ndarray, inferior: np.ndarray, centro: np.ndarray,
+              superior: np.ndarray, min_cases: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Zona (índice em ZONES) e alerta de cada município, para uma semana ou uma matriz de semanas"""
+    zona = (casos >= inferior).astype(np.int8) + (casos > centro) + (casos > superior)
+    return zona, (casos > superior) & (casos >= min_cases)
+
+
+def _weeks(year: int) -> int:
+    return int(weeks_in_year([year])[0])
+
+
+class OutbreakEngine(WeekCounts):
+    """
+    Motor de alertas de surto sobre o índice de municípios
+
+    No canal endêmico, os limiares de uma semana são o 1º quartil, a mediana e o 3º quartil da
+    mesma semana nos `years` anos anteriores; no limiar móvel, a média menos/mais z desvios-padrão
+    das `window` semanas anteriores. Há alerta quando os casos passam do limiar superior (zona
+    epidêmica). Anos sem contagens carregadas contam como semanas sem casos.
+
+    As somas móveis da última semana consultada ficam guardadas: consultar a semana seguinte (a
+    semana nova que acabou de chegar) soma a coluna que entra na janela e subtrai a que sai, sem
+    reler a janela inteira.
+    """
+
+    def __init__(self, index: Optional[MunicipioIndex] = None, years: int = HISTORY_YEARS,
+                 window: int = WINDOW, z: float = Z_SCORE, min_cases: int = MIN_CASES):
+        super().__init__(index)
+        if years < 1:
+            raise ValueError("years deve ser maior que zero")
+        if window < 2:
+            raise ValueError("window deve ter ao menos duas semanas")
+        self.years_back = years
+        self.window = window
+        self.z = z
+        self.min_cases = min_cases
+
+        table = self.index.table
+        self._codes = np.asarray(table['sinan'])
+        self._names = [name.decode('utf-8') for name in table['nome']]
+        # (última semana da janela, soma dos casos, soma dos quadrados) por município
+        self._rolling: Optional[Tuple[Tuple[int, int], np.ndarray, np.ndarray]] = None
+
+    # Contagens
+
+    def _year_counts(self, year: int) -> np.ndarray:
+        """Matriz do ano sem criá-la (ano não carregado conta como zerado)"""
+        counts = self._counts.get(year)
+        return counts if counts is not None else np.zeros((len(self.index), WEEKS), dtype=np.int64)
+
+    def _column(self, year: int, week: int) -> np.ndarray:
+        return self._year_counts(year)[:, week - 1].astype(np.float64)
+
+    @staticmethod
+    def _previous(year: int, week: int, steps: int) -> Tuple[int, int]:
+        """Semana `steps` semanas antes, atravessando anos de 52 ou 53 semanas"""
+        week -= steps
+        while week < 1:
+            year -= 1
+            week += _weeks(year)
+        return year, week
+
+    def _series(self, year: int, week: int, length: int) -> np.ndarray:
+        """Matriz município × `length` semanas consecutivas que terminam em (year, week)"""
+        parts = []
+        while length > 0:
+            take = min(length, week)
+            parts.append(self._year_counts(year)[:, week - take:week])
+            length -= take
+            year -= 1
+            week = _weeks(year)
+        return np.concatenate(parts[::-1], axis=1).astype(np.float64)
+
+    def _history(self, year: int, weeks: np.ndarray) -> np.ndarray:
+        """Contagens das semanas nos anos anteriores (ano × município × semana); sem semana 53, vale a 52"""
+        return np.stack([
+            self._year_counts(previous)[:, np.minimum(weeks, _weeks(previous)) - 1]
+            for previous in range(year - self.years_back, year)
+        ])
+
+    def history_years(self, year: int, method: str) -> List[int]:
+        """Anos cujas contagens entram nos limiares das semanas de `year`, incluindo o próprio"""
+        if method == 'quartis':
+            return list(range(year - self.years_back, year + 1))
+        return list(range(self._previous(year, 1, self.window)[0], year + 1))
+
+    # Invalidação
+
+    def _invalidate(self, year: int, first_week: int) -> None:
+        """
+        Descarta alertas e somas móveis a partir da semana alterada
+
+        A semana entra no histórico das seguintes, inclusive de outros anos, então a memoização de
+        todas as semanas posteriores (e não só das do mesmo ano) é descartada.
+        """
+        changed = (year, first_week)
+        for key in [key for key in self._cache if key[:2] >= changed]:
+            del self._cache[key]
+        if self._rolling is not None and self._rolling[0] >= changed:
+            self._rolling = None
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+            self._rolling = None
+
+    # Limiares
+
+    def _check(self, year: int, week: int, method: str) -> None:
+        if method not in METHODS:
+            raise ValueError(f"Método inválido: '{method}'. Use {', '.join(METHODS)}")
+        if not FIRST_YEAR + self.years_back <= year <= LAST_YEAR:
+            raise ValueError(f"Ano fora do calendário epidemiológico: {year}")
+        if not 1 <= week <= _weeks(year):
+            raise ValueError(f"Semana epidemiológica inválida: {year}{week:02d}")
+
+    def _statistics(self, sums: np.ndarray, squares: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Limiar inferior, média e limiar superior a partir das somas da janela"""
+        mean = sums / self.window
+        deviation = np.sqrt(np.maximum(squares - sums * mean, 0.0) / (self.window - 1))
+        return np.maximum(mean - self.z * deviation, 0.0), mean, mean + self.z * deviation
+
+    def _moving(self, year: int, week: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Somas da janela que termina na semana anterior, avançando as somas guardadas quando possível"""
+        end = self._previous(year, week, 1)
+        state = self._rolling
+        if state is not None and state[0] == end:
+            sums, squares = state[1], state[2]
+        elif state is not None and state[0] == self._previous(*end, 1):
+            entering = self._column(*end)
+            leaving = self._column(*self._previous(*end, self.window))
+            sums = state[1] + entering - leaving
+            squares = state[2] + np.square(entering) - np.square(leaving)
+        else:
+            series = self._series(*end, self.window)
+            sums, squares = series.sum(axis=1), np.square(series).sum(axis=1)
+        self._rolling = (end, sums, squares)
+        return sums, squares
+
+    def _build(self, year: int, week: int, method: str, casos: np.ndarray, inferior: np.ndarray,
+               centro: np.ndarray, superior: np.ndarray, zona: np.ndarray, alerta: np.ndarray) -> WeekAlerts:
+        return WeekAlerts(
+            year=year, week=week, method=method, codes=self._codes, names=self._names,
+            casos=casos, inferior=inferior, centro=centro, superior=superior, zona=zona, alerta=alerta,
+        )
+
+    def alerts(self, year: int, week: int, method: str = 'quartis') -> WeekAlerts:
+        """Limiares e alertas de uma semana para todos os municípios, memoizados por (ano, semana, método)"""
+        self._check(year, week, method)
+
+        key = (year, week, method)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+
+            casos = self._year_counts(year)[:, week - 1].copy()
+            if method == 'quartis':
+                history = self._history(year, np.array([week]))[:, :, 0]
+                inferior, centro, superior = np.percentile(history, [25, 50, 75], axis=0)
+            else:
+                inferior, centro, superior = self._statistics(*self._moving(year, week))
+
+            zona, alerta = _classify(casos, inferior, centro, superior, self.min_cases)
+            result = self._build(year, week, method, casos, inferior, centro, superior, zona, alerta)
+            self._cache[key] = result
+            return result
+
+    def compute_year(self, year: int, method: str = 'quartis') -> List[WeekAlerts]:
+        """
+        Calcula os limiares e alertas de todas as semanas de um ano em uma única passada vetorizada
+
+        No limiar móvel, as somas de todas as janelas saem das somas acumuladas da série; as somas
+        da última semana do ano ficam guardadas para a semana 1 do ano seguinte.
+        """
+        self._check(year, 1, method)
+        weeks = _weeks(year)
+
+        with self._lock:
+            casos = self._year_counts(year)[:, :weeks].copy()
+            if method == 'quartis':
+                history = self._history(year, np.arange(1, weeks + 1))
+                inferior, centro, superior = np.percentile(history, [25, 50, 75], axis=0)
+            else:
+                series = self._series(year, weeks, self.window + weeks)
+                sums = np.zeros((len(series), self.window + weeks + 1))
+                squares = np.zeros_like(sums)
+                np.cumsum(series, axis=1, out=sums[:, 1:])
+                np.cumsum(np.square(series), axis=1, out=squares[:, 1:])
+                # Janela da semana i: colunas [i - 1, window + i - 1) da série
+                window_sums = sums[:, self.window:] - sums[:, :weeks + 1]
+                window_squares = squares[:, self.window:] - squares[:, :weeks + 1]
+                self._rolling = ((year, weeks), window_sums[:, weeks].copy(), window_squares[:, weeks].copy())
+                inferior, centro, superior = self._statistics(window_sums[:, :weeks], window_squares[:, :weeks])
+
+            zona, alerta = _classify(casos, inferior, centro, superior, self.min_cases)
+            results = []
+            for week in range(1, weeks + 1):
+                column = week - 1
+                result = self._build(year, week, method, casos[:, column], inferior[:, column], centro[:, column],
+                                     superior[:, column], zona[:, column], alerta[:, column])
+                self._cache[(year, week, method)] = result
+                results.append(result)
+            return results
+
+
+_default_engine: Optional[OutbreakEngine] = None
+_default_lock = threading.Lock()
+
+
+def clear_default_engine() -> None:
+    """Descarta as contagens do motor padrão, se já criado (ex.: entre testes)"""
+    if _default_engine is not None:
+        _default_engine.clear()
+
+
+def get_default_engine() -> OutbreakEngine:
+    """Retorna o motor de alertas sobre o índice padrão de municípios, criado uma vez por processo"""
+    global _default_engine
+    if _default_engine is None:
+        with _default_lock:
+            if _default_engine is None:
+                _default_engine = OutbreakEngine()
+    return _default_engine
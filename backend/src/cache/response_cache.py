@@ -0,0 +1,171 @@
+"""
+Cache de respostas HTTP dos endpoints de leitura
+Guarda o corpo já serializado por rota + parâmetros da consulta, com limite LRU e TTL,
+responde com ETag forte e 304 a requisições condicionais, e é invalidado pelas escritas dos serviços
+do processo; endpoints com revisão no banco entram com ela na chave e enxergam escritas de outros workers
+"""
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+
+from flask import Response, current_app, has_app_context, request
+
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_TTL_SECONDS = 30.0
+
+CacheKey = Tuple[str, Tuple[Tuple[str, str], ...], Any]
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Resposta serializada guardada no cache"""
+    body: bytes
+    status: int
+    mimetype: str
+    etag: str
+    tags: FrozenSet[str]
+    expires_at: float
+
+
+class ResponseCache:
+    """Cache LRU com TTL de respostas, invalidado por tags (ex.: 'users', 'dengue', 'stats')"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_entries <= 0:
+            raise ValueError("max_entries deve ser maior que zero")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: 'OrderedDict[CacheKey, CachedResponse]' = OrderedDict()
+        # Geração de cada tag: uma escrita durante o cálculo da resposta impede que ela seja guardada
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        """Retorna a resposta guardada (e a marca como usada) ou None se ausente/expirada"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= self._clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def generations(self, tags: FrozenSet[str]) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in sorted(tags))
+
+    def put(self, key: CacheKey, body: bytes, status: int, mimetype: str, tags: FrozenSet[str],
+            generations: Optional[Tuple[int, ...]] = None) -> CachedResponse:
+        """
+        Guarda uma resposta; se as tags foram invalidadas desde generations, ela não é guardada
+        """
+        entry = CachedResponse(
+            body=body,
+            status=status,
+            mimetype=mimetype,
+            etag=hashlib.sha256(body).hexdigest(),
+            tags=tags,
+            expires_at=self._clock() + self.ttl,
+        )
+        with self._lock:
+            current = tuple(self._generations.get(tag, 0) for tag in sorted(tags))
+            if generations is not None and generations != current:
+                return entry
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, *tags: str) -> int:
+        """Remove as respostas com alguma das tags; retorna quantas foram removidas"""
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            stale = [key for key, entry in self._entries.items() if entry.tags.intersection(tags)]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+
+def init_app(app) -> ResponseCache:
+    """Cria o cache da aplicação a partir de RESPONSE_CACHE_MAX_ENTRIES e RESPONSE_CACHE_TTL"""
+    cache = ResponseCache(
+        max_entries=app.config.get('RESPONSE_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES),
+        ttl=app.config.get('RESPONSE_CACHE_TTL', DEFAULT_TTL_SECONDS),
+    )
+    app.extensions['response_cache'] = cache
+    return cache
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """Cache da aplicação corrente (None fora de um contexto de aplicação ou se desabilitado)"""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('response_cache')
+
+
+def invalidate(*tags: str) -> None:
+    """Invalida as respostas das tags no cache da aplicação corrente; chamado pelos serviços após escritas"""
+    cache = get_cache()
+    if cache is not None:
+        cache.invalidate(*tags)
+
+
+def cached(*tags: str, revision: Optional[Callable[[], Any]] = None):
+    """
+    Decorador de endpoints GET: responde do cache e trata If-None-Match
+
+    A chave é a rota mais os parâmetros da consulta (em ordem) e, se informada, a revisão atual dos
+    dados. A invalidação por tags só alcança este processo; a revisão, lida do banco a cada requisição,
+    faz uma escrita de outro worker mudar a chave. Só respostas 200 são guardadas.
+    """
+    tag_set = frozenset(tags)
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = get_cache()
+            if cache is None or request.method != 'GET':
+                return view(*args, **kwargs)
+
+            # A revisão é lida antes da view: a resposta nunca é mais antiga que a chave em que fica
+            version = revision() if revision is not None else None
+            key = (request.path, tuple(sorted(request.args.items(multi=True))), version)
+            entry = cache.get(key)
+            if entry is None:
+                generations = cache.generations(tag_set)
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                entry = cache.put(key, response.get_data(), response.status_code, response.mimetype,
+                                  tag_set, generations)
+
+            response = Response(entry.body, status=entry.status, mimetype=entry.mimetype)
+            response.set_etag(entry.etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response.make_conditional(request)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,61 @@
+"""
+Decodificadores escalares do SINAN
+Versões originais (linha a linha) usadas no notebook de pré-processamento,
+mantidas como referência de semântica e para o benchmark dos decodificadores vetorizados
+"""
+
+
+def ibge_to_sinan(cod_ibge: str):
+    """
+    Converte código IBGE (7 dígitos) para código SINAN (6 dígitos).
+    - Remove o dígito verificador (último dígito do IBGE)
+    - Elimina zeros à esquerda do código do município
+    """
+    s = str(cod_ibge).zfill(7)   # garante 7 dígitos
+    uf = s[:2]
+    municipio_5 = s[2:-1]        # 5 dígitos do município (sem DV)
+
+    municipio_int = int(municipio_5)  # remove zeros à esquerda
+    return uf + str(municipio_int).zfill(4)
+
+
+def decode_idade(codigo: str) -> int:
+    """
+    Decodifica o código de idade no formato TNNNN.
+    Apenas quando T=4 (anos) retorna a idade em anos.
+    Para T=1,2,3 retorna 0 (não considerado idade em anos).
+    """
+    codigo_str = str(codigo)
+    tipo = int(codigo_str[0])
+    valor = int(codigo_str[1:])
+
+    if tipo == 4:  # anos
+        return valor
+    else:  # horas, dias, meses => considerado zero
+        return 0
+
+
+def decode_gestante(valor: int) -> int:
+    """
+    Decodifica o código da gestante.
+    Mantém 1,2,3 (trimestres) e transforma 4,5,6,9 em 0.
+    """
+    if valor in [1, 2, 3]:
+        return valor
+    elif valor in [4, 5, 6, 9]:
+        return 0
+    else:
+        return None  # caso apareça código inesperado
+
+
+def decode_escolaridade(valor: int) -> int:
+    """
+    Decodifica o código da escolaridade.
+    Mantém 0 a 8 e transforma 9 e 10 em 0.
+    """
+    if valor in range(0, 9):
+        return valor
+    elif valor in [9, 10]:
+        return 0
+    else:
+        return None  # caso apareça código inesperado
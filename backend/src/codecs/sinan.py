@@ -0,0 +1,143 @@
+"""
+Decodificadores vetorizados do SINAN
+Decodificam uma coluna inteira de uma vez (arrays Arrow, NumPy, Series do pandas ou listas),
+com a mesma semântica das versões escalares em src.codecs.scalar.
+Valores nulos são propagados como nulos e códigos inesperados viram nulos (o None das versões escalares).
+"""
+from typing import Any
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+# Tabelas de consulta indexadas pelo próprio código; -1 marca código inesperado
+_GESTANTE_LUT = np.array([-1, 1, 2, 3, 0, 0, 0, -1, -1, 0], dtype=np.int8)
+_ESCOLARIDADE_LUT = np.array([0, 1, 2, 3, 4, 5, 6, 7, 8, 0, 0], dtype=np.int8)
+
+# Tipo do código de idade (primeiro dígito) que representa anos
+_IDADE_EM_ANOS = 4
+
+
+def as_arrow(values: Any) -> pa.Array:
+    """Converte a entrada (Arrow, NumPy, pandas ou lista) em um único pa.Array"""
+    if isinstance(values, pa.ChunkedArray):
+        return values.combine_chunks()
+    if isinstance(values, pa.Array):
+        return values
+    return pa.array(values, from_pandas=True)
+
+
+def to_int64(values: Any) -> pa.Array:
+    """
+    Converte códigos numéricos ou texto numérico (como vêm do DBF) para int64
+
+    Textos em branco ou não numéricos viram nulos.
+    """
+    array = as_arrow(values)
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+    if pa.types.is_integer(array.type):
+        return array.cast(pa.int64())
+    if pa.types.is_floating(array.type):
+        valid = pc.and_(pc.is_finite(array), pc.equal(pc.floor(array), array))
+        return pc.if_else(valid, array, None).cast(pa.int64())
+
+    text = pc.utf8_trim_whitespace(array.cast(pa.string()))
+    numeric = pc.utf8_is_digit(text)
+    return pc.if_else(numeric, text, None).cast(pa.int64())
+
+
+def _apply_lut(codes: pa.Array, lut: np.ndarray) -> pa.Array:
+    """Aplica uma tabela de consulta a códigos inteiros, com nulo para códigos fora da tabela"""
+    positions = codes.fill_null(-1).to_numpy()
+    in_range = (positions >= 0) & (positions < len(lut))
+    decoded = np.full(len(positions), -1, dtype=lut.dtype)
+    decoded[in_range] = lut[positions[in_range]]
+
+    return pa.array(decoded, mask=decoded < 0)
+
+
+def decode_idade(codes: Any) -> pa.Array:
+    """
+    Decodifica códigos de idade no formato TNNN para idade em anos (int16)
+
+    Apenas quando T=4 (anos) retorna o valor; para horas, dias e meses retorna 0.
+    """
+    array = as_arrow(codes)
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+
+    if pa.types.is_string(array.type) or pa.types.is_large_string(array.type):
+        # Para texto, o tipo é o primeiro caractere, como na versão escalar
+        text = pc.utf8_trim_whitespace(array)
+        tipo = to_int64(pc.utf8_slice_codeunits(text, 0, 1))
+        valor = to_int64(pc.utf8_slice_codeunits(text, 1))
+    else:
+        numbers = to_int64(array)
+        digits = pc.floor(pc.log10(pc.max_element_wise(numbers, 1))).cast(pa.int64())
+        scale = pc.power(10, digits)
+        tipo = pc.divide(numbers, scale)
+        valor = pc.subtract(numbers, pc.multiply(tipo, scale))
+
+    em_anos = pc.equal(tipo, _IDADE_EM_ANOS)
+    return pc.if_else(em_anos, valor, 0).cast(pa.int16())
+
+
+def decode_gestante(codes: Any) -> pa.Array:
+    """
+    Decodifica o código da gestante (int8)
+
+    Mantém 1, 2 e 3 (trimestres), transforma 4, 5, 6 e 9 em 0 e códigos inesperados em nulo.
+    """
+    return _apply_lut(to_int64(codes), _GESTANTE_LUT)
+
+
+def decode_escolaridade(codes: Any) -> pa.Array:
+    """
+    Decodifica o código da escolaridade (int8)
+
+    Mantém 0 a 8, transforma 9 e 10 em 0 e códigos inesperados em nulo.
+    """
+    return _apply_lut(to_int64(codes), _ESCOLARIDADE_LUT)
+
+
+def ibge_to_sinan(codes: Any) -> pa.Array:
+    """
+    Converte códigos IBGE (7 dígitos) em códigos SINAN (6 dígitos, texto)
+
+    O código SINAN é o código IBGE sem o dígito verificador.
+    """
+    array = as_arrow(codes)
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+    if not (pa.types.is_string(array.type) or pa.types.is_large_string(array.type)):
+        array = to_int64(array).cast(pa.string())
+
+    text = pc.utf8_lpad(pc.utf8_trim_whitespace(array), 7, '0')
+    return pc.utf8_slice_codeunits(text, 0, 6)
+
+
+def sinan_to_ibge(codes: Any, ibge_reference: Any) -> pa.Array:
+    """
+    Converte códigos SINAN (6 dígitos) em códigos IBGE (7 dígitos, texto)
+
+    O dígito verificador não é derivável de forma segura, por isso a conversão usa
+    a lista de códigos IBGE válidos como referência. Códigos sem correspondência viram nulos.
+
+    Args:
+        codes: Códigos SINAN
+        ibge_reference: Todos os códigos IBGE válidos (por exemplo, a tabela de municípios)
+    """
+    reference = np.sort(pc.drop_null(to_int64(ibge_reference)).to_numpy())
+    sinan = to_int64(codes)
+    if len(reference) == 0:
+        return pa.nulls(len(sinan), type=pa.string())
+
+    reference_sinan = reference // 10
+    values = sinan.fill_null(-1).to_numpy()
+    positions = np.minimum(np.searchsorted(reference_sinan, values), len(reference) - 1)
+    found = reference_sinan[positions] == values
+
+    ibge = pa.array(reference[positions], mask=~found)
+    return pc.utf8_lpad(ibge.cast(pa.string()), 7, '0')
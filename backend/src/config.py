@@ -17,18 +17,65 @@ class Config:
         f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Perfil do engine (src/database/engine.py): pool para bancos servidor (PostgreSQL via
+    # DATABASE_URL) e PRAGMAs aplicados a cada conexão SQLite
+    DATABASE_POOL = {
+        'pool_size': 5,
+        'max_overflow': 10,
+        'pool_pre_ping': True,
+        'pool_recycle': 1800,
+    }
+    SQLITE_PRAGMAS = {
+        # WAL: leitores não bloqueiam o escritor; com NORMAL, o fsync fica no checkpoint
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 64 * 1024 * 1024,
+        'cache_size': -16000,  # em KiB quando negativo (~16 MB)
+        'busy_timeout': 5000,  # ms esperando o lock de escrita antes de "database is locked"
+    }
+    
     # Configurações de CORS
     CORS_ORIGINS = ['*']  # Em produção, especificar domínios específicos
     
-    # Configurações de JSON
+    # Cache de respostas dos endpoints de leitura (LRU + TTL, invalidado pelas escritas)
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 512))
+    RESPONSE_CACHE_TTL = float(os.environ.get('RESPONSE_CACHE_TTL', 30))
+    
+    # Pontuação de risco (POST /api/dengue-notifications/predict): modelo exportado por
+    # python -m src.ml export e micro-lotes das requisições concorrentes de cada worker
+    PREDICTION_MODEL_PATH = os.environ.get('PREDICTION_MODEL_PATH') or \
+        os.path.join(os.path.dirname(__file__), 'database', 'modelo.pkl')
+    PREDICTION_MAX_BATCH_SIZE = int(os.environ.get('PREDICTION_MAX_BATCH_SIZE', 64))
+    PREDICTION_MAX_WAIT_MS = float(os.environ.get('PREDICTION_MAX_WAIT_MS', 5))
+    PREDICTION_MAX_RECORDS = int(os.environ.get('PREDICTION_MAX_RECORDS', 1000))
+    PREDICTION_LATENCY_WINDOW = 10000
+    
+    # Tabelas da imputação pela moda (python -m src.ml impute): as cargas em massa somam suas
+    # contagens às tabelas, se o arquivo existir
+    IMPUTER_PATH = os.environ.get('IMPUTER_PATH') or \
+        os.path.join(os.path.dirname(__file__), 'database', 'imputacao.json')
+    
+    # Índice de duplicadas da carga em massa (src/quality/dedup.py): notificações já carregadas
+    # são recusadas ('reject') ou inseridas e listadas no relatório ('flag'); ?duplicates= na requisição
+    DEDUP_INDEX_PATH = os.environ.get('DEDUP_INDEX_PATH') or \
+        os.path.join(os.path.dirname(__file__), 'database', 'duplicadas')
+    DEDUP_MODE = os.environ.get('DEDUP_MODE', 'reject')
+    
+    # População por município para a incidência (src/geo/municipios.py, read_populacao): CSV com
+    # colunas de código e de população, com precedência sobre a planilha; ignorado se não existir
+    POPULACAO_PATH = os.environ.get('POPULACAO_PATH') or \
+        os.path.join(os.path.dirname(__file__), 'database', 'populacao.csv')
+    
+    # Configurações de JSON (aplicadas ao provedor JSON do Flask em create_app)
     JSON_SORT_KEYS = False
-    JSONIFY_PRETTYPRINT_REGULAR = True
+    JSONIFY_PRETTYPRINT_REGULAR = False
 
 
 class DevelopmentConfig(Config):
     """Configuração para ambiente de desenvolvimento"""
     DEBUG = True
     TESTING = False
+    JSONIFY_PRETTYPRINT_REGULAR = True
 
 
 class ProductionConfig(Config):
@@ -38,6 +85,20 @@ class ProductionConfig(Config):
     
     # Em produção, usar variáveis de ambiente para configurações sensíveis
     SECRET_KEY = os.environ.get('SECRET_KEY') or Config.SECRET_KEY
+    
+    DATABASE_POOL = {
+        'pool_size': int(os.environ.get('DATABASE_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DATABASE_MAX_OVERFLOW', 20)),
+        'pool_timeout': 30,
+        'pool_pre_ping': True,
+        'pool_recycle': 1800,
+    }
+    SQLITE_PRAGMAS = {
+        **Config.SQLITE_PRAGMAS,
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64000,
+        'busy_timeout': 15000,
+    }
 
 
 class TestingConfig(Config):
@@ -45,6 +106,15 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    
+    # Banco em memória: sem arquivo de journal para sincronizar
+    DATABASE_POOL = {'pool_size': 2, 'max_overflow': 0, 'pool_pre_ping': False}
+    SQLITE_PRAGMAS = {'journal_mode': 'MEMORY', 'synchronous': 'OFF'}
+    
+    # Testes não atualizam as tabelas de imputação nem o índice de duplicadas do ambiente
+    IMPUTER_PATH = None
+    DEDUP_INDEX_PATH = None
+    POPULACAO_PATH = None
 
 
 # Mapeamento de configurações por ambiente
@@ -1,5 +1,267 @@
+"""
+Controlador de notificações de dengue - Camada de apresentação
+Responsável por lidar com requisições HTTP e respostas
+"""
 from flask import Blueprint, jsonify, request
+from src.cache.response_cache import cached
+from src.serialization.encoders import stream_json_response, stream_ndjson_response
+from src.services.dengue_service import DengueService
+
 
 class DengueController:
+    """Controlador para endpoints de notificações de dengue"""
+
+    def __init__(self):
+        self.dengue_service = DengueService()
+        self.blueprint = Blueprint('dengue', __name__)
+        self._register_routes()
+
+    def _register_routes(self):
+        """Registra todas as rotas do controlador"""
+        self.blueprint.add_url_rule('/dengue-notifications', 'get_notifications',
+                                    self.get_notifications, methods=['GET'])
+        self.blueprint.add_url_rule('/dengue-notifications', 'create_notification',
+                                    self.create_notification, methods=['POST'])
+        self.blueprint.add_url_rule('/dengue-notifications/export', 'export_notifications',
+                                    self.export_notifications, methods=['GET'])
+        self.blueprint.add_url_rule('/dengue-notifications/bulk', 'bulk_create_notifications',
+                                    self.bulk_create_notifications, methods=['POST'])
+        self.blueprint.add_url_rule('/dengue-notifications/<int:notification_id>', 'get_notification',
+                                    self.get_notification, methods=['GET'])
+        self.blueprint.add_url_rule('/dengue-notifications/<int:notification_id>', 'update_notification',
+                                    self.update_notification, methods=['PUT'])
+        self.blueprint.add_url_rule('/dengue-notifications/<int:notification_id>', 'delete_notification',
+                                    self.delete_notification, methods=['DELETE'])
+
+    @cached('dengue', revision=DengueService.revision)
+    def get_notifications(self):
+        """GET /dengue-notifications - Lista notificações com filtros e paginação por cursor"""
+        try:
+            notifications, next_cursor = self.dengue_service.list_notifications(request.args.to_dict())
+            return jsonify({
+                'success': True,
+                'data': notifications,
+                'pagination': {
+                    'next_cursor': next_cursor,
+                    'count': len(notifications)
+                },
+                'message': 'Notificações recuperadas com sucesso'
+            }), 200
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Parâmetros inválidos'
+            }), 400
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Erro ao recuperar notificações'
+            }), 500
+
+    def export_notifications(self):
+        """GET /dengue-notifications/export - Exporta as notificações filtradas em streaming (JSON ou NDJSON)"""
+        try:
+            params = request.args.to_dict()
+            output = params.pop('format', 'json')
+            if output not in ('json', 'ndjson'):
+                raise ValueError("format deve ser 'json' ou 'ndjson'")
+
+            rows = self.dengue_service.export_notifications(params)
+            if output == 'ndjson':
+                return stream_ndjson_response(rows)
+            return stream_json_response(rows, {
+                'success': True,
+                'message': 'Notificações exportadas com sucesso'
+            })
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Parâmetros inválidos'
+            }), 400
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Erro ao exportar notificações'
+            }), 500
+
+    def create_notification(self):
+        """POST /dengue-notifications - Cria uma nova notificação"""
+        try:
+            # Validar se o corpo da requisição é JSON
+            if not request.is_json:
+                return jsonify({
+                    'success': False,
+                    'error': 'Content-Type deve ser application/json',
+                    'message': 'Dados inválidos'
+                }), 400
+
+            data = request.get_json()
+
+            # Validar se os dados foram fornecidos
+            if not data:
+                return jsonify({
+                    'success': False,
+                    'error': 'Corpo da requisição vazio',
+                    'message': 'Dados são obrigatórios'
+                }), 400
+
+            notification = self.dengue_service.create_notification(data)
+            return jsonify({
+                'success': True,
+                'data': notification,
+                'message': 'Notificação criada com sucesso'
+            }), 201
+
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Dados inválidos'
+            }), 400
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Erro interno do servidor'
+            }), 500
+
+    def bulk_create_notifications(self):
+        """POST /dengue-notifications/bulk - Carga em massa via NDJSON ou Arrow IPC"""
+        # Leitores (PyArrow) importados no primeiro uso, fora da inicialização da aplicação
+        from src.ingest import bulk
+
+        try:
+            if request.mimetype in bulk.NDJSON_MIMETYPES:
+                report = self.dengue_service.bulk_create(bulk.iter_ndjson(request.stream),
+                                                         duplicates=request.args.get('duplicates'))
+            elif request.mimetype in bulk.ARROW_STREAM_MIMETYPES:
+                report = self.dengue_service.bulk_create_batches(bulk.iter_arrow_batches(request.stream),
+                                                                 duplicates=request.args.get('duplicates'))
+            else:
+                return jsonify({
+                    'success': False,
+                    'error': 'Content-Type deve ser application/x-ndjson ou application/vnd.apache.arrow.stream',
+                    'message': 'Dados inválidos'
+                }), 415
+
+            return jsonify({
+                'success': True,
+                'data': report,
+                'message': f"{report['inserted']} de {report['received']} notificações inseridas"
+            }), 200
+
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Dados inválidos'
+            }), 400
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Erro interno do servidor'
+            }), 500
+
+    @cached('dengue', revision=DengueService.revision)
+    def get_notification(self, notification_id):
+        """GET /dengue-notifications/<id> - Retorna uma notificação específica"""
+        try:
+            notification = self.dengue_service.get_notification_by_id(notification_id)
+
+            if not notification:
+                return jsonify({
+                    'success': False,
+                    'error': f'Notificação com ID {notification_id} não encontrada',
+                    'message': 'Notificação não encontrada'
+                }), 404
+
+            return jsonify({
+                'success': True,
+                'data': notification,
+                'message': 'Notificação recuperada com sucesso'
+            }), 200
+
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Erro ao recuperar notificação'
+            }), 500
+
+    def update_notification(self, notification_id):
+        """PUT /dengue-notifications/<id> - Atualiza uma notificação existente"""
+        try:
+            # Validar se o corpo da requisição é JSON
+            if not request.is_json:
+                return jsonify({
+                    'success': False,
+                    'error': 'Content-Type deve ser application/json',
+                    'message': 'Dados inválidos'
+                }), 400
+
+            data = request.get_json()
+
+            # Validar se os dados foram fornecidos
+            if not data:
+                return jsonify({
+                    'success': False,
+                    'error': 'Corpo da requisição vazio',
+                    'message': 'Dados são obrigatórios'
+                }), 400
+
+            notification = self.dengue_service.update_notification(notification_id, data)
+
+            if not notification:
+                return jsonify({
+                    'success': False,
+                    'error': f'Notificação com ID {notification_id} não encontrada',
+                    'message': 'Notificação não encontrada'
+                }), 404
+
+            return jsonify({
+                'success': True,
+                'data': notification,
+                'message': 'Notificação atualizada com sucesso'
+            }), 200
+
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Dados inválidos'
+            }), 400
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Erro interno do servidor'
+            }), 500
+
+    def delete_notification(self, notification_id):
+        """DELETE /dengue-notifications/<id> - Remove uma notificação"""
+        try:
+            success = self.dengue_service.delete_notification(notification_id)
+
+            if not success:
+                return jsonify({
+                    'success': False,
+                    'error': f'Notificação com ID {notification_id} não encontrada',
+                    'message': 'Notificação não encontrada'
+                }), 404
+
+            return jsonify({
+                'success': True,
+                'message': 'Notificação removida com sucesso'
+            }), 200
 
-    
\ No newline at end of file
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Erro ao remover notificação'
+            }), 500
@@ -0,0 +1,92 @@
+"""
+Controlador de pontuação de risco - Camada de apresentação
+Responsável por lidar com requisições HTTP e respostas
+"""
+from flask import Blueprint, jsonify, request
+from src.services.prediction_service import PredictionService
+
+
+class PredictionController:
+    """Controlador para endpoints de pontuação do risco de desfecho"""
+
+    def __init__(self):
+        self.prediction_service = PredictionService()
+        self.blueprint = Blueprint('prediction', __name__)
+        self._register_routes()
+
+    def _register_routes(self):
+        """Registra todas as rotas do controlador"""
+        self.blueprint.add_url_rule('/dengue-notifications/predict', 'predict_notification',
+                                    self.predict_notification, methods=['POST'])
+        self.blueprint.add_url_rule('/dengue-notifications/predict/batch', 'predict_notifications',
+                                    self.predict_notifications, methods=['POST'])
+        self.blueprint.add_url_rule('/dengue-notifications/predict/latency', 'get_prediction_latency',
+                                    self.get_prediction_latency, methods=['GET'])
+
+    def predict_notification(self):
+        """POST /dengue-notifications/predict - Pontua o risco de óbito de uma notificação"""
+        return self._predict(self.prediction_service.predict)
+
+    def predict_notifications(self):
+        """POST /dengue-notifications/predict/batch - Pontua uma lista de notificações"""
+        return self._predict(self.prediction_service.predict_many)
+
+    def _predict(self, score):
+        try:
+            # Validar se o corpo da requisição é JSON
+            if not request.is_json:
+                return jsonify({
+                    'success': False,
+                    'error': 'Content-Type deve ser application/json',
+                    'message': 'Dados inválidos'
+                }), 400
+
+            data = request.get_json()
+
+            # Validar se os dados foram fornecidos
+            if not data:
+                return jsonify({
+                    'success': False,
+                    'error': 'Corpo da requisição vazio',
+                    'message': 'Dados são obrigatórios'
+                }), 400
+
+            return jsonify({
+                'success': True,
+                'data': score(data),
+                'message': 'Risco calculado com sucesso'
+            }), 200
+
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Dados inválidos'
+            }), 400
+        except FileNotFoundError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Modelo indisponível'
+            }), 503
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Erro interno do servidor'
+            }), 500
+
+    def get_prediction_latency(self):
+        """GET /dengue-notifications/predict/latency - Latências p50/p99 da pontuação neste processo"""
+        try:
+            return jsonify({
+                'success': True,
+                'data': self.prediction_service.latency(),
+                'message': 'Latências recuperadas com sucesso'
+            }), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Erro ao recuperar latências'
+            }), 500
@@ -0,0 +1,111 @@
+"""
+Controlador de estatísticas - Camada de apresentação
+Responsável por lidar com requisições HTTP e respostas
+"""
+from flask import Blueprint, jsonify, request
+from src.cache.response_cache import cached
+from src.services.stats_service import StatsService
+
+
+class StatsController:
+    """Controlador para endpoints de estatísticas de notificações"""
+
+    def __init__(self):
+        self.stats_service = StatsService()
+        self.blueprint = Blueprint('stats', __name__)
+        self._register_routes()
+
+    def _register_routes(self):
+        """Registra todas as rotas do controlador"""
+        self.blueprint.add_url_rule('/stats/notifications', 'get_notification_counts',
+                                    self.get_notification_counts, methods=['GET'])
+        self.blueprint.add_url_rule('/stats/weeks', 'get_week_counts',
+                                    self.get_week_counts, methods=['GET'])
+        self.blueprint.add_url_rule('/stats/municipalities', 'get_municipality_counts',
+                                    self.get_municipality_counts, methods=['GET'])
+        self.blueprint.add_url_rule('/stats/incidence', 'get_incidence',
+                                    self.get_incidence, methods=['GET'])
+        self.blueprint.add_url_rule('/stats/alerts', 'get_alerts',
+                                    self.get_alerts, methods=['GET'])
+
+    @cached('stats', revision=StatsService.revision)
+    def get_notification_counts(self):
+        """GET /stats/notifications - Contagens agrupadas pelas dimensões em group_by"""
+        return self._counts(None)
+
+    @cached('stats', revision=StatsService.revision)
+    def get_week_counts(self):
+        """GET /stats/weeks - Contagens por semana epidemiológica"""
+        return self._counts(['sem_not'])
+
+    @cached('stats', revision=StatsService.revision)
+    def get_municipality_counts(self):
+        """GET /stats/municipalities - Contagens por município de notificação"""
+        return self._counts(['id_municip'])
+
+    @cached('stats', revision=StatsService.revision)
+    def get_incidence(self):
+        """GET /stats/incidence - Incidência por 100 mil habitantes de uma semana epidemiológica"""
+        try:
+            incidence = self.stats_service.get_incidence(request.args.to_dict())
+            return jsonify({
+                'success': True,
+                'data': incidence,
+                'message': 'Incidência calculada com sucesso'
+            }), 200
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Parâmetros inválidos'
+            }), 400
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Erro ao calcular incidência'
+            }), 500
+
+    @cached('stats', revision=StatsService.revision)
+    def get_alerts(self):
+        """GET /stats/alerts - Alertas de surto por município (canal endêmico ou limiar móvel)"""
+        try:
+            alerts = self.stats_service.get_alerts(request.args.to_dict())
+            return jsonify({
+                'success': True,
+                'data': alerts,
+                'message': 'Alertas calculados com sucesso'
+            }), 200
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Parâmetros inválidos'
+            }), 400
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Erro ao calcular alertas'
+            }), 500
+
+    def _counts(self, group_by):
+        try:
+            counts = self.stats_service.get_counts(request.args.to_dict(), group_by)
+            return jsonify({
+                'success': True,
+                'data': counts,
+                'message': 'Estatísticas recuperadas com sucesso'
+            }), 200
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Parâmetros inválidos'
+            }), 400
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'message': 'Erro ao recuperar estatísticas'
+            }), 500
@@ -3,6 +3,7 @@ Controlador de usuários - Camada de apresentação
 Responsável por lidar com requisições HTTP e respostas
 """
 from flask import Blueprint, jsonify, request
+from src.cache.response_cache import cached
 from src.services.user_service import UserService
 
 
@@ -22,6 +23,7 @@ class UserController:
         self.blueprint.add_url_rule('/users/<int:user_id>', 'update_user', self.update_user, methods=['PUT'])
         self.blueprint.add_url_rule('/users/<int:user_id>', 'delete_user', self.delete_user, methods=['DELETE'])
     
+    @cached('users', revision=UserService.revision)
     def get_users(self):
         """GET /users - Retorna todos os usuários"""
         try:
@@ -79,6 +81,7 @@ class UserController:
                 'message': 'Erro interno do servidor'
             }), 500
     
+    @cached('users', revision=UserService.revision)
     def get_user(self, user_id):
         """GET /users/<id> - Retorna um usuário específico"""
         try:
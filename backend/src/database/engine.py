@@ -0,0 +1,70 @@
+"""
+Perfis do engine do banco de dados por ambiente
+Aplica as opções de pool (pool_size, max_overflow, pre-ping) aos bancos servidor, como o
+PostgreSQL de DATABASE_URL, e os PRAGMAs do SQLite (WAL, synchronous, mmap_size, cache_size,
+busy_timeout) a cada conexão aberta
+"""
+from typing import Any, Dict, Mapping
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+from src.models.user import db
+
+
+def is_sqlite(uri: str) -> bool:
+    """Indica se a URL do banco é de um SQLite (arquivo ou memória)"""
+    return make_url(uri).get_backend_name() == 'sqlite'
+
+
+def engine_options(config: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Opções do create_engine para a URL configurada
+
+    O pool de DATABASE_POOL só vale para bancos servidor: o SQLite usa o pool padrão do
+    Flask-SQLAlchemy. Opções explícitas em SQLALCHEMY_ENGINE_OPTIONS têm precedência.
+    """
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if is_sqlite(config['SQLALCHEMY_DATABASE_URI']):
+        return options
+    return {**config.get('DATABASE_POOL', {}), **options}
+
+
+def apply_pragmas(engine: Engine, pragmas: Mapping[str, Any]) -> None:
+    """Executa os PRAGMAs em cada conexão DBAPI aberta pelo engine"""
+    if not pragmas:
+        return
+
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas.items()]
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def init_app(app) -> None:
+    """Inicializa o banco da aplicação com o perfil do engine do ambiente"""
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+    db.init_app(app)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                apply_pragmas(engine, app.config.get('SQLITE_PRAGMAS', {}))
+
+
+def dispose_engines(app) -> None:
+    """
+    Descarta o pool herdado em um processo filho (worker do Gunicorn após o fork)
+
+    Com close=False as conexões abertas pelo processo mestre não são fechadas pelo filho, só
+    deixam de ser usadas: cada worker abre as suas.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
@@ -0,0 +1,151 @@
+"""
+Calendário de semanas epidemiológicas do SINAN
+Tabela pré-calculada dia → semana (AAAASS), leitura das datas do DBF direto para date32 e
+conferência de sem_not/sem_pri contra dt_notific/dt_sin_pri sobre colunas inteiras
+"""
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.codecs.sinan import as_arrow, to_int64
+
+
+# Anos cobertos pela tabela (datas fora dela não têm semana)
+FIRST_YEAR = 1950
+LAST_YEAR = 2099
+
+# Pares (data, semana) conferidos pela consistência
+WEEK_FIELDS = (('DT_NOTIFIC', 'SEM_NOT'), ('DT_SIN_PRI', 'SEM_PRI'))
+
+
+def days_from_civil(year: np.ndarray, month: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """Dias desde 1970-01-01 (o inteiro do date32) de cada data do calendário gregoriano, vetorizado"""
+    year = np.asarray(year, dtype=np.int64) - (np.asarray(month) <= 2)
+    month = np.asarray(month, dtype=np.int64)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * np.where(month > 2, month - 3, month + 9) + 2) // 5 + np.asarray(day, dtype=np.int64) - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+@lru_cache(maxsize=1)
+def _calendar() -> Tuple[np.ndarray, int, np.ndarray]:
+    """
+    Tabela dia → AAAASS, primeiro dia coberto e o domingo que abre a semana 1 de cada ano
+
+    A semana epidemiológica vai de domingo a sábado; a semana 1 é a que termina no primeiro sábado
+    de janeiro com pelo menos quatro dias no ano, ou seja, a que contém 4 de janeiro (difere da
+    semana ISO %G%V, que começa na segunda-feira).
+    """
+    years = np.arange(FIRST_YEAR - 1, LAST_YEAR + 2)
+    january_4 = days_from_civil(years, np.ones_like(years), np.full_like(years, 4))
+    # 1970-01-01 foi uma quinta-feira: (dias + 4) % 7 é o dia da semana contado a partir do domingo
+    starts = january_4 - (january_4 + 4) % 7
+    days = np.arange(starts[1], starts[-1])
+    position = np.searchsorted(starts, days, side='right') - 1
+    codes = years[position] * 100 + (days - starts[position]) // 7 + 1
+    return codes.astype(np.int32), int(starts[1]), starts
+
+
+def parse_dates(values: Any) -> pa.Array:
+    """
+    Datas AAAAMMDD (DBF) ou AAAA-MM-DD em texto convertidas para date32 de uma vez
+
+    Texto em branco, em outro formato ou com data inexistente (20240230) vira nulo. O segundo
+    formato só é tentado quando a coluna tem textos com o tamanho dele, então a coluna do DBF passa
+    por um único strptime. Colunas já em date32 ou timestamp só são convertidas.
+    """
+    array = as_arrow(values)
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+    if pa.types.is_date(array.type) or pa.types.is_timestamp(array.type):
+        return array.cast(pa.date32())
+    text = pc.utf8_trim_whitespace(array.cast(pa.string()))
+    parsed = _strptime(text, '%Y%m%d', 6)
+    if pc.any(pc.equal(pc.binary_length(text), 10)).as_py():
+        parsed = pc.coalesce(parsed, _strptime(text, '%Y-%m-%d', 8))
+    return parsed
+
+
+def _strptime(text: pa.Array, date_format: str, day_at: int) -> pa.Array:
+    """strptime que recusa dias inexistentes: o strptime do Arrow leva 20230229 para 2023-03-01"""
+    parsed = pc.strptime(text, format=date_format, unit='s', error_is_null=True).cast(pa.date32())
+    day = pc.utf8_slice_codeunits(text, day_at, day_at + 2)
+    same_day = pc.equal(pc.day(parsed), pc.if_else(pc.utf8_is_digit(day), day, None).cast(pa.int64()))
+    return pc.if_else(same_day, parsed, None)
+
+
+def epi_week(dates: Any) -> pa.Array:
+    """Semana epidemiológica AAAASS (int32) de cada data; nulo sem data ou fora da tabela"""
+    codes, first, _ = _calendar()
+    days = parse_dates(dates).cast(pa.int32())
+    positions = days.fill_null(first - 1).to_numpy(zero_copy_only=False).astype(np.int64) - first
+    inside = (positions >= 0) & (positions < len(codes))
+    return pa.array(np.where(inside, codes[np.clip(positions, 0, len(codes) - 1)], 0), pa.int32(), mask=~inside)
+
+
+def weeks_in_year(years: Any) -> np.ndarray:
+    """Quantidade de semanas epidemiológicas (52 ou 53) de cada ano da tabela"""
+    _, _, starts = _calendar()
+    position = np.asarray(years, dtype=np.int64) - FIRST_YEAR + 1
+    return (starts[position + 1] - starts[position]) // 7
+
+
+def week_start(codes: Any) -> pa.Array:
+    """Domingo que abre cada semana AAAASS (date32); nulo para semanas inexistentes (202453, 202400)"""
+    _, _, starts = _calendar()
+    numbers = to_int64(codes).fill_null(0).to_numpy(zero_copy_only=False)
+    year, week = numbers // 100, numbers % 100
+    inside = (year >= FIRST_YEAR) & (year <= LAST_YEAR)
+    position = np.where(inside, year - FIRST_YEAR + 1, 1)
+    valid = inside & (week >= 1) & (week <= (starts[position + 1] - starts[position]) // 7)
+    days = np.where(valid, starts[position] + (week - 1) * 7, 0).astype(np.int32)
+    return pa.array(days, pa.int32(), mask=~valid).cast(pa.date32())
+
+
+def week_matches(dates: Any, weeks: Any) -> pa.Array:
+    """
+    Confere, linha a linha e de uma vez, se a semana informada é a semana epidemiológica da data
+
+    Returns:
+        Booleanos: True quando coincidem, False quando divergem, nulo sem data ou sem semana válida
+    """
+    return _compare(epi_week(dates), to_int64(weeks))
+
+
+def _compare(expected: pa.Array, informed: pa.Array) -> pa.Array:
+    existing = pc.if_else(pc.is_valid(week_start(informed)), informed, None)
+    return pc.equal(expected.cast(pa.int64()), existing)
+
+
+def check_weeks(batch: pa.RecordBatch, samples: int = 5) -> Dict[str, Dict[str, Any]]:
+    """
+    Consistência de SEM_NOT com DT_NOTIFIC e de SEM_PRI com DT_SIN_PRI em um lote
+
+    Returns:
+        Por coluna de semana: linhas conferidas, divergentes, semanas inexistentes e exemplos
+        [data, semana informada, semana esperada]
+    """
+    names = {name.upper(): name for name in batch.schema.names}
+    result = {}
+    for date_field, week_field in WEEK_FIELDS:
+        if date_field not in names or week_field not in names:
+            continue
+        dates = parse_dates(batch.column(names[date_field]))
+        informed = to_int64(batch.column(names[week_field]))
+        expected = epi_week(dates)
+        matches = _compare(expected, informed)
+        invalid = pc.and_(pc.is_valid(informed), pc.is_null(week_start(informed)))
+        diverging = np.flatnonzero(pc.invert(matches).fill_null(False).to_numpy(zero_copy_only=False))
+        result[week_field] = {
+            'checked': len(matches) - matches.null_count,
+            'mismatched': int(len(diverging)),
+            'invalid': int(pc.sum(invalid).as_py() or 0),
+            'samples': [[dates[row].as_py().isoformat(), informed[row].as_py(), expected[row].as_py()]
+                        for row in diverging[:samples].tolist()],
+        }
+    return result
@@ -0,0 +1,48 @@
+"""
+Interface de linha de comando do índice de municípios
+
+Uso:
+    python -m src.geo build [--source ../data/POP.xlsx] [--output src/database/municipios.npy]
+    python -m src.geo lookup 130260
+"""
+import argparse
+import json
+import sys
+
+from src.geo.municipios import DEFAULT_INDEX_PATH, DEFAULT_SOURCE_PATH, MunicipioIndex
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m src.geo', description='Índice compilado de municípios')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help='Compila a planilha de municípios no índice binário')
+    build.add_argument('--source', default=DEFAULT_SOURCE_PATH, help='Planilha de origem (padrão: %(default)s)')
+    build.add_argument('--output', default=DEFAULT_INDEX_PATH, help='Arquivo do índice (padrão: %(default)s)')
+
+    lookup = subparsers.add_parser('lookup', help='Consulta um município por código SINAN ou IBGE')
+    lookup.add_argument('code', help='Código SINAN (6 dígitos) ou IBGE (7 dígitos)')
+    lookup.add_argument('--index', default=DEFAULT_INDEX_PATH, help='Arquivo do índice (padrão: %(default)s)')
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.command == 'build':
+        index = MunicipioIndex.from_excel(args.source)
+        index.save(args.output)
+        print(f"{len(index)} municípios compilados em {args.output}")
+        return 0
+
+    index = MunicipioIndex.load(args.index)
+    record = index.by_ibge(args.code) if len(args.code.strip()) == 7 else index.by_sinan(args.code)
+    if record is None:
+        print(f"Município '{args.code}' não encontrado", file=sys.stderr)
+        return 1
+    print(json.dumps(record, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""
+Índice compilado de municípios
+Compila a tabela de municípios (data/POP.xlsx) uma única vez em um arquivo binário .npy,
+carregado por memory map, com consultas O(1) entre códigos IBGE, SINAN, nome e população
+"""
+import csv
+import os
+import threading
+import unicodedata
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pyarrow as pa
+
+from src.codecs.sinan import to_int64
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+DEFAULT_SOURCE_PATH = os.path.join(os.path.dirname(BACKEND_DIR), 'data', 'POP.xlsx')
+DEFAULT_INDEX_PATH = os.path.join(BACKEND_DIR, 'src', 'database', 'municipios.npy')
+
+# Os códigos SINAN têm 6 dígitos (UF + município sem dígito verificador)
+_SINAN_RANGE = 1_000_000
+
+# População desconhecida (a planilha de origem pode não trazer a coluna)
+POPULACAO_DESCONHECIDA = -1
+
+
+def _normalize_name(name: str) -> str:
+    """Normaliza nomes para comparação (sem acentos, caixa e espaços extras)"""
+    decomposed = unicodedata.normalize('NFKD', name)
+    return ' '.join(''.join(c for c in decomposed if not unicodedata.combining(c)).casefold().split())
+
+
+def _to_code(value: Union[str, int, None]) -> Optional[int]:
+    """Converte um código (texto ou inteiro) para inteiro, ou None se inválido"""
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    text = str(value).strip()
+    return int(text) if text.isdigit() else None
+
+
+class MunicipioIndex:
+    """Índice de municípios ordenado por código SINAN, com endereçamento direto"""
+
+    def __init__(self, table: np.ndarray):
+        self.table = table
+        # Posição de cada código SINAN na tabela (-1 quando não existe)
+        self._positions = np.full(_SINAN_RANGE, -1, dtype=np.int32)
+        self._positions[table['sinan']] = np.arange(len(table), dtype=np.int32)
+        self._names: Optional[Dict[str, List[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    @classmethod
+    def from_excel(cls, path: str = DEFAULT_SOURCE_PATH) -> 'MunicipioIndex':
+        """
+        Compila o índice a partir da planilha de municípios
+
+        A planilha deve ter as colunas UF, COD. UF, COD. MUNIC e NOME DO MUNICÍPIO;
+        uma coluna de população (cabeçalho contendo "POPULA") é usada quando existir.
+        """
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = [str(value or '').strip().upper() for value in next(rows)]
+            population_column = next((i for i, name in enumerate(header) if 'POPULA' in name), None)
+
+            records = []
+            for row in rows:
+                if not row or row[1] is None or row[2] is None:
+                    continue
+                ibge = int(f"{int(row[1]):02d}{int(row[2]):05d}")
+                population = _to_code(row[population_column]) if population_column is not None else None
+                records.append((
+                    ibge,
+                    ibge // 10,
+                    int(row[1]),
+                    str(row[0]).strip(),
+                    str(row[3]).strip(),
+                    population if population is not None else POPULACAO_DESCONHECIDA,
+                ))
+        finally:
+            workbook.close()
+
+        name_size = max(len(record[4].encode('utf-8')) for record in records)
+        dtype = np.dtype([
+            ('ibge', '<i4'),
+            ('sinan', '<i4'),
+            ('cod_uf', '<i1'),
+            ('uf', 'S2'),
+            ('nome', f'S{name_size}'),
+            ('populacao', '<i4'),
+        ])
+        table = np.array(
+            [(r[0], r[1], r[2], r[3].encode('ascii'), r[4].encode('utf-8'), r[5]) for r in records],
+            dtype=dtype,
+        )
+        table.sort(order='sinan')
+        return cls(table)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH, mmap: bool = True) -> 'MunicipioIndex':
+        """Carrega um índice compilado, por memory map por padrão"""
+        return cls(np.load(path, mmap_mode='r' if mmap else None))
+
+    def save(self, path: str = DEFAULT_INDEX_PATH) -> None:
+        """Grava o índice compilado em disco"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.save(path, np.asarray(self.table))
+
+    def _position_by_sinan(self, code: Union[str, int, None]) -> int:
+        value = _to_code(code)
+        if value is None or not 0 <= value < _SINAN_RANGE:
+            return -1
+        return int(self._positions[value])
+
+    def _record(self, position: int) -> Optional[Dict[str, Any]]:
+        if position < 0:
+            return None
+        row = self.table[position]
+        population = int(row['populacao'])
+        return {
+            'cod_ibge': f"{int(row['ibge']):07d}",
+            'cod_sinan': f"{int(row['sinan']):06d}",
+            'cod_uf': f"{int(row['cod_uf']):02d}",
+            'uf': row['uf'].decode('ascii'),
+            'nome': row['nome'].decode('utf-8'),
+            'populacao': population if population != POPULACAO_DESCONHECIDA else None,
+        }
+
+    def contains_sinan(self, code: Union[str, int, None]) -> bool:
+        """Verifica se o código SINAN (6 dígitos) existe"""
+        return self._position_by_sinan(code) >= 0
+
+    def by_sinan(self, code: Union[str, int, None]) -> Optional[Dict[str, Any]]:
+        """Retorna o município pelo código SINAN"""
+        return self._record(self._position_by_sinan(code))
+
+    def by_ibge(self, code: Union[str, int, None]) -> Optional[Dict[str, Any]]:
+        """Retorna o município pelo código IBGE (7 dígitos, com dígito verificador)"""
+        value = _to_code(code)
+        if value is None:
+            return None
+        position = self._position_by_sinan(value // 10)
+        if position < 0 or int(self.table[position]['ibge']) != value:
+            return None
+        return self._record(position)
+
+    def by_nome(self, nome: str, uf: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Retorna os municípios com o nome informado (opcionalmente filtrando pela sigla da UF)"""
+        if self._names is None:
+            names: Dict[str, List[int]] = {}
+            for position, raw in enumerate(self.table['nome']):
+                names.setdefault(_normalize_name(raw.decode('utf-8')), []).append(position)
+            self._names = names
+
+        records = [self._record(position) for position in self._names.get(_normalize_name(nome), [])]
+        if uf is not None:
+            records = [record for record in records if record['uf'] == uf.upper()]
+        return records
+
+    def populacao(self, code: Union[str, int, None]) -> Optional[int]:
+        """Retorna a população do município pelo código SINAN"""
+        record = self.by_sinan(code)
+        return record['populacao'] if record else None
+
+    def positions(self, codes: Any) -> np.ndarray:
+        """Posições na tabela de uma coluna de códigos SINAN (-1 quando não encontrado)"""
+        values = to_int64(codes).fill_null(-1).to_numpy()
+        valid = (values >= 0) & (values < _SINAN_RANGE)
+        positions = np.full(len(values), -1, dtype=np.int32)
+        positions[valid] = self._positions[values[valid]]
+        return positions
+
+    def join(self, codes: Any, uf_codes: Any = None) -> pa.Table:
+        """
+        Junção vetorizada de uma coluna de códigos SINAN com a tabela de municípios
+
+        Substitui o pd.merge em SG_UF_NOT/ID_MUNICIP: cada linha da entrada recebe os dados
+        do município correspondente (nulos quando não há correspondência).
+
+        Args:
+            codes: Códigos SINAN do município (ex.: ID_MUNICIP)
+            uf_codes: Códigos da UF (ex.: SG_UF_NOT); se informados, precisam coincidir
+
+        Returns:
+            Tabela alinhada à entrada com UF, COD_UF, COD_IBGE, COD_SINAN, NOME_DO_MUNICIPIO e POPULACAO
+        """
+        positions = self.positions(codes)
+        found = positions >= 0
+        if uf_codes is not None:
+            uf = to_int64(uf_codes).fill_null(-1).to_numpy()
+            found &= self.table['cod_uf'][np.maximum(positions, 0)] == uf
+        rows = self.table[np.where(found, positions, 0)]
+        missing = ~found
+
+        def column(name, arrow_type, mask=missing):
+            return pa.array(np.ascontiguousarray(rows[name]), type=arrow_type, mask=mask)
+
+        return pa.table({
+            'UF': column('uf', pa.binary()).cast(pa.string()),
+            'COD_UF': column('cod_uf', pa.int8()),
+            'COD_IBGE': column('ibge', pa.int32()),
+            'COD_SINAN': column('sinan', pa.int32()),
+            'NOME_DO_MUNICIPIO': column('nome', pa.binary()).cast(pa.string()),
+            'POPULACAO': column('populacao', pa.int32(), missing | (rows['populacao'] == POPULACAO_DESCONHECIDA)),
+        })
+
+
+def read_populacao(path: str) -> Dict[int, int]:
+    """
+    Lê uma tabela de população por município (ex.: estimativas do IBGE exportadas em CSV)
+
+    O CSV (separado por ',' ou ';') deve ter uma coluna de código de município (cabeçalho
+    contendo "COD") e uma de população (cabeçalho contendo "POPULA"). Códigos IBGE de 7 dígitos
+    são convertidos para o código SINAN (sem o dígito verificador).
+
+    Returns:
+        Dicionário código SINAN → habitantes
+
+    Raises:
+        ValueError: Se o cabeçalho não tiver as colunas de código e de população
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        dialect = csv.Sniffer().sniff(f.readline(), delimiters=',;')
+        f.seek(0)
+        rows = csv.reader(f, dialect)
+        header = [name.strip().upper() for name in next(rows, [])]
+        code_column = next((i for i, name in enumerate(header) if 'COD' in name), None)
+        population_column = next((i for i, name in enumerate(header) if 'POPULA' in name), None)
+        if code_column is None or population_column is None:
+            raise ValueError(f"{path}: o cabeçalho deve ter as colunas de código e de população")
+
+        populacao = {}
+        for row in rows:
+            if len(row) <= max(code_column, population_column):
+                continue
+            code = _to_code(row[code_column])
+            # Separadores de milhar das planilhas do IBGE ("2.063.547")
+            population = _to_code(row[population_column].replace('.', '').replace(' ', ''))
+            if code is None or population is None:
+                continue
+            populacao[code // 10 if code >= _SINAN_RANGE else code] = population
+    return populacao
+
+
+_default_index: Optional[MunicipioIndex] = None
+_default_lock = threading.Lock()
+
+
+def get_default_index() -> Optional[MunicipioIndex]:
+    """
+    Retorna o índice padrão, carregado uma vez por processo
+
+    Usa o arquivo compilado (variável de ambiente MUNICIPIOS_INDEX ou src/database/municipios.npy);
+    se ele não existir, compila em memória a partir de data/POP.xlsx. Retorna None se nenhum existir.
+    """
+    global _default_index
+    if _default_index is None:
+        with _default_lock:
+            if _default_index is None:
+                index_path = os.environ.get('MUNICIPIOS_INDEX', DEFAULT_INDEX_PATH)
+                if os.path.exists(index_path):
+                    _default_index = MunicipioIndex.load(index_path)
+                elif os.path.exists(DEFAULT_SOURCE_PATH):
+                    _default_index = MunicipioIndex.from_excel(DEFAULT_SOURCE_PATH)
+    return _default_index
+
+
+def validate_municipio(code: Optional[str]) -> Optional[str]:
+    """
+    Valida um código SINAN de município contra o índice padrão
+
+    Raises:
+        ValueError: Se o código não corresponder a nenhum município
+    """
+    if code is None:
+        return code
+    index = get_default_index()
+    if index is not None and not index.contains_sinan(code):
+        raise ValueError(f"Município '{code}' não encontrado")
+    return code
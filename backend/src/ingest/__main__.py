@@ -0,0 +1,68 @@
+"""
+Interface de linha de comando da ingestão
+
+Uso:
+    python -m src.ingest DENGBR23.dbf DENGBR24.dbf -o data/parquet --workers 2
+    python -m src.ingest DENGBR25.dbf -o data/parquet --dedup src/database/duplicadas --duplicates reject
+"""
+import argparse
+import json
+import os
+import sys
+
+from src.ingest.dbf_reader import DEFAULT_BATCH_SIZE
+from src.ingest.pipeline import convert_many
+from src.quality.dedup import DEFAULT_INDEX_PATH, DUPLICATE_MODES
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m src.ingest',
+        description='Converte arquivos DBF do SINAN em Parquet com memória limitada'
+    )
+    parser.add_argument('sources', nargs='+', help='Arquivos DBF de entrada')
+    parser.add_argument('-o', '--output-dir', required=True, help='Diretório dos arquivos Parquet')
+    parser.add_argument('-b', '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Registros por lote / row group (padrão: %(default)s)')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='Processos em paralelo (padrão: número de CPUs)')
+    parser.add_argument('--encoding', default=None, help='Codificação dos campos texto')
+    parser.add_argument('--municipios', default=None,
+                        help='Índice compilado de municípios (python -m src.geo build) para enriquecer os registros')
+    parser.add_argument('--raw', action='store_true',
+                        help='Mantém os tipos do DBF, sem aplicar o registro de schema do CasoDengue')
+    parser.add_argument('--imputer', default=None,
+                        help='Tabelas de imputação (python -m src.ml impute): preenche os vazios com a moda')
+    parser.add_argument('--dedup', nargs='?', const=DEFAULT_INDEX_PATH, default=None,
+                        help='Índice de duplicadas: cada notificação é comparada com as já carregadas '
+                             '(padrão: %(const)s)')
+    parser.add_argument('--duplicates', choices=DUPLICATE_MODES, default='flag',
+                        help='Com --dedup, marca as duplicadas na coluna DUPLICADA ou as descarta (padrão: %(default)s)')
+    parser.add_argument('--json', action='store_true', help='Imprime os relatórios em JSON')
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    jobs = []
+    for source in args.sources:
+        name = os.path.splitext(os.path.basename(source))[0]
+        jobs.append((source, os.path.join(args.output_dir, f'{name}.parquet')))
+
+    reports = convert_many(jobs, batch_size=args.batch_size, encoding=args.encoding,
+                           workers=args.workers, municipios=args.municipios, typed=not args.raw,
+                           imputer=args.imputer, dedup=args.dedup, duplicates=args.duplicates)
+
+    if args.json:
+        print(json.dumps([report.to_dict() for report in reports], indent=2))
+    else:
+        for report in reports:
+            duplicates = f", {report.duplicates} duplicadas" if args.dedup else ''
+            print(f"{report.source}: {report.rows} linhas em {report.seconds}s{duplicates} "
+                  f"({report.rows_per_second} linhas/s, pico de memória {report.peak_rss_mb} MB)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""
+Leitura das cargas em massa de notificações
+Converte o corpo de uma requisição NDJSON em registros numerados, um a um, e o de uma
+requisição Arrow IPC em lotes, sem materializar a carga inteira em memória
+"""
+import json
+from typing import Any, BinaryIO, Dict, Iterator, Tuple, Union
+
+import pyarrow as pa
+
+
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/jsonl', 'application/ndjson')
+ARROW_STREAM_MIMETYPES = ('application/vnd.apache.arrow.stream',)
+
+# Cada item é (número do registro na carga, dicionário da notificação ou o erro de leitura)
+BulkRecord = Tuple[int, Union[Dict[str, Any], ValueError]]
+
+
+def iter_ndjson(stream: BinaryIO) -> Iterator[BulkRecord]:
+    """Lê uma notificação por linha; linhas em branco são ignoradas, mas contam na numeração"""
+    for row, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            yield row, ValueError(f"JSON inválido: {e}")
+            continue
+        if not isinstance(record, dict):
+            yield row, ValueError("Cada linha deve conter um objeto JSON")
+            continue
+        yield row, record
+
+
+def iter_arrow_batches(stream: BinaryIO) -> Iterator[pa.RecordBatch]:
+    """
+    Lê um stream Arrow IPC lote a lote, sem conversão
+
+    Os lotes seguem como vieram para a validação colunar (ValidationService.validate_batch),
+    que aplica o registro de schema e precisa dos valores de origem.
+    """
+    try:
+        reader = pa.ipc.open_stream(stream)
+    except (pa.ArrowInvalid, OSError) as e:
+        raise ValueError(f"Stream Arrow IPC inválido: {e}") from None
+    yield from reader
@@ -0,0 +1,126 @@
+"""
+Leitor de arquivos DBF do SINAN em lotes
+Lê os registros de largura fixa em blocos e converte cada bloco em um RecordBatch do Arrow,
+já nos tipos do registro de schema, sem nunca carregar o arquivo inteiro em memória
+"""
+from typing import Iterator, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from dbfread import DBF
+
+from src.epi.weeks import parse_dates
+from src.schema.registry import get_registry
+
+
+DEFAULT_BATCH_SIZE = 50_000
+
+# Marcador de registro removido no formato dBase
+_DELETED_FLAG = ord('*')
+
+
+class DBFBatchReader:
+    """Leitor em lotes de um arquivo DBF"""
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE, encoding: Optional[str] = None,
+                 typed: bool = True):
+        if batch_size <= 0:
+            raise ValueError("batch_size deve ser maior que zero")
+
+        # O dbfread é usado apenas para interpretar o cabeçalho; os registros são lidos em bloco
+        self._table = DBF(path, encoding=encoding, load=False)
+        self.path = path
+        self.batch_size = batch_size
+        self.encoding = self._table.encoding
+        self.fields = self._table.fields
+        self.raw_schema = pa.schema([self._arrow_field(field) for field in self.fields])
+        # Com typed=True, cada coluna é convertida para o tipo do registro ainda dentro do lote
+        self.registry = get_registry() if typed else None
+        self.schema = self.registry.target_schema(self.raw_schema) if self.registry else self.raw_schema
+
+        # Deslocamento de cada campo dentro do registro (o primeiro byte é a flag de remoção)
+        self._offsets: List[int] = []
+        offset = 1
+        for field in self.fields:
+            self._offsets.append(offset)
+            offset += field.length
+
+    @property
+    def num_records(self) -> int:
+        """Quantidade de registros declarada no cabeçalho (inclui removidos)"""
+        return self._table.header.numrecords
+
+    def __iter__(self) -> Iterator[pa.RecordBatch]:
+        header = self._table.header
+        record_length = header.recordlen
+        remaining = header.numrecords
+
+        with open(self.path, 'rb') as infile:
+            infile.seek(header.headerlen)
+            while remaining > 0:
+                count = min(self.batch_size, remaining)
+                block = infile.read(count * record_length)
+                count = len(block) // record_length
+                if count == 0:
+                    break
+                remaining -= count
+
+                records = np.frombuffer(block, dtype=np.uint8, count=count * record_length)
+                records = records.reshape(count, record_length)
+                records = records[records[:, 0] != _DELETED_FLAG]
+                if len(records) == 0:
+                    continue
+
+                yield self._decode_block(records)
+
+    def _decode_block(self, records: np.ndarray) -> pa.RecordBatch:
+        """Converte um bloco de registros brutos em um RecordBatch"""
+        columns = []
+        for field, offset, arrow_field in zip(self.fields, self._offsets, self.raw_schema):
+            raw = np.ascontiguousarray(records[:, offset:offset + field.length])
+            values = raw.view(f'S{field.length}').ravel()
+            if self.registry is None:
+                columns.append(self._decode_column(values, arrow_field.type))
+            elif self.registry.spec(field.name) is not None:
+                # Campos do modelo vão do texto direto para o tipo do registro, tolerando valores sujos
+                columns.append(self.registry.cast_array(field.name, self._decode_column(values, pa.string())))
+            else:
+                columns.append(self.registry.cast_array(field.name, self._decode_column(values, arrow_field.type)))
+        return pa.RecordBatch.from_arrays(columns, schema=self.schema)
+
+    def _decode_column(self, values: np.ndarray, arrow_type: pa.DataType) -> pa.Array:
+        """Decodifica uma coluna de bytes de largura fixa para o tipo Arrow do campo"""
+        stripped = np.char.strip(values, b' \x00')
+        mask = stripped == b''
+
+        if self.encoding.lower().replace('-', '') in ('ascii', 'utf8'):
+            strings = pa.array(stripped, type=pa.binary(), mask=mask).cast(pa.string())
+        else:
+            decoded = np.char.decode(stripped, self.encoding, errors='replace')
+            strings = pa.array(decoded, type=pa.string(), mask=mask)
+
+        if pa.types.is_string(arrow_type):
+            return strings
+        if pa.types.is_date32(arrow_type):
+            return parse_dates(strings)
+        if pa.types.is_boolean(arrow_type):
+            upper = pc.utf8_upper(strings)
+            return pc.if_else(pc.is_in(upper, pa.array(['T', 'Y', 'S'])), True,
+                              pc.if_else(pc.is_in(upper, pa.array(['F', 'N'])), False, None))
+        return strings.cast(arrow_type)
+
+    @staticmethod
+    def _arrow_field(field) -> pa.Field:
+        """Mapeia o descritor de campo do DBF para um campo Arrow"""
+        if field.type == 'D':
+            arrow_type = pa.date32()
+        elif field.type == 'N' and field.decimal_count == 0:
+            arrow_type = pa.int64()
+        elif field.type in ('N', 'F'):
+            arrow_type = pa.float64()
+        elif field.type == 'L':
+            arrow_type = pa.bool_()
+        else:
+            arrow_type = pa.string()
+        return pa.field(field.name, arrow_type)
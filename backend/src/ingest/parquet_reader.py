@@ -0,0 +1,47 @@
+"""
+Leitor de arquivos Parquet do SINAN em lotes
+Lê os row groups lote a lote aplicando o registro de schema, de modo que arquivos
+gravados sem tipos (texto/objeto) chegam já com inteiros estreitos, dicionários e date32
+"""
+from typing import Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.ingest.dbf_reader import DEFAULT_BATCH_SIZE
+from src.schema.registry import SchemaRegistry, get_registry
+
+
+def typed_schema(path: str, columns: Optional[List[str]] = None,
+                 registry: Optional[SchemaRegistry] = None) -> pa.Schema:
+    """Schema resultante da leitura tipada de um arquivo Parquet"""
+    registry = registry or get_registry()
+    schema = pq.read_schema(path)
+    if columns is not None:
+        schema = pa.schema([schema.field(name) for name in columns])
+    return registry.target_schema(schema)
+
+
+def iter_typed_batches(path: str, columns: Optional[List[str]] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                       registry: Optional[SchemaRegistry] = None) -> Iterator[pa.RecordBatch]:
+    """
+    Itera sobre um arquivo Parquet em lotes já convertidos para o schema do registro
+
+    Args:
+        path: Caminho do arquivo Parquet
+        columns: Colunas a ler (padrão: todas)
+        batch_size: Quantidade máxima de linhas por lote
+        registry: Registro de schema (padrão: o do CasoDengue)
+    """
+    registry = registry or get_registry()
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        yield registry.cast_batch(batch)
+
+
+def read_typed_table(path: str, columns: Optional[List[str]] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                     registry: Optional[SchemaRegistry] = None) -> pa.Table:
+    """Lê um arquivo Parquet inteiro, convertendo lote a lote para o schema do registro"""
+    schema = typed_schema(path, columns, registry)
+    batches = iter_typed_batches(path, columns, batch_size, registry)
+    return pa.Table.from_batches(batches, schema=schema)
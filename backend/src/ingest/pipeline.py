@@ -0,0 +1,179 @@
+"""
+Pipeline de ingestão DBF → Parquet
+Converte arquivos do SINAN em Parquet lote a lote, com pico de memória limitado,
+e processa vários arquivos (UF/ano) em paralelo
+"""
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.geo.municipios import MunicipioIndex
+from src.ingest.dbf_reader import DBFBatchReader, DEFAULT_BATCH_SIZE
+from src.ml.imputer import ModeImputer
+from src.quality.dedup import DUPLICATE_COLUMN, DUPLICATE_MODES, fingerprint, get_index
+
+
+@dataclass
+class IngestReport:
+    """Métricas de conversão de um arquivo"""
+    source: str
+    destination: str
+    rows: int
+    row_groups: int
+    seconds: float
+    rows_per_second: float
+    peak_rss_mb: float
+    duplicates: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def peak_rss_mb() -> float:
+    """Retorna o pico de memória residente do processo atual em MB"""
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # No Linux ru_maxrss vem em KB; no macOS, em bytes
+    if sys.platform == 'darwin':
+        return usage / 1024 ** 2
+    return usage / 1024
+
+
+def enrich_municipios(batch: pa.RecordBatch, index: MunicipioIndex) -> pa.RecordBatch:
+    """
+    Acrescenta ao lote as colunas da tabela de municípios, pela junção em SG_UF_NOT/ID_MUNICIP
+
+    Colunas que já existem no lote (como UF em alguns extratos) são mantidas como estão.
+    """
+    uf_codes = batch.column('SG_UF_NOT') if 'SG_UF_NOT' in batch.schema.names else None
+    joined = index.join(batch.column('ID_MUNICIP'), uf_codes)
+    names = [name for name in joined.column_names if name not in batch.schema.names]
+    return pa.RecordBatch.from_arrays(
+        batch.columns + [joined.column(name).combine_chunks() for name in names],
+        names=batch.schema.names + names,
+    )
+
+
+def convert_file(source: str, destination: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                 encoding: Optional[str] = None, compression: str = 'zstd',
+                 municipios: Optional[str] = None, typed: bool = True,
+                 imputer: Optional[str] = None, dedup: Optional[str] = None,
+                 duplicates: str = 'flag') -> IngestReport:
+    """
+    Converte um arquivo DBF em Parquet, gravando um row group por lote
+
+    Args:
+        source: Caminho do arquivo DBF
+        destination: Caminho do arquivo Parquet de saída
+        batch_size: Quantidade de registros por lote (e por row group)
+        encoding: Codificação dos campos texto (padrão: detectada pelo cabeçalho)
+        compression: Codec de compressão do Parquet
+        municipios: Índice compilado de municípios; se informado, cada lote recebe as colunas do município
+        typed: Aplica o registro de schema (inteiros estreitos, dicionários, date32) durante a leitura
+        imputer: Tabelas de imputação (python -m src.ml impute); se informadas, os vazios das
+            colunas imputadas recebem a moda em cada lote
+        dedup: Índice de duplicadas (diretório); as notificações do arquivo entram no índice e as
+            já indexadas (de cargas anteriores ou repetidas no próprio arquivo) são tratadas conforme duplicates
+        duplicates: 'flag' grava a coluna DUPLICADA; 'reject' descarta as linhas duplicadas
+
+    Returns:
+        Relatório com linhas convertidas, duplicadas, vazão e pico de memória
+    """
+    if duplicates not in DUPLICATE_MODES:
+        raise ValueError(f"duplicates deve ser um de {', '.join(DUPLICATE_MODES)}")
+    started = time.perf_counter()
+    reader = DBFBatchReader(source, batch_size=batch_size, encoding=encoding, typed=typed)
+
+    directory = os.path.dirname(destination)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    index = MunicipioIndex.load(municipios) if municipios else None
+    modes = ModeImputer.load(imputer) if imputer else None
+    fingerprints = get_index(dedup) if dedup else None
+    schema = reader.schema
+    if index is not None:
+        schema = enrich_municipios(pa.RecordBatch.from_pylist([], schema=schema), index).schema
+    if fingerprints is not None and duplicates == 'flag':
+        schema = schema.append(pa.field(DUPLICATE_COLUMN, pa.bool_()))
+
+    rows = 0
+    row_groups = 0
+    found = 0
+    with pq.ParquetWriter(destination, schema, compression=compression) as writer:
+        for batch in reader:
+            # A impressão digital usa os campos como vieram, antes da imputação
+            duplicated = fingerprints.check(fingerprint(batch)) if fingerprints is not None else None
+            if index is not None:
+                batch = enrich_municipios(batch, index)
+            if modes is not None:
+                batch = modes.transform(batch)
+            if duplicated is not None:
+                found += int(duplicated.sum())
+                if duplicates == 'flag':
+                    batch = batch.append_column(DUPLICATE_COLUMN, pa.array(duplicated))
+                else:
+                    batch = batch.filter(pa.array(~duplicated))
+            writer.write_batch(batch, row_group_size=batch.num_rows)
+            rows += batch.num_rows
+            row_groups += 1
+
+    seconds = time.perf_counter() - started
+    return IngestReport(
+        source=source,
+        destination=destination,
+        rows=rows,
+        row_groups=row_groups,
+        seconds=round(seconds, 3),
+        rows_per_second=round(rows / seconds, 1) if seconds > 0 else 0.0,
+        peak_rss_mb=round(peak_rss_mb(), 1),
+        duplicates=found,
+    )
+
+
+def _convert_job(job: Tuple[str, str, int, Optional[str], Optional[str], bool, Optional[str],
+                            Optional[str], str]) -> IngestReport:
+    source, destination, batch_size, encoding, municipios, typed, imputer, dedup, duplicates = job
+    return convert_file(source, destination, batch_size=batch_size, encoding=encoding,
+                        municipios=municipios, typed=typed, imputer=imputer, dedup=dedup, duplicates=duplicates)
+
+
+def convert_many(jobs: Sequence[Tuple[str, str]], batch_size: int = DEFAULT_BATCH_SIZE,
+                 encoding: Optional[str] = None, workers: Optional[int] = None,
+                 municipios: Optional[str] = None, typed: bool = True,
+                 imputer: Optional[str] = None, dedup: Optional[str] = None,
+                 duplicates: str = 'flag') -> List[IngestReport]:
+    """
+    Converte vários arquivos em paralelo em um pool de processos
+
+    Cada arquivo roda em um processo novo, de modo que o pico de memória
+    reportado corresponde apenas àquele arquivo.
+
+    Args:
+        jobs: Pares (arquivo DBF, arquivo Parquet de saída)
+        batch_size: Quantidade de registros por lote
+        encoding: Codificação dos campos texto
+        workers: Quantidade de processos (padrão: número de CPUs)
+        municipios: Índice compilado de municípios para enriquecer os lotes
+        typed: Aplica o registro de schema durante a leitura
+        imputer: Tabelas de imputação pela moda aplicadas a cada lote
+        dedup: Índice de duplicadas compartilhado pelos processos
+        duplicates: Tratamento das duplicadas ('flag' ou 'reject')
+
+    Returns:
+        Relatórios na mesma ordem dos arquivos de entrada
+    """
+    tasks = [(source, destination, batch_size, encoding, municipios, typed, imputer, dedup, duplicates)
+             for source, destination in jobs]
+    if not tasks:
+        return []
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as executor:
+        return list(executor.map(_convert_job, tasks))
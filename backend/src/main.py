@@ -6,8 +6,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from flask import Flask, send_from_directory
 from flask_cors import CORS
 from src.models.user import db
+from src.database import engine
 from src.controllers.user_controller import UserController
+from src.controllers.dengue_controller import DengueController
+from src.controllers.stats_controller import StatsController
+from src.controllers.prediction_controller import PredictionController
 from src.config import config
+from src.cache import response_cache
 
 
 def create_app(config_name=None):
@@ -20,19 +25,41 @@ def create_app(config_name=None):
     # Carregar configurações
     app.config.from_object(config[config_name])
     
+    # O Flask 3 ignora JSON_SORT_KEYS/JSONIFY_PRETTYPRINT_REGULAR; o provedor JSON é configurado aqui
+    app.json.sort_keys = app.config['JSON_SORT_KEYS']
+    app.json.compact = not app.config['JSONIFY_PRETTYPRINT_REGULAR']
+    app.json.ensure_ascii = False
+    
     # Habilitar CORS
     CORS(app, origins=app.config['CORS_ORIGINS'])
     
-    # Inicializar banco de dados
-    db.init_app(app)
+    # Inicializar banco de dados com o perfil do engine do ambiente (pool ou PRAGMAs do SQLite)
+    engine.init_app(app)
+    
+    # Cache de respostas HTTP
+    response_cache.init_app(app)
     
     # Registrar controladores
     user_controller = UserController()
     app.register_blueprint(user_controller.blueprint, url_prefix='/api')
-    
-    # Criar tabelas do banco de dados
-    with app.app_context():
+    dengue_controller = DengueController()
+    app.register_blueprint(dengue_controller.blueprint, url_prefix='/api')
+    stats_controller = StatsController()
+    app.register_blueprint(stats_controller.blueprint, url_prefix='/api')
+    prediction_controller = PredictionController()
+    app.register_blueprint(prediction_controller.blueprint, url_prefix='/api')
+
+    @app.cli.command('init-db')
+    def init_db():
+        """Cria as tabelas que ainda não existem (não roda a cada inicialização da aplicação)"""
         db.create_all()
+        print(f"Banco inicializado: {', '.join(sorted(db.metadata.tables))}")
+
+    @app.cli.command('rebuild-stats')
+    def rebuild_stats():
+        """Recalcula o cubo de estatísticas a partir das notificações"""
+        cells = stats_controller.stats_service.rebuild()
+        print(f"Cubo de estatísticas recalculado: {cells} células")
     
     # Rota para servir arquivos estáticos (frontend)
     @app.route('/', defaults={'path': ''})
@@ -63,4 +90,5 @@ def create_app(config_name=None):
 app = create_app()
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Servidor de desenvolvimento; em produção use o Gunicorn (gunicorn.conf.py)
+    app.run(host='0.0.0.0', port=5000, debug=app.config['DEBUG'])
@@ -0,0 +1,252 @@
+"""
+Interface de linha de comando do modelo de desfecho
+
+Uso:
+    python -m src.ml impute [--root src/database/casos] [--output src/database/imputacao.json] [--append data/parquet/DENGBR25.parquet]
+    python -m src.ml vocabulary [--root src/database/casos] [--year 2023 2024] [--output src/database/vocabulario.json] [--profile src/database/perfil.json] [--imputer]
+    python -m src.ml matrix [--root src/database/casos] [--vocabulary src/database/vocabulario.json] [--save src/database/matriz] [--imputer]
+    python -m src.ml versions [--matrix src/database/matriz] [--prune 2]
+    python -m src.ml train [--matrix src/database/matriz] [--output src/database/treino] [--workers 4]
+    python -m src.ml export [--sweep src/database/treino] [--output src/database/modelo.pkl] [--imputer]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List, Optional
+
+import pyarrow.parquet as pq
+
+from src.ingest.dbf_reader import DEFAULT_BATCH_SIZE
+from src.ml.feature_store import FeatureStore, canonical_digest, resolve_matrix
+from src.ml.features import DEFAULT_VOCABULARY_PATH, FEATURE_COLUMNS, TARGET_CLASSES, TARGET_COLUMN, FeatureBuilder
+from src.ml.imputer import DEFAULT_IMPUTER_PATH, ModeImputer
+from src.ml.model import DEFAULT_MODEL_PATH, OutcomeModel
+from src.ml.training import (DEFAULT_MATRIX_PATH, DEFAULT_SWEEP_PATH, DENSE_MODELS, METRICS, MODELS, RESAMPLERS,
+                             best_combination, expand_grid, fit_model, load_matrix, run_sweep)
+from src.quality.profiler import DROP_THRESHOLD, Profile
+from src.store.case_store import DEFAULT_STORE_PATH, CaseStore
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m src.ml', description='Atributos e treino do modelo de desfecho')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    impute = subparsers.add_parser('impute', help='Monta as tabelas de frequência da imputação pela moda')
+    impute.add_argument('--root', default=DEFAULT_STORE_PATH, help='Diretório do dataset (padrão: %(default)s)')
+    impute.add_argument('--year', type=int, nargs='*', help='Anos lidos (padrão: todos)')
+    impute.add_argument('-b', '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Linhas por lote (padrão: %(default)s)')
+    impute.add_argument('--append', nargs='+', metavar='PARQUET',
+                        help='Soma só estes arquivos (ex.: a semana nova) às tabelas já gravadas, sem reler o dataset')
+    impute.add_argument('--output', default=DEFAULT_IMPUTER_PATH, help='Arquivo das tabelas (padrão: %(default)s)')
+
+    for name, help_text in (('vocabulary', 'Monta o vocabulário de categorias a partir do armazenamento'),
+                            ('matrix', 'Monta a matriz esparsa e informa o tamanho')):
+        command = subparsers.add_parser(name, help=help_text)
+        command.add_argument('--root', default=DEFAULT_STORE_PATH, help='Diretório do dataset (padrão: %(default)s)')
+        command.add_argument('--year', type=int, nargs='*', help='Anos lidos (padrão: todos)')
+        command.add_argument('-b', '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                             help='Linhas por lote (padrão: %(default)s)')
+        command.add_argument('--vocabulary', '--output', dest='vocabulary', default=DEFAULT_VOCABULARY_PATH,
+                             help='Arquivo do vocabulário (padrão: %(default)s)')
+        command.add_argument('--imputer', nargs='?', const=DEFAULT_IMPUTER_PATH, default=None,
+                             help='Preenche os vazios com a moda antes de montar os atributos (padrão: %(const)s)')
+        if name == 'vocabulary':
+            command.add_argument('--profile', default=None,
+                                 help='Perfil de qualidade (python -m src.quality profile): descarta as colunas '
+                                      'com mais de --threshold de vazios')
+            command.add_argument('--threshold', type=float, default=DROP_THRESHOLD,
+                                 help='Proporção de vazios para descartar a coluna (padrão: %(default)s)')
+        if name == 'matrix':
+            command.add_argument('--save', nargs='?', const=DEFAULT_MATRIX_PATH, default=None,
+                                 help='Grava a matriz para o treino, como versão do armazenamento de atributos; '
+                                      'partições e vocabulário inalterados reaproveitam a versão existente '
+                                      '(padrão: %(const)s)')
+
+    train = subparsers.add_parser('train', help='Varredura modelo × hiperparâmetros × balanceamento')
+    train.add_argument('--matrix', default=DEFAULT_MATRIX_PATH,
+                       help='Matriz gravada ou armazenamento de atributos, do qual usa a versão atual (padrão: %(default)s)')
+    train.add_argument('--output', default=DEFAULT_SWEEP_PATH,
+                       help='Diretório das partições e resultados; retoma a varredura se existir (padrão: %(default)s)')
+    train.add_argument('--models', nargs='*', choices=list(MODELS), help='Modelos (padrão: todos)')
+    train.add_argument('--resamplers', nargs='*', choices=list(RESAMPLERS), default=list(RESAMPLERS),
+                       help='Balanceamentos (padrão: todos)')
+    train.add_argument('-w', '--workers', type=int, default=None, help='Processos em paralelo (padrão: número de CPUs)')
+    train.add_argument('--splits', type=int, default=5, help='Partições da validação cruzada (padrão: %(default)s)')
+    train.add_argument('--seed', type=int, default=42, help='Semente das partições (padrão: %(default)s)')
+
+    versions = subparsers.add_parser('versions', help='Lista as versões gravadas da matriz')
+    versions.add_argument('--matrix', default=DEFAULT_MATRIX_PATH, help='Armazenamento de atributos (padrão: %(default)s)')
+    versions.add_argument('--prune', type=int, metavar='N', help='Remove as versões além das N mais recentes')
+
+    export = subparsers.add_parser('export', help='Treina a melhor combinação com todas as linhas e grava o modelo')
+    export.add_argument('--matrix', default=DEFAULT_MATRIX_PATH, help='Matriz gravada (padrão: %(default)s)')
+    export.add_argument('--vocabulary', default=DEFAULT_VOCABULARY_PATH,
+                        help='Vocabulário usado na matriz (padrão: %(default)s)')
+    export.add_argument('--sweep', default=DEFAULT_SWEEP_PATH,
+                        help='Varredura de onde vem a melhor combinação (padrão: %(default)s)')
+    export.add_argument('--model', choices=list(MODELS), help='Modelo escolhido em vez do melhor da varredura')
+    export.add_argument('--params', default='{}', help='Hiperparâmetros em JSON, com --model')
+    export.add_argument('--resampler', choices=list(RESAMPLERS), default='nenhum', help='Balanceamento, com --model')
+    export.add_argument('--imputer', nargs='?', const=DEFAULT_IMPUTER_PATH, default=None,
+                        help='Empacota a imputação usada na matriz, aplicada também na pontuação (padrão: %(const)s)')
+    export.add_argument('--output', default=DEFAULT_MODEL_PATH, help='Arquivo do modelo (padrão: %(default)s)')
+    return parser
+
+
+def _available(store: CaseStore, columns: List[str]) -> List[str]:
+    """Colunas pedidas que existem no dataset (as ausentes contam como nulas no FeatureBuilder)"""
+    names = set(store.dataset.schema.names)
+    return [column for column in columns if column in names]
+
+
+def _train(args) -> int:
+    started = time.perf_counter()
+    combinations = expand_grid(args.models, args.resamplers)
+    table = run_sweep(resolve_matrix(args.matrix), args.output, combinations, workers=args.workers,
+                      n_splits=args.splits, seed=args.seed)
+
+    print(f"{'modelo':<16}{'balanceamento':<15}" + ''.join(f'{name:>12}' for name in ('cv_f1', 'test_f1')) + '  params')
+    for line in table:
+        print(f"{line['modelo']:<16}{line['balanceamento']:<15}"
+              + ''.join(f"{line[name] if line[name] is not None else '-':>12}" for name in ('cv_f1_macro', 'test_f1_macro'))
+              + f"  {line['params']}")
+    print(f"{len(table)} combinações em {args.output}/resultados.csv ({', '.join(METRICS)}) "
+          f"em {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+def _export(args) -> int:
+    started = time.perf_counter()
+    if args.model:
+        chosen = {'model': args.model, 'params': json.loads(args.params), 'resampler': args.resampler}
+    else:
+        chosen = best_combination(args.sweep)
+    estimator = fit_model(resolve_matrix(args.matrix), chosen['model'], chosen['params'], chosen['resampler'])
+    metadata = {**chosen, 'dense': chosen['model'] in DENSE_MODELS}
+    imputer = ModeImputer.load(args.imputer) if args.imputer else None
+    OutcomeModel(FeatureBuilder.load(args.vocabulary), estimator, metadata, imputer=imputer).save(args.output)
+    print(f"{chosen['model']} {json.dumps(chosen['params'], sort_keys=True)} ({chosen['resampler']}) "
+          f"gravado em {args.output} ({time.perf_counter() - started:.1f}s)")
+    return 0
+
+
+def _versions(args) -> int:
+    store = FeatureStore(args.matrix)
+    if args.prune is not None:
+        for key in store.prune(args.prune):
+            print(f"versão {key} removida")
+    for entry in store.versions():
+        shape = ' × '.join(str(size) for size in entry['shape'])
+        print(f"{'*' if entry['current'] else ' '} {entry['key']}  {entry['created']}  {shape:>16}  "
+              f"{len(entry['sources'])} partições")
+    return 0
+
+
+def _impute(args) -> int:
+    started = time.perf_counter()
+    if args.append:
+        # Semana nova: as contagens já gravadas recebem só os arquivos informados
+        imputer = ModeImputer.load(args.output)
+        for path in args.append:
+            imputer.fit(pq.ParquetFile(path).iter_batches(batch_size=args.batch_size,
+                                                          columns=_present(path, imputer.columns)))
+        sources = list(args.append)
+    else:
+        store = CaseStore(args.root)
+        imputer = ModeImputer()
+        if os.path.exists(args.output):
+            # A recontagem completa continua a numeração de revisões do arquivo existente
+            imputer.revision = ModeImputer.load(args.output).revision
+        imputer.fit(store.iter_batches(columns=_available(store, imputer.columns), year=args.year,
+                                       batch_size=args.batch_size))
+        sources = store.files(year=args.year)
+    imputer.sources.extend(sources)
+    imputer.save(args.output)
+    modes = ', '.join(f'{column}={mode}' for column, mode in imputer.modes.items() if mode is not None)
+    print(f"modas: {modes or '-'}")
+    print(f"{imputer.rows} linhas contadas (revisão {imputer.revision}) gravadas em {args.output} "
+          f"({time.perf_counter() - started:.1f}s)")
+    return 0
+
+
+def _present(path: str, columns: List[str]) -> List[str]:
+    names = set(pq.ParquetFile(path).schema_arrow.names)
+    return [column for column in columns if column in names]
+
+
+def _batches(args, store: CaseStore, columns: List[str], imputer: Optional[ModeImputer], **kwargs):
+    batches = store.iter_batches(columns=columns, year=args.year, batch_size=args.batch_size, **kwargs)
+    return imputer.transform_batches(batches) if imputer is not None else batches
+
+
+def _save_matrix(args, store: CaseStore, builder: FeatureBuilder, imputer: Optional[ModeImputer]) -> int:
+    started = time.perf_counter()
+    columns = _available(store, builder.columns + [TARGET_COLUMN])
+    config = {
+        'vocabulary': canonical_digest(builder.to_dict()),
+        'columns': columns,
+        'target': TARGET_COLUMN,
+        'classes': list(TARGET_CLASSES),
+        'year': sorted(args.year) if args.year else None,
+    }
+    if imputer is not None:
+        # Só as modas mudam a matriz: contagens novas com as mesmas modas reaproveitam a versão
+        config['imputer'] = imputer.modes
+
+    def build():
+        return builder.build(_batches(args, store, columns, imputer))
+
+    key, directory, reused = FeatureStore(args.save).get_or_build(store.files(year=args.year), config, build,
+                                                                  base=store.root)
+    X, _ = load_matrix(directory)
+    action = 'reaproveitada' if reused else 'gravada'
+    print(f"matriz {X.shape[0]} × {X.shape[1]} ({X.nnz} não nulos) {action}: versão {key} em {directory} "
+          f"({time.perf_counter() - started:.1f}s)")
+    return 0
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == 'train':
+        return _train(args)
+    if args.command == 'export':
+        return _export(args)
+    if args.command == 'versions':
+        return _versions(args)
+    if args.command == 'impute':
+        return _impute(args)
+
+    store = CaseStore(args.root)
+    started = time.perf_counter()
+    imputer = ModeImputer.load(args.imputer) if args.imputer else None
+
+    if args.command == 'vocabulary':
+        builder = FeatureBuilder()
+        if args.profile:
+            dropped = Profile.load(args.profile).columns_to_drop(args.threshold)
+            builder = FeatureBuilder([column for column in builder.columns if column not in dropped])
+            print(f"colunas descartadas pelo perfil: {', '.join(sorted(set(dropped) & set(FEATURE_COLUMNS))) or '-'}")
+        builder.fit(_batches(args, store, _available(store, builder.columns), imputer,
+                             where={TARGET_COLUMN: list(TARGET_CLASSES)}))
+        builder.save(args.vocabulary)
+        print(f"{builder.n_features} atributos de {builder.rows} linhas gravados em {args.vocabulary} "
+              f"({time.perf_counter() - started:.1f}s)")
+        return 0
+
+    builder = FeatureBuilder.load(args.vocabulary)
+    if args.save:
+        return _save_matrix(args, store, builder, imputer)
+    columns = _available(store, builder.columns + [TARGET_COLUMN])
+    matrix, _ = builder.build(_batches(args, store, columns, imputer))
+    size = matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+    dense = matrix.shape[0] * matrix.shape[1] * 8
+    print(f"matriz {matrix.shape[0]} × {matrix.shape[1]}: {size / 2 ** 20:.1f} MiB em CSR float32 "
+          f"({dense / 2 ** 20:.1f} MiB densa em float64) em {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
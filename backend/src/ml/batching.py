@@ -0,0 +1,141 @@
+"""
+Agrupamento de requisições de pontuação em micro-lotes
+Requisições concorrentes de um registro são reunidas por uma thread do processo em lotes
+pequenos, pontuados em uma única chamada vetorizada, com espera máxima configurável
+"""
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT = 0.005
+DEFAULT_LATENCY_WINDOW = 10_000
+
+
+class LatencyTracker:
+    """Latências das últimas requisições (janela fixa), com percentis sob demanda"""
+
+    def __init__(self, window: int = DEFAULT_LATENCY_WINDOW):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+
+    def percentiles(self, *quantiles: float) -> List[Optional[float]]:
+        """Percentis (0 a 100) das latências da janela, em milissegundos; None sem amostras"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return [None] * len(quantiles)
+        last = len(samples) - 1
+        return [round(samples[min(last, int(round(q / 100 * last)))] * 1000, 3) for q in quantiles]
+
+    def summary(self) -> Dict[str, Any]:
+        p50, p99 = self.percentiles(50, 99)
+        return {'count': self.count, 'window': len(self._samples), 'p50_ms': p50, 'p99_ms': p99}
+
+
+class MicroBatcher:
+    """
+    Reúne chamadas concorrentes de submit em lotes para handler
+
+    A thread coletora pega o primeiro item da fila e tudo o que já estiver enfileirado. Enquanto
+    houver outras requisições dentro de submit e o lote não estiver cheio, espera por elas até
+    max_wait depois do primeiro item; uma requisição sozinha é despachada sem espera. A thread é
+    criada no primeiro uso em cada processo (depois do fork dos workers do Gunicorn).
+    """
+
+    def __init__(self, handler: Callable[[List[Any]], Sequence[Any]],
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_wait: float = DEFAULT_MAX_WAIT,
+                 latency_window: int = DEFAULT_LATENCY_WINDOW):
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size deve ser maior que zero")
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.latency = LatencyTracker(latency_window)
+        self.batches = 0
+        self.items = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._queue: Optional[queue.Queue] = None
+        self._pid: Optional[int] = None
+
+    def _ensure_worker(self) -> queue.Queue:
+        with self._lock:
+            if self._pid != os.getpid():
+                # Processo novo (ou worker recém-criado pelo fork): fila e thread próprias
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._in_flight = 0
+                threading.Thread(target=self._run, args=(self._queue,), name='micro-batcher', daemon=True).start()
+            self._in_flight += 1
+            return self._queue
+
+    def submit(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """Enfileira um item e espera o resultado do lote em que ele foi pontuado"""
+        started = time.perf_counter()
+        pending = self._ensure_worker()
+        future: Future = Future()
+        pending.put((item, future))
+        try:
+            return future.result(timeout)
+        finally:
+            self.latency.record(time.perf_counter() - started)
+
+    def _collect(self, pending: queue.Queue) -> List[tuple]:
+        batch = [pending.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(pending.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._in_flight <= len(batch):
+                break
+            try:
+                batch.append(pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self, pending: queue.Queue) -> None:
+        while True:
+            batch = self._collect(pending)
+            try:
+                results = self.handler([item for item, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"handler retornou {len(results)} resultados para {len(batch)} itens")
+            except Exception as e:
+                results, error = None, e
+            with self._lock:
+                # Os itens do lote deixam de contar como requisições à espera
+                self._in_flight -= len(batch)
+                self.batches += 1
+                self.items += len(batch)
+            for position, (_, future) in enumerate(batch):
+                if results is None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(results[position])
+
+    def stats(self) -> Dict[str, Any]:
+        """Latência (p50/p99, da entrada em submit ao resultado) e tamanho médio dos lotes"""
+        return {
+            **self.latency.summary(),
+            'batches': self.batches,
+            'mean_batch_size': round(self.items / self.batches, 2) if self.batches else None,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': round(self.max_wait * 1000, 3),
+        }
@@ -0,0 +1,207 @@
+"""
+Armazenamento versionado das matrizes de atributos
+Cada matriz é gravada em .npy (lida por memory map, sem desserializar) em um diretório endereçado
+pelo hash do conteúdo das partições de origem e da configuração do pipeline, com um manifesto
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from src.ml.training import DEFAULT_MATRIX_PATH, load_matrix, save_matrix
+
+
+# Versão do formato das matrizes: mudá-la invalida todas as versões gravadas
+STORE_VERSION = 1
+
+MANIFEST = 'manifest.json'
+
+# Blocos lidos por vez no hash das partições
+_CHUNK_SIZE = 1 << 20
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 do conteúdo do arquivo, lido em blocos"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def canonical_digest(value: Any) -> str:
+    """SHA-256 do JSON canônico (chaves ordenadas, sem espaços) de um valor"""
+    text = json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class FeatureStore:
+    """
+    Versões da matriz de atributos, uma por combinação de partições de origem e configuração
+
+    O manifesto (manifest.json na raiz) registra para cada versão as partições e seus hashes, a
+    configuração, o formato da matriz e quando foi gerada, além da versão atual (a última gravada
+    ou reaproveitada). Os hashes das partições são guardados com tamanho e data de modificação,
+    então um arquivo só é relido quando muda.
+    """
+
+    def __init__(self, root: str = DEFAULT_MATRIX_PATH):
+        self.root = root
+        self._manifest: Optional[Dict[str, Any]] = None
+
+    @property
+    def manifest(self) -> Dict[str, Any]:
+        if self._manifest is None:
+            path = os.path.join(self.root, MANIFEST)
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    self._manifest = json.load(f)
+            else:
+                self._manifest = {'store_version': STORE_VERSION, 'current': None, 'versions': {}, 'hashes': {}}
+        return self._manifest
+
+    def _write_manifest(self) -> None:
+        # Gravação atômica: um processo interrompido não deixa o manifesto pela metade
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, MANIFEST)
+        temporary = path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(temporary, path)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def source_digests(self, files: Sequence[str], base: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Hash do conteúdo de cada partição de origem (caminhos relativos a base, em ordem)
+
+        Arquivos com o mesmo tamanho e data de modificação da última vez usam o hash guardado.
+        """
+        hashes = self.manifest.setdefault('hashes', {})
+        sources = []
+        for path in sorted(files):
+            name = os.path.relpath(path, base) if base else path
+            stat = os.stat(path)
+            cached = hashes.get(name)
+            if not cached or cached['size'] != stat.st_size or cached['mtime_ns'] != stat.st_mtime_ns:
+                cached = hashes[name] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                                         'sha256': file_digest(path)}
+            sources.append({'path': name.replace(os.sep, '/'), 'sha256': cached['sha256']})
+        return sources
+
+    @staticmethod
+    def version_key(sources: Sequence[Dict[str, Any]], config: Dict[str, Any]) -> str:
+        """Endereço da versão: hash das partições (caminho e conteúdo) e da configuração do pipeline"""
+        return canonical_digest({'store_version': STORE_VERSION,
+                                 'sources': [[source['path'], source['sha256']] for source in sources],
+                                 'config': config})[:16]
+
+    def get(self, key: str) -> Optional[str]:
+        """Diretório da versão, se ela foi gravada por completo"""
+        entry = self.manifest['versions'].get(key)
+        if entry is None:
+            return None
+        directory = self.path(key)
+        for name, size in entry['files'].items():
+            target = os.path.join(directory, name)
+            if not os.path.exists(target) or os.path.getsize(target) != size:
+                return None
+        return directory
+
+    def put(self, key: str, X: sp.csr_matrix, y: np.ndarray, sources: Sequence[Dict[str, Any]],
+            config: Dict[str, Any]) -> str:
+        """Grava a matriz como a versão key (em um diretório temporário, renomeado ao final)"""
+        directory = self.path(key)
+        temporary = directory + '.tmp'
+        self.manifest['versions'].pop(key, None)
+        shutil.rmtree(temporary, ignore_errors=True)
+        save_matrix(temporary, X, y)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(temporary, directory)
+
+        self.manifest['versions'][key] = {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'shape': list(X.shape),
+            'nnz': int(X.nnz),
+            'sources': list(sources),
+            'config': config,
+            'files': {name: os.path.getsize(os.path.join(directory, name)) for name in sorted(os.listdir(directory))},
+        }
+        self.manifest['current'] = key
+        self._write_manifest()
+        return directory
+
+    def get_or_build(self, files: Sequence[str], config: Dict[str, Any],
+                     build: Callable[[], Tuple[sp.csr_matrix, np.ndarray]],
+                     base: Optional[str] = None) -> Tuple[str, str, bool]:
+        """
+        Versão da matriz para as partições e a configuração, montada só se ainda não existir
+
+        Args:
+            files: Partições de origem que a montagem lê
+            config: Configuração do pipeline (vocabulário, colunas, filtros)
+            build: Monta (X, y); chamado apenas quando a versão não existe
+            base: Diretório de referência dos caminhos das partições no manifesto
+
+        Returns:
+            (chave, diretório, reaproveitada)
+        """
+        sources = self.source_digests(files, base)
+        key = self.version_key(sources, config)
+        directory = self.get(key)
+        if directory is not None:
+            self.manifest['current'] = key
+            self._write_manifest()
+            return key, directory, True
+
+        X, y = build()
+        return key, self.put(key, X, y, sources, config), False
+
+    def resolve(self, key: Optional[str] = None) -> str:
+        """
+        Diretório de uma versão (padrão: a atual)
+
+        Raises:
+            FileNotFoundError: Se a versão não existe ou está incompleta
+        """
+        key = key or self.manifest.get('current')
+        directory = self.get(key) if key else None
+        if directory is None:
+            raise FileNotFoundError(f"Versão da matriz não encontrada em {self.root}: {key or '(nenhuma)'}")
+        return directory
+
+    def load(self, key: Optional[str] = None, mmap_mode: Optional[str] = 'r') -> Tuple[sp.csr_matrix, np.ndarray]:
+        """Matriz e classes de uma versão, lidas por memory map"""
+        return load_matrix(self.resolve(key), mmap_mode)
+
+    def versions(self) -> List[Dict[str, Any]]:
+        """Versões gravadas, da mais recente para a mais antiga (o manifesto guarda a ordem de gravação)"""
+        current = self.manifest.get('current')
+        entries = [{'key': key, 'current': key == current, **entry} for key, entry in self.manifest['versions'].items()]
+        return entries[::-1]
+
+    def prune(self, keep: int = 1) -> List[str]:
+        """Remove as versões mais antigas além das keep mais recentes (a atual é sempre mantida)"""
+        removed = []
+        for position, entry in enumerate(self.versions()):
+            if position < keep or entry['current']:
+                continue
+            shutil.rmtree(self.path(entry['key']), ignore_errors=True)
+            del self.manifest['versions'][entry['key']]
+            removed.append(entry['key'])
+        if removed:
+            self._write_manifest()
+        return removed
+
+
+def resolve_matrix(path: str) -> str:
+    """Diretório da matriz: o próprio path (gravado por save_matrix) ou a versão atual do FeatureStore"""
+    if os.path.exists(os.path.join(path, 'matriz.json')):
+        return path
+    return FeatureStore(path).resolve()
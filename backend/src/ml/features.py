@@ -0,0 +1,217 @@
+"""
+Matriz de atributos do modelo de desfecho (EVOLUCAO)
+Codifica as colunas categóricas em one-hot direto para uma matriz CSR float32, a partir de um
+vocabulário de categorias persistido, lote a lote e com escalonamento que não densifica a matriz
+"""
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import scipy.sparse as sp
+
+from src.schema.registry import text_column
+
+
+DEFAULT_VOCABULARY_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'vocabulario.json')
+
+# Colunas categóricas usadas como previsores no notebook (após o descarte das colunas vazias)
+FEATURE_COLUMNS = (
+    'TP_NOT', 'SG_UF_NOT', 'CS_SEXO', 'CS_GESTANT', 'FEBRE', 'MIALGIA', 'CEFALEIA', 'EXANTEMA',
+    'VOMITO', 'NAUSEA', 'DOR_COSTAS', 'CONJUNTVIT', 'ARTRITE', 'ARTRALGIA', 'PETEQUIA_N',
+    'LEUCOPENIA', 'LACO', 'DOR_RETRO', 'DIABETES', 'HEMATOLOG', 'HEPATOPAT', 'RENAL', 'HIPERTENSA',
+    'ACIDO_PEPT', 'AUTO_IMUNE', 'RESUL_SORO', 'RESUL_NS1', 'HOSPITALIZ',
+)
+
+TARGET_COLUMN = 'EVOLUCAO'
+
+# Desfechos mantidos no treino: 1 (cura) e 2 (óbito pelo agravo)
+TARGET_CLASSES = ('1', '2')
+
+_VOCABULARY_VERSION = 1
+
+
+class FeatureBuilder:
+    """
+    Codificador one-hot esparso com vocabulário persistido
+
+    Equivale ao OneHotEncoder(handle_unknown='ignore') seguido do StandardScaler do notebook,
+    sem materializar a matriz densa: cada coluna contribui com no máximo um valor não nulo por
+    linha. Nulos são uma categoria própria (como o NaN no OneHotEncoder), colunas ausentes do lote
+    contam como nulas e categorias fora do vocabulário não geram atributo.
+
+    O escalonamento divide cada atributo pelo desvio padrão (StandardScaler(with_mean=False));
+    subtrair a média tornaria todas as células não nulas. As médias ficam em mean_ para os modelos
+    que precisarem delas.
+    """
+
+    def __init__(self, columns: Sequence[str] = FEATURE_COLUMNS, scale: bool = True):
+        self.columns = [column.upper() for column in columns]
+        self.scale = scale
+        self.rows = 0
+        # Contagem de cada categoria (None para nulos) por coluna, acumulada entre os lotes
+        self.counts: Dict[str, Dict[Optional[str], int]] = {column: {} for column in self.columns}
+        self._layout = None
+
+    def partial_fit(self, batch: pa.RecordBatch) -> 'FeatureBuilder':
+        """Acrescenta as categorias e contagens de um lote ao vocabulário"""
+        for column in self.columns:
+            counts = self.counts[column]
+            for entry in pc.value_counts(text_column(batch, column)).to_pylist():
+                counts[entry['values']] = counts.get(entry['values'], 0) + entry['counts']
+        self.rows += batch.num_rows
+        self._layout = None
+        return self
+
+    def fit(self, batches: Iterable[pa.RecordBatch]) -> 'FeatureBuilder':
+        """Monta o vocabulário percorrendo os lotes (partições do CaseStore, arquivos Parquet, ...)"""
+        for batch in batches:
+            self.partial_fit(batch)
+        return self
+
+    @property
+    def vocabulary(self) -> Dict[str, List[Optional[str]]]:
+        """Categorias de cada coluna, ordenadas (nulo por último)"""
+        return {
+            column: sorted(value for value in counts if value is not None) + ([None] if None in counts else [])
+            for column, counts in self.counts.items()
+        }
+
+    @property
+    def n_features(self) -> int:
+        return sum(len(counts) for counts in self.counts.values())
+
+    def get_feature_names_out(self) -> List[str]:
+        """Nomes dos atributos no formato do OneHotEncoder (CS_SEXO_F, CS_SEXO_nan, ...)"""
+        return [f"{column}_{'nan' if value is None else value}"
+                for column, values in self.vocabulary.items() for value in values]
+
+    @property
+    def mean_(self) -> np.ndarray:
+        """Frequência de cada atributo (a média da coluna one-hot)"""
+        counts = [self.counts[column][value] for column, values in self.vocabulary.items() for value in values]
+        return np.asarray(counts, dtype=np.float64) / max(self.rows, 1)
+
+    @property
+    def scale_(self) -> np.ndarray:
+        """Desvio padrão de cada atributo; colunas constantes ficam com 1, como no StandardScaler"""
+        mean = self.mean_
+        std = np.sqrt(mean * (1.0 - mean))
+        return np.where(std > 0, std, 1.0)
+
+    def _get_layout(self) -> Tuple[List[Tuple[str, pa.Array, int]], np.ndarray]:
+        """Categorias de cada coluna com o deslocamento no vetor de atributos e o valor de cada atributo"""
+        if self._layout is None:
+            if not self.rows:
+                raise ValueError('Vocabulário vazio: ajuste o FeatureBuilder antes de transformar')
+            layout, offset = [], 0
+            for column, values in self.vocabulary.items():
+                layout.append((column, pa.array(values, pa.string()), offset))
+                offset += len(values)
+            weights = 1.0 / self.scale_ if self.scale else np.ones(offset)
+            self._layout = (layout, weights.astype(np.float32))
+        return self._layout
+
+    def _codes(self, batch: pa.RecordBatch) -> np.ndarray:
+        """Índice do atributo ativo de cada coluna por linha (-1 quando a categoria é desconhecida)"""
+        layout, _ = self._get_layout()
+        codes = np.empty((batch.num_rows, len(layout)), dtype=np.int32)
+        for position, (column, values, offset) in enumerate(layout):
+            # index_in casa nulo com nulo quando o vocabulário tem a categoria dos nulos
+            found = pc.index_in(text_column(batch, column), value_set=values).fill_null(-1).to_numpy()
+            codes[:, position] = np.where(found >= 0, found + offset, -1)
+        return codes
+
+    def transform(self, batch: pa.RecordBatch) -> sp.csr_matrix:
+        """Codifica um lote em uma matriz CSR float32 (linhas × n_features)"""
+        codes = self._codes(batch)
+        active = codes >= 0
+        indptr = np.zeros(batch.num_rows + 1, dtype=np.int64)
+        np.cumsum(active.sum(axis=1), out=indptr[1:])
+        # Percorrido linha a linha, codes[active] já sai ordenado por coluna dentro de cada linha
+        indices = codes[active]
+        _, weights = self._get_layout()
+        return sp.csr_matrix((weights[indices], indices, indptr), shape=(batch.num_rows, self.n_features))
+
+    def transform_batches(self, batches: Iterable[pa.RecordBatch]) -> Iterator[sp.csr_matrix]:
+        """Codifica os lotes um a um, sem acumular"""
+        for batch in batches:
+            yield self.transform(batch)
+
+    def build(self, batches: Iterable[pa.RecordBatch], target: Optional[str] = TARGET_COLUMN,
+              classes: Optional[Sequence[str]] = TARGET_CLASSES) -> Tuple[sp.csr_matrix, Optional[np.ndarray]]:
+        """
+        Monta a matriz de atributos e o vetor de classes de todos os lotes
+
+        Cada lote guarda só os índices dos atributos ativos (int32); os valores e a matriz final
+        são montados uma única vez no fim, então o pico de memória fica perto do tamanho da CSR.
+
+        Args:
+            batches: Lotes com as colunas do vocabulário e a coluna de desfecho
+            target: Coluna de desfecho (None para montar só a matriz)
+            classes: Desfechos mantidos; as linhas com outros valores são descartadas
+                     (como o query("EVOLUCAO in ['1', '2']") do notebook)
+
+        Returns:
+            Tupla (matriz CSR float32, classes int8 ou None)
+        """
+        parts, counts, labels = [], [], []
+        for batch in batches:
+            if target is not None:
+                values = text_column(batch, target)
+                if classes is not None:
+                    batch = batch.filter(pc.fill_null(pc.is_in(values, value_set=pa.array(list(classes))), False))
+                    values = text_column(batch, target)
+                labels.append(pc.cast(values, pa.int8()).to_numpy(zero_copy_only=False))
+            codes = self._codes(batch)
+            active = codes >= 0
+            parts.append(codes[active])
+            counts.append(active.sum(axis=1))
+
+        indices = np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)
+        row_counts = np.concatenate(counts) if counts else np.empty(0, dtype=np.int64)
+        del parts
+        indptr = np.zeros(len(row_counts) + 1, dtype=np.int64)
+        np.cumsum(row_counts, out=indptr[1:])
+        _, weights = self._get_layout()
+        matrix = sp.csr_matrix((weights[indices], indices, indptr), shape=(len(row_counts), self.n_features))
+        y = np.concatenate(labels) if target is not None and labels else None
+        return matrix, y
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': _VOCABULARY_VERSION,
+            'columns': self.columns,
+            'scale': self.scale,
+            'rows': self.rows,
+            'categories': {
+                column: [[value, self.counts[column][value]] for value in values]
+                for column, values in self.vocabulary.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FeatureBuilder':
+        if data.get('version') != _VOCABULARY_VERSION:
+            raise ValueError(f"Versão de vocabulário não suportada: {data.get('version')}")
+        builder = cls(data['columns'], scale=data['scale'])
+        builder.rows = data['rows']
+        for column, entries in data['categories'].items():
+            builder.counts[column] = {value: count for value, count in entries}
+        return builder
+
+    def save(self, path: str = DEFAULT_VOCABULARY_PATH) -> None:
+        """Grava o vocabulário (categorias e contagens) em JSON"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=1)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_VOCABULARY_PATH) -> 'FeatureBuilder':
+        """Carrega um vocabulário gravado por save"""
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,173 @@
+"""
+Imputação pela moda com tabelas de frequência acumuladas em streaming
+As contagens de cada coluna são somadas lote a lote (partições, semanas novas, cargas em massa) e
+gravadas em um JSON pequeno e versionado; a moda é aplicada aos lotes Arrow de forma vetorizada
+"""
+import fcntl
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.ml.features import FEATURE_COLUMNS
+from src.schema.registry import records_batch, text_column
+
+
+DEFAULT_IMPUTER_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'imputacao.json')
+
+_IMPUTER_VERSION = 1
+
+Records = Union[pa.RecordBatch, Sequence[Dict[str, Any]]]
+
+
+class ModeImputer:
+    """
+    Substitui nulos e textos em branco pela moda de cada coluna (o mode() + fillna do notebook)
+
+    As tabelas de frequência são só somas, então uma semana nova atualiza as contagens com
+    partial_fit, sem reler as partições já contadas. revision aumenta a cada atualização gravada.
+    """
+
+    def __init__(self, columns: Sequence[str] = FEATURE_COLUMNS):
+        self.columns = [column.upper() for column in columns]
+        self.counts: Dict[str, Dict[str, int]] = {column: {} for column in self.columns}
+        self.rows = 0
+        self.revision = 0
+        self.updated: Optional[str] = None
+        self.sources: List[str] = []
+
+    def partial_fit(self, batch: Records) -> 'ModeImputer':
+        """Soma às tabelas as contagens de um lote (ou de notificações planas)"""
+        if not isinstance(batch, pa.RecordBatch):
+            batch = records_batch(batch, self.columns)
+        for column in self.columns:
+            counts = self.counts[column]
+            for entry in pc.value_counts(text_column(batch, column).drop_null()).to_pylist():
+                counts[entry['values']] = counts.get(entry['values'], 0) + entry['counts']
+        self.rows += batch.num_rows
+        return self
+
+    def fit(self, batches: Iterable[pa.RecordBatch]) -> 'ModeImputer':
+        """Monta as tabelas em uma passada pelos lotes (partições do CaseStore, arquivos Parquet, ...)"""
+        for batch in batches:
+            self.partial_fit(batch)
+        return self
+
+    @property
+    def modes(self) -> Dict[str, Optional[str]]:
+        """Valor mais frequente de cada coluna (no empate, o menor); None sem valores contados"""
+        return {
+            column: min(counts.items(), key=lambda item: (-item[1], item[0]))[0] if counts else None
+            for column, counts in self.counts.items()
+        }
+
+    def transform(self, batch: pa.RecordBatch) -> pa.RecordBatch:
+        """
+        Preenche os vazios das colunas do lote com a moda, mantendo o tipo de cada coluna
+
+        Colunas ausentes do lote continuam ausentes; uma moda que não cabe no tipo da coluna
+        (texto em uma coluna inteira) deixa a coluna como está.
+        """
+        modes = self.modes
+        for position, field in enumerate(batch.schema):
+            mode = modes.get(field.name.upper())
+            if mode is None:
+                continue
+            filled = _fill(batch.column(position), mode)
+            if filled is not None:
+                batch = batch.set_column(position, field, filled)
+        return batch
+
+    def transform_batches(self, batches: Iterable[pa.RecordBatch]) -> Iterable[pa.RecordBatch]:
+        for batch in batches:
+            yield self.transform(batch)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': _IMPUTER_VERSION,
+            'revision': self.revision,
+            'updated': self.updated,
+            'columns': self.columns,
+            'rows': self.rows,
+            'modes': self.modes,
+            'counts': {column: sorted(counts.items()) for column, counts in self.counts.items()},
+            'sources': self.sources,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ModeImputer':
+        if data.get('version') != _IMPUTER_VERSION:
+            raise ValueError(f"Versão de imputação não suportada: {data.get('version')}")
+        imputer = cls(data['columns'])
+        imputer.rows, imputer.revision, imputer.updated = data['rows'], data['revision'], data['updated']
+        imputer.sources = list(data['sources'])
+        for column, entries in data['counts'].items():
+            imputer.counts[column] = {value: count for value, count in entries}
+        return imputer
+
+    def save(self, path: str = DEFAULT_IMPUTER_PATH) -> None:
+        """Grava as tabelas como uma nova revisão (arquivo temporário renomeado ao final)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.revision += 1
+        self.updated = time.strftime('%Y-%m-%dT%H:%M:%S')
+        temporary = path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=1)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_IMPUTER_PATH) -> 'ModeImputer':
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def accumulate(cls, path: str, batch: Records, source: Optional[str] = None) -> 'ModeImputer':
+        """
+        Soma um lote às tabelas gravadas em path e grava a nova revisão
+
+        A leitura, a soma e a gravação acontecem sob um lock de arquivo, então workers do
+        Gunicorn que recebem cargas ao mesmo tempo não perdem contagens uns dos outros.
+        """
+        with open(path + '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                imputer = cls.load(path)
+                imputer.partial_fit(batch)
+                if source:
+                    imputer.sources.append(source)
+                imputer.save(path)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        return imputer
+
+
+def _fill(array: Union[pa.Array, pa.ChunkedArray], mode: str) -> Optional[pa.Array]:
+    """Coluna com nulos e textos em branco trocados pela moda, no tipo original (None se a moda não cabe)"""
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    original = array.type
+    if pa.types.is_dictionary(original):
+        array = array.dictionary_decode()
+    if pa.types.is_string(array.type) or pa.types.is_large_string(array.type):
+        # utf8_is_space é falso para '', então o texto vazio entra pelo comprimento (sem copiar o texto aparado)
+        blank = pc.or_(pc.utf8_is_space(array), pc.equal(pc.binary_length(array), 0))
+        empty = pc.or_kleene(pc.is_null(array), blank)
+        if not pc.any(empty).as_py():
+            return None
+        filled = pc.if_else(empty, pa.scalar(mode, array.type), array)
+    else:
+        if not array.null_count:
+            return None
+        try:
+            value = pa.scalar(mode, pa.string()).cast(array.type)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            return None
+        filled = pc.fill_null(array, value)
+    if pa.types.is_dictionary(original):
+        filled = filled.dictionary_encode().cast(original)
+    return filled
@@ -0,0 +1,116 @@
+"""
+Modelo de risco de desfecho (EVOLUCAO) para a pontuação online
+Empacota o estimador treinado com o vocabulário de atributos usado no treino, de modo que a
+pontuação aplica exatamente a mesma transformação, e o carrega uma vez por processo
+"""
+import os
+import pickle
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+
+from src.ml.features import FeatureBuilder
+from src.ml.imputer import ModeImputer
+from src.schema.registry import records_batch
+
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'modelo.pkl')
+
+# Classe cujo risco é pontuado: 2 = óbito pelo agravo
+RISK_CLASS = 2
+
+
+class OutcomeModel:
+    """Estimador do scikit-learn, vocabulário de atributos e (opcionalmente) modas de imputação gravados juntos"""
+
+    def __init__(self, builder: FeatureBuilder, estimator: Any, metadata: Optional[Dict[str, Any]] = None,
+                 imputer: Optional[ModeImputer] = None):
+        self.builder = builder
+        self.estimator = estimator
+        self.metadata = metadata or {}
+        self.imputer = imputer
+
+    @property
+    def name(self) -> str:
+        return self.metadata.get('model', type(self.estimator).__name__)
+
+    def records_batch(self, records: Sequence[Dict[str, Any]]) -> pa.RecordBatch:
+        """Lote Arrow com as colunas do vocabulário a partir de notificações planas (chaves em minúsculo ou no SINAN)"""
+        return records_batch(records, self.builder.columns)
+
+    def risk(self, batch: pa.RecordBatch) -> np.ndarray:
+        """
+        Risco de óbito (0 a 1) de cada linha do lote
+
+        Para estimadores sem predict_proba (SGDClassifier com hinge), a margem da decisão
+        passa pela logística: a ordem dos riscos é preservada, mas não é uma probabilidade calibrada.
+        Com imputação empacotada, os vazios recebem as mesmas modas aplicadas à matriz de treino.
+        """
+        # Modelos gravados antes da imputação não têm o atributo
+        imputer = getattr(self, 'imputer', None)
+        if imputer is not None:
+            batch = imputer.transform(batch)
+        X = self.builder.transform(batch)
+        classes = list(self.estimator.classes_)
+        if hasattr(self.estimator, 'predict_proba'):
+            # Estimadores treinados sobre a matriz densa (GaussianNB) recebem o lote densificado
+            proba = self.estimator.predict_proba(X.toarray() if self.metadata.get('dense') else X)
+            return proba[:, classes.index(RISK_CLASS)] if RISK_CLASS in classes else np.zeros(batch.num_rows)
+        margin = np.asarray(self.estimator.decision_function(X), dtype=np.float64)
+        if classes[-1] != RISK_CLASS:
+            margin = -margin
+        return 1.0 / (1.0 + np.exp(-margin))
+
+    def score(self, records: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Pontua notificações em uma única chamada vetorizada ao estimador"""
+        if not records:
+            return []
+        risks = self.risk(self.records_batch(records))
+        return [
+            {
+                'risco_obito': round(float(risk), 4),
+                'evolucao_prevista': str(RISK_CLASS) if risk >= 0.5 else '1',
+                'modelo': self.name,
+            }
+            for risk in risks
+        ]
+
+    def save(self, path: str = DEFAULT_MODEL_PATH) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH) -> 'OutcomeModel':
+        """Carrega um modelo gravado por save (pickle: só arquivos gerados por python -m src.ml export)"""
+        with open(path, 'rb') as f:
+            model = pickle.load(f)
+        if not isinstance(model, cls):
+            raise ValueError(f"Arquivo de modelo inválido: {path}")
+        return model
+
+
+_models: Dict[str, OutcomeModel] = {}
+_models_lock = threading.Lock()
+
+
+def get_model(path: str = DEFAULT_MODEL_PATH) -> OutcomeModel:
+    """
+    Retorna o modelo do arquivo, carregado uma vez por processo
+
+    Raises:
+        FileNotFoundError: Se o modelo ainda não foi exportado
+    """
+    model = _models.get(path)
+    if model is None:
+        with _models_lock:
+            model = _models.get(path)
+            if model is None:
+                if not os.path.exists(path):
+                    raise FileNotFoundError(f"Modelo não encontrado em {path} (python -m src.ml export)")
+                model = _models[path] = OutcomeModel.load(path)
+    return model
@@ -0,0 +1,472 @@
+"""
+Seleção de modelos do desfecho em paralelo
+Executa as combinações modelo × hiperparâmetros × balanceamento em um pool de processos que leem
+a matriz de atributos por memory map, com as partições da validação cruzada gravadas uma única vez
+e retomada das combinações já concluídas
+"""
+import csv
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+
+_DATABASE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database')
+DEFAULT_MATRIX_PATH = os.path.join(_DATABASE_DIR, 'matriz')
+DEFAULT_SWEEP_PATH = os.path.join(_DATABASE_DIR, 'treino')
+
+# Modelos do notebook; n_jobs fica em 1 porque o paralelismo é entre combinações
+MODELS: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    'NaiveBayes': ('sklearn.naive_bayes.GaussianNB', {}),
+    'RandomForest': ('sklearn.ensemble.RandomForestClassifier', {'n_jobs': 1, 'random_state': 42}),
+    'LinearSVM_SGD': ('sklearn.linear_model.SGDClassifier', {'loss': 'hinge', 'random_state': 42}),
+}
+
+# O GaussianNB não aceita matriz esparsa: a partição é densificada no processo que a usa
+DENSE_MODELS = {'NaiveBayes'}
+
+# Grades do GridSearchCV do notebook (sem o prefixo model__ do Pipeline)
+PARAM_GRIDS: Dict[str, Dict[str, List[Any]]] = {
+    'NaiveBayes': {
+        'var_smoothing': [1e-9, 1e-8, 1e-7],
+    },
+    'RandomForest': {
+        'n_estimators': [50, 100, 200],
+        'max_depth': [5, 10, None],
+        'min_samples_leaf': [1, 5, 10],
+    },
+    'LinearSVM_SGD': {
+        'alpha': [1e-3, 1e-4, 1e-5],
+        'penalty': ['l2', 'elasticnet'],
+        'max_iter': [1000, 2000],
+        'tol': [1e-3],
+    },
+}
+
+RESAMPLERS = ('nenhum', 'ros', 'tomek')
+
+METRICS = ('accuracy', 'precision_macro', 'recall_macro', 'f1_macro')
+
+# Partição de avaliação final: treino inteiro (balanceado) contra o conjunto de teste
+HOLDOUT = 'teste'
+
+_MATRIX_ARRAYS = ('data', 'indices', 'indptr')
+
+
+def save_matrix(directory: str, X: sp.csr_matrix, y: np.ndarray) -> None:
+    """
+    Grava a matriz CSR e as classes como arquivos .npy, lidos depois por memory map
+
+    Índices e ponteiros usam o mesmo tipo inteiro (int32 quando cabe), para que o scipy monte a
+    matriz sobre os arrays mapeados sem convertê-los.
+    """
+    os.makedirs(directory, exist_ok=True)
+    index_dtype = np.int32 if max(X.nnz, X.shape[1]) < np.iinfo(np.int32).max else np.int64
+    np.save(os.path.join(directory, 'data.npy'), X.data.astype(np.float32, copy=False))
+    np.save(os.path.join(directory, 'indices.npy'), X.indices.astype(index_dtype, copy=False))
+    np.save(os.path.join(directory, 'indptr.npy'), X.indptr.astype(index_dtype, copy=False))
+    np.save(os.path.join(directory, 'y.npy'), np.asarray(y))
+    with open(os.path.join(directory, 'matriz.json'), 'w', encoding='utf-8') as f:
+        json.dump({'shape': list(X.shape), 'nnz': int(X.nnz)}, f)
+
+
+def load_matrix(directory: str, mmap_mode: Optional[str] = 'r') -> Tuple[sp.csr_matrix, np.ndarray]:
+    """Abre a matriz gravada por save_matrix; com mmap_mode, os arrays são páginas do arquivo, não cópias"""
+    with open(os.path.join(directory, 'matriz.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    arrays = [np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode) for name in _MATRIX_ARRAYS]
+    X = sp.csr_matrix(tuple(arrays), shape=tuple(meta['shape']), copy=False)
+    return X, np.load(os.path.join(directory, 'y.npy'), mmap_mode=mmap_mode)
+
+
+def matrix_digest(directory: str) -> str:
+    """
+    Hash do conteúdo da matriz gravada por save_matrix (forma e arrays CSR, sem as classes)
+
+    Os arrays são lidos por memory map e passados ao hash sem cópia.
+    """
+    digest = hashlib.sha256()
+    with open(os.path.join(directory, 'matriz.json'), 'rb') as f:
+        digest.update(f.read())
+    for name in _MATRIX_ARRAYS:
+        array = np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+        digest.update(str(array.dtype).encode('ascii'))
+        digest.update(array)
+    return digest.hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class Combination:
+    """Uma combinação da varredura: modelo, hiperparâmetros e balanceamento do treino"""
+    model: str
+    params: Tuple[Tuple[str, Any], ...]
+    resampler: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.model}|{json.dumps(dict(self.params), sort_keys=True)}|{self.resampler}"
+
+
+def expand_grid(models: Optional[Sequence[str]] = None, resamplers: Sequence[str] = RESAMPLERS,
+                grids: Optional[Dict[str, Dict[str, List[Any]]]] = None) -> List[Combination]:
+    """Todas as combinações modelo × hiperparâmetros × balanceamento"""
+    grids = grids or PARAM_GRIDS
+    combinations = []
+    for model in models or list(MODELS):
+        if model not in MODELS:
+            raise ValueError(f"Modelo desconhecido: '{model}'")
+        grid = grids.get(model, {})
+        names = sorted(grid)
+        for values in itertools.product(*(grid[name] for name in names)):
+            for resampler in resamplers:
+                if resampler not in RESAMPLERS:
+                    raise ValueError(f"Balanceamento desconhecido: '{resampler}'")
+                combinations.append(Combination(model, tuple(zip(names, values)), resampler))
+    return combinations
+
+
+def build_estimator(model: str, params: Dict[str, Any]):
+    import importlib
+
+    path, defaults = MODELS[model]
+    module, name = path.rsplit('.', 1)
+    return getattr(importlib.import_module(module), name)(**{**defaults, **params})
+
+
+def random_over_sample(y: np.ndarray, rows: np.ndarray, seed: int = 42) -> np.ndarray:
+    """
+    Equivalente ao RandomOverSampler: sorteia, com reposição, linhas das classes minoritárias
+    até igualarem a majoritária. Devolve índices de linha, não uma cópia das linhas.
+    """
+    rng = np.random.default_rng(seed)
+    labels = y[rows]
+    classes, counts = np.unique(labels, return_counts=True)
+    extra = [rng.choice(rows[labels == label], counts.max() - count, replace=True)
+             for label, count in zip(classes, counts) if count < counts.max()]
+    return np.sort(np.concatenate([rows] + extra))
+
+
+def tomek_links(X: sp.csr_matrix, y: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """
+    Equivalente ao TomekLinks(sampling_strategy='auto'): remove as linhas da classe majoritária
+    que formam com o vizinho mais próximo (mútuo) um par de classes diferentes
+    """
+    from sklearn.neighbors import NearestNeighbors
+
+    labels = np.asarray(y[rows])
+    points = X[rows]
+    neighbors = NearestNeighbors(n_neighbors=2).fit(points).kneighbors(points, return_distance=False)[:, 1]
+    positions = np.arange(len(rows))
+    linked = (labels != labels[neighbors]) & (neighbors[neighbors] == positions)
+    classes, counts = np.unique(labels, return_counts=True)
+    majority = classes[np.argmax(counts)]
+    return rows[~(linked & (labels == majority))]
+
+
+def resample(name: str, X: sp.csr_matrix, y: np.ndarray, rows: np.ndarray, seed: int = 42) -> np.ndarray:
+    """Linhas de treino após o balanceamento (índices na matriz compartilhada)"""
+    if name == 'nenhum':
+        return rows
+    if name == 'ros':
+        return random_over_sample(y, rows, seed)
+    if name == 'tomek':
+        return tomek_links(X, y, rows)
+    raise ValueError(f"Balanceamento desconhecido: '{name}'")
+
+
+def fit_model(matrix_dir: str, model: str, params: Dict[str, Any], resampler: str = 'nenhum', seed: int = 42):
+    """Treina a combinação escolhida com todas as linhas da matriz (balanceadas), para exportação"""
+    X, y = load_matrix(matrix_dir)
+    rows = resample(resampler, X, y, np.arange(X.shape[0]), seed)
+    X_train = X[rows].toarray() if model in DENSE_MODELS else X[rows]
+    estimator = build_estimator(model, params)
+    estimator.fit(X_train, y[rows])
+    return estimator
+
+
+def best_combination(output_dir: str) -> Dict[str, Any]:
+    """Melhor linha de resultados.csv (maior cv_f1_macro)"""
+    path = os.path.join(output_dir, 'resultados.csv')
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Resultados não encontrados em {path} (python -m src.ml train)")
+    with open(path, encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        raise ValueError(f"Nenhuma combinação concluída em {path}")
+    best = rows[0]
+    return {'model': best['modelo'], 'params': json.loads(best['params']), 'resampler': best['balanceamento'],
+            'cv_f1_macro': float(best['cv_f1_macro'] or 0)}
+
+
+def score(y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, float]:
+    """Métricas do notebook (macro, zero_division=0), arredondadas em 4 casas"""
+    from sklearn.metrics import accuracy_score, precision_recall_fscore_support
+
+    precision, recall, f1, _ = precision_recall_fscore_support(y_true, y_pred, average='macro', zero_division=0)
+    return {
+        'accuracy': round(float(accuracy_score(y_true, y_pred)), 4),
+        'precision_macro': round(float(precision), 4),
+        'recall_macro': round(float(recall), 4),
+        'f1_macro': round(float(f1), 4),
+    }
+
+
+class FoldCache:
+    """
+    Partições da validação cruzada gravadas em disco
+
+    O teste (test_size, estratificado) é separado uma vez; o restante é dividido em n_splits
+    partições estratificadas. As linhas de treino já balanceadas de cada partição também ficam
+    gravadas, então a varredura e as retomadas não repetem o sorteio nem o TomekLinks.
+    """
+
+    def __init__(self, directory: str, n_splits: int = 5, test_size: float = 0.30, seed: int = 42):
+        self.directory = directory
+        self.n_splits = n_splits
+        self.test_size = test_size
+        self.seed = seed
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        return {'n_splits': self.n_splits, 'test_size': self.test_size, 'seed': self.seed}
+
+    @property
+    def splits(self) -> List[str]:
+        return [f'fold-{k}' for k in range(self.n_splits)] + [HOLDOUT]
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f'{name}.npy')
+
+    def save(self, name: str, rows: np.ndarray) -> None:
+        # Gravação atômica: um processo interrompido não deixa partição pela metade
+        temporary = self._path(name) + '.tmp.npy'
+        np.save(temporary, rows)
+        os.replace(temporary, self._path(name))
+
+    def load(self, name: str) -> np.ndarray:
+        return np.load(self._path(name), mmap_mode='r')
+
+    def prepare(self, y: np.ndarray, matrix: Optional[str] = None) -> bool:
+        """
+        Grava as partições, a menos que já existam com os mesmos parâmetros, o mesmo y e a mesma matriz
+
+        O y entra pelo hash do conteúdo e a matriz pelo matrix_digest: outra versão da matriz
+        (outro vocabulário, perfil ou imputação), mesmo com as mesmas classes, também refaz as
+        partições, porque as linhas balanceadas pelo TomekLinks dependem dos atributos.
+
+        Returns:
+            True quando as partições foram (re)criadas
+        """
+        from sklearn.model_selection import StratifiedKFold, train_test_split
+
+        manifest = os.path.join(self.directory, 'particoes.json')
+        y = np.asarray(y)
+        settings = {**self.settings, 'rows': int(len(y)), 'y': hashlib.sha256(y.tobytes()).hexdigest()[:16],
+                    'matriz': matrix}
+        if os.path.exists(manifest):
+            with open(manifest, encoding='utf-8') as f:
+                if json.load(f) == settings:
+                    return False
+
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(self.directory):
+            if name.endswith('.npy'):
+                os.remove(os.path.join(self.directory, name))
+
+        rows = np.arange(len(y))
+        train, test = train_test_split(rows, test_size=self.test_size, random_state=self.seed, stratify=y)
+        train, test = np.sort(train), np.sort(test)
+        self.save(f'{HOLDOUT}-train', train)
+        self.save(f'{HOLDOUT}-valid', test)
+        folds = StratifiedKFold(n_splits=self.n_splits, shuffle=True, random_state=self.seed)
+        for k, (fit, valid) in enumerate(folds.split(train, y[train])):
+            self.save(f'fold-{k}-train', train[fit])
+            self.save(f'fold-{k}-valid', train[valid])
+        with open(manifest, 'w', encoding='utf-8') as f:
+            json.dump(settings, f)
+        return True
+
+    def resampled(self, resampler: str, split: str) -> str:
+        """Nome das linhas de treino de uma partição após o balanceamento"""
+        return f'{split}-train' if resampler == 'nenhum' else f'{split}-{resampler}'
+
+    def has(self, name: str) -> bool:
+        return os.path.exists(self._path(name))
+
+
+@dataclass
+class TaskResult:
+    """Métricas de uma combinação em uma partição"""
+    key: str
+    model: str
+    params: Dict[str, Any]
+    resampler: str
+    split: str
+    train_rows: int
+    fit_seconds: float
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# Estado de cada processo do pool: a matriz mapeada e as partições, abertas uma vez
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(matrix_dir: str, folds: FoldCache) -> None:
+    _worker['X'], _worker['y'] = load_matrix(matrix_dir)
+    _worker['folds'] = folds
+
+
+def _resample_task(job: Tuple[str, str]) -> str:
+    resampler, split = job
+    folds: FoldCache = _worker['folds']
+    rows = np.asarray(folds.load(f'{split}-train'))
+    folds.save(folds.resampled(resampler, split), resample(resampler, _worker['X'], _worker['y'], rows, folds.seed))
+    return folds.resampled(resampler, split)
+
+
+def _fit_task(job: Tuple[Combination, str]) -> TaskResult:
+    combination, split = job
+    X, y, folds = _worker['X'], _worker['y'], _worker['folds']
+    train = np.asarray(folds.load(folds.resampled(combination.resampler, split)))
+    valid = np.asarray(folds.load(f'{split}-valid'))
+
+    X_train, X_valid = X[train], X[valid]
+    if combination.model in DENSE_MODELS:
+        X_train, X_valid = X_train.toarray(), X_valid.toarray()
+
+    estimator = build_estimator(combination.model, dict(combination.params))
+    started = time.perf_counter()
+    estimator.fit(X_train, y[train])
+    fit_seconds = time.perf_counter() - started
+    return TaskResult(
+        key=combination.key,
+        model=combination.model,
+        params=dict(combination.params),
+        resampler=combination.resampler,
+        split=split,
+        train_rows=len(train),
+        fit_seconds=round(fit_seconds, 3),
+        metrics=score(y[valid], estimator.predict(X_valid)),
+    )
+
+
+def read_results(path: str) -> List[Dict[str, Any]]:
+    """Resultados já gravados (uma linha JSON por combinação e partição); linhas truncadas são ignoradas"""
+    if not os.path.exists(path):
+        return []
+    results = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                results.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return results
+
+
+def _ends_truncated(path: str) -> bool:
+    """Se a última linha ficou sem quebra de linha (execução interrompida durante a gravação)"""
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) != b'\n'
+
+
+def summarize(results: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Tabela comparativa: média das partições da validação cruzada (cv_*) e avaliação no teste
+    (test_*) de cada combinação, ordenada por cv_f1_macro como o refit do notebook
+    """
+    grouped: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        row = grouped.setdefault(result['key'], {
+            'modelo': result['model'], 'balanceamento': result['resampler'],
+            'params': json.dumps(result['params'], sort_keys=True), 'folds': [], 'teste': None,
+        })
+        if result['split'] == HOLDOUT:
+            row['teste'] = result['metrics']
+        else:
+            row['folds'].append(result['metrics'])
+
+    table = []
+    for row in grouped.values():
+        line = {'modelo': row['modelo'], 'balanceamento': row['balanceamento'], 'params': row['params']}
+        for metric in METRICS:
+            values = [fold[metric] for fold in row['folds']]
+            line[f'cv_{metric}'] = round(float(np.mean(values)), 4) if values else None
+        for metric in METRICS:
+            line[f'test_{metric}'] = row['teste'][metric] if row['teste'] else None
+        table.append(line)
+    return sorted(table, key=lambda line: -(line['cv_f1_macro'] or 0))
+
+
+def write_table(path: str, table: List[Dict[str, Any]]) -> None:
+    columns = ['modelo', 'balanceamento', 'params'] + [f'cv_{m}' for m in METRICS] + [f'test_{m}' for m in METRICS]
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(table)
+
+
+def run_sweep(matrix_dir: str, output_dir: str, combinations: Sequence[Combination],
+              workers: Optional[int] = None, n_splits: int = 5, test_size: float = 0.30,
+              seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Executa a varredura e grava resultados.jsonl (por partição) e resultados.csv (tabela)
+
+    Cada combinação roda nas n_splits partições da validação cruzada e no teste. As partições
+    concluídas são gravadas à medida que terminam; numa nova execução com o mesmo output_dir,
+    as que já estão em resultados.jsonl são puladas. Se as partições mudarem (outro n_splits,
+    test_size, seed, classes ou atributos da matriz), os resultados anteriores são descartados.
+
+    Args:
+        matrix_dir: Diretório gravado por save_matrix (python -m src.ml matrix --save)
+        output_dir: Diretório das partições e dos resultados
+        combinations: Combinações a executar (expand_grid)
+        workers: Processos em paralelo (padrão: número de CPUs)
+        n_splits: Partições da validação cruzada
+        test_size: Fração separada para o teste
+        seed: Semente das partições e do balanceamento
+
+    Returns:
+        Tabela comparativa (summarize) de todas as combinações concluídas
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    folds = FoldCache(os.path.join(output_dir, 'particoes'), n_splits=n_splits, test_size=test_size, seed=seed)
+    results_path = os.path.join(output_dir, 'resultados.jsonl')
+    if folds.prepare(load_matrix(matrix_dir)[1], matrix_digest(matrix_dir)) and os.path.exists(results_path):
+        # Resultados de outras partições não são comparáveis com os novos
+        os.remove(results_path)
+
+    done = {(result['key'], result['split']) for result in read_results(results_path)}
+    tasks = [(combination, split) for combination in combinations for split in folds.splits
+             if (combination.key, split) not in done]
+    resamples = sorted({(combination.resampler, split) for combination, split in tasks
+                        if not folds.has(folds.resampled(combination.resampler, split))})
+
+    if tasks:
+        workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(matrix_dir, folds)) as executor:
+            list(executor.map(_resample_task, resamples))
+            futures = [executor.submit(_fit_task, task) for task in tasks]
+            with open(results_path, 'a+', encoding='utf-8') as f:
+                if f.tell() and _ends_truncated(results_path):
+                    f.write('\n')
+                # Cada partição é gravada assim que termina, para que uma interrupção perca só as em andamento
+                for future in as_completed(futures):
+                    f.write(json.dumps(future.result().to_dict()) + '\n')
+                    f.flush()
+
+    table = summarize(read_results(results_path))
+    write_table(os.path.join(output_dir, 'resultados.csv'), table)
+    return table
@@ -0,0 +1,101 @@
+from src.models.user import db
+from src.serialization.encoders import get_encoder
+
+
+class DengueNotification(db.Model):
+    """Notificação de dengue armazenada de forma plana (uma coluna por campo do CasoDengue)"""
+    __tablename__ = 'dengue_notifications'
+    __table_args__ = (
+        # Listagens por período/local e agregações por desfecho
+        db.Index('ix_dengue_notifications_local', 'dt_notific', 'sg_uf_not', 'id_municip'),
+        db.Index('ix_dengue_notifications_desfecho', 'classi_fin', 'evolucao'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    # Identificação da notificação
+    tp_not = db.Column(db.String(1), nullable=False)
+    id_agravo = db.Column(db.String(4), nullable=False)
+    dt_notific = db.Column(db.Date, nullable=False)
+    sem_not = db.Column(db.String(6), nullable=False)
+    nu_ano = db.Column(db.String(4), nullable=False)
+    sg_uf_not = db.Column(db.String(2), nullable=False)
+    id_municip = db.Column(db.String(6), nullable=False)
+    id_regiona = db.Column(db.String(8))
+    id_unidade = db.Column(db.String(8))
+
+    # Paciente
+    dt_sin_pri = db.Column(db.Date)
+    sem_pri = db.Column(db.String(6))
+    ano_nasc = db.Column(db.String(4))
+    nu_idade_n = db.Column(db.SmallInteger)
+    cs_sexo = db.Column(db.String(1))
+    cs_gestant = db.Column(db.String(1))
+    cs_raca = db.Column(db.String(1))
+    cs_escol_n = db.Column(db.String(2))
+
+    # Residência
+    sg_uf = db.Column(db.String(2), nullable=False)
+    id_mn_resi = db.Column(db.String(6), nullable=False)
+    id_rg_resi = db.Column(db.String(8))
+    id_pais = db.Column(db.String(3))
+    dt_invest = db.Column(db.Date)
+    id_ocupa_n = db.Column(db.String(6))
+
+    # Sinais e sintomas
+    febre = db.Column(db.SmallInteger)
+    mialgia = db.Column(db.SmallInteger)
+    cefaleia = db.Column(db.SmallInteger)
+    exantema = db.Column(db.SmallInteger)
+    vomito = db.Column(db.SmallInteger)
+    nausea = db.Column(db.SmallInteger)
+    dor_costas = db.Column(db.SmallInteger)
+    conjuntvit = db.Column(db.SmallInteger)
+    artrite = db.Column(db.SmallInteger)
+    artralgia = db.Column(db.SmallInteger)
+    petequia_n = db.Column(db.SmallInteger)
+    leucopenia = db.Column(db.SmallInteger)
+    laco = db.Column(db.SmallInteger)
+    dor_retro = db.Column(db.SmallInteger)
+
+    # Comorbidades
+    diabetes = db.Column(db.SmallInteger)
+    hematolog = db.Column(db.SmallInteger)
+    hepatopat = db.Column(db.SmallInteger)
+    renal = db.Column(db.SmallInteger)
+    hipertensa = db.Column(db.SmallInteger)
+    acido_pept = db.Column(db.SmallInteger)
+    auto_imune = db.Column(db.SmallInteger)
+
+    # Exames
+    dt_coleta = db.Column(db.Date)
+    resul_soro = db.Column(db.String(1))
+    dt_ns1 = db.Column(db.Date)
+    resul_ns1 = db.Column(db.String(1))
+    dt_viral = db.Column(db.Date)
+    resul_vi_n = db.Column(db.String(1))
+    dt_pcr = db.Column(db.Date)
+    resul_pcr = db.Column(db.String(1))
+    sorotipo = db.Column(db.String(1))
+    histopa_n = db.Column(db.String(1))
+    imunoh_n = db.Column(db.String(1))
+
+    # Hospitalização
+    hospitaliz = db.Column(db.String(1))
+    dt_interna = db.Column(db.Date)
+    coufinf = db.Column(db.String(2))
+    municipio = db.Column(db.String(6))
+    tpautocto = db.Column(db.String(1))
+
+    # Encerramento
+    classi_fin = db.Column(db.String(2))
+    criterio = db.Column(db.String(1))
+    dt_encerra = db.Column(db.Date)
+    evolucao = db.Column(db.String(1))
+    dt_obito = db.Column(db.Date)
+
+    def __repr__(self):
+        return f'<DengueNotification {self.id}>'
+
+    def to_dict(self):
+        return get_encoder(DengueNotification).to_dict(self)
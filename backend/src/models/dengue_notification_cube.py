@@ -0,0 +1,36 @@
+from src.models.user import db
+
+
+class DengueNotificationCube(db.Model):
+    """Contagem pré-agregada de notificações por semana, município, classificação e evolução"""
+    __tablename__ = 'dengue_notification_cube'
+    __table_args__ = (
+        db.Index('ix_dengue_notification_cube_municipio', 'id_municip', 'sem_not'),
+    )
+
+    # Dimensões do cubo; valores ausentes (classificação/evolução em aberto) são guardados como ''
+    sem_not = db.Column(db.String(6), primary_key=True)
+    id_municip = db.Column(db.String(6), primary_key=True)
+    classi_fin = db.Column(db.String(2), primary_key=True, default='')
+    evolucao = db.Column(db.String(1), primary_key=True, default='')
+
+    total = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<DengueNotificationCube {self.sem_not} {self.id_municip} {self.classi_fin} {self.evolucao}>'
+
+
+class DengueNotificationCubeRevision(db.Model):
+    """
+    Revisão do cubo, compartilhada entre processos
+
+    A linha de sem_not '' é o contador, incrementado na transação de toda escrita de notificação;
+    as demais guardam a revisão da última escrita que alterou cada semana.
+    """
+    __tablename__ = 'dengue_notification_cube_revision'
+
+    sem_not = db.Column(db.String(6), primary_key=True)
+    revision = db.Column(db.Integer, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<DengueNotificationCubeRevision {self.sem_not or "*"} {self.revision}>'
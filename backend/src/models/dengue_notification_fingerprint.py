@@ -0,0 +1,20 @@
+from src.models.user import db
+
+
+class DengueNotificationFingerprint(db.Model):
+    """
+    Impressão digital (src/quality/dedup.py) das notificações gravadas com o índice de duplicadas ativo
+
+    A impressão é a chave primária: ela entra na transação da notificação, então duas escritas
+    concorrentes da mesma notificação não passam as duas. Remover ou alterar a notificação remove ou
+    troca a impressão. Duplicadas inseridas com 'flag' não têm impressão.
+    """
+    __tablename__ = 'dengue_notification_fingerprints'
+
+    # uint64 do fingerprint() reinterpretado como inteiro com sinal (BIGINT)
+    fingerprint = db.Column(db.BigInteger, primary_key=True, autoincrement=False)
+    notification_id = db.Column(db.Integer, db.ForeignKey('dengue_notifications.id', ondelete='CASCADE'),
+                                nullable=False, unique=True)
+
+    def __repr__(self):
+        return f'<DengueNotificationFingerprint {self.notification_id} {self.fingerprint}>'
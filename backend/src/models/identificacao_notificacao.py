@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 from datetime import date
 
@@ -14,4 +14,12 @@ class IdentificacaoNotificacao(BaseModel):
     sg_uf_not: str
     id_municip: str
     id_regiona: Optional[str]
-    id_unidade: Optional[str]
\ No newline at end of file
+    id_unidade: Optional[str]
+
+    @field_validator('id_municip')
+    @classmethod
+    def validar_municipio(cls, value):
+        """Valida o código SINAN do município no índice compilado, sem acesso ao banco"""
+        # Importado no primeiro uso: o índice (NumPy) fica fora da inicialização da aplicação
+        from src.geo.municipios import validate_municipio
+        return validate_municipio(value)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 from datetime import date
 
@@ -9,4 +9,12 @@ class Residencia(BaseModel):
     id_rg_resi: Optional[str]
     id_pais: Optional[str]
     dt_invest: Optional[date]
-    id_ocupa_n: Optional[str]
\ No newline at end of file
+    id_ocupa_n: Optional[str]
+
+    @field_validator('id_mn_resi')
+    @classmethod
+    def validar_municipio(cls, value):
+        """Valida o código SINAN do município no índice compilado, sem acesso ao banco"""
+        # Importado no primeiro uso: o índice (NumPy) fica fora da inicialização da aplicação
+        from src.geo.municipios import validate_municipio
+        return validate_municipio(value)
@@ -16,3 +16,18 @@ class User(db.Model):
             'username': self.username,
             'email': self.email
         }
+
+
+class UserRevision(db.Model):
+    """
+    Revisão dos usuários, compartilhada entre processos
+
+    Uma única linha, incrementada na transação de toda escrita de usuário.
+    """
+    __tablename__ = 'user_revision'
+
+    id = db.Column(db.Integer, primary_key=True)
+    revision = db.Column(db.Integer, nullable=False)
+
+    def __repr__(self):
+        return f'<UserRevision {self.revision}>'
@@ -0,0 +1,130 @@
+"""
+Interface de linha de comando do perfil de qualidade
+
+Uso:
+    python -m src.quality profile [--root src/database/casos] [--year 2023 2024] [--workers 2] [--output src/database/perfil.json]
+    python -m src.quality profile data/parquet/DENGBR23.parquet data/parquet/DENGBR24.parquet
+    python -m src.quality show [--profile src/database/perfil.json] [--merge outro_perfil.json]
+    python -m src.quality dedup [--root src/database/casos] [--year 2023 2024] [--index src/database/duplicadas]
+    python -m src.quality weeks [--root src/database/casos] [--year 2023 2024]
+"""
+import argparse
+import sys
+import time
+from typing import Dict, List
+
+import pyarrow.parquet as pq
+
+from src.epi.weeks import WEEK_FIELDS, check_weeks
+from src.quality.dedup import DEFAULT_INDEX_PATH, FINGERPRINT_FIELDS, fingerprint, get_index
+from src.quality.profiler import DEFAULT_PROFILE_PATH, DROP_THRESHOLD, Profile, profile_files
+from src.store.case_store import DEFAULT_STORE_PATH, CaseStore
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m src.quality',
+                                     description='Perfil de qualidade dos dados do SINAN em uma passada')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    profile = subparsers.add_parser('profile', help='Gera o perfil das partições (ou de arquivos Parquet)')
+    profile.add_argument('sources', nargs='*', help='Arquivos Parquet (padrão: as partições do dataset)')
+    profile.add_argument('--root', default=DEFAULT_STORE_PATH, help='Diretório do dataset (padrão: %(default)s)')
+    profile.add_argument('--year', type=int, nargs='*', help='Anos lidos do dataset (padrão: todos)')
+    profile.add_argument('-w', '--workers', type=int, default=None,
+                         help='Processos em paralelo, um arquivo por vez (padrão: número de CPUs)')
+    profile.add_argument('--output', default=DEFAULT_PROFILE_PATH, help='Arquivo do perfil (padrão: %(default)s)')
+
+    show = subparsers.add_parser('show', help='Mostra um perfil gravado (opcionalmente combinado com outros)')
+    show.add_argument('--profile', default=DEFAULT_PROFILE_PATH, help='Arquivo do perfil (padrão: %(default)s)')
+    show.add_argument('--merge', nargs='*', default=[], help='Perfis combinados ao primeiro (ex.: outro ano)')
+    show.add_argument('--output', default=None, help='Grava o perfil combinado')
+
+    dedup = subparsers.add_parser('dedup', help='Indexa as notificações do dataset e conta as duplicadas')
+    dedup.add_argument('sources', nargs='*', help='Arquivos Parquet (padrão: as partições do dataset)')
+    dedup.add_argument('--root', default=DEFAULT_STORE_PATH, help='Diretório do dataset (padrão: %(default)s)')
+    dedup.add_argument('--year', type=int, nargs='*', help='Anos lidos do dataset (padrão: todos)')
+    dedup.add_argument('--index', default=DEFAULT_INDEX_PATH, help='Diretório do índice (padrão: %(default)s)')
+
+    weeks = subparsers.add_parser('weeks', help='Confere SEM_NOT/SEM_PRI com as semanas de DT_NOTIFIC/DT_SIN_PRI')
+    weeks.add_argument('sources', nargs='*', help='Arquivos Parquet (padrão: as partições do dataset)')
+    weeks.add_argument('--root', default=DEFAULT_STORE_PATH, help='Diretório do dataset (padrão: %(default)s)')
+    weeks.add_argument('--year', type=int, nargs='*', help='Anos lidos do dataset (padrão: todos)')
+
+    for command in (profile, show):
+        command.add_argument('--threshold', type=float, default=DROP_THRESHOLD,
+                             help='Proporção de vazios para descartar a coluna (padrão: %(default)s)')
+    return parser
+
+
+def _print(profile: Profile, threshold: float) -> None:
+    print(f"{'coluna':<14}{'tipo':<34}{'vazios':>9}{'nulos':>9}{'distintos':>11}{'fora':>9}  mais frequentes")
+    for line in profile.summary(k=3):
+        violations = '-' if line['violations'] is None else line['violations']
+        top = ', '.join(f'{value} ({count})' for value, count in line['top'])
+        print(f"{line['column']:<14}{line['type'][:33]:<34}{line['empty_rate']:>9.1%}{line['null_rate']:>9.1%}"
+              f"{line['distinct']:>11}{violations:>9}  {top}")
+    dropped = profile.columns_to_drop(threshold)
+    print(f"{profile.rows} linhas, {len(profile.columns)} colunas; "
+          f"{len(dropped)} com mais de {threshold:.0%} de vazios: {', '.join(dropped) or '-'}")
+
+
+def _weeks(sources: List[str], started: float) -> int:
+    columns = [column for pair in WEEK_FIELDS for column in pair]
+    totals: Dict[str, Dict] = {}
+    for source in sources:
+        names = set(pq.ParquetFile(source).schema_arrow.names)
+        for batch in pq.ParquetFile(source).iter_batches(columns=[column for column in columns if column in names]):
+            for field, counts in check_weeks(batch).items():
+                total = totals.setdefault(field, {'checked': 0, 'mismatched': 0, 'invalid': 0, 'samples': []})
+                for name in ('checked', 'mismatched', 'invalid'):
+                    total[name] += counts[name]
+                total['samples'].extend(counts['samples'][:5 - len(total['samples'])])
+
+    print(f"{'semana':<10}{'conferidas':>12}{'divergentes':>13}{'inexistentes':>14}  exemplos (data, informada, esperada)")
+    for field, total in totals.items():
+        share = total['mismatched'] / total['checked'] if total['checked'] else 0.0
+        samples = ', '.join(f'{date} {informed}→{expected}' for date, informed, expected in total['samples'])
+        print(f"{field:<10}{total['checked']:>12}{total['mismatched']:>13}{total['invalid']:>14}  "
+              f"{samples or '-'} ({share:.2%} divergentes)")
+    print(f"{len(sources)} arquivos em {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    started = time.perf_counter()
+
+    if args.command == 'show':
+        profile = Profile.load(args.profile)
+        for path in args.merge:
+            profile.merge(Profile.load(path))
+        if args.output:
+            profile.save(args.output)
+        _print(profile, args.threshold)
+        return 0
+
+    sources = args.sources or CaseStore(args.root).files(year=args.year)
+    if args.command == 'dedup':
+        index = get_index(args.index)
+        rows = duplicates = 0
+        for source in sources:
+            names = set(pq.ParquetFile(source).schema_arrow.names)
+            columns = [column for column in FINGERPRINT_FIELDS if column in names]
+            for batch in pq.ParquetFile(source).iter_batches(columns=columns):
+                rows += batch.num_rows
+                duplicates += int(index.check(fingerprint(batch)).sum())
+        print(f"{rows} linhas de {len(sources)} arquivos, {duplicates} duplicadas; "
+              f"{len(index)} notificações no índice {args.index} ({time.perf_counter() - started:.1f}s)")
+        return 0
+    if args.command == 'weeks':
+        return _weeks(sources, started)
+
+    profile = profile_files(sources, workers=args.workers)
+    profile.save(args.output)
+    _print(profile, args.threshold)
+    print(f"{len(sources)} arquivos em {time.perf_counter() - started:.1f}s; perfil gravado em {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+Índice de notificações duplicadas
+Impressão digital de 64 bits dos campos de identificação da notificação e do paciente, guardada em
+uma tabela hash em disco (memory map) com um filtro de Bloom na frente
+"""
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.quality.profiler import hash64
+from src.schema.registry import text_column
+
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'duplicadas')
+
+# Campos da IdentificacaoNotificacao e do Paciente que identificam a mesma notificação
+FINGERPRINT_FIELDS = ('ID_AGRAVO', 'DT_NOTIFIC', 'ID_MUNICIP', 'ID_UNIDADE', 'DT_SIN_PRI', 'ANO_NASC', 'CS_SEXO')
+_DATE_FIELDS = ('DT_NOTIFIC', 'DT_SIN_PRI')
+
+# 'reject' descarta (ou recusa) as duplicadas; 'flag' as mantém marcadas
+DUPLICATE_MODES = ('reject', 'flag')
+DUPLICATE_COLUMN = 'DUPLICADA'
+
+INITIAL_CAPACITY = 1 << 16
+# Ocupação máxima da tabela antes de dobrar (sondagem linear: ~1,5 sondagens por consulta a 50%)
+LOAD_FACTOR = 0.5
+# Bits do filtro de Bloom por posição da tabela (16 por chave na ocupação máxima) e funções de hash
+BLOOM_BITS_PER_SLOT = 8
+BLOOM_HASHES = 7
+
+_INDEX_VERSION = 1
+
+
+def fingerprint(batch: pa.RecordBatch) -> np.ndarray:
+    """
+    Impressão digital (uint64, nunca 0) de cada linha do lote
+
+    Os campos são normalizados antes do hash: texto sem espaços nas pontas e em maiúsculo, datas sem
+    os hífens (date32, '2024-01-05' e '20240105' coincidem) e o município com 6 dígitos (o
+    código do IBGE com o dígito verificador coincide com o do SINAN). Campo vazio ou ausente conta
+    como texto vazio.
+    """
+    parts = []
+    for field in FINGERPRINT_FIELDS:
+        text = text_column(batch, field)
+        if field in _DATE_FIELDS:
+            text = pc.replace_substring(text, pattern='-', replacement='')
+        elif field == 'ID_MUNICIP':
+            text = pc.utf8_slice_codeunits(text, 0, 6)
+        parts.append(pc.fill_null(pc.utf8_upper(text), ''))
+    keys = hash64(pc.binary_join_element_wise(*parts, '\x1f'))
+    # 0 marca posição livre na tabela
+    keys[keys == 0] = 1
+    return keys
+
+
+class DedupIndex:
+    """
+    Conjunto de impressões digitais em disco, compartilhado entre processos
+
+    A tabela (endereçamento aberto com sondagem linear) e o filtro de Bloom ficam em arquivos .npy
+    abertos por memory map; consultas e inserções são vetorizadas sobre o lote. A maioria das
+    notificações novas é descartada pelo filtro, que cabe em memória, sem tocar nas páginas da
+    tabela. As operações acontecem sob um lock de arquivo, de modo que workers do Gunicorn e
+    processos da ingestão podem usar o mesmo índice.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH, capacity: int = INITIAL_CAPACITY):
+        self.path = path
+        self._lock = threading.Lock()
+        self._generation: Optional[int] = None
+        os.makedirs(path, exist_ok=True)
+        with self._locked():
+            if not os.path.exists(self._file('meta.json')):
+                self._create(_power_of_two(capacity), np.zeros(0, dtype=np.uint64), generation=0)
+
+    def __len__(self) -> int:
+        with self._locked() as meta:
+            return meta['count']
+
+    @property
+    def capacity(self) -> int:
+        with self._locked() as meta:
+            return meta['capacity']
+
+    def check(self, keys: np.ndarray, add: bool = True) -> np.ndarray:
+        """
+        Marca as impressões já indexadas ou repetidas antes no mesmo lote
+
+        Args:
+            keys: Impressões digitais (fingerprint)
+            add: Acrescenta ao índice as impressões novas
+
+        Returns:
+            Máscara booleana das linhas duplicadas (a primeira ocorrência de uma impressão nova não é)
+        """
+        keys = np.asarray(keys, dtype=np.uint64)
+        duplicated = np.ones(len(keys), dtype=bool)
+        if not len(keys):
+            return duplicated
+        unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        duplicated[first] = False
+
+        with self._locked() as meta:
+            present = np.zeros(len(unique), dtype=bool)
+            maybe = self._bloom_test(unique)
+            if maybe.any():
+                present[maybe] = self._find(unique[maybe])
+            if add and not present.all():
+                self._add(meta, unique[~present])
+        return duplicated | present[inverse]
+
+    def add(self, keys: np.ndarray) -> int:
+        """Acrescenta impressões ao índice e retorna quantas eram novas"""
+        keys = np.asarray(keys, dtype=np.uint64)
+        return int(np.count_nonzero(~self.check(keys))) if len(keys) else 0
+
+    # Armazenamento
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    @contextmanager
+    def _locked(self) -> Iterator[Dict]:
+        """Lock da thread e do arquivo; reabre a tabela se outro processo a redimensionou"""
+        with self._lock, open(self._file('.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                meta = self._read_meta()
+                if meta is not None and meta['generation'] != self._generation:
+                    self._open(meta)
+                yield meta
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read_meta(self) -> Optional[Dict]:
+        try:
+            with open(self._file('meta.json'), encoding='utf-8') as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        if meta['version'] != _INDEX_VERSION:
+            raise ValueError(f"Versão do índice de duplicadas não suportada: {meta['version']}")
+        return meta
+
+    def _write_meta(self, meta: Dict) -> None:
+        temporary = self._file('meta.json.tmp')
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(temporary, self._file('meta.json'))
+
+    def _open(self, meta: Dict) -> None:
+        self._table = np.load(self._file('tabela.npy'), mmap_mode='r+')
+        self._bloom = np.load(self._file('bloom.npy'), mmap_mode='r+')
+        self._generation = meta['generation']
+
+    def _create(self, capacity: int, keys: np.ndarray, generation: int) -> Dict:
+        """Grava tabela e filtro novos com as chaves (arquivos temporários renomeados ao final)"""
+        table = np.lib.format.open_memmap(self._file('tabela.npy.tmp'), mode='w+', dtype=np.uint64,
+                                          shape=(capacity,))
+        bloom = np.lib.format.open_memmap(self._file('bloom.npy.tmp'), mode='w+', dtype=np.uint64,
+                                          shape=(capacity * BLOOM_BITS_PER_SLOT // 64,))
+        _insert(table, keys)
+        _bloom_set(bloom, keys)
+        table.flush()
+        bloom.flush()
+        del table, bloom
+        os.replace(self._file('tabela.npy.tmp'), self._file('tabela.npy'))
+        os.replace(self._file('bloom.npy.tmp'), self._file('bloom.npy'))
+        meta = {'version': _INDEX_VERSION, 'fields': list(FINGERPRINT_FIELDS), 'count': int(len(keys)),
+                'capacity': capacity, 'generation': generation}
+        self._write_meta(meta)
+        self._open(meta)
+        return meta
+
+    def _add(self, meta: Dict, keys: np.ndarray) -> None:
+        count = meta['count'] + len(keys)
+        if count > meta['capacity'] * LOAD_FACTOR:
+            # Dobra a tabela até caber; as chaves atuais são reinseridas de uma vez
+            capacity = _power_of_two(int(count / LOAD_FACTOR) + 1)
+            current = np.asarray(self._table[self._table != 0])
+            self._create(capacity, np.concatenate([current, keys]), meta['generation'] + 1)
+            return
+        _insert(self._table, keys)
+        _bloom_set(self._bloom, keys)
+        meta['count'] = count
+        self._write_meta(meta)
+
+    def _find(self, keys: np.ndarray) -> np.ndarray:
+        return _find(self._table, keys)
+
+    def _bloom_test(self, keys: np.ndarray) -> np.ndarray:
+        maybe = np.ones(len(keys), dtype=bool)
+        for positions in _bloom_positions(keys, len(self._bloom) * 64):
+            maybe &= (self._bloom[positions >> 6] >> (positions & 63)) & 1 == 1
+        return maybe
+
+
+def _power_of_two(value: int) -> int:
+    return max(INITIAL_CAPACITY, 1 << (max(value, 1) - 1).bit_length())
+
+
+def _find(table: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """Sondagem linear vetorizada: cada rodada avança uma posição para as chaves ainda não resolvidas"""
+    mask = np.uint64(len(table) - 1)
+    present = np.zeros(len(keys), dtype=bool)
+    slots = keys & mask
+    active = np.arange(len(keys))
+    while active.size:
+        values = table[slots[active]]
+        present[active[values == keys[active]]] = True
+        active = active[(values != keys[active]) & (values != 0)]
+        slots[active] = (slots[active] + np.uint64(1)) & mask
+    return present
+
+
+def _insert(table: np.ndarray, keys: np.ndarray) -> None:
+    """Insere chaves ausentes e distintas; quando duas disputam a mesma posição livre, a primeira fica"""
+    mask = np.uint64(len(table) - 1)
+    slots = keys & mask
+    while keys.size:
+        free = np.flatnonzero(table[slots] == 0)
+        _, first = np.unique(slots[free], return_index=True)
+        winners = free[first]
+        table[slots[winners]] = keys[winners]
+        waiting = np.ones(len(keys), dtype=bool)
+        waiting[winners] = False
+        keys = keys[waiting]
+        slots = (slots[waiting] + np.uint64(1)) & mask
+
+
+def _bloom_positions(keys: np.ndarray, bits: int) -> Iterator[np.ndarray]:
+    """Posições do filtro por hash duplo (metades alta e baixa da impressão)"""
+    mask = np.uint64(bits - 1)
+    high = keys >> np.uint64(32)
+    low = (keys & np.uint64(0xFFFFFFFF)) | np.uint64(1)
+    for i in range(BLOOM_HASHES):
+        yield (high + np.uint64(i) * low) & mask
+
+
+def _bloom_set(bloom: np.ndarray, keys: np.ndarray) -> None:
+    for positions in _bloom_positions(keys, len(bloom) * 64):
+        np.bitwise_or.at(bloom, positions >> np.uint64(6), np.uint64(1) << (positions & np.uint64(63)))
+
+
+_indexes: Dict[str, DedupIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(path: str = DEFAULT_INDEX_PATH) -> DedupIndex:
+    """Retorna o índice do diretório, aberto uma vez por processo (criado vazio se não existir)"""
+    index = _indexes.get(path)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(path)
+            if index is None:
+                index = _indexes[path] = DedupIndex(path)
+    return index
@@ -0,0 +1,440 @@
+"""
+Perfil de qualidade dos extratos do SINAN em uma única passada
+Lê lotes Arrow uma vez e acumula, por coluna, vazios e nulos, distintos aproximados (HyperLogLog),
+valores mais frequentes e códigos fora do dicionário de dados, em perfis que se combinam
+"""
+import base64
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+
+DEFAULT_PROFILE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'perfil.json')
+
+# Proporção de vazios (texto em branco ou nulo) acima da qual a coluna é descartada, como no notebook
+DROP_THRESHOLD = 0.5
+
+_PROFILE_VERSION = 1
+
+# Registradores do HyperLogLog: 2^12, erro padrão de ~1,6% nos distintos
+HLL_PRECISION = 12
+
+# Valores acompanhados por coluna (Misra-Gries); abaixo disso as contagens são exatas
+TOP_CAPACITY = 256
+TOP_K = 10
+
+# Amostra de códigos fora do domínio guardada por coluna
+VIOLATION_SAMPLES = 20
+
+_SIM_NAO = ('1', '2')
+_SIM_NAO_IGNORADO = ('1', '2', '9')
+_RESULTADO = ('1', '2', '3', '4')
+_UFS = ('11', '12', '13', '14', '15', '16', '17', '21', '22', '23', '24', '25', '26', '27', '28', '29',
+        '31', '32', '33', '35', '41', '42', '43', '50', '51', '52', '53')
+
+# Códigos válidos das colunas categóricas (dicionário de dados do SINAN dengue)
+CODE_DOMAINS: Dict[str, Tuple[str, ...]] = {
+    'TP_NOT': ('1', '2', '3', '4'),
+    'SG_UF_NOT': _UFS,
+    'SG_UF': _UFS,
+    'CS_SEXO': ('M', 'F', 'I'),
+    'CS_GESTANT': ('1', '2', '3', '4', '5', '6', '9'),
+    'CS_RACA': ('1', '2', '3', '4', '5', '9'),
+    'CS_ESCOL_N': ('0', '1', '2', '3', '4', '5', '6', '7', '8', '9', '10'),
+    **{column: _SIM_NAO for column in (
+        'FEBRE', 'MIALGIA', 'CEFALEIA', 'EXANTEMA', 'VOMITO', 'NAUSEA', 'DOR_COSTAS', 'CONJUNTVIT',
+        'ARTRITE', 'ARTRALGIA', 'PETEQUIA_N', 'LEUCOPENIA', 'LACO', 'DOR_RETRO',
+        'DIABETES', 'HEMATOLOG', 'HEPATOPAT', 'RENAL', 'HIPERTENSA', 'ACIDO_PEPT', 'AUTO_IMUNE',
+    )},
+    'RESUL_SORO': _RESULTADO,
+    'RESUL_NS1': _RESULTADO,
+    'RESUL_VI_N': _RESULTADO,
+    'RESUL_PCR_': _RESULTADO,
+    'HISTOPA_N': _RESULTADO,
+    'IMUNOH_N': _RESULTADO,
+    'SOROTIPO': ('1', '2', '3', '4'),
+    'HOSPITALIZ': _SIM_NAO_IGNORADO,
+    'TPAUTOCTO': _SIM_NAO_IGNORADO,
+    'CLASSI_FIN': ('5', '8', '10', '11', '12', '13'),
+    'CRITERIO': ('1', '2', '3'),
+    'EVOLUCAO': ('1', '2', '3', '4', '9'),
+}
+
+
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_SEED = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """Finalizador do splitmix64, aplicado elemento a elemento"""
+    x = x ^ (x >> np.uint64(30))
+    x = x * _MIX_1
+    x = x ^ (x >> np.uint64(27))
+    x = x * _MIX_2
+    return x ^ (x >> np.uint64(31))
+
+
+def as_text(array: pa.Array) -> pa.Array:
+    """Texto dos valores usado nas contagens e nos domínios, sem espaços nas pontas (1, 1.0 e ' 1' são '1')"""
+    if pa.types.is_dictionary(array.type):
+        array = array.cast(array.type.value_type)
+    if not pa.types.is_string(array.type):
+        array = pc.cast(array, pa.string())
+    return pc.utf8_trim_whitespace(array)
+
+
+def hash64(texts: pa.Array) -> np.ndarray:
+    """
+    Hash de 64 bits de cada texto (sem nulos), estável entre processos
+
+    Os bytes de cada texto são lidos em palavras de 8 bytes sobre os buffers Arrow e combinados
+    com o finalizador do splitmix64, coluna de palavras por coluna, sem laço por valor.
+    """
+    texts = texts.cast(pa.large_string()) if not pa.types.is_large_string(texts.type) else texts
+    count = len(texts)
+    if not count:
+        return np.zeros(0, dtype=np.uint64)
+    _, offsets_buffer, data_buffer = texts.buffers()
+    offsets = np.frombuffer(offsets_buffer, dtype=np.int64)[texts.offset:texts.offset + count + 1]
+    data = np.frombuffer(data_buffer, dtype=np.uint8) if data_buffer is not None else np.zeros(0, np.uint8)
+    lengths = np.diff(offsets)
+    width = max(8, int(-(-int(lengths.max()) // 8) * 8))
+    positions = offsets[:-1, None] + np.arange(width)
+    inside = np.arange(width) < lengths[:, None]
+    padded = np.zeros((count, width), dtype=np.uint8)
+    padded[inside] = data[positions[inside]]
+    words = padded.view(np.uint64)
+
+    hashes = _mix(lengths.astype(np.uint64) ^ _SEED)
+    for column in range(words.shape[1]):
+        hashes = _mix(hashes ^ words[:, column])
+    return hashes
+
+
+class HyperLogLog:
+    """Estimador de distintos com 2^precision registradores; combinar dois é o máximo dos registradores"""
+
+    def __init__(self, precision: int = HLL_PRECISION, registers: Optional[np.ndarray] = None):
+        self.precision = precision
+        self.registers = registers if registers is not None else np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        if not len(hashes):
+            return
+        p = np.uint64(self.precision)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        rest = hashes << p
+        # Zeros à esquerda do restante: os 53 bits altos cabem exatos em float64
+        high = (rest >> np.uint64(11)).astype(np.float64)
+        _, exponent = np.frexp(high)
+        rank = np.where(high > 0, 54 - exponent, 64 - self.precision + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, np.minimum(rank, 64 - self.precision + 1).astype(np.uint8))
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        if other.precision != self.precision:
+            raise ValueError("HyperLogLog com precisões diferentes")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        m = float(len(self.registers))
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Correção para poucos distintos (contagem linear)
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'precision': self.precision, 'registers': base64.b64encode(self.registers.tobytes()).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'HyperLogLog':
+        registers = np.frombuffer(base64.b64decode(data['registers']), dtype=np.uint8).copy()
+        return cls(data['precision'], registers)
+
+
+def _trim(counts: Dict[str, int], capacity: int) -> int:
+    """Resumo de Misra-Gries: mantém os capacity valores mais frequentes; retorna o quanto foi descontado"""
+    if len(counts) <= capacity:
+        return 0
+    cut = sorted(counts.values(), reverse=True)[capacity]
+    for value in [value for value, count in counts.items() if count <= cut]:
+        del counts[value]
+    for value in counts:
+        counts[value] -= cut
+    return cut
+
+
+class ColumnProfile:
+    """Contagens de uma coluna, atualizadas lote a lote e combináveis entre partições"""
+
+    def __init__(self, name: str, arrow_type: str = '', domain: Optional[Sequence[str]] = None):
+        self.name = name
+        self.arrow_type = arrow_type
+        if domain is None:
+            domain = CODE_DOMAINS.get(name.upper())
+        self.domain = frozenset(domain) if domain is not None else None
+        self.rows = 0
+        self.nulls = 0
+        self.blanks = 0
+        self.violations = 0
+        self.violation_samples: Dict[str, int] = {}
+        self.top: Dict[str, int] = {}
+        # Quanto as contagens de top podem estar abaixo do real (0 enquanto exatas)
+        self.top_error = 0
+        self.hll = HyperLogLog()
+
+    def update(self, array: pa.Array) -> None:
+        """Acumula um lote da coluna: uma contagem de valores (value_counts) e o restante sobre os distintos"""
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks()
+        if not self.arrow_type:
+            self.arrow_type = str(array.type)
+        self.rows += len(array)
+        self.nulls += array.null_count
+        if array.null_count == len(array):
+            return
+
+        counted = pc.value_counts(array)
+        values, counts = counted.field('values'), counted.field('counts')
+        present = pc.is_valid(values)
+        texts = as_text(values.filter(present))
+        counts = counts.filter(present)
+
+        blank = pc.equal(texts, '')
+        self.blanks += pc.sum(counts.filter(blank)).as_py() or 0
+        texts, counts = texts.filter(pc.invert(blank)), counts.filter(pc.invert(blank))
+        if pc.count_distinct(texts).as_py() < len(texts):
+            # Valores iguais depois de aparados (' 1' e '1') são somados
+            grouped = pa.table({'text': texts, 'count': counts}).group_by('text').aggregate([('count', 'sum')])
+            texts, counts = grouped.column('text').combine_chunks(), grouped.column('count_sum')
+        counts = counts.to_numpy()
+
+        if self.domain is not None and len(texts):
+            outside = ~pc.is_in(texts, value_set=pa.array(sorted(self.domain), pa.string())).to_numpy(zero_copy_only=False)
+            self.violations += int(counts[outside].sum())
+            for text, count in self._most_frequent(texts.filter(pa.array(outside)), counts[outside], VIOLATION_SAMPLES):
+                self.violation_samples[text] = self.violation_samples.get(text, 0) + count
+            _trim(self.violation_samples, VIOLATION_SAMPLES)
+
+        self.hll.add_hashes(hash64(texts))
+        # Só os valores mais frequentes do lote entram no resumo: o lote vira um Misra-Gries de TOP_CAPACITY
+        if len(counts) > TOP_CAPACITY:
+            cut = int(np.partition(counts, len(counts) - TOP_CAPACITY - 1)[len(counts) - TOP_CAPACITY - 1])
+            self.top_error += cut
+            kept = counts > cut
+            texts, counts = texts.filter(pa.array(kept)), counts[kept] - cut
+        for text, count in zip(texts.to_pylist(), counts.tolist()):
+            self.top[text] = self.top.get(text, 0) + count
+        self.top_error += _trim(self.top, TOP_CAPACITY)
+
+    @staticmethod
+    def _most_frequent(texts: pa.Array, counts: np.ndarray, k: int) -> List[Tuple[str, int]]:
+        order = np.argsort(-counts, kind='stable')[:k]
+        return [(texts[int(position)].as_py(), int(counts[position])) for position in order]
+
+    def add_missing(self, rows: int) -> None:
+        """Linhas de lotes sem a coluna, contadas como nulas"""
+        self.rows += rows
+        self.nulls += rows
+
+    def merge(self, other: 'ColumnProfile') -> 'ColumnProfile':
+        self.arrow_type = self.arrow_type or other.arrow_type
+        self.rows += other.rows
+        self.nulls += other.nulls
+        self.blanks += other.blanks
+        self.violations += other.violations
+        for text, count in other.violation_samples.items():
+            self.violation_samples[text] = self.violation_samples.get(text, 0) + count
+        _trim(self.violation_samples, VIOLATION_SAMPLES)
+        for text, count in other.top.items():
+            self.top[text] = self.top.get(text, 0) + count
+        self.top_error += other.top_error + _trim(self.top, TOP_CAPACITY)
+        self.hll.merge(other.hll)
+        return self
+
+    @property
+    def empty_rate(self) -> float:
+        """Proporção de vazios: texto em branco (' ') ou nulo"""
+        return (self.blanks + self.nulls) / self.rows if self.rows else 0.0
+
+    def top_values(self, k: int = TOP_K) -> List[Tuple[str, int]]:
+        return sorted(self.top.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+    def summary(self, k: int = TOP_K) -> Dict[str, Any]:
+        rows = self.rows or 1
+        return {
+            'column': self.name,
+            'type': self.arrow_type,
+            'rows': self.rows,
+            'nulls': self.nulls,
+            'blanks': self.blanks,
+            'null_rate': round(self.nulls / rows, 4),
+            'blank_rate': round(self.blanks / rows, 4),
+            'empty_rate': round(self.empty_rate, 4),
+            'distinct': len(self.top) if not self.top_error else self.hll.count(),
+            'top': [[value, count] for value, count in self.top_values(k)],
+            'top_exact': self.top_error == 0,
+            'violations': self.violations if self.domain is not None else None,
+            'violation_samples': sorted(self.violation_samples, key=lambda text: -self.violation_samples[text]),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'type': self.arrow_type,
+            'domain': sorted(self.domain) if self.domain is not None else None,
+            'rows': self.rows,
+            'nulls': self.nulls,
+            'blanks': self.blanks,
+            'violations': self.violations,
+            'violation_samples': self.violation_samples,
+            'top': self.top,
+            'top_error': self.top_error,
+            'hll': self.hll.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ColumnProfile':
+        column = cls(data['name'], data['type'], data['domain'])
+        column.rows, column.nulls, column.blanks = data['rows'], data['nulls'], data['blanks']
+        column.violations = data['violations']
+        column.violation_samples = dict(data['violation_samples'])
+        column.top, column.top_error = dict(data['top']), data['top_error']
+        column.hll = HyperLogLog.from_dict(data['hll'])
+        return column
+
+
+class Profile:
+    """
+    Perfil de um conjunto de lotes (um arquivo, uma partição ou o dataset inteiro)
+
+    Perfis de partições diferentes se combinam com merge: as contagens somam, os HyperLogLog
+    combinam pelo máximo dos registradores e os valores frequentes pelo resumo de Misra-Gries,
+    então o perfil de 2023 + 2024 não precisa reler os dados.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.columns: Dict[str, ColumnProfile] = {}
+        self.sources: List[str] = []
+
+    def update(self, batch: pa.RecordBatch) -> 'Profile':
+        for name in batch.schema.names:
+            if name not in self.columns:
+                # Coluna nova: as linhas anteriores não a tinham
+                self.columns[name] = ColumnProfile(name)
+                if self.rows:
+                    self.columns[name].add_missing(self.rows)
+            self.columns[name].update(batch.column(name))
+        for name, column in self.columns.items():
+            if name not in batch.schema.names:
+                column.add_missing(batch.num_rows)
+        self.rows += batch.num_rows
+        return self
+
+    def fit(self, batches: Iterable[pa.RecordBatch]) -> 'Profile':
+        for batch in batches:
+            self.update(batch)
+        return self
+
+    def merge(self, other: 'Profile') -> 'Profile':
+        for name, column in self.columns.items():
+            if name not in other.columns:
+                column.add_missing(other.rows)
+        for name, column in other.columns.items():
+            if name not in self.columns:
+                self.columns[name] = ColumnProfile(name, column.arrow_type, column.domain)
+                self.columns[name].add_missing(self.rows)
+            self.columns[name].merge(column)
+        self.rows += other.rows
+        self.sources.extend(other.sources)
+        return self
+
+    def columns_to_drop(self, threshold: float = DROP_THRESHOLD, keep: Sequence[str] = ()) -> List[str]:
+        """Colunas com mais de threshold de vazios (texto em branco ou nulo), exceto as de keep"""
+        keep = set(keep)
+        return [name for name, column in self.columns.items()
+                if name not in keep and column.empty_rate > threshold]
+
+    def summary(self, k: int = TOP_K) -> List[Dict[str, Any]]:
+        """Resumo por coluna, da mais vazia para a menos vazia"""
+        return sorted((column.summary(k) for column in self.columns.values()),
+                      key=lambda line: (-line['empty_rate'], line['column']))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': _PROFILE_VERSION,
+            'rows': self.rows,
+            'sources': self.sources,
+            'columns': [column.to_dict() for column in self.columns.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Profile':
+        if data.get('version') != _PROFILE_VERSION:
+            raise ValueError(f"Versão de perfil não suportada: {data.get('version')}")
+        profile = cls()
+        profile.rows = data['rows']
+        profile.sources = list(data['sources'])
+        for column in data['columns']:
+            profile.columns[column['name']] = ColumnProfile.from_dict(column)
+        return profile
+
+    def save(self, path: str = DEFAULT_PROFILE_PATH) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PROFILE_PATH) -> 'Profile':
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def profile_file(path: str, columns: Optional[List[str]] = None, batch_size: int = 100_000) -> Profile:
+    """Perfil de um arquivo Parquet, lido lote a lote"""
+    profile = Profile()
+    profile.fit(pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=columns))
+    profile.sources.append(path)
+    return profile
+
+
+def _profile_job(job: Tuple[str, Optional[List[str]], int]) -> Dict[str, Any]:
+    path, columns, batch_size = job
+    return profile_file(path, columns, batch_size).to_dict()
+
+
+def profile_files(paths: Sequence[str], columns: Optional[List[str]] = None, batch_size: int = 100_000,
+                  workers: Optional[int] = None) -> Profile:
+    """
+    Perfil de vários arquivos (ex.: as partições de 2023 e 2024), um processo por arquivo
+
+    Cada processo devolve o perfil do seu arquivo, e os perfis são combinados na ordem dos arquivos.
+    """
+    jobs = [(path, columns, batch_size) for path in paths]
+    profile = Profile()
+    if not jobs:
+        return profile
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers == 1:
+        return _merge_all(profile, map(_profile_job, jobs))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return _merge_all(profile, executor.map(_profile_job, jobs))
+
+
+def _merge_all(profile: Profile, results: Iterable[Dict[str, Any]]) -> Profile:
+    for result in results:
+        profile.merge(Profile.from_dict(result))
+    return profile
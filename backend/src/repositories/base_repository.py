@@ -0,0 +1,149 @@
+"""
+Repositório base - Camada de acesso aos dados
+Primitivas em lote compartilhadas pelos repositórios: cada operação custa uma única consulta,
+independente de quantos IDs ou valores são verificados
+"""
+import importlib
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import UniqueConstraint, insert, or_, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.models.user import db
+
+
+class BaseRepository:
+    """Operações de dados comuns a um modelo do SQLAlchemy"""
+
+    # Modelo do repositório, definido pelas subclasses
+    model = None
+
+    @classmethod
+    def get_by_id(cls, entity_id: int):
+        """Retorna uma entidade pelo ID (None se não existir)"""
+        return db.session.get(cls.model, entity_id)
+
+    @classmethod
+    def get_many(cls, ids: Iterable[int]) -> Dict[int, Any]:
+        """Retorna as entidades dos IDs informados, em uma consulta, indexadas pelo ID"""
+        ids = set(ids)
+        if not ids:
+            return {}
+        primary_key = cls._primary_key()
+        entities = db.session.scalars(select(cls.model).where(primary_key.in_(ids)))
+        return {getattr(entity, primary_key.key): entity for entity in entities}
+
+    @classmethod
+    def exists_many(cls, field: str, values: Iterable[Any]) -> Set[Any]:
+        """Retorna, em uma consulta, quais dos valores já existem na coluna informada"""
+        values = set(values)
+        if not values:
+            return set()
+        column = cls.model.__table__.c[field]
+        return set(db.session.scalars(select(column).where(column.in_(values)).distinct()))
+
+    @classmethod
+    def unique_fields(cls) -> List[str]:
+        """Colunas com restrição UNIQUE de uma coluna, na ordem da tabela"""
+        table = cls.model.__table__
+        unique = {
+            constraint.columns.keys()[0] for constraint in table.constraints
+            if isinstance(constraint, UniqueConstraint) and len(constraint.columns) == 1
+        }
+        return [column.key for column in table.columns if column.key in unique]
+
+    @classmethod
+    def find_conflicts(cls, rows: Iterable[Dict[str, Any]],
+                       exclude_id: Optional[int] = None) -> Dict[str, Set[Any]]:
+        """
+        Detecta, em uma consulta, valores que violariam as restrições UNIQUE da tabela
+
+        Args:
+            rows: Valores a inserir ou atualizar (apenas as colunas únicas presentes são verificadas)
+            exclude_id: ID da entidade sendo atualizada, que não conflita com ela mesma
+
+        Returns:
+            Valores já existentes por coluna única (só as colunas com conflito)
+        """
+        requested: Dict[str, Set[Any]] = {}
+        for row in rows:
+            for field in cls.unique_fields():
+                if row.get(field) is not None:
+                    requested.setdefault(field, set()).add(row[field])
+        if not requested:
+            return {}
+
+        table = cls.model.__table__
+        primary_key = cls._primary_key()
+        query = select(primary_key, *(table.c[field] for field in requested)).where(
+            or_(*(table.c[field].in_(values) for field, values in requested.items()))
+        )
+        if exclude_id is not None:
+            query = query.where(primary_key != exclude_id)
+
+        conflicts: Dict[str, Set[Any]] = {}
+        for row in db.session.execute(query).mappings():
+            for field, values in requested.items():
+                if row[field] in values:
+                    conflicts.setdefault(field, set()).add(row[field])
+        return conflicts
+
+    @classmethod
+    def create(cls, entity):
+        """Cria uma nova entidade"""
+        db.session.add(entity)
+        cls._commit()
+        return entity
+
+    @classmethod
+    def create_many(cls, values: List[Dict[str, Any]]) -> int:
+        """
+        Insere várias entidades em uma única transação
+
+        Usa o insert do Core com a lista de valores (executemany), sem instanciar objetos do ORM.
+
+        Returns:
+            Quantidade de entidades inseridas
+        """
+        if not values:
+            return 0
+        try:
+            db.session.execute(insert(cls.model.__table__), values)
+        except SQLAlchemyError:
+            db.session.rollback()
+            raise
+        cls._commit()
+        return len(values)
+
+    @classmethod
+    def update(cls, entity):
+        """Atualiza uma entidade existente"""
+        cls._commit()
+        return entity
+
+    @classmethod
+    def delete(cls, entity) -> None:
+        """Remove uma entidade"""
+        db.session.delete(entity)
+        cls._commit()
+
+    @staticmethod
+    def _commit() -> None:
+        """Confirma a transação; se o commit falha, desfaz para a sessão não ficar inutilizável"""
+        try:
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            raise
+
+    @staticmethod
+    def _insert(table):
+        """INSERT com upsert do dialeto em uso"""
+        name = 'postgresql' if db.session.get_bind().dialect.name == 'postgresql' else 'sqlite'
+        # Só o dialeto em uso é importado: o do PostgreSQL fica fora da inicialização com SQLite
+        dialect = importlib.import_module(f'sqlalchemy.dialects.{name}')
+        return dialect.insert(table)
+
+    @classmethod
+    def _primary_key(cls):
+        return cls.model.__table__.primary_key.columns.values()[0]
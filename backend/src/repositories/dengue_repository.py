@@ -1,2 +1,156 @@
-class DengueRepository:
-    
\ No newline at end of file
+"""
+Repositório de notificações de dengue - Camada de acesso aos dados
+Responsável por todas as operações de banco de dados relacionadas às notificações
+"""
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import Row, delete, insert, select, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.models.dengue_notification import DengueNotification
+from src.models.dengue_notification_fingerprint import DengueNotificationFingerprint
+from src.models.user import db
+from src.repositories.base_repository import BaseRepository
+
+
+class DengueRepository(BaseRepository):
+    """Repositório para operações de dados de notificações de dengue"""
+
+    model = DengueNotification
+
+    # Filtros de igualdade aceitos na listagem
+    EQUALITY_FILTERS = ('sg_uf_not', 'id_municip', 'sem_not', 'classi_fin', 'evolucao')
+
+    @staticmethod
+    def get_page(filters: Dict[str, Any], limit: int,
+                 after: Optional[Tuple[date, int]] = None) -> List[DengueNotification]:
+        """
+        Retorna uma página de notificações por paginação keyset
+
+        A ordenação (dt_notific, id) decrescente acompanha o índice composto em dt_notific,
+        então cada página custa o mesmo independente de quantas páginas vieram antes.
+
+        Args:
+            filters: Filtros de igualdade e o período (dt_inicio, dt_fim)
+            limit: Tamanho da página
+            after: Chave (dt_notific, id) do último registro da página anterior
+        """
+        query = DengueRepository._filtered(DengueNotification.query, filters)
+
+        if after is not None:
+            query = query.filter(tuple_(DengueNotification.dt_notific, DengueNotification.id) < after)
+
+        return query.order_by(
+            DengueNotification.dt_notific.desc(),
+            DengueNotification.id.desc()
+        ).limit(limit).all()
+
+    @staticmethod
+    def iter_rows(filters: Dict[str, Any], batch_size: int = 1000) -> Iterator[Row]:
+        """
+        Itera sobre todas as notificações filtradas como linhas do Core, lidas em lotes
+
+        Sem instanciar objetos do ORM e sem carregar o resultado inteiro: cada lote de
+        batch_size linhas é buscado do cursor conforme o consumo.
+        """
+        table = DengueNotification.__table__
+        query = DengueRepository._filtered(select(table), filters).order_by(
+            table.c.dt_notific.desc(), table.c.id.desc()
+        )
+        result = db.session.execute(query.execution_options(yield_per=batch_size))
+        yield from result
+
+    # Impressões digitais das duplicadas: gravadas e removidas na transação da notificação
+
+    @staticmethod
+    def existing_fingerprints(fingerprints: Iterable[int], exclude_id: Optional[int] = None) -> Set[int]:
+        """Retorna, em uma consulta, quais impressões já pertencem a notificações (exceto a exclude_id)"""
+        fingerprints = set(fingerprints)
+        if not fingerprints:
+            return set()
+        table = DengueNotificationFingerprint.__table__
+        query = select(table.c.fingerprint).where(table.c.fingerprint.in_(fingerprints))
+        if exclude_id is not None:
+            query = query.where(table.c.notification_id != exclude_id)
+        return set(db.session.scalars(query))
+
+    @classmethod
+    def create(cls, entity, fingerprint: Optional[int] = None):
+        """Cria a notificação e, se informada, registra a impressão digital na mesma transação"""
+        db.session.add(entity)
+        if fingerprint is not None:
+            try:
+                db.session.flush()
+            except SQLAlchemyError:
+                db.session.rollback()
+                raise
+            db.session.add(DengueNotificationFingerprint(fingerprint=fingerprint, notification_id=entity.id))
+        cls._commit()
+        return entity
+
+    @classmethod
+    def create_many(cls, values: List[Dict[str, Any]], fingerprints: Optional[List[Optional[int]]] = None) -> int:
+        """
+        Insere várias notificações em uma única transação, com as impressões digitais informadas
+
+        Args:
+            values: Notificações (dicionários planos)
+            fingerprints: Impressão de cada notificação, alinhada a values (None: sem impressão)
+        """
+        if fingerprints is None or not values:
+            return super().create_many(values)
+        table = DengueNotification.__table__
+        try:
+            # RETURNING na ordem dos parâmetros liga cada impressão ao ID gerado
+            ids = db.session.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True),
+                                     values).scalars().all()
+            rows = [{'fingerprint': fingerprint, 'notification_id': notification_id}
+                    for notification_id, fingerprint in zip(ids, fingerprints) if fingerprint is not None]
+            if rows:
+                db.session.execute(insert(DengueNotificationFingerprint.__table__), rows)
+        except SQLAlchemyError:
+            db.session.rollback()
+            raise
+        cls._commit()
+        return len(values)
+
+    @classmethod
+    def update(cls, entity, fingerprint: Optional[int] = None):
+        """Atualiza a notificação e troca a impressão digital pela informada (None remove)"""
+        try:
+            cls._delete_fingerprint(entity.id)
+            if fingerprint is not None:
+                db.session.add(DengueNotificationFingerprint(fingerprint=fingerprint, notification_id=entity.id))
+        except SQLAlchemyError:
+            db.session.rollback()
+            raise
+        cls._commit()
+        return entity
+
+    @classmethod
+    def delete(cls, entity) -> None:
+        """Remove a notificação e a sua impressão digital"""
+        try:
+            cls._delete_fingerprint(entity.id)
+        except SQLAlchemyError:
+            db.session.rollback()
+            raise
+        super().delete(entity)
+
+    @staticmethod
+    def _delete_fingerprint(notification_id: int) -> None:
+        table = DengueNotificationFingerprint.__table__
+        db.session.execute(delete(table).where(table.c.notification_id == notification_id))
+
+    @staticmethod
+    def _filtered(query, filters: Dict[str, Any]):
+        """Aplica os filtros de igualdade e de período a uma consulta (ORM ou Core)"""
+        for name in DengueRepository.EQUALITY_FILTERS:
+            if filters.get(name) is not None:
+                query = query.filter(getattr(DengueNotification, name) == filters[name])
+        if filters.get('dt_inicio') is not None:
+            query = query.filter(DengueNotification.dt_notific >= filters['dt_inicio'])
+        if filters.get('dt_fim') is not None:
+            query = query.filter(DengueNotification.dt_notific <= filters['dt_fim'])
+        return query
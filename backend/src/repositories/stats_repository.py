@@ -0,0 +1,165 @@
+"""
+Repositório do cubo de notificações - Camada de acesso aos dados
+Responsável por manter as contagens pré-agregadas e consultá-las
+"""
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.models.dengue_notification import DengueNotification
+from src.models.dengue_notification_cube import DengueNotificationCube, DengueNotificationCubeRevision
+from src.models.user import db
+from src.repositories.base_repository import BaseRepository
+
+
+class StatsRepository:
+    """Repositório para operações de dados do cubo de notificações"""
+
+    DIMENSIONS = ('sem_not', 'id_municip', 'classi_fin', 'evolucao')
+    # sem_not da linha do contador na tabela de revisões
+    COUNTER = ''
+
+    @staticmethod
+    def key(values: Dict[str, Any]) -> Tuple[str, ...]:
+        """Chave do cubo de uma notificação (dicionário plano ou to_dict)"""
+        return tuple(values.get(name) or '' for name in StatsRepository.DIMENSIONS)
+
+    @staticmethod
+    def apply(deltas: Dict[Tuple[str, ...], int]) -> None:
+        """
+        Soma as variações às células do cubo na transação corrente (sem commit)
+
+        O commit é feito pela escrita da notificação, então cubo e notificações mudam juntos. A
+        revisão também avança nessa transação, mesmo sem variação no cubo (a notificação mudou).
+        """
+        rows = [dict(zip(StatsRepository.DIMENSIONS, key), total=delta)
+                for key, delta in deltas.items() if delta]
+        try:
+            if rows:
+                table = DengueNotificationCube.__table__
+                statement = BaseRepository._insert(table)
+                statement = statement.on_conflict_do_update(
+                    index_elements=list(StatsRepository.DIMENSIONS),
+                    set_={'total': table.c.total + statement.excluded.total}
+                )
+                db.session.execute(statement, rows)
+            StatsRepository._bump({row['sem_not'] for row in rows})
+        except SQLAlchemyError:
+            db.session.rollback()
+            raise
+
+    @staticmethod
+    def _bump(weeks: Set[str]) -> int:
+        """
+        Avança o contador de revisões e marca as semanas com a nova revisão (sem commit)
+
+        A linha do contador fica bloqueada até o commit, então as revisões são confirmadas na
+        mesma ordem em que são distribuídas e um leitor nunca pula uma escrita.
+        """
+        table = DengueNotificationCubeRevision.__table__
+        statement = BaseRepository._insert(table)
+        db.session.execute(statement.values(sem_not=StatsRepository.COUNTER, revision=1).on_conflict_do_update(
+            index_elements=['sem_not'], set_={'revision': table.c.revision + 1}
+        ))
+        revision = StatsRepository.revision()
+        if weeks:
+            statement = BaseRepository._insert(table)
+            db.session.execute(
+                statement.on_conflict_do_update(index_elements=['sem_not'],
+                                                set_={'revision': statement.excluded.revision}),
+                [{'sem_not': week, 'revision': revision} for week in sorted(weeks)]
+            )
+        return revision
+
+    @staticmethod
+    def revision() -> int:
+        """Revisão corrente do cubo (0 antes da primeira escrita)"""
+        table = DengueNotificationCubeRevision.__table__
+        value = db.session.execute(
+            select(table.c.revision).where(table.c.sem_not == StatsRepository.COUNTER)
+        ).scalar()
+        return int(value or 0)
+
+    @staticmethod
+    def changed_weeks(since: int) -> List[str]:
+        """Semanas alteradas por escritas com revisão posterior a since"""
+        table = DengueNotificationCubeRevision.__table__
+        query = select(table.c.sem_not).where(table.c.revision > since, table.c.sem_not != StatsRepository.COUNTER)
+        return list(db.session.scalars(query.order_by(table.c.sem_not)))
+
+    @staticmethod
+    def get_counts(group_by: List[str], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Soma as células do cubo agrupando pelas dimensões pedidas
+
+        Args:
+            group_by: Dimensões do resultado (vazio para o total geral)
+            filters: Igualdade por dimensão e o intervalo de semanas (sem_inicio, sem_fim)
+        """
+        cube = DengueNotificationCube
+        columns = [getattr(cube, name) for name in group_by]
+        total = func.sum(cube.total).label('total')
+        query = select(*columns, total)
+
+        for name in StatsRepository.DIMENSIONS:
+            if filters.get(name) is not None:
+                query = query.where(getattr(cube, name) == filters[name])
+        if filters.get('sem_inicio') is not None:
+            query = query.where(cube.sem_not >= filters['sem_inicio'])
+        if filters.get('sem_fim') is not None:
+            query = query.where(cube.sem_not <= filters['sem_fim'])
+
+        if columns:
+            query = query.group_by(*columns).having(total > 0).order_by(*columns)
+
+        results = []
+        for row in db.session.execute(query):
+            values = {name: row[index] or None for index, name in enumerate(group_by)}
+            values['total'] = int(row.total or 0)
+            results.append(values)
+        if not columns and not results:
+            results.append({'total': 0})
+        return results
+
+    @staticmethod
+    def rebuild(batch_size: int = 10_000) -> int:
+        """
+        Recalcula o cubo inteiro a partir das notificações
+
+        Returns:
+            Quantidade de células do cubo
+        """
+        notification = DengueNotification
+        columns = [getattr(notification, name) for name in StatsRepository.DIMENSIONS]
+        query = select(*columns, func.count().label('total')).group_by(*columns)
+
+        try:
+            db.session.execute(DengueNotificationCube.__table__.delete())
+            counts: Counter = Counter()
+            for row in db.session.execute(query):
+                counts[StatsRepository.key(dict(zip(StatsRepository.DIMENSIONS, row)))] += row.total
+            items = list(counts.items())
+            for start in range(0, len(items), batch_size):
+                StatsRepository.apply(dict(items[start:start + batch_size]))
+            # Todas as semanas já vistas (inclusive as que ficaram sem notificações) mudam de revisão
+            table = DengueNotificationCubeRevision.__table__
+            StatsRepository._bump(set(db.session.scalars(
+                select(table.c.sem_not).where(table.c.sem_not != StatsRepository.COUNTER)
+            )))
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            raise
+        return len(counts)
+
+    @staticmethod
+    def deltas(removed: Iterable[Dict[str, Any]] = (), added: Iterable[Dict[str, Any]] = ()) -> Dict[Tuple[str, ...], int]:
+        """Variações do cubo para notificações removidas e adicionadas"""
+        counts: Dict[Tuple[str, ...], int] = Counter()
+        for values in removed:
+            counts[StatsRepository.key(values)] -= 1
+        for values in added:
+            counts[StatsRepository.key(values)] += 1
+        return dict(counts)
@@ -3,22 +3,22 @@ Repositório de usuários - Camada de acesso aos dados
 Responsável por todas as operações de banco de dados relacionadas aos usuários
 """
 from typing import List, Optional
-from src.models.user import User, db
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from src.models.user import User, UserRevision, db
+from src.repositories.base_repository import BaseRepository
 
 
-class UserRepository:
+class UserRepository(BaseRepository):
     """Repositório para operações de dados de usuários"""
     
+    model = User
+    
     @staticmethod
     def get_all() -> List[User]:
         """Retorna todos os usuários"""
         return User.query.all()
     
-    @staticmethod
-    def get_by_id(user_id: int) -> Optional[User]:
-        """Retorna um usuário pelo ID"""
-        return User.query.get(user_id)
-    
     @staticmethod
     def get_by_username(username: str) -> Optional[User]:
         """Retorna um usuário pelo nome de usuário"""
@@ -29,32 +29,53 @@ class UserRepository:
         """Retorna um usuário pelo email"""
         return User.query.filter_by(email=email).first()
     
-    @staticmethod
-    def create(user: User) -> User:
-        """Cria um novo usuário"""
-        db.session.add(user)
-        db.session.commit()
-        return user
+    @classmethod
+    def exists_by_username(cls, username: str) -> bool:
+        """Verifica se existe um usuário com o nome de usuário fornecido"""
+        return bool(cls.exists_many('username', [username]))
     
-    @staticmethod
-    def update(user: User) -> User:
-        """Atualiza um usuário existente"""
-        db.session.commit()
-        return user
+    @classmethod
+    def exists_by_email(cls, email: str) -> bool:
+        """Verifica se existe um usuário com o email fornecido"""
+        return bool(cls.exists_many('email', [email]))
     
-    @staticmethod
-    def delete(user: User) -> None:
-        """Remove um usuário"""
-        db.session.delete(user)
-        db.session.commit()
+    @classmethod
+    def create(cls, entity):
+        """Cria um novo usuário e avança a revisão na mesma transação"""
+        db.session.add(entity)
+        cls._bump()
+        cls._commit()
+        return entity
     
-    @staticmethod
-    def exists_by_username(username: str) -> bool:
-        """Verifica se existe um usuário com o nome de usuário fornecido"""
-        return User.query.filter_by(username=username).first() is not None
+    @classmethod
+    def update(cls, entity):
+        """Atualiza um usuário existente e avança a revisão na mesma transação"""
+        cls._bump()
+        cls._commit()
+        return entity
+    
+    @classmethod
+    def delete(cls, entity) -> None:
+        """Remove um usuário e avança a revisão na mesma transação"""
+        db.session.delete(entity)
+        cls._bump()
+        cls._commit()
     
     @staticmethod
-    def exists_by_email(email: str) -> bool:
-        """Verifica se existe um usuário com o email fornecido"""
-        return User.query.filter_by(email=email).first() is not None
-
+    def revision() -> int:
+        """Revisão corrente dos usuários (0 antes da primeira escrita)"""
+        value = db.session.execute(select(UserRevision.__table__.c.revision)).scalar()
+        return int(value or 0)
+    
+    @classmethod
+    def _bump(cls) -> None:
+        """Incrementa a revisão na transação corrente (sem commit)"""
+        table = UserRevision.__table__
+        statement = cls._insert(table)
+        try:
+            db.session.execute(statement.values(id=1, revision=1).on_conflict_do_update(
+                index_elements=['id'], set_={'revision': table.c.revision + 1}
+            ))
+        except SQLAlchemyError:
+            db.session.rollback()
+            raise
@@ -0,0 +1,244 @@
+"""
+Registro de schema colunar do caso de dengue
+Gera, a partir do modelo CasoDengue e de seus sub-modelos, o schema Arrow tipado
+(inteiros estreitos, categóricas com dicionário e datas date32) aplicado pelos leitores
+durante a decodificação, sem materializar o frame largo de objetos
+"""
+import datetime
+import typing
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.codecs.sinan import to_int64
+from src.epi.weeks import parse_dates
+from src.models.caso_dengue import CasoDengue
+
+
+# Campos texto no modelo que são, na prática, numéricos (anos)
+TYPE_OVERRIDES: Dict[str, pa.DataType] = {
+    'nu_ano': pa.int16(),
+    'ano_nasc': pa.int16(),
+    'nu_idade_n': pa.int16(),
+}
+
+# Categóricas com muitos valores distintos precisam de índices de dicionário mais largos
+HIGH_CARDINALITY = {
+    'sem_not', 'sem_pri', 'id_municip', 'id_regiona', 'id_unidade',
+    'id_mn_resi', 'id_rg_resi', 'id_ocupa_n', 'municipio', 'id_pais',
+}
+
+# Colunas fora do modelo (ALRM_*, GRAV_*, ...) ficam com o tipo lido; texto vira dicionário
+EXTRA_STRING_TYPE = pa.dictionary(pa.int32(), pa.string())
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """Especificação de uma coluna derivada de um campo do modelo"""
+    field: str
+    column: str
+    group: str
+    arrow_type: pa.DataType
+    nullable: bool
+
+
+def _unwrap_optional(annotation) -> Tuple[type, bool]:
+    """Retorna o tipo base de uma anotação e se ela aceita None"""
+    if typing.get_origin(annotation) is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        return args[0], True
+    return annotation, False
+
+
+def _arrow_type(field: str, python_type: type) -> pa.DataType:
+    if field in TYPE_OVERRIDES:
+        return TYPE_OVERRIDES[field]
+    if python_type is datetime.date:
+        return pa.date32()
+    if python_type is int:
+        return pa.int8()
+    if python_type is str:
+        index_type = pa.int32() if field in HIGH_CARDINALITY else pa.int16()
+        return pa.dictionary(index_type, pa.string())
+    raise TypeError(f"Tipo sem mapeamento para Arrow no campo '{field}': {python_type}")
+
+
+class SchemaRegistry:
+    """Registro das colunas do caso de dengue, na ordem dos modelos"""
+
+    def __init__(self, model=CasoDengue):
+        self.specs: List[ColumnSpec] = []
+        self.groups: Dict[str, List[str]] = {}
+
+        for group, group_field in model.model_fields.items():
+            submodel, _ = _unwrap_optional(group_field.annotation)
+            self.groups[group] = []
+            for name, field in submodel.model_fields.items():
+                python_type, nullable = _unwrap_optional(field.annotation)
+                self.specs.append(ColumnSpec(
+                    field=name,
+                    column=name.upper(),
+                    group=group,
+                    arrow_type=_arrow_type(name, python_type),
+                    nullable=nullable,
+                ))
+                self.groups[group].append(name)
+
+        self._by_column = {spec.column: spec for spec in self.specs}
+
+    def spec(self, column: str) -> Optional[ColumnSpec]:
+        """Retorna a especificação pelo nome da coluna (maiúsculo, como no SINAN, ou minúsculo)"""
+        return self._by_column.get(column.upper())
+
+    def arrow_schema(self, lowercase: bool = False) -> pa.Schema:
+        """Schema Arrow com todas as colunas do modelo"""
+        return pa.schema([
+            pa.field(spec.field if lowercase else spec.column, spec.arrow_type, nullable=spec.nullable)
+            for spec in self.specs
+        ])
+
+    def target_type(self, column: str, source_type: pa.DataType) -> pa.DataType:
+        """Tipo de destino de uma coluna lida com o tipo de origem informado"""
+        spec = self.spec(column)
+        if spec is not None:
+            return spec.arrow_type
+        if pa.types.is_string(source_type) or pa.types.is_large_string(source_type):
+            return EXTRA_STRING_TYPE
+        return source_type
+
+    def target_schema(self, source_schema: pa.Schema) -> pa.Schema:
+        """Schema resultante da aplicação do registro a um schema de leitura"""
+        return pa.schema([
+            pa.field(field.name, self.target_type(field.name, field.type)) for field in source_schema
+        ])
+
+    def cast_array(self, column: str, array: pa.Array) -> pa.Array:
+        """Converte uma coluna para o tipo do registro"""
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks()
+        return cast_to(array, self.target_type(column, array.type))
+
+    def cast_batch(self, batch: pa.RecordBatch) -> pa.RecordBatch:
+        """Aplica o registro a um lote lido (DBF, Parquet ou ingestão em massa)"""
+        schema = self.target_schema(batch.schema)
+        columns = [self.cast_array(name, column) for name, column in zip(batch.schema.names, batch.columns)]
+        return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def _blank_to_null(array: pa.Array) -> pa.Array:
+    text = pc.utf8_trim_whitespace(array.cast(pa.string()))
+    return pc.if_else(pc.equal(text, ''), None, text)
+
+
+def cast_to(array: pa.Array, target: pa.DataType) -> pa.Array:
+    """
+    Converte um array para o tipo de destino, tolerando dados sujos do SINAN
+
+    Textos em branco viram nulos; valores não numéricos ou fora da faixa do inteiro estreito
+    viram nulos em vez de falhar ou estourar.
+    """
+    if array.type == target:
+        return array
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+
+    if pa.types.is_dictionary(target):
+        return _blank_to_null(array).dictionary_encode().cast(target)
+
+    if pa.types.is_integer(target):
+        numbers = to_int64(array)
+        bits = target.bit_width
+        if pa.types.is_unsigned_integer(target):
+            low, high = 0, 2 ** bits - 1
+        else:
+            low, high = -(2 ** (bits - 1)), 2 ** (bits - 1) - 1
+        in_range = pc.and_(pc.greater_equal(numbers, low), pc.less_equal(numbers, high))
+        return pc.if_else(in_range, numbers, None).cast(target)
+
+    if pa.types.is_date32(target):
+        if pa.types.is_timestamp(array.type) or pa.types.is_date(array.type):
+            return array.cast(target)
+        return parse_dates(array)
+
+    return array.cast(target)
+
+
+def present_mask(array: pa.Array) -> np.ndarray:
+    """Máscara das células preenchidas na origem (não nulas e, para texto, não em branco)"""
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+    if pa.types.is_string(array.type) or pa.types.is_large_string(array.type):
+        filled = pc.not_equal(pc.utf8_trim_whitespace(array), '')
+        return filled.fill_null(False).to_numpy(zero_copy_only=False)
+    return array.is_valid().to_numpy(zero_copy_only=False)
+
+
+def categories(array: pa.Array) -> pa.Array:
+    """Valores de uma coluna como texto (dicionários decodificados, texto em branco vira nulo)"""
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+    text = pc.utf8_trim_whitespace(array.cast(pa.string()))
+    return pc.if_else(pc.equal(text, ''), None, text)
+
+
+def text_column(batch: pa.RecordBatch, name: str) -> pa.Array:
+    """Coluna de um lote como texto pelo nome do SINAN, em maiúsculo ou minúsculo (nula quando ausente)"""
+    for candidate in (name, name.lower()):
+        position = batch.schema.get_field_index(candidate)
+        if position >= 0:
+            return categories(batch.column(position))
+    return pa.nulls(batch.num_rows, pa.string())
+
+
+def records_batch(records: Sequence[Dict[str, Any]], columns: Sequence[str]) -> pa.RecordBatch:
+    """Lote Arrow (texto) com as colunas pedidas a partir de notificações planas (chaves em minúsculo ou no SINAN)"""
+    arrays = {}
+    for column in columns:
+        lower = column.lower()
+        values = []
+        for record in records:
+            value = record.get(lower, record.get(column))
+            values.append(None if value is None else str(value))
+        arrays[column] = pa.array(values, pa.string())
+    return pa.RecordBatch.from_pydict(arrays)
+
+
+def null_mask(array: pa.Array) -> np.ndarray:
+    """Máscara NumPy das células nulas"""
+    return array.is_null().to_numpy(zero_copy_only=False)
+
+
+def to_python(array: pa.Array) -> List[Any]:
+    """
+    Converte uma coluna tipada em lista de valores Python (None nos nulos)
+
+    Mais rápido que to_pylist: categóricas decodificam só o dicionário e datas e inteiros
+    passam pelo NumPy, sem criar um escalar Arrow por célula.
+    """
+    if pa.types.is_dictionary(array.type):
+        dictionary = np.array(array.dictionary.to_pylist() + [None], dtype=object)
+        return dictionary[array.indices.fill_null(len(array.dictionary)).to_numpy()].tolist()
+    if pa.types.is_integer(array.type):
+        values = array.fill_null(0).to_numpy().astype(object)
+    elif pa.types.is_date32(array.type):
+        values = array.to_numpy(zero_copy_only=False).astype(object)
+    else:
+        return array.to_pylist()
+    values[null_mask(array)] = None
+    return values.tolist()
+
+
+_registry: Optional[SchemaRegistry] = None
+
+
+def get_registry() -> SchemaRegistry:
+    """Retorna o registro do CasoDengue, construído uma vez por processo"""
+    global _registry
+    if _registry is None:
+        _registry = SchemaRegistry()
+    return _registry
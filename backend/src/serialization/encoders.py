@@ -0,0 +1,151 @@
+"""
+Serialização JSON das respostas da API
+Codificadores pré-computados por modelo (colunas e conversores resolvidos uma única vez),
+saída compacta e respostas em streaming que emitem arrays JSON linha a linha
+"""
+import datetime
+import decimal
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from flask import Response, stream_with_context
+
+
+COMPACT_SEPARATORS = (',', ':')
+
+# Linhas acumuladas antes de cada escrita no stream (evita um chunk HTTP por linha)
+STREAM_CHUNK_ROWS = 500
+
+_compact = json.JSONEncoder(ensure_ascii=False, separators=COMPACT_SEPARATORS)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _isoformat(value: Any) -> Any:
+    return value.isoformat() if value is not None else None
+
+
+def _decimal(value: Any) -> Any:
+    return float(value) if value is not None else None
+
+
+def _converter(python_type: Optional[type]) -> Callable[[Any], Any]:
+    if python_type is not None and issubclass(python_type, (datetime.date, datetime.time)):
+        return _isoformat
+    if python_type is decimal.Decimal:
+        return _decimal
+    return _identity
+
+
+class ModelEncoder:
+    """Codificador de um modelo do SQLAlchemy, resolvido a partir das colunas da tabela"""
+
+    def __init__(self, model, groups: Optional[Dict[str, Sequence[str]]] = None):
+        self.model = model
+        columns = list(model.__table__.columns)
+        self.names: Tuple[str, ...] = tuple(column.name for column in columns)
+        self.converters: Tuple[Callable[[Any], Any], ...] = tuple(
+            _converter(self._python_type(column)) for column in columns
+        )
+        # Só as colunas com conversão de fato (datas); as demais são copiadas como estão
+        self._converted = tuple(
+            (name, converter) for name, converter in zip(self.names, self.converters) if converter is not _identity
+        )
+        self.groups = {group: tuple(fields) for group, fields in (groups or {}).items()}
+
+    @staticmethod
+    def _python_type(column) -> Optional[type]:
+        try:
+            return column.type.python_type
+        except NotImplementedError:
+            return None
+
+    def to_dict(self, instance) -> Dict[str, Any]:
+        """Dicionário plano de uma instância do ORM (mesmo formato do to_dict do modelo)"""
+        values = {name: getattr(instance, name) for name in self.names}
+        for name, converter in self._converted:
+            values[name] = converter(values[name])
+        return values
+
+    def row_to_dict(self, row: Sequence[Any]) -> Dict[str, Any]:
+        """Dicionário plano de uma linha do Core, com as colunas na ordem da tabela"""
+        return {name: converter(value) for name, converter, value in zip(self.names, self.converters, row)}
+
+    def nested(self, values: Dict[str, Any], keep: Sequence[str] = ('id',)) -> Dict[str, Any]:
+        """Reagrupa um dicionário plano nos sub-modelos (ex.: o formato aninhado do CasoDengue)"""
+        result = {name: values[name] for name in keep if name in values}
+        for group, fields in self.groups.items():
+            result[group] = {field: values.get(field) for field in fields}
+        return result
+
+
+_encoders: Dict[Any, ModelEncoder] = {}
+
+
+def get_encoder(model) -> ModelEncoder:
+    """Codificador de um modelo, construído uma vez por processo"""
+    encoder = _encoders.get(model)
+    if encoder is None:
+        encoder = _encoders[model] = ModelEncoder(model)
+    return encoder
+
+
+def register_encoder(model, groups: Dict[str, Sequence[str]]) -> ModelEncoder:
+    """Registra o codificador de um modelo com agrupamento (ex.: DengueNotification → CasoDengue)"""
+    encoder = _encoders[model] = ModelEncoder(model, groups)
+    return encoder
+
+
+def dumps(value: Any) -> str:
+    """JSON compacto (sem espaços e sem escapar acentos)"""
+    return _compact.encode(value)
+
+
+def iter_json_array(rows: Iterable[Dict[str, Any]], envelope: Dict[str, Any],
+                    key: str = 'data', chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[str]:
+    """
+    Gera um documento JSON com o array em `key` emitido linha a linha
+
+    Os demais campos do envelope são emitidos depois do array; o documento completo é
+    equivalente a {**envelope, key: list(rows)} sem nunca montar a lista em memória.
+    """
+    yield '{' + dumps(key) + ':['
+    buffer: List[str] = []
+    first = True
+    for row in rows:
+        buffer.append(dumps(row) if first else ',' + dumps(row))
+        first = False
+        if len(buffer) >= chunk_rows:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+    tail = ''.join(f',{dumps(name)}:{dumps(value)}' for name, value in envelope.items())
+    yield ']' + tail + '}'
+
+
+def iter_ndjson(rows: Iterable[Dict[str, Any]], chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[str]:
+    """Gera uma linha JSON por registro (application/x-ndjson)"""
+    buffer: List[str] = []
+    for row in rows:
+        buffer.append(dumps(row) + '\n')
+        if len(buffer) >= chunk_rows:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def stream_json_response(rows: Iterable[Dict[str, Any]], envelope: Dict[str, Any],
+                         status: int = 200) -> Response:
+    """Resposta HTTP em streaming com o array JSON no envelope padrão da API"""
+    return Response(stream_with_context(iter_json_array(rows, envelope)), status=status,
+                    mimetype='application/json')
+
+
+def stream_ndjson_response(rows: Iterable[Dict[str, Any]], status: int = 200) -> Response:
+    """Resposta HTTP em streaming em NDJSON"""
+    return Response(stream_with_context(iter_ndjson(rows)), status=status, mimetype='application/x-ndjson')
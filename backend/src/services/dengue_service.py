@@ -1,5 +1,501 @@
+"""
+Serviço de notificações de dengue - Camada de lógica de negócio
+Responsável por validar as notificações contra o CasoDengue e orquestrar a paginação
+"""
+import base64
+import binascii
+import os
+from datetime import date
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from flask import current_app, has_app_context
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from src.cache.response_cache import invalidate
+from src.models.dengue_notification import DengueNotification
+from src.repositories.dengue_repository import DengueRepository
+from src.repositories.stats_repository import StatsRepository
+from src.serialization.encoders import register_encoder
+from src.services.validation_service import ValidationService
+
+if TYPE_CHECKING:
+    import pyarrow as pa
 
 
 class DengueService:
-    
\ No newline at end of file
+    """Serviço para lógica de negócio de notificações de dengue"""
+
+    DEFAULT_PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 500
+    # Registros validados e inseridos por transação na carga em massa
+    BULK_CHUNK_SIZE = 1000
+    # Tratamento das duplicadas nas escritas (ver src/quality/dedup.py)
+    DUPLICATE_MODES = ('reject', 'flag')
+    DUPLICATE_ERROR = 'Notificação duplicada (mesmos agravo, datas, município, unidade, ano de nascimento e sexo)'
+    # Linhas lidas do banco por vez na exportação em streaming
+    EXPORT_BATCH_SIZE = 1000
+    GROUPS = ValidationService.GROUPS
+    ENCODER = register_encoder(DengueNotification, GROUPS)
+
+    def __init__(self):
+        self.dengue_repository = DengueRepository()
+        # O cubo de contagens é atualizado na mesma transação de cada escrita de notificação
+        self.stats_repository = StatsRepository()
+        self.validation_service = ValidationService()
+
+    def list_notifications(self, params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Lista notificações com filtros e paginação por cursor
+
+        Args:
+            params: Parâmetros da consulta (filtros, limit, cursor e layout='nested' para o
+                formato aninhado do CasoDengue)
+
+        Returns:
+            Tupla (notificações da página, cursor da próxima página ou None)
+
+        Raises:
+            ValueError: Se algum parâmetro é inválido
+        """
+        limit = self._parse_limit(params.get('limit'))
+        after = self.decode_cursor(params['cursor']) if params.get('cursor') else None
+        filters = self._parse_filters(params)
+        encode = self._layout_encoder(params)
+
+        # Busca um registro a mais para saber se existe próxima página
+        notifications = self.dengue_repository.get_page(filters, limit + 1, after)
+        next_cursor = None
+        if len(notifications) > limit:
+            notifications = notifications[:limit]
+            last = notifications[-1]
+            next_cursor = self.encode_cursor(last.dt_notific, last.id)
+
+        return [encode(self.ENCODER.to_dict(notification)) for notification in notifications], next_cursor
+
+    def export_notifications(self, params: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Exporta todas as notificações que atendem aos filtros, lidas do banco em lotes
+
+        Os parâmetros são validados antes de retornar, então erros aparecem antes do streaming.
+
+        Raises:
+            ValueError: Se algum parâmetro é inválido
+        """
+        filters = self._parse_filters(params)
+        encode = self._layout_encoder(params)
+        rows = self.dengue_repository.iter_rows(filters, self.EXPORT_BATCH_SIZE)
+        return (encode(self.ENCODER.row_to_dict(row)) for row in rows)
+
+    def _parse_filters(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        filters = {name: params.get(name) or None for name in DengueRepository.EQUALITY_FILTERS}
+        filters['dt_inicio'] = self._parse_date(params.get('dt_inicio'), 'dt_inicio')
+        filters['dt_fim'] = self._parse_date(params.get('dt_fim'), 'dt_fim')
+        return filters
+
+    def _layout_encoder(self, params: Dict[str, Any]):
+        layout = params.get('layout') or 'flat'
+        if layout == 'flat':
+            return lambda values: values
+        if layout == 'nested':
+            return self.ENCODER.nested
+        raise ValueError("layout deve ser 'flat' ou 'nested'")
+
+    def get_notification_by_id(self, notification_id: int) -> Optional[Dict[str, Any]]:
+        """Retorna uma notificação pelo ID"""
+        notification = self.dengue_repository.get_by_id(notification_id)
+        return notification.to_dict() if notification else None
+
+    def create_notification(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Cria uma nova notificação validada contra o CasoDengue
+
+        Args:
+            data: Notificação no formato plano do formulário ou no formato aninhado do CasoDengue
+
+        Returns:
+            Dicionário com a notificação criada
+
+        Raises:
+            ValueError: Se os dados não passam na validação do CasoDengue ou se a notificação já
+                foi carregada (índice de duplicadas ativo e DEDUP_MODE 'reject')
+        """
+        values = self.validate(data)
+        mode = self._duplicates_mode(None)
+        key = self._claim([values], mode)[0]
+        if key is None and mode == 'reject':
+            raise ValueError(self.DUPLICATE_ERROR)
+
+        def create(fingerprint: Optional[int]) -> DengueNotification:
+            self.stats_repository.apply(self.stats_repository.deltas(added=[values]))
+            return self.dengue_repository.create(DengueNotification(**values), fingerprint)
+
+        created, key = self._write(create, key, mode)
+        self._after_write()
+        self._index_fingerprints([key])
+        return created.to_dict()
+
+    def bulk_create(self, records: Iterable[Tuple[int, Any]], duplicates: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Valida e insere uma carga de notificações em lotes
+
+        Cada lote de BULK_CHUNK_SIZE registros é validado de uma vez contra o CasoDengue e os
+        válidos são inseridos em uma única transação. Um registro inválido é apenas reportado e
+        não interrompe a carga.
+
+        Args:
+            records: Pares (número do registro, notificação); o segundo item pode ser o
+                ValueError da leitura quando o registro não pôde ser interpretado
+            duplicates: Tratamento das notificações já carregadas ('reject' ou 'flag'; padrão: DEDUP_MODE)
+
+        Returns:
+            Relatório com os totais e os erros por registro
+
+        Raises:
+            ValueError: Se duplicates não é um dos modos aceitos
+        """
+        mode = self._duplicates_mode(duplicates)
+        report = self._new_report()
+        chunk = []
+
+        for row, record in records:
+            report['received'] += 1
+            if isinstance(record, Exception):
+                report['errors'].append({'row': row, 'error': str(record)})
+            else:
+                chunk.append((row, record))
+
+            if len(chunk) >= self.BULK_CHUNK_SIZE:
+                self._validate_chunk(chunk, report, mode)
+                chunk = []
+
+        self._validate_chunk(chunk, report, mode)
+        return self._close_report(report)
+
+    def bulk_create_batches(self, batches: Iterable['pa.RecordBatch'],
+                            duplicates: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Valida e insere uma carga colunar (lotes Arrow) de notificações
+
+        As restrições do CasoDengue são verificadas sobre as colunas de cada lote, sem instanciar
+        o modelo para as linhas válidas. Os registros são numerados a partir de 1 na carga.
+
+        Returns:
+            Relatório com os totais e os erros por registro
+        """
+        mode = self._duplicates_mode(duplicates)
+        report = self._new_report()
+        offset = 0
+
+        for batch in batches:
+            for start in range(0, batch.num_rows, self.BULK_CHUNK_SIZE):
+                chunk = batch.slice(start, self.BULK_CHUNK_SIZE)
+                values, errors = self.validation_service.validate_batch(chunk)
+                first = offset + start + 1
+                self._collect(range(first, first + chunk.num_rows), values, errors, report, mode)
+            offset += batch.num_rows
+
+        report['received'] = offset
+        return self._close_report(report)
+
+    @staticmethod
+    def _new_report() -> Dict[str, Any]:
+        return {'received': 0, 'inserted': 0, 'rejected': 0, 'errors': [], 'duplicates': []}
+
+    @staticmethod
+    def _close_report(report: Dict[str, Any]) -> Dict[str, Any]:
+        report['rejected'] = len(report['errors'])
+        report['errors'].sort(key=lambda error: error['row'])
+        report['duplicates'].sort()
+        return report
+
+    def _validate_chunk(self, chunk: List[Tuple[int, Dict[str, Any]]], report: Dict[str, Any],
+                        mode: Optional[str] = None) -> None:
+        """Valida um lote de registros com uma única chamada ao TypeAdapter e insere os válidos"""
+        if not chunk:
+            return
+        values, errors = self.validation_service.validate_many([record for _, record in chunk])
+        self._collect([row for row, _ in chunk], values, errors, report, mode)
+
+    def _collect(self, rows: Iterable[int], values: List[Optional[Dict[str, Any]]],
+                 errors: Dict[int, str], report: Dict[str, Any], mode: Optional[str] = None) -> None:
+        """Reporta os erros de validação de um lote e insere os registros válidos"""
+        valid = []
+        for position, row in enumerate(rows):
+            if position in errors:
+                report['errors'].append({'row': row, 'error': errors[position]})
+            elif values[position] is not None:
+                valid.append((row, values[position]))
+        self._insert_chunk(*self._deduplicate(valid, report, mode), report, mode)
+
+    def _deduplicate(self, chunk: List[Tuple[int, Dict[str, Any]]], report: Dict[str, Any], mode: Optional[str]
+                     ) -> Tuple[List[Tuple[int, Dict[str, Any]]], Optional[List[Optional[int]]]]:
+        """
+        Compara o lote validado com as notificações já gravadas (e consigo mesmo)
+
+        As duplicadas vão para report['duplicates']; com 'reject', também para os erros, e não são
+        inseridas; com 'flag', são inseridas sem impressão digital.
+
+        Returns:
+            Tupla (registros a inserir, impressão digital de cada um ou None sem o índice ativo)
+        """
+        if mode is None or not chunk:
+            return chunk, None
+        keys = self._claim([values for _, values in chunk], mode)
+        kept, kept_keys = [], []
+        for (row, values), key in zip(chunk, keys):
+            if key is None:
+                report['duplicates'].append(row)
+            if key is None and mode == 'reject':
+                report['errors'].append({'row': row, 'error': self.DUPLICATE_ERROR})
+            else:
+                kept.append((row, values))
+                kept_keys.append(key)
+        return kept, kept_keys
+
+    def _claim(self, batch: List[Dict[str, Any]], mode: Optional[str],
+               exclude_id: Optional[int] = None) -> List[Optional[int]]:
+        """
+        Impressão digital de cada notificação do lote, ou None para as duplicadas
+
+        Duplicada é a notificação cuja impressão já pertence a outra gravada no banco, ou que se repete
+        antes no lote. O índice em disco é só a frente da consulta: o banco é consultado apenas para
+        as impressões que o filtro de Bloom e a tabela hash já viram, e notificações removidas ou
+        alteradas deixam de contar mesmo continuando no índice. Sem o índice ativo, retorna None
+        para todas (nenhuma impressão é gravada).
+        """
+        if mode is None:
+            return [None] * len(batch)
+        # PyArrow e NumPy só são importados quando o índice de duplicadas está configurado
+        import numpy as np
+
+        from src.quality.dedup import FINGERPRINT_FIELDS, fingerprint, get_index
+        from src.schema.registry import records_batch
+
+        keys = fingerprint(records_batch(batch, FINGERPRINT_FIELDS))
+        unique, first = np.unique(keys, return_index=True)
+        seen = unique[get_index(self._setting('DEDUP_INDEX_PATH')).check(unique, add=False)]
+        # O banco guarda o uint64 como BIGINT com sinal
+        signed = keys.view(np.int64).tolist()
+        existing = self.dengue_repository.existing_fingerprints(seen.view(np.int64).tolist(), exclude_id)
+        repeated = np.ones(len(keys), dtype=bool)
+        repeated[first] = False
+        return [None if repeat or key in existing else key for key, repeat in zip(signed, repeated.tolist())]
+
+    def _write(self, write: Callable[[Optional[int]], Any], key: Optional[int], mode: Optional[str],
+               exclude_id: Optional[int] = None) -> Tuple[Any, Optional[int]]:
+        """
+        Executa a escrita com a impressão digital na mesma transação
+
+        Se a chave primária da impressão recusa a escrita, a mesma notificação foi gravada por outra
+        requisição depois de _claim: com 'reject', ValueError; com 'flag', a escrita é refeita sem
+        impressão.
+
+        Returns:
+            Tupla (resultado da escrita, impressão gravada)
+        """
+        try:
+            return write(key), key
+        except IntegrityError:
+            if key is None or not self.dengue_repository.existing_fingerprints([key], exclude_id):
+                raise
+            if mode == 'reject':
+                raise ValueError(self.DUPLICATE_ERROR)
+            return write(None), None
+
+    def _duplicates_mode(self, value: Optional[str]) -> Optional[str]:
+        """Modo de tratamento das duplicadas da carga; None quando o índice não está configurado"""
+        if not self._setting('DEDUP_INDEX_PATH'):
+            return None
+        mode = value or self._setting('DEDUP_MODE') or 'reject'
+        if mode not in self.DUPLICATE_MODES:
+            raise ValueError(f"duplicates deve ser um de {', '.join(self.DUPLICATE_MODES)}")
+        return mode
+
+    def _insert_chunk(self, chunk: List[Tuple[int, Dict[str, Any]]], keys: Optional[List[Optional[int]]],
+                      report: Dict[str, Any], mode: Optional[str] = None) -> None:
+        """
+        Insere um lote validado com as impressões digitais; se o banco recusar o lote, insere
+        registro a registro (uma impressão gravada por outra carga no meio do caminho vira duplicada)
+        """
+        if not chunk:
+            return
+        batch = [values for _, values in chunk]
+        try:
+            self.stats_repository.apply(self.stats_repository.deltas(added=batch))
+            report['inserted'] += self.dengue_repository.create_many(batch, keys)
+            self._after_write()
+            self._after_insert(batch, keys)
+            return
+        except SQLAlchemyError:
+            pass
+
+        inserted, stored = [], []
+        for position, (row, values) in enumerate(chunk):
+            def create(fingerprint: Optional[int], values=values) -> int:
+                self.stats_repository.apply(self.stats_repository.deltas(added=[values]))
+                return self.dengue_repository.create_many([values], [fingerprint])
+
+            key = keys[position] if keys is not None else None
+            try:
+                count, stored_key = self._write(create, key, mode)
+            except ValueError as e:
+                report['duplicates'].append(row)
+                report['errors'].append({'row': row, 'error': str(e)})
+                continue
+            except SQLAlchemyError as e:
+                report['errors'].append({'row': row, 'error': str(getattr(e, 'orig', None) or e)})
+                continue
+            if key is not None and stored_key is None:
+                report['duplicates'].append(row)
+            report['inserted'] += count
+            self._after_write()
+            inserted.append(values)
+            stored.append(stored_key)
+        self._after_insert(inserted, stored)
+
+    def update_notification(self, notification_id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Atualiza uma notificação existente (os campos não enviados são mantidos)
+
+        Returns:
+            Dicionário com a notificação atualizada ou None se não encontrada
+
+        Raises:
+            ValueError: Se o resultado não passa na validação do CasoDengue ou se coincide com outra
+                notificação já carregada (índice de duplicadas ativo e DEDUP_MODE 'reject')
+        """
+        notification = self.dengue_repository.get_by_id(notification_id)
+        if not notification:
+            return None
+
+        current = notification.to_dict()
+        current.pop('id')
+        previous = dict(current)
+        current.update(self.flatten(data))
+        values = self.validate(current)
+        # A impressão digital acompanha os campos novos; a da própria notificação não conta como duplicada
+        mode = self._duplicates_mode(None)
+        key = self._claim([values], mode, exclude_id=notification_id)[0]
+        if key is None and mode == 'reject':
+            raise ValueError(self.DUPLICATE_ERROR)
+
+        def update(fingerprint: Optional[int]) -> DengueNotification:
+            self.stats_repository.apply(self.stats_repository.deltas(removed=[previous], added=[values]))
+            for name, value in values.items():
+                setattr(notification, name, value)
+            return self.dengue_repository.update(notification, fingerprint)
+
+        updated, key = self._write(update, key, mode, exclude_id=notification_id)
+        self._after_write()
+        self._index_fingerprints([key])
+        return updated.to_dict()
+
+    def delete_notification(self, notification_id: int) -> bool:
+        """
+        Remove uma notificação
+
+        Returns:
+            True se a notificação foi removida, False se não foi encontrada
+        """
+        notification = self.dengue_repository.get_by_id(notification_id)
+        if not notification:
+            return False
+
+        deltas = self.stats_repository.deltas(removed=[notification.to_dict()])
+        self.stats_repository.apply(deltas)
+        self.dengue_repository.delete(notification)
+        self._after_write()
+        return True
+
+    @staticmethod
+    def revision() -> int:
+        """Revisão do cubo de contagens, avançada na transação de cada escrita (ver cached)"""
+        return StatsRepository.revision()
+
+    @staticmethod
+    def _after_write() -> None:
+        """
+        Depois do commit (que já avançou a revisão do cubo), invalida o cache de respostas do processo
+
+        Os motores de incidência e de alertas e o cache dos outros workers não precisam de aviso:
+        eles seguem a revisão do cubo guardada no banco.
+        """
+        invalidate('dengue', 'stats')
+
+    @staticmethod
+    def _setting(name: str) -> Any:
+        return current_app.config.get(name) if has_app_context() else None
+
+    def _after_insert(self, batch: List[Dict[str, Any]], keys: Optional[List[Optional[int]]]) -> None:
+        """Depois de uma inserção em massa, atualiza o índice de duplicadas e as tabelas de imputação"""
+        if not batch:
+            return
+        self._index_fingerprints(keys)
+        self._update_imputer(batch)
+
+    def _index_fingerprints(self, keys: Optional[List[Optional[int]]]) -> None:
+        """Acrescenta ao índice em disco as impressões gravadas, para a frente de _claim conhecê-las"""
+        stored = [key for key in keys or () if key is not None]
+        if not stored:
+            return
+        import numpy as np
+
+        from src.quality.dedup import get_index
+
+        get_index(self._setting('DEDUP_INDEX_PATH')).add(np.array(stored, dtype=np.int64).view(np.uint64))
+
+    def _update_imputer(self, batch: List[Dict[str, Any]]) -> None:
+        """
+        Soma as notificações inseridas em massa às tabelas de imputação pela moda (IMPUTER_PATH)
+
+        Só atualiza tabelas já montadas por python -m src.ml impute; sem o arquivo, não faz nada.
+        """
+        path = self._setting('IMPUTER_PATH')
+        if not batch or not path or not os.path.exists(path):
+            return
+        # pyarrow só é importado quando há tabelas de imputação para atualizar
+        from src.ml.imputer import ModeImputer
+
+        ModeImputer.accumulate(path, batch)
+
+    # A validação contra o CasoDengue (unitária e em lote) fica no ValidationService
+    validate = ValidationService.validate
+    flatten = ValidationService.flatten
+    nest = ValidationService.nest
+    format_errors = ValidationService.format_errors
+
+    @staticmethod
+    def encode_cursor(dt_notific: date, notification_id: int) -> str:
+        """Codifica a chave (dt_notific, id) em um cursor opaco"""
+        raw = f"{dt_notific.isoformat()}:{notification_id}".encode('ascii')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[date, int]:
+        """Decodifica um cursor gerado por encode_cursor"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('ascii')
+            dt_notific, notification_id = raw.split(':')
+            return date.fromisoformat(dt_notific), int(notification_id)
+        except (binascii.Error, UnicodeError, ValueError):
+            raise ValueError("Cursor de paginação inválido") from None
+
+    def _parse_limit(self, value: Any) -> int:
+        if value in (None, ''):
+            return self.DEFAULT_PAGE_SIZE
+        try:
+            limit = int(value)
+        except (TypeError, ValueError):
+            raise ValueError("limit deve ser um número inteiro") from None
+        if limit < 1 or limit > self.MAX_PAGE_SIZE:
+            raise ValueError(f"limit deve estar entre 1 e {self.MAX_PAGE_SIZE}")
+        return limit
+
+    @staticmethod
+    def _parse_date(value: Any, name: str) -> Optional[date]:
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"{name} deve estar no formato AAAA-MM-DD") from None
@@ -0,0 +1,104 @@
+"""
+Serviço de pontuação do risco de desfecho - Camada de lógica de negócio
+Pontua notificações do formulário com o modelo exportado pelo treino, reunindo as requisições
+concorrentes de um registro em micro-lotes e medindo a latência da pontuação
+"""
+import time
+from typing import Any, Dict, List, Optional
+
+from flask import current_app, has_app_context
+
+from src.ml.batching import DEFAULT_LATENCY_WINDOW, LatencyTracker, MicroBatcher
+from src.services.validation_service import ValidationService
+
+
+class PredictionService:
+    """Serviço para pontuação do risco de óbito (evolucao) de notificações de dengue"""
+
+    DEFAULT_MAX_RECORDS = 1000
+
+    def __init__(self):
+        # Modelo e micro-lote são criados no primeiro uso, com a configuração da aplicação
+        self._batcher: Optional[MicroBatcher] = None
+        self._model_path: Optional[str] = None
+        self.batch_latency = LatencyTracker(DEFAULT_LATENCY_WINDOW)
+
+    @staticmethod
+    def _config(name: str, default: Any = None) -> Any:
+        return current_app.config.get(name, default) if has_app_context() else default
+
+    def load_model(self):
+        """Modelo exportado (PREDICTION_MODEL_PATH), carregado na primeira pontuação e mantido no processo"""
+        # scikit-learn e NumPy são importados aqui, fora da inicialização da aplicação
+        from src.ml.model import DEFAULT_MODEL_PATH, get_model
+
+        if self._model_path is None:
+            # Resolvido na requisição: a thread do micro-lote não tem contexto de aplicação
+            self._model_path = self._config('PREDICTION_MODEL_PATH') or DEFAULT_MODEL_PATH
+        return get_model(self._model_path)
+
+    @property
+    def batcher(self) -> MicroBatcher:
+        if self._batcher is None:
+            self._batcher = MicroBatcher(
+                self._score,
+                max_batch_size=int(self._config('PREDICTION_MAX_BATCH_SIZE', 64)),
+                max_wait=float(self._config('PREDICTION_MAX_WAIT_MS', 5)) / 1000,
+                latency_window=int(self._config('PREDICTION_LATENCY_WINDOW', DEFAULT_LATENCY_WINDOW)),
+            )
+        return self._batcher
+
+    def _score(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return self.load_model().score(records)
+
+    def predict(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Pontua uma notificação (formato plano do formulário ou aninhado do CasoDengue)
+
+        A chamada entra no micro-lote do processo e é pontuada junto com as requisições
+        concorrentes, na mesma chamada vetorizada ao modelo.
+
+        Raises:
+            ValueError: Se a notificação não é um objeto
+            FileNotFoundError: Se o modelo não foi exportado
+        """
+        record = self._record(data)
+        # Carregado aqui, e não na thread do micro-lote, para que a falta do arquivo seja o erro desta requisição
+        self.load_model()
+        return self.batcher.submit(record)
+
+    def predict_many(self, records: Any) -> List[Dict[str, Any]]:
+        """
+        Pontua uma lista de notificações em uma única chamada ao modelo
+
+        Raises:
+            ValueError: Se a lista está vazia, excede PREDICTION_MAX_RECORDS ou tem itens que não são objetos
+        """
+        if isinstance(records, dict):
+            records = records.get('notifications')
+        if not isinstance(records, list) or not records:
+            raise ValueError("Envie uma lista de notificações (ou um objeto com 'notifications')")
+        limit = int(self._config('PREDICTION_MAX_RECORDS', self.DEFAULT_MAX_RECORDS))
+        if len(records) > limit:
+            raise ValueError(f"Máximo de {limit} notificações por requisição")
+
+        cleaned = [self._record(record, position) for position, record in enumerate(records, start=1)]
+        started = time.perf_counter()
+        scores = self._score(cleaned)
+        self.batch_latency.record(time.perf_counter() - started)
+        return scores
+
+    def latency(self) -> Dict[str, Any]:
+        """Latências p50/p99 da pontuação: individual (com a espera do micro-lote) e em lote"""
+        return {
+            'predict': self.batcher.stats(),
+            'batch': self.batch_latency.summary(),
+        }
+
+    @staticmethod
+    def _record(data: Any, position: Optional[int] = None) -> Dict[str, Any]:
+        if not isinstance(data, dict):
+            where = f" (item {position})" if position is not None else ''
+            raise ValueError(f"A notificação deve ser um objeto JSON{where}")
+        flat = ValidationService.flatten(data)
+        return {key: ValidationService._blank_to_none(value) for key, value in flat.items()}
@@ -0,0 +1,174 @@
+"""
+Serviço de estatísticas de notificações - Camada de lógica de negócio
+Responsável por validar os parâmetros e consultar o cubo pré-agregado
+"""
+from typing import Any, Dict, List, Optional
+
+from flask import current_app, has_app_context
+
+from src.cache.response_cache import invalidate
+from src.repositories.stats_repository import StatsRepository
+
+
+class StatsService:
+    """Serviço para consultas agregadas de notificações de dengue"""
+
+    # Com mais semanas alteradas que isso, o ano inteiro é recarregado em uma só consulta ao cubo
+    YEAR_RELOAD_WEEKS = 8
+
+    def __init__(self):
+        self.stats_repository = StatsRepository()
+
+    def get_counts(self, params: Dict[str, Any], group_by: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Conta notificações agrupadas por dimensões do cubo
+
+        Args:
+            params: Filtros por dimensão, intervalo de semanas (sem_inicio, sem_fim) e,
+                se group_by não for informado, o parâmetro group_by separado por vírgulas
+            group_by: Dimensões do agrupamento
+
+        Returns:
+            Lista de grupos com a contagem em 'total'
+
+        Raises:
+            ValueError: Se alguma dimensão ou semana é inválida
+        """
+        if group_by is None:
+            group_by = [name.strip() for name in (params.get('group_by') or '').split(',') if name.strip()]
+        invalid = [name for name in group_by if name not in StatsRepository.DIMENSIONS]
+        if invalid:
+            raise ValueError(f"Dimensões inválidas: {', '.join(invalid)}. "
+                             f"Use {', '.join(StatsRepository.DIMENSIONS)}")
+
+        filters = {name: params.get(name) or None for name in StatsRepository.DIMENSIONS}
+        for name in ('sem_inicio', 'sem_fim'):
+            filters[name] = self._parse_week(params.get(name), name)
+
+        return self.stats_repository.get_counts(list(dict.fromkeys(group_by)), filters)
+
+    def get_incidence(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Incidência por 100 mil habitantes de uma semana epidemiológica
+
+        Args:
+            params: sem_not (AAAASS, obrigatório), level (municipio, uf ou brasil) e
+                with_cases ('true' para omitir unidades sem casos na semana)
+
+        Raises:
+            ValueError: Se a semana ou o nível são inválidos
+        """
+        # Motor de incidência (NumPy) importado na primeira consulta, fora da inicialização
+        from src.analytics.incidence import LEVELS, get_default_engine, split_sem_not
+
+        if not params.get('sem_not'):
+            raise ValueError("sem_not é obrigatório")
+        year, week = split_sem_not(params['sem_not'])
+        level = params.get('level') or 'municipio'
+        if level not in LEVELS:
+            raise ValueError(f"Nível inválido: '{level}'. Use {', '.join(LEVELS)}")
+
+        engine = get_default_engine(self._setting('POPULACAO_PATH'))
+        self._refresh(engine)
+        for history_year in engine.history_years(year, week):
+            self._sync_engine(engine, history_year)
+        result = engine.week(year, week, level)
+        only_with_cases = str(params.get('with_cases', '')).lower() in ('1', 'true', 'sim')
+        return {
+            'sem_not': result.sem_not,
+            'level': level,
+            'units': result.to_records(only_with_cases),
+        }
+
+    def get_alerts(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Alertas de surto por município em uma semana epidemiológica
+
+        Args:
+            params: sem_not (AAAASS, obrigatório), method (quartis ou media) e
+                alerts_only ('false' para listar todos os municípios, não só os em alerta)
+
+        Raises:
+            ValueError: Se a semana ou o método são inválidos
+        """
+        # Motor de alertas (NumPy) importado na primeira consulta, fora da inicialização
+        from src.analytics.incidence import split_sem_not
+        from src.analytics.outbreak import METHODS, get_default_engine
+
+        if not params.get('sem_not'):
+            raise ValueError("sem_not é obrigatório")
+        year, week = split_sem_not(params['sem_not'])
+        method = params.get('method') or 'quartis'
+        if method not in METHODS:
+            raise ValueError(f"Método inválido: '{method}'. Use {', '.join(METHODS)}")
+
+        engine = get_default_engine()
+        self._refresh(engine)
+        for history_year in engine.history_years(year, method):
+            self._sync_engine(engine, history_year)
+        result = engine.alerts(year, week, method)
+        only_alerts = str(params.get('alerts_only', '')).lower() not in ('0', 'false', 'nao', 'não')
+        return {
+            'sem_not': result.sem_not,
+            'method': method,
+            'alerts': int(result.alerta.sum()),
+            'units': result.to_records(only_alerts),
+        }
+
+    @staticmethod
+    def _setting(name: str) -> Any:
+        return current_app.config.get(name) if has_app_context() else None
+
+    @staticmethod
+    def revision() -> int:
+        """Revisão do cubo de contagens, avançada na transação de cada escrita (ver cached)"""
+        return StatsRepository.revision()
+
+    def _refresh(self, engine) -> None:
+        """
+        Marca no motor as semanas alteradas desde a revisão do cubo que ele já reflete
+
+        A revisão fica no banco e avança na transação de cada escrita, então escritas feitas por
+        outro worker do Gunicorn ou pelo rebuild-stats também chegam às contagens deste processo.
+        """
+        revision = self.stats_repository.revision()
+        if engine.revision is not None and revision < engine.revision:
+            # Banco recriado: as revisões recomeçaram
+            engine.clear()
+        elif engine.revision is not None and revision != engine.revision:
+            engine.mark_stale(self.stats_repository.changed_weeks(engine.revision))
+        engine.revision = revision
+
+    def _sync_engine(self, engine, year: int) -> None:
+        """Carrega o ano do cubo na primeira consulta e, depois, só as semanas alteradas"""
+        stale = engine.stale_weeks(year)
+        if not engine.has_year(year) or len(stale) > self.YEAR_RELOAD_WEEKS:
+            rows = self.stats_repository.get_counts(
+                ['sem_not', 'id_municip'], {'sem_inicio': f'{year}01', 'sem_fim': f'{year}53'}
+            )
+            engine.set_year(year, [row['sem_not'] for row in rows], [row['id_municip'] for row in rows],
+                            [row['total'] for row in rows])
+            return
+
+        for week in stale:
+            rows = self.stats_repository.get_counts(['id_municip'], {'sem_not': f'{year}{week:02d}'})
+            engine.set_week(year, week, [row['id_municip'] for row in rows], [row['total'] for row in rows])
+
+    def rebuild(self) -> int:
+        """
+        Recalcula o cubo a partir das notificações (carga inicial ou correção)
+
+        Todas as semanas mudam de revisão, então os motores de todos os processos as recarregam.
+        """
+        cells = self.stats_repository.rebuild()
+        invalidate('stats')
+        return cells
+
+    @staticmethod
+    def _parse_week(value: Any, name: str) -> Optional[str]:
+        if not value:
+            return None
+        value = str(value).strip()
+        if len(value) != 6 or not value.isdigit() or not 1 <= int(value[4:]) <= 53:
+            raise ValueError(f"{name} deve estar no formato AAAASS (ex.: 202401)")
+        return value
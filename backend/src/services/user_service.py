@@ -3,8 +3,10 @@ Serviço de usuários - Camada de lógica de negócio
 Responsável por implementar as regras de negócio e validações
 """
 from typing import List, Optional, Dict, Any
+from src.cache.response_cache import invalidate
 from src.models.user import User
 from src.repositories.user_repository import UserRepository
+from src.serialization.encoders import get_encoder
 
 
 class UserService:
@@ -16,7 +18,8 @@ class UserService:
     def get_all_users(self) -> List[Dict[str, Any]]:
         """Retorna todos os usuários como dicionários"""
         users = self.user_repository.get_all()
-        return [user.to_dict() for user in users]
+        encoder = get_encoder(User)
+        return [encoder.to_dict(user) for user in users]
     
     def get_user_by_id(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Retorna um usuário pelo ID"""
@@ -39,13 +42,8 @@ class UserService:
         # Validações de negócio
         self._validate_user_data(user_data)
         
-        # Verificar se username já existe
-        if self.user_repository.exists_by_username(user_data['username']):
-            raise ValueError(f"Nome de usuário '{user_data['username']}' já existe")
-        
-        # Verificar se email já existe
-        if self.user_repository.exists_by_email(user_data['email']):
-            raise ValueError(f"Email '{user_data['email']}' já está em uso")
+        # Verificar username e email já existentes em uma única consulta
+        self._check_conflicts(user_data)
         
         # Criar o usuário
         user = User(
@@ -54,6 +52,7 @@ class UserService:
         )
         
         created_user = self.user_repository.create(user)
+        invalidate('users')
         return created_user.to_dict()
     
     def update_user(self, user_id: int, user_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -77,21 +76,19 @@ class UserService:
         # Validar apenas os campos que estão sendo atualizados
         if 'username' in user_data:
             self._validate_username(user_data['username'])
-            # Verificar se o novo username já existe (exceto para o próprio usuário)
-            existing_user = self.user_repository.get_by_username(user_data['username'])
-            if existing_user and existing_user.id != user_id:
-                raise ValueError(f"Nome de usuário '{user_data['username']}' já existe")
-            user.username = user_data['username']
-        
         if 'email' in user_data:
             self._validate_email(user_data['email'])
-            # Verificar se o novo email já existe (exceto para o próprio usuário)
-            existing_user = self.user_repository.get_by_email(user_data['email'])
-            if existing_user and existing_user.id != user_id:
-                raise ValueError(f"Email '{user_data['email']}' já está em uso")
+        
+        # Verificar se o novo username/email já existe (exceto para o próprio usuário)
+        self._check_conflicts(user_data, exclude_id=user_id)
+        
+        if 'username' in user_data:
+            user.username = user_data['username']
+        if 'email' in user_data:
             user.email = user_data['email']
         
         updated_user = self.user_repository.update(user)
+        invalidate('users')
         return updated_user.to_dict()
     
     def delete_user(self, user_id: int) -> bool:
@@ -109,8 +106,24 @@ class UserService:
             return False
         
         self.user_repository.delete(user)
+        invalidate('users')
         return True
     
+    @staticmethod
+    def revision() -> int:
+        """Revisão dos usuários, avançada na transação de cada escrita (ver cached)"""
+        return UserRepository.revision()
+    
+    def _check_conflicts(self, user_data: Dict[str, Any], exclude_id: Optional[int] = None) -> None:
+        """Verifica as restrições de unicidade de username e email com uma consulta"""
+        conflicts = self.user_repository.find_conflicts([user_data], exclude_id=exclude_id)
+        
+        if 'username' in conflicts:
+            raise ValueError(f"Nome de usuário '{user_data['username']}' já existe")
+        
+        if 'email' in conflicts:
+            raise ValueError(f"Email '{user_data['email']}' já está em uso")
+    
     def _validate_user_data(self, user_data: Dict[str, Any]) -> None:
         """Valida os dados completos do usuário"""
         if not user_data.get('username'):
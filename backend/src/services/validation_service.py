@@ -0,0 +1,291 @@
+"""
+Serviço de validação de notificações - Camada de lógica de negócio
+Valida lotes inteiros contra o CasoDengue: registros (dicionários) por um TypeAdapter da lista,
+construído uma vez por processo, e dados colunares (Arrow) com as mesmas restrições verificadas
+de forma vetorizada, validando pelo modelo apenas as linhas que falham
+"""
+import typing
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import AfterValidator, TypeAdapter, ValidationError
+from typing_extensions import Annotated, TypedDict
+
+from src.models.caso_dengue import CasoDengue
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+    from src.schema.registry import SchemaRegistry
+
+
+# Resultado de um lote: valores planos alinhados à entrada (None quando inválido) e erros por posição
+BatchResult = Tuple[List[Optional[Dict[str, Any]]], Dict[int, str]]
+
+# Campos com código de município validado contra o índice compilado
+MUNICIPIO_FIELDS = ('id_municip', 'id_mn_resi')
+
+# Anos que o registro guarda como inteiro, mas que o CasoDengue valida como texto
+_YEAR_FIELDS = ('nu_ano', 'ano_nasc')
+
+
+def _submodel(group_field) -> type:
+    """Sub-modelo de um grupo do CasoDengue (sem o Optional)"""
+    return next(arg for arg in typing.get_args(group_field.annotation) or (group_field.annotation,)
+                if arg is not type(None))
+
+
+def _submodel_fields(model=CasoDengue) -> Dict[str, List[str]]:
+    """Campos de cada sub-modelo do CasoDengue, na ordem da ficha"""
+    return {group: list(_submodel(field).model_fields) for group, field in model.model_fields.items()}
+
+
+def _record_type(model=CasoDengue) -> type:
+    """
+    TypedDict plano com os campos de todos os sub-modelos do CasoDengue
+
+    Cada campo leva a anotação, as restrições e os field_validators do sub-modelo, então o
+    TypedDict aceita e recusa os mesmos valores, mas a validação produz um dicionário plano em
+    vez de instanciar nove modelos por notificação.
+    """
+    annotations = {}
+    for group_field in model.model_fields.values():
+        submodel = _submodel(group_field)
+        validators = submodel.__pydantic_decorators__.field_validators.values()
+        for name, field in submodel.model_fields.items():
+            annotation = field.annotation
+            if field.metadata:
+                annotation = Annotated[(annotation, *field.metadata)]
+            for validator in validators:
+                if name not in validator.info.fields:
+                    continue
+                if validator.info.mode != 'after':
+                    raise TypeError(f"Validador '{validator.cls_var_name}' sem equivalente no lote: "
+                                    f"modo '{validator.info.mode}'")
+                annotation = Annotated[annotation, AfterValidator(getattr(submodel, validator.cls_var_name))]
+            annotations[name] = annotation
+    return TypedDict(f'{model.__name__}Record', annotations)
+
+
+def _is_text(arrow_type: 'pa.DataType') -> bool:
+    """Se a coluna de origem é texto (ou dicionário de texto)"""
+    import pyarrow as pa
+
+    if pa.types.is_dictionary(arrow_type):
+        arrow_type = arrow_type.value_type
+    return pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)
+
+
+@lru_cache(maxsize=None)
+def get_batch_adapter() -> TypeAdapter:
+    """TypeAdapter da lista de notificações planas; o validador é compilado uma única vez por processo"""
+    return TypeAdapter(List[_record_type()])
+
+
+class ValidationService:
+    """Serviço para validação em lote de notificações de dengue"""
+
+    # Campos de cada sub-modelo do CasoDengue, na ordem da ficha
+    GROUPS = _submodel_fields()
+    FIELDS = [name for fields in GROUPS.values() for name in fields]
+
+    def __init__(self, registry: 'SchemaRegistry' = None):
+        # O registro (PyArrow) e o TypeAdapter são criados no primeiro uso, não na inicialização
+        self._registry = registry
+
+    @property
+    def registry(self) -> 'SchemaRegistry':
+        if self._registry is None:
+            from src.schema.registry import get_registry
+            self._registry = get_registry()
+        return self._registry
+
+    @property
+    def adapter(self) -> TypeAdapter:
+        return get_batch_adapter()
+
+    def validate_many(self, records: Sequence[Dict[str, Any]]) -> BatchResult:
+        """
+        Valida uma lista de notificações com uma única chamada ao TypeAdapter
+
+        Quando algum registro falha, os erros são separados por posição e apenas os registros
+        válidos são validados de novo. O resultado é o mesmo de validate, registro a registro.
+
+        Args:
+            records: Notificações no formato plano do formulário ou no formato aninhado do CasoDengue
+
+        Returns:
+            Tupla (valores planos alinhados à entrada, com None nos inválidos; erros por posição)
+        """
+        fields = self.FIELDS
+        cleaned = []
+        for record in records:
+            flat = self.flatten(record)
+            cleaned.append({name: self._blank_to_none(flat.get(name)) for name in fields})
+        values: List[Optional[Dict[str, Any]]] = [None] * len(cleaned)
+        errors: Dict[int, str] = {}
+
+        try:
+            validated = self.adapter.validate_python(cleaned)
+            positions = range(len(cleaned))
+        except ValidationError as e:
+            errors = self._errors_by_position(e)
+            positions = [position for position in range(len(cleaned)) if position not in errors]
+            validated = self.adapter.validate_python([cleaned[position] for position in positions])
+
+        for position, row in zip(positions, validated):
+            values[position] = row
+        return values, errors
+
+    def validate_batch(self, batch: 'pa.RecordBatch') -> BatchResult:
+        """
+        Valida um lote Arrow de forma vetorizada
+
+        Verifica sobre as colunas as restrições do CasoDengue: campos obrigatórios preenchidos,
+        datas e inteiros que o registro de schema consegue converter, campos de texto lidos como
+        texto e códigos de município existentes no índice. Só as linhas reprovadas passam pelo
+        modelo, que dá a mensagem de erro (e tem a palavra final sobre a linha).
+
+        Args:
+            batch: Lote com as colunas em maiúsculo (SINAN) ou minúsculo, tipadas ou não
+
+        Returns:
+            Tupla (valores planos alinhados ao lote, com None nos inválidos; erros por posição)
+        """
+        import numpy as np
+        import pyarrow as pa
+
+        from src.geo.municipios import get_default_index
+        from src.schema.registry import null_mask, present_mask
+
+        batch = batch.rename_columns([name.lower() for name in batch.schema.names])
+        typed = self.registry.cast_batch(batch)
+        for name in _YEAR_FIELDS:
+            position = typed.schema.get_field_index(name)
+            if position >= 0:
+                typed = typed.set_column(position, name, typed.column(position).cast(pa.string()))
+
+        failed = np.zeros(batch.num_rows, dtype=bool)
+        # Campos de texto cuja coluna de origem não é texto: o valor da origem vai para o modelo
+        raw = set()
+        index = get_default_index()
+        for spec in self.registry.specs:
+            position = batch.schema.get_field_index(spec.field)
+            if position < 0:
+                failed |= not spec.nullable
+                continue
+
+            column = typed.column(position)
+            if not spec.nullable:
+                failed |= null_mask(column)
+            if not pa.types.is_dictionary(spec.arrow_type):
+                # Data ou inteiro preenchido na origem que o registro não conseguiu converter
+                failed |= null_mask(column) & present_mask(batch.column(position))
+            elif not _is_text(batch.column(position).type):
+                # O registro converte números em texto, mas o modelo só aceita texto
+                failed |= present_mask(batch.column(position))
+                raw.add(spec.field)
+            if spec.field in MUNICIPIO_FIELDS and index is not None:
+                failed |= (index.positions(column) < 0) & ~null_mask(column)
+
+        values: List[Optional[Dict[str, Any]]] = [None] * batch.num_rows
+        passed = np.flatnonzero(~failed)
+        for position, row in zip(passed, self._rows(typed.take(pa.array(passed)))):
+            values[position] = row
+
+        errors: Dict[int, str] = {}
+        rejected = np.flatnonzero(failed)
+        if len(rejected):
+            take = pa.array(rejected)
+            records = [
+                # O valor da origem volta para o modelo quando a conversão o descartou
+                {name: value if value is not None and name not in raw else source.get(name)
+                 for name, value in row.items()}
+                for row, source in zip(typed.take(take).to_pylist(), batch.take(take).to_pylist())
+            ]
+            checked, model_errors = self.validate_many(records)
+            for position, row in zip(rejected, checked):
+                values[position] = row
+            errors = {int(rejected[position]): message for position, message in model_errors.items()}
+        return values, errors
+
+    def _rows(self, batch: 'pa.RecordBatch') -> List[Dict[str, Any]]:
+        """Converte um lote já validado em valores planos, com todos os campos do modelo"""
+        from src.schema.registry import to_python
+
+        fields = [spec.field for spec in self.registry.specs]
+        columns = []
+        for name in fields:
+            position = batch.schema.get_field_index(name)
+            columns.append(to_python(batch.column(position)) if position >= 0 else [None] * batch.num_rows)
+        return [dict(zip(fields, row)) for row in zip(*columns)]
+
+    @classmethod
+    def _flat_values(cls, dumped: Dict[str, Any]) -> Dict[str, Any]:
+        values = {}
+        for group in cls.GROUPS:
+            values.update(dumped.get(group) or {})
+        return values
+
+    @staticmethod
+    def _errors_by_position(error: ValidationError) -> Dict[int, str]:
+        """Agrupa os erros do TypeAdapter da lista pela posição do registro"""
+        messages: Dict[int, List[str]] = {}
+        for detail in error.errors():
+            position, *loc = detail['loc']
+            field = loc[-1] if loc else ''
+            messages.setdefault(position, []).append(f"{field}: {detail['msg']}")
+        return {position: '; '.join(lines) for position, lines in messages.items()}
+
+    @classmethod
+    def validate(cls, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Valida uma única notificação contra o CasoDengue
+
+        Returns:
+            Valores validados no formato plano, prontos para a tabela
+
+        Raises:
+            ValueError: Com a descrição dos campos inválidos
+        """
+        try:
+            caso = CasoDengue.model_validate(cls.nest(cls.flatten(data)))
+        except ValidationError as e:
+            raise ValueError(cls.format_errors(e)) from None
+        return cls._flat_values(caso.model_dump())
+
+    @classmethod
+    def flatten(cls, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Converte o formato aninhado do CasoDengue para o plano (o plano é mantido como está)"""
+        flat = {}
+        for key, value in data.items():
+            if key in cls.GROUPS and isinstance(value, dict):
+                flat.update(value)
+            else:
+                flat[key] = value
+        return flat
+
+    @classmethod
+    def nest(cls, flat: Dict[str, Any]) -> Dict[str, Any]:
+        """Agrupa os campos planos nos sub-modelos do CasoDengue (texto vazio vira None)"""
+        nested = {}
+        for group, fields in cls.GROUPS.items():
+            nested[group] = {}
+            for name in fields:
+                nested[group][name] = cls._blank_to_none(flat.get(name))
+        return nested
+
+    @staticmethod
+    def _blank_to_none(value: Any) -> Any:
+        if isinstance(value, str):
+            return value.strip() or None
+        return value
+
+    @staticmethod
+    def format_errors(error: ValidationError) -> str:
+        """Formata os erros do Pydantic em uma mensagem legível"""
+        messages = []
+        for detail in error.errors():
+            field = detail['loc'][-1] if detail['loc'] else ''
+            messages.append(f"{field}: {detail['msg']}")
+        return '; '.join(messages)
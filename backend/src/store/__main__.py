@@ -0,0 +1,48 @@
+"""
+Interface de linha de comando do armazenamento particionado de casos
+
+Uso:
+    python -m src.store write dengue_preprocessado.parquet [--root src/database/casos]
+    python -m src.store partitions [--root src/database/casos]
+"""
+import argparse
+import sys
+import time
+
+from src.ingest.dbf_reader import DEFAULT_BATCH_SIZE
+from src.store.case_store import DEFAULT_STORE_PATH, CaseStore
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m src.store',
+                                     description='Dataset de casos particionado por ano e UF')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    write = subparsers.add_parser('write', help='Grava arquivos Parquet no dataset particionado')
+    write.add_argument('sources', nargs='+', help='Arquivos Parquet de origem')
+    write.add_argument('--root', default=DEFAULT_STORE_PATH, help='Diretório do dataset (padrão: %(default)s)')
+    write.add_argument('-b', '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                       help='Linhas por lote / row group (padrão: %(default)s)')
+
+    partitions = subparsers.add_parser('partitions', help='Lista as partições e a quantidade de linhas')
+    partitions.add_argument('--root', default=DEFAULT_STORE_PATH, help='Diretório do dataset (padrão: %(default)s)')
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    store = CaseStore(args.root)
+
+    if args.command == 'write':
+        started = time.perf_counter()
+        rows = store.write(args.sources, batch_size=args.batch_size)
+        print(f"{rows} linhas gravadas em {args.root} ({time.perf_counter() - started:.1f}s)")
+        return 0
+
+    for partition in store.partitions():
+        print(f"year={partition['year']}/uf={partition['uf']}: {partition['rows']} linhas")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
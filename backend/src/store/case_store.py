@@ -0,0 +1,228 @@
+"""
+Armazenamento particionado dos casos de dengue
+Grava os dados pré-processados como um dataset Parquet particionado no estilo Hive
+(year=AAAA/uf=NN) e consulta com poda de partições e estatísticas dos row groups
+"""
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from src.ingest.dbf_reader import DEFAULT_BATCH_SIZE
+from src.ingest.parquet_reader import iter_typed_batches, typed_schema
+from src.schema.registry import SchemaRegistry, get_registry
+
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'casos')
+
+PARTITION_SCHEMA = pa.schema([('year', pa.int16()), ('uf', pa.string())])
+
+# Limite de arquivos abertos ao mesmo tempo durante a escrita (27 UFs x anos)
+_MAX_OPEN_FILES = 256
+
+Values = Union[Any, Sequence[Any]]
+
+
+def partition_columns(batch: pa.RecordBatch) -> pa.RecordBatch:
+    """
+    Acrescenta as colunas de partição a um lote tipado
+
+    year vem de NU_ANO e, quando ausente, do ano de DT_NOTIFIC; uf é o SG_UF_NOT.
+    """
+    names = batch.schema.names
+    if 'NU_ANO' in names:
+        year = batch.column('NU_ANO').cast(pa.int16())
+    else:
+        year = pa.nulls(batch.num_rows, pa.int16())
+    if 'DT_NOTIFIC' in names:
+        year = pc.coalesce(year, pc.year(batch.column('DT_NOTIFIC')).cast(pa.int16()))
+    uf = batch.column('SG_UF_NOT').cast(pa.string())
+
+    return pa.RecordBatch.from_arrays(
+        list(batch.columns) + [year, uf],
+        schema=batch.schema.append(PARTITION_SCHEMA.field('year')).append(PARTITION_SCHEMA.field('uf'))
+    )
+
+
+def _as_list(values: Values) -> List[Any]:
+    if isinstance(values, (list, tuple, set, frozenset)):
+        return list(values)
+    return [values]
+
+
+def _conform(batch: pa.RecordBatch, schema: pa.Schema) -> pa.RecordBatch:
+    """Lote com as colunas do schema, na ordem dele; as que faltam na fonte viram nulos tipados"""
+    names = set(batch.schema.names)
+    columns = [
+        batch.column(field.name).cast(field.type) if field.name in names else pa.nulls(batch.num_rows, field.type)
+        for field in schema
+    ]
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+class CaseStore:
+    """Dataset de casos particionado por ano e UF de notificação"""
+
+    def __init__(self, root: str = DEFAULT_STORE_PATH, registry: Optional[SchemaRegistry] = None):
+        self.root = root
+        self.registry = registry or get_registry()
+        self._dataset: Optional[ds.Dataset] = None
+
+    @property
+    def partitioning(self) -> ds.Partitioning:
+        return ds.partitioning(PARTITION_SCHEMA, flavor='hive')
+
+    def write(self, sources: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE,
+              compression: str = 'zstd') -> int:
+        """
+        Grava arquivos Parquet (ex.: dengue_preprocessado.parquet) no dataset particionado
+
+        A leitura é feita lote a lote, então a memória fica limitada ao tamanho do lote
+        independente do tamanho das fontes. As partições recebidas são substituídas. O dataset
+        tem a união das colunas das fontes (extrações de anos diferentes do SINAN não trazem as
+        mesmas colunas); as ausentes em uma fonte ficam nulas nas linhas dela.
+
+        Args:
+            sources: Arquivos Parquet de origem, com as colunas do SINAN
+            batch_size: Linhas por lote e máximo de linhas por row group
+            compression: Codec de compressão do Parquet
+
+        Returns:
+            Quantidade de linhas gravadas
+        """
+        sources = list(sources)
+        if not sources:
+            return 0
+
+        schemas = []
+        for source in sources:
+            schema = typed_schema(source, registry=self.registry)
+            if 'SG_UF_NOT' not in schema.names:
+                raise ValueError(f"Coluna 'SG_UF_NOT' ausente em {source}")
+            # Os dicionários de cada lote cobrem o lote inteiro; gravados em cada partição, repetiriam
+            # os valores de todas as UFs. Em disco ficam como texto (o Parquet já codifica com
+            # dicionário) e voltam a ser dicionários na leitura.
+            schemas.append(pa.schema([
+                pa.field(field.name, field.type.value_type) if pa.types.is_dictionary(field.type) else field
+                for field in schema
+            ]))
+        schema = pa.unify_schemas(schemas, promote_options='permissive')
+        schema = schema.append(PARTITION_SCHEMA.field('year')).append(PARTITION_SCHEMA.field('uf'))
+
+        written = [0]
+
+        def batches() -> Iterator[pa.RecordBatch]:
+            for source in sources:
+                for batch in iter_typed_batches(source, batch_size=batch_size, registry=self.registry):
+                    batch = partition_columns(batch)
+                    written[0] += batch.num_rows
+                    yield _conform(batch, schema)
+
+        ds.write_dataset(
+            batches(),
+            self.root,
+            schema=schema,
+            format='parquet',
+            partitioning=self.partitioning,
+            file_options=ds.ParquetFileFormat().make_write_options(compression=compression),
+            basename_template='part-{i}.parquet',
+            min_rows_per_group=batch_size,
+            max_rows_per_group=batch_size,
+            max_open_files=_MAX_OPEN_FILES,
+            existing_data_behavior='delete_matching',
+        )
+        self._dataset = None
+        return written[0]
+
+    @property
+    def dataset(self) -> ds.Dataset:
+        """Dataset Parquet do armazenamento (descoberto uma vez e reutilizado)"""
+        if self._dataset is None:
+            if not os.path.isdir(self.root):
+                raise FileNotFoundError(f"Armazenamento de casos não encontrado em {self.root}")
+            discovered = ds.dataset(self.root, format='parquet', partitioning=self.partitioning)
+            schema = pa.schema([
+                field if field.name in PARTITION_SCHEMA.names
+                else pa.field(field.name, self.registry.target_type(field.name, field.type))
+                for field in discovered.schema
+            ])
+            self._dataset = ds.dataset(self.root, format='parquet', partitioning=self.partitioning, schema=schema)
+        return self._dataset
+
+    def build_filter(self, year: Optional[Values] = None, uf: Optional[Values] = None,
+                     where: Optional[Dict[str, Values]] = None,
+                     expression: Optional[ds.Expression] = None) -> Optional[ds.Expression]:
+        """
+        Monta a expressão de filtro de uma consulta
+
+        year e uf podam as partições; os demais filtros (where, expression) são avaliados
+        contra as estatísticas dos row groups antes de qualquer leitura.
+        """
+        conditions = []
+        if year is not None:
+            conditions.append(ds.field('year').isin([int(value) for value in _as_list(year)]))
+        if uf is not None:
+            conditions.append(ds.field('uf').isin([str(value) for value in _as_list(uf)]))
+        for column, values in (where or {}).items():
+            values = _as_list(values)
+            if len(values) == 1:
+                conditions.append(ds.field(column) == values[0])
+            else:
+                conditions.append(ds.field(column).isin(values))
+        if expression is not None:
+            conditions.append(expression)
+
+        if not conditions:
+            return None
+        combined = conditions[0]
+        for condition in conditions[1:]:
+            combined = combined & condition
+        return combined
+
+    def scanner(self, columns: Optional[List[str]] = None, year: Optional[Values] = None,
+                uf: Optional[Values] = None, where: Optional[Dict[str, Values]] = None,
+                expression: Optional[ds.Expression] = None,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> ds.Scanner:
+        """Scanner com projeção de colunas e filtros empurrados para a leitura"""
+        return self.dataset.scanner(
+            columns=columns,
+            filter=self.build_filter(year, uf, where, expression),
+            batch_size=batch_size,
+        )
+
+    def query(self, columns: Optional[List[str]] = None, year: Optional[Values] = None,
+              uf: Optional[Values] = None, where: Optional[Dict[str, Values]] = None,
+              expression: Optional[ds.Expression] = None) -> pa.Table:
+        """
+        Consulta o armazenamento
+
+        Exemplo (equivalente ao concat de 2023 e 2024 seguido de .query('SG_UF_NOT == "53"'),
+        mas lendo só os arquivos do DF):
+            store.query(columns=['DT_NOTIFIC', 'CLASSI_FIN'], year=[2023, 2024], uf='53')
+        """
+        return self.scanner(columns, year, uf, where, expression).to_table()
+
+    def iter_batches(self, columns: Optional[List[str]] = None, year: Optional[Values] = None,
+                     uf: Optional[Values] = None, where: Optional[Dict[str, Values]] = None,
+                     expression: Optional[ds.Expression] = None,
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[pa.RecordBatch]:
+        """Mesma consulta de query, entregue em lotes"""
+        yield from self.scanner(columns, year, uf, where, expression, batch_size).to_batches()
+
+    def files(self, year: Optional[Values] = None, uf: Optional[Values] = None) -> List[str]:
+        """Arquivos que uma consulta por ano/UF efetivamente lê, após a poda de partições"""
+        expression = self.build_filter(year, uf)
+        fragments = self.dataset.get_fragments(filter=expression) if expression is not None \
+            else self.dataset.get_fragments()
+        return sorted(fragment.path for fragment in fragments)
+
+    def partitions(self) -> List[Dict[str, Any]]:
+        """Partições existentes (ano, UF) com a quantidade de linhas, lida só dos metadados"""
+        counts: Dict[tuple, int] = {}
+        for fragment in self.dataset.get_fragments():
+            keys = ds.get_partition_keys(fragment.partition_expression)
+            key = (keys.get('year'), keys.get('uf'))
+            counts[key] = counts.get(key, 0) + fragment.count_rows()
+        return [{'year': year, 'uf': uf, 'rows': rows} for (year, uf), rows in sorted(counts.items())]
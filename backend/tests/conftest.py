@@ -2,6 +2,7 @@
 Configuração dos testes
 """
 import pytest
+import struct
 import sys
 import os
 
@@ -34,3 +35,61 @@ def runner(app):
     """Fixture para criar o runner de comandos CLI"""
     return app.test_cli_runner()
 
+
+def make_notification(**overrides):
+    """Notificação de dengue no formato plano enviado pelo formulário"""
+    data = {
+        'tp_not': '2',
+        'id_agravo': 'A90',
+        'dt_notific': '2024-01-05',
+        'sem_not': '202401',
+        'nu_ano': '2024',
+        'sg_uf_not': '13',
+        'id_municip': '130260',
+        'id_unidade': '2012456',
+        'dt_sin_pri': '2024-01-02',
+        'nu_idade_n': '4030',
+        'cs_sexo': 'F',
+        'sg_uf': '13',
+        'id_mn_resi': '130260',
+        'febre': '1',
+        'mialgia': '1',
+        'cefaleia': '2',
+        'classi_fin': '10',
+        'evolucao': '1',
+    }
+    data.update(overrides)
+    return data
+
+
+@pytest.fixture
+def notification_data():
+    """Fixture com uma notificação de dengue válida"""
+    return make_notification()
+
+
+
+def write_dbf(path, fields, records, deleted=()):
+    """
+    Grava um arquivo DBF (dBase III) mínimo para os testes de ingestão
+
+    Args:
+        path: Caminho do arquivo
+        fields: Lista de tuplas (nome, tipo, tamanho, casas decimais)
+        records: Lista de tuplas com os valores de cada registro (texto)
+        deleted: Índices dos registros marcados como removidos
+    """
+    record_length = 1 + sum(field[2] for field in fields)
+    header_length = 32 + 32 * len(fields) + 1
+
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<BBBBIHH20x', 0x03, 124, 1, 1, len(records), header_length, record_length))
+        for name, field_type, length, decimals in fields:
+            f.write(struct.pack('<11sc4xBB14x', name.encode('ascii'), field_type.encode('ascii'), length, decimals))
+        f.write(b'\r')
+        for index, record in enumerate(records):
+            f.write(b'*' if index in deleted else b' ')
+            for (name, field_type, length, decimals), value in zip(fields, record):
+                raw = str(value).encode('latin-1')
+                f.write(raw.rjust(length) if field_type == 'N' else raw.ljust(length))
+        f.write(b'\x1a')
@@ -213,3 +213,68 @@ class TestUserEndpoints:
         assert 'user1' in usernames
         assert 'user2' in usernames
 
+
+
+class TestDengueNotificationEndpoints:
+    """Testes para os endpoints de notificações de dengue"""
+
+    def _create(self, client, data):
+        return client.post('/api/dengue-notifications',
+                           data=json.dumps(data),
+                           content_type='application/json')
+
+    def test_create_notification(self, client, notification_data):
+        """Teste de criação de notificação"""
+        response = self._create(client, notification_data)
+        assert response.status_code == 201
+
+        data = json.loads(response.data)
+        assert data['success'] is True
+        assert data['data']['id_municip'] == '130260'
+
+    def test_create_notification_invalid(self, client, notification_data):
+        """Teste de criação de notificação com dados inválidos"""
+        notification_data['dt_notific'] = 'ontem'
+
+        response = self._create(client, notification_data)
+        assert response.status_code == 400
+
+        data = json.loads(response.data)
+        assert data['success'] is False
+        assert 'dt_notific' in data['error']
+
+    def test_list_notifications_paginated(self, client, notification_data):
+        """Teste de listagem paginada por cursor"""
+        for _ in range(3):
+            self._create(client, notification_data)
+
+        first = json.loads(client.get('/api/dengue-notifications?limit=2').data)
+        cursor = first['pagination']['next_cursor']
+        second = json.loads(client.get(f'/api/dengue-notifications?limit=2&cursor={cursor}').data)
+
+        assert len(first['data']) == 2
+        assert len(second['data']) == 1
+        assert second['pagination']['next_cursor'] is None
+
+    def test_list_notifications_invalid_params(self, client):
+        """Teste de listagem com parâmetros inválidos"""
+        response = client.get('/api/dengue-notifications?dt_inicio=05/01/2024')
+        assert response.status_code == 400
+
+    def test_get_update_delete_notification(self, client, notification_data):
+        """Teste do ciclo de consulta, atualização e remoção"""
+        created = json.loads(self._create(client, notification_data).data)['data']
+        url = f"/api/dengue-notifications/{created['id']}"
+
+        assert client.get(url).status_code == 200
+
+        response = client.put(url, data=json.dumps({'evolucao': '2'}), content_type='application/json')
+        assert json.loads(response.data)['data']['evolucao'] == '2'
+
+        assert client.delete(url).status_code == 200
+        assert client.get(url).status_code == 404
+
+    def test_notification_not_found(self, client):
+        """Teste de notificação inexistente"""
+        assert client.get('/api/dengue-notifications/999').status_code == 404
+        assert client.delete('/api/dengue-notifications/999').status_code == 404
@@ -0,0 +1,94 @@
+"""
+Testes para o repositório base (primitivas em lote)
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from src.models.user import User, db
+from src.repositories.dengue_repository import DengueRepository
+from src.repositories.user_repository import UserRepository
+from src.services.user_service import UserService
+
+
+@contextmanager
+def count_selects(until=None):
+    """Conta os SELECTs executados no engine da aplicação corrente (até o primeiro comando `until`)"""
+    statements = []
+    stopped = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        command = statement.lstrip().upper()
+        if until and command.startswith(until):
+            stopped.append(statement)
+        if command.startswith('SELECT') and not stopped:
+            statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+class TestBaseRepository:
+    """Testes para as primitivas get_many, exists_many, create_many e find_conflicts"""
+
+    def create_users(self, count):
+        UserRepository.create_many([
+            {'username': f'user{index}', 'email': f'user{index}@example.com'} for index in range(count)
+        ])
+        return {user.username: user.id for user in UserRepository.get_all()}
+
+    def test_get_many(self, app):
+        """Uma consulta para qualquer quantidade de IDs; IDs inexistentes são omitidos"""
+        ids = self.create_users(5)
+
+        with count_selects() as selects:
+            users = UserRepository.get_many(list(ids.values()) + [999])
+
+        assert len(selects) == 1
+        assert set(users) == set(ids.values())
+        assert all(isinstance(user, User) for user in users.values())
+
+    def test_exists_many(self, app):
+        """Retorna apenas os valores que já existem"""
+        self.create_users(3)
+
+        with count_selects() as selects:
+            existing = UserRepository.exists_many('email', ['user0@example.com', 'novo@example.com'])
+
+        assert len(selects) == 1
+        assert existing == {'user0@example.com'}
+        assert UserRepository.exists_by_username('user1')
+        assert not UserRepository.exists_by_username('novo')
+
+    def test_find_conflicts(self, app):
+        """Conflitos por coluna única, ignorando a própria entidade na atualização"""
+        ids = self.create_users(3)
+        rows = [{'username': 'user0', 'email': 'novo@example.com'},
+                {'username': 'novo', 'email': 'user2@example.com'}]
+
+        assert UserRepository.unique_fields() == ['username', 'email']
+        assert UserRepository.find_conflicts(rows) == {'username': {'user0'}, 'email': {'user2@example.com'}}
+        assert UserRepository.find_conflicts([{'username': 'user0'}], exclude_id=ids['user0']) == {}
+        assert DengueRepository.find_conflicts([{'sem_not': '202401'}]) == {}
+
+    def test_user_service_single_conflict_query(self, app):
+        """Criar um usuário verifica username e email em uma única consulta antes do INSERT"""
+        with count_selects(until='INSERT') as selects:
+            UserService().create_user({'username': 'testuser', 'email': 'test@example.com'})
+
+        assert len(selects) == 1
+
+    def test_failed_commit_rolls_back(self, app):
+        """Um commit que falha é desfeito, e a sessão continua utilizável na mesma requisição"""
+        self.create_users(1)
+
+        with pytest.raises(IntegrityError):
+            UserRepository.create(User(username='user0', email='outro@example.com'))
+
+        UserRepository.create(User(username='novo', email='novo@example.com'))
+        assert UserRepository.exists_by_username('novo')
@@ -0,0 +1,96 @@
+"""
+Testes para a carga em massa de notificações (NDJSON e Arrow IPC)
+"""
+import io
+import json
+
+import pyarrow as pa
+
+from src.ingest.bulk import iter_ndjson
+from tests.conftest import make_notification
+
+
+def arrow_stream(records):
+    """Serializa registros planos em um stream Arrow IPC"""
+    table = pa.Table.from_pylist(records)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+class TestBulkReaders:
+    """Testes para a leitura das cargas em massa"""
+
+    def test_iter_ndjson(self):
+        """Linhas inválidas viram erros numerados pela linha"""
+        body = b'{"a": 1}\n\nnao-e-json\n[1, 2]\n{"b": 2}\n'
+
+        records = list(iter_ndjson(io.BytesIO(body)))
+
+        assert [row for row, _ in records] == [1, 3, 4, 5]
+        assert records[0][1] == {'a': 1}
+        assert isinstance(records[1][1], ValueError)
+        assert isinstance(records[2][1], ValueError)
+        assert records[3][1] == {'b': 2}
+
+
+class TestBulkEndpoint:
+    """Testes para o endpoint POST /api/dengue-notifications/bulk"""
+
+    def test_bulk_ndjson(self, client):
+        """Carga NDJSON com um registro inválido"""
+        lines = [make_notification(), make_notification(dt_notific='05/01/2024'), make_notification()]
+        body = '\n'.join(json.dumps(line) for line in lines)
+
+        response = client.post('/api/dengue-notifications/bulk', data=body,
+                               content_type='application/x-ndjson')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)['data']
+        assert data['inserted'] == 2
+        assert data['rejected'] == 1
+        assert data['errors'][0]['row'] == 2
+        assert 'dt_notific' in data['errors'][0]['error']
+
+    def test_bulk_arrow(self, client):
+        """Carga Arrow IPC"""
+        body = arrow_stream([make_notification(), make_notification(sem_not=None)])
+
+        response = client.post('/api/dengue-notifications/bulk', data=body,
+                               content_type='application/vnd.apache.arrow.stream')
+
+        data = json.loads(response.data)['data']
+        assert data['inserted'] == 1
+        assert [error['row'] for error in data['errors']] == [2]
+
+        listed = json.loads(client.get('/api/dengue-notifications').data)
+        assert listed['pagination']['count'] == 1
+
+    def test_bulk_arrow_batches(self, client):
+        """Registros numerados ao longo dos lotes do stream; data inválida em campo opcional é rejeitada"""
+        table = pa.Table.from_pylist([make_notification(), make_notification(),
+                                      make_notification(dt_sin_pri='2024-13-45')])
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            for batch in table.to_batches(max_chunksize=2):
+                writer.write_batch(batch)
+
+        response = client.post('/api/dengue-notifications/bulk', data=sink.getvalue(),
+                               content_type='application/vnd.apache.arrow.stream')
+
+        data = json.loads(response.data)['data']
+        assert data['received'] == 3
+        assert data['inserted'] == 2
+        assert data['errors'][0]['row'] == 3
+        assert 'dt_sin_pri' in data['errors'][0]['error']
+
+    def test_bulk_invalid_content(self, client):
+        """Content-Type não suportado e stream Arrow corrompido"""
+        response = client.post('/api/dengue-notifications/bulk', data='{}',
+                               content_type='application/json')
+        assert response.status_code == 415
+
+        response = client.post('/api/dengue-notifications/bulk', data=b'lixo',
+                               content_type='application/vnd.apache.arrow.stream')
+        assert response.status_code == 400
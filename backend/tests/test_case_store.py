@@ -0,0 +1,101 @@
+"""
+Testes para o armazenamento particionado de casos
+"""
+import datetime
+import os
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+
+from src.store.case_store import CaseStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Armazenamento gravado a partir de um dengue_preprocessado.parquet sintético"""
+    rows = 600
+    table = pa.table({
+        'NU_ANO': [str(2023 + i % 2) for i in range(rows)],
+        'SG_UF_NOT': [['13', '53', '35'][i % 3] for i in range(rows)],
+        'DT_NOTIFIC': [f'{2023 + i % 2}01{i % 28 + 1:02d}' for i in range(rows)],
+        'ID_MUNICIP': [['130260', '530010', '355030'][i % 3] for i in range(rows)],
+        'CLASSI_FIN': [['10', '5', '11'][i % 6 // 2] for i in range(rows)],
+    })
+    source = tmp_path / 'dengue_preprocessado.parquet'
+    pq.write_table(table, source)
+
+    case_store = CaseStore(str(tmp_path / 'casos'))
+    assert case_store.write([str(source)], batch_size=50) == rows
+    return case_store
+
+
+class TestCaseStore:
+    """Testes da escrita particionada e das consultas com poda"""
+
+    def test_hive_layout(self, store):
+        """As partições seguem o layout year=/uf="""
+        partitions = store.partitions()
+
+        assert len(partitions) == 6
+        assert {'year': 2024, 'uf': '53', 'rows': 100} in partitions
+        assert os.path.isdir(os.path.join(store.root, 'year=2023', 'uf=13'))
+
+    def test_single_partition_reads_only_its_files(self, store):
+        """Uma consulta de um ano e uma UF toca só os arquivos da partição"""
+        files = store.files(year=2024, uf='53')
+
+        assert len(files) == 1
+        assert os.path.join('year=2024', 'uf=53') in files[0]
+        assert len(store.files(year=[2023, 2024], uf='53')) == 2
+
+    def test_query_projection_and_filters(self, store):
+        """Projeção de colunas, partições e filtros de valor combinados"""
+        table = store.query(columns=['DT_NOTIFIC', 'CLASSI_FIN'], year=2024, uf='53', where={'CLASSI_FIN': '10'})
+
+        assert table.column_names == ['DT_NOTIFIC', 'CLASSI_FIN']
+        assert table.num_rows > 0
+        assert set(table.column('CLASSI_FIN').to_pylist()) == {'10'}
+        assert store.query(year=2024, uf='53', where={'CLASSI_FIN': '5'}).num_rows == 0
+        assert all(value.year == 2024 for value in table.column('DT_NOTIFIC').to_pylist())
+
+    def test_typed_columns(self, store):
+        """O dataset guarda os tipos do registro de schema"""
+        schema = store.dataset.schema
+
+        assert schema.field('DT_NOTIFIC').type == pa.date32()
+        assert schema.field('NU_ANO').type == pa.int16()
+        assert pa.types.is_dictionary(schema.field('CLASSI_FIN').type)
+
+    def test_iter_batches_and_expression(self, store):
+        """Expressões arbitrárias e leitura em lotes"""
+        expression = ds.field('DT_NOTIFIC') >= pa.scalar(datetime.date(2023, 1, 15))
+        batches = list(store.iter_batches(columns=['DT_NOTIFIC'], year=2023, expression=expression, batch_size=20))
+
+        assert all(batch.num_rows <= 20 for batch in batches)
+        assert sum(batch.num_rows for batch in batches) == store.scanner(year=2023, expression=expression).count_rows()
+
+    def test_rewrite_replaces_partitions(self, store, tmp_path):
+        """Gravar de novo substitui as partições recebidas em vez de duplicar linhas"""
+        source = tmp_path / 'dengue_preprocessado.parquet'
+        store.write([str(source)], batch_size=50)
+
+        assert sum(partition['rows'] for partition in store.partitions()) == 600
+
+    def test_sources_with_different_columns(self, tmp_path):
+        """Fontes com colunas diferentes gravam a união delas, com nulos onde a coluna falta"""
+        first, second = tmp_path / '2023.parquet', tmp_path / '2024.parquet'
+        pq.write_table(pa.table({'NU_ANO': ['2023'], 'SG_UF_NOT': ['13'], 'FEBRE': ['1']}), first)
+        pq.write_table(pa.table({'NU_ANO': ['2024'], 'SG_UF_NOT': ['13'], 'CLASSI_FIN': ['10']}), second)
+        store = CaseStore(str(tmp_path / 'casos'))
+
+        assert store.write([str(first), str(second)]) == 2
+        table = store.query(columns=['NU_ANO', 'FEBRE', 'CLASSI_FIN']).sort_by('NU_ANO')
+        assert table.column('FEBRE').to_pylist() == [1, None]
+        assert table.column('CLASSI_FIN').to_pylist() == [None, '10']
+
+    def test_missing_store(self, tmp_path):
+        """Armazenamento inexistente"""
+        with pytest.raises(FileNotFoundError):
+            CaseStore(str(tmp_path / 'nao_existe')).query()
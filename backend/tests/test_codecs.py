@@ -0,0 +1,74 @@
+"""
+Testes para os decodificadores vetorizados do SINAN
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.codecs import scalar, sinan
+
+
+class TestDecodersParity:
+    """Os decodificadores vetorizados devem ter a mesma semântica dos escalares"""
+
+    def test_decode_idade_matches_scalar(self):
+        """Códigos TNNN em texto e numéricos devem bater com a versão escalar"""
+        codes = ['1012', '2030', '3011', '4000', '4020', '4105']
+
+        expected = [scalar.decode_idade(code) for code in codes]
+
+        assert sinan.decode_idade(codes).to_pylist() == expected
+        assert sinan.decode_idade(np.array([int(code) for code in codes])).to_pylist() == expected
+        assert sinan.decode_idade(codes).type == pa.int16()
+
+    def test_decode_gestante_matches_scalar(self):
+        """Trimestres são mantidos, demais códigos conhecidos viram 0 e inesperados viram nulo"""
+        codes = list(range(-1, 12))
+
+        expected = [scalar.decode_gestante(code) for code in codes]
+
+        assert sinan.decode_gestante(codes).to_pylist() == expected
+
+    def test_decode_escolaridade_matches_scalar(self):
+        """Escolaridade 0 a 8 é mantida, 9 e 10 viram 0 e inesperados viram nulo"""
+        codes = list(range(-1, 13))
+
+        expected = [scalar.decode_escolaridade(code) for code in codes]
+
+        assert sinan.decode_escolaridade(codes).to_pylist() == expected
+
+    def test_ibge_to_sinan_matches_scalar(self):
+        """Conversão IBGE → SINAN deve remover o dígito verificador"""
+        codes = ['1100015', '1302603', '5300108', '3550308']
+
+        expected = [scalar.ibge_to_sinan(code) for code in codes]
+
+        assert sinan.ibge_to_sinan(codes).to_pylist() == expected
+        assert sinan.ibge_to_sinan(np.array([int(code) for code in codes])).to_pylist() == expected
+
+
+class TestDecodersInputs:
+    """Testes de tipos de entrada e valores ausentes"""
+
+    def test_text_codes_from_dbf(self):
+        """Códigos em texto (como vêm do DBF) devem ser aceitos"""
+        assert sinan.decode_gestante(['1', ' 5', '9', 'X']).to_pylist() == [1, 0, 0, None]
+
+    def test_nulls_are_propagated(self):
+        """Valores nulos ou em branco devem continuar nulos"""
+        assert sinan.decode_idade(['4030', None, '']).to_pylist() == [30, None, None]
+        assert sinan.decode_escolaridade(pd.Series([1.0, np.nan])).to_pylist() == [1, None]
+
+    def test_dictionary_and_chunked_arrays(self):
+        """Colunas categóricas e chunked arrays do Arrow devem ser aceitos"""
+        column = pa.chunked_array([pa.array(['1', '2']).dictionary_encode(), pa.array(['6']).dictionary_encode()])
+
+        assert sinan.decode_gestante(column).to_pylist() == [1, 2, 0]
+
+    def test_sinan_to_ibge_uses_reference(self):
+        """Conversão SINAN → IBGE deve usar a lista de códigos IBGE válidos"""
+        reference = ['1100015', '1302603', '5300108']
+
+        result = sinan.sinan_to_ibge(['130260', '530010', '999999', None], reference)
+
+        assert result.to_pylist() == ['1302603', '5300108', None, None]
@@ -0,0 +1,57 @@
+"""
+Testes para os perfis do engine do banco de dados
+"""
+from sqlalchemy import text
+
+from src.config import Config, ProductionConfig, TestingConfig, config
+from src.database.engine import engine_options, is_sqlite
+from src.main import create_app
+from src.models.user import db
+
+
+class TestEngineProfiles:
+    """Testes para as opções de pool e os PRAGMAs do SQLite"""
+
+    def test_engine_options_server_database(self):
+        """Bancos servidor recebem o pool do perfil; opções explícitas têm precedência"""
+        settings = {
+            'SQLALCHEMY_DATABASE_URI': 'postgresql://dengue@localhost/dengue',
+            'DATABASE_POOL': ProductionConfig.DATABASE_POOL,
+            'SQLALCHEMY_ENGINE_OPTIONS': {'pool_size': 3},
+        }
+
+        options = engine_options(settings)
+
+        assert options['pool_size'] == 3
+        assert options['max_overflow'] == ProductionConfig.DATABASE_POOL['max_overflow']
+        assert options['pool_pre_ping'] is True
+
+    def test_engine_options_sqlite(self):
+        """O SQLite não recebe as opções de pool"""
+        settings = {'SQLALCHEMY_DATABASE_URI': Config.SQLALCHEMY_DATABASE_URI,
+                    'DATABASE_POOL': Config.DATABASE_POOL}
+
+        assert is_sqlite(settings['SQLALCHEMY_DATABASE_URI'])
+        assert engine_options(settings) == {}
+
+    def test_sqlite_pragmas_applied_on_connect(self, tmp_path):
+        """Cada conexão do SQLite em arquivo abre com os PRAGMAs do perfil"""
+        uri = f"sqlite:///{tmp_path / 'profile.db'}"
+        config['profile'] = type('ProfileConfig', (TestingConfig,), {
+            'SQLALCHEMY_DATABASE_URI': uri,
+            'SQLITE_PRAGMAS': ProductionConfig.SQLITE_PRAGMAS,
+        })
+        try:
+            app = create_app('profile')
+            with app.app_context():
+                with db.engine.connect() as connection:
+                    journal_mode = connection.execute(text('PRAGMA journal_mode')).scalar()
+                    busy_timeout = connection.execute(text('PRAGMA busy_timeout')).scalar()
+                    synchronous = connection.execute(text('PRAGMA synchronous')).scalar()
+                db.engine.dispose()
+        finally:
+            del config['profile']
+
+        assert journal_mode == 'wal'
+        assert busy_timeout == ProductionConfig.SQLITE_PRAGMAS['busy_timeout']
+        assert synchronous == 1  # NORMAL
@@ -0,0 +1,200 @@
+"""
+Testes para o índice de notificações duplicadas
+"""
+import datetime
+import json
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.config import TestingConfig, config
+from src.ingest.pipeline import convert_file, convert_many
+from src.main import create_app
+from src.models.dengue_notification import DengueNotification
+from src.models.user import db
+from src.repositories.dengue_repository import DengueRepository
+from src.services.dengue_service import DengueService
+from src.quality.__main__ import main as quality_main
+from src.quality.dedup import INITIAL_CAPACITY, DedupIndex, fingerprint
+from tests.conftest import make_notification, write_dbf
+
+
+FIELDS = [
+    ('ID_AGRAVO', 'C', 3, 0),
+    ('DT_NOTIFIC', 'D', 8, 0),
+    ('ID_MUNICIP', 'C', 6, 0),
+    ('ID_UNIDADE', 'C', 7, 0),
+    ('CS_SEXO', 'C', 1, 0),
+]
+
+
+def make_records(count, offset=0):
+    return [('A90', f'202401{(i % 28) + 1:02d}', '130260', f'{i:07d}', 'MF'[i % 2])
+            for i in range(offset, offset + count)]
+
+
+class TestDedupIndex:
+    """Testes da impressão digital, do índice em disco e do seu uso na ingestão e na carga em massa"""
+
+    def test_fingerprint_normalizes_fields(self):
+        """Data em date32 ou texto, município do IBGE ou do SINAN e caixa do texto dão a mesma impressão"""
+        batch = pa.record_batch({
+            'ID_AGRAVO': ['A90', 'a90 ', 'A90'],
+            'DT_NOTIFIC': pa.array([datetime.date(2024, 1, 5)] * 3),
+            'ID_MUNICIP': ['1302603', '130260', '130260'],
+            'CS_SEXO': ['F', 'f', 'M'],
+        })
+        raw = pa.record_batch({'id_agravo': ['A90'], 'dt_notific': ['20240105'], 'id_municip': ['130260'],
+                               'cs_sexo': ['F']})
+
+        keys = fingerprint(batch)
+        assert keys[0] == keys[1] == fingerprint(raw)[0]
+        assert keys[2] != keys[0]
+        assert keys.dtype == np.uint64 and (keys != 0).all()
+
+    def test_check_repeats_and_persistence(self, tmp_path):
+        index = DedupIndex(str(tmp_path / 'duplicadas'))
+
+        assert index.check(np.array([5, 7, 5], np.uint64)).tolist() == [False, False, True]
+        assert index.check(np.array([7, 9], np.uint64), add=False).tolist() == [True, False]
+        assert len(index) == 2
+
+        reopened = DedupIndex(str(tmp_path / 'duplicadas'))
+        assert reopened.check(np.array([9, 5], np.uint64)).tolist() == [False, True]
+        assert len(reopened) == 3
+
+    def test_growth_keeps_keys(self, tmp_path):
+        """Passar da ocupação máxima dobra a tabela sem perder chaves, também para outra instância aberta"""
+        path = str(tmp_path / 'duplicadas')
+        index, other = DedupIndex(path), DedupIndex(path)
+        keys = np.random.default_rng(0).integers(1, 2 ** 63, INITIAL_CAPACITY, dtype=np.uint64)
+        for start in range(0, len(keys), 10_000):
+            assert not index.check(keys[start:start + 10_000]).any()
+
+        assert index.capacity > INITIAL_CAPACITY
+        assert other.check(keys, add=False).all()
+        assert len(other) == len(keys)
+
+    def test_convert_flags_and_rejects(self, tmp_path):
+        """Ingestão: reenvio do mesmo extrato é marcado (flag) ou descartado (reject), inclusive entre processos"""
+        index = str(tmp_path / 'duplicadas')
+        write_dbf(tmp_path / 'DENGAM24.dbf', FIELDS, make_records(10) + make_records(2))
+        write_dbf(tmp_path / 'DENGAM24_reenvio.dbf', FIELDS, make_records(6, offset=8))
+
+        report = convert_file(str(tmp_path / 'DENGAM24.dbf'), str(tmp_path / 'DENGAM24.parquet'), dedup=index)
+        assert report.rows == 12 and report.duplicates == 2
+        assert pq.read_table(tmp_path / 'DENGAM24.parquet').column('DUPLICADA').to_pylist() == [False] * 10 + [True] * 2
+
+        reports = convert_many([(str(tmp_path / 'DENGAM24_reenvio.dbf'), str(tmp_path / 'reenvio.parquet'))],
+                               workers=1, dedup=index, duplicates='reject')
+        assert reports[0].duplicates == 2 and reports[0].rows == 4
+        assert pq.read_table(tmp_path / 'reenvio.parquet').column('ID_UNIDADE').to_pylist() == \
+            [f'{i:07d}' for i in range(10, 14)]
+        assert len(DedupIndex(index)) == 14
+
+    def test_bulk_endpoint_rejects_and_flags(self, tmp_path):
+        config['dedup'] = type('DedupConfig', (TestingConfig,), {'DEDUP_INDEX_PATH': str(tmp_path / 'duplicadas')})
+        try:
+            app = create_app('dedup')
+            with app.app_context():
+                db.create_all()
+                client = app.test_client()
+                lines = [make_notification(id_unidade=str(unit)) for unit in (1, 2, 1)]
+                body = '\n'.join(json.dumps(line) for line in lines)
+                first = client.post('/api/dengue-notifications/bulk', data=body,
+                                    content_type='application/x-ndjson').get_json()['data']
+                again = client.post('/api/dengue-notifications/bulk?duplicates=flag', data=body,
+                                    content_type='application/x-ndjson').get_json()['data']
+                invalid = client.post('/api/dengue-notifications/bulk?duplicates=ignore', data=body,
+                                      content_type='application/x-ndjson')
+                db.drop_all()
+        finally:
+            del config['dedup']
+
+        assert first['inserted'] == 2 and first['duplicates'] == [3]
+        assert first['errors'][0]['row'] == 3 and 'duplicada' in first['errors'][0]['error']
+        assert again['inserted'] == 3 and again['duplicates'] == [1, 2, 3]
+        assert again['errors'] == []
+        assert invalid.status_code == 400
+
+    def test_every_write_keeps_fingerprints(self, tmp_path):
+        """Criação unitária, alteração e remoção mantêm as impressões no banco; o índice é só a frente"""
+        config['dedup'] = type('DedupConfig', (TestingConfig,), {'DEDUP_INDEX_PATH': str(tmp_path / 'duplicadas')})
+        try:
+            app = create_app('dedup')
+            with app.app_context():
+                db.create_all()
+                client = app.test_client()
+
+                def post(unit):
+                    return client.post('/api/dengue-notifications', content_type='application/json',
+                                       data=json.dumps(make_notification(id_unidade=unit)))
+
+                def bulk(unit):
+                    return client.post('/api/dengue-notifications/bulk', content_type='application/x-ndjson',
+                                       data=json.dumps(make_notification(id_unidade=unit))).get_json()['data']
+
+                first_id = post('1').get_json()['data']['id']
+                second_id = post('2').get_json()['data']['id']
+                repeated_post = post('1')
+                repeated_bulk = bulk('1')
+
+                # Alterar para os campos de outra notificação é recusado; para campos novos, libera os antigos
+                clash = client.put(f'/api/dengue-notifications/{first_id}', data=json.dumps({'id_unidade': '2'}),
+                                   content_type='application/json')
+                client.put(f'/api/dengue-notifications/{first_id}', data=json.dumps({'id_unidade': '3'}),
+                           content_type='application/json')
+                after_update = bulk('1')
+
+                # Notificação removida pode ser reenviada, mesmo continuando no índice em disco
+                client.delete(f'/api/dengue-notifications/{second_id}')
+                after_delete = bulk('2')
+                moved = bulk('3')
+                db.drop_all()
+        finally:
+            del config['dedup']
+
+        assert repeated_post.status_code == 400 and 'duplicada' in repeated_post.get_json()['error']
+        assert repeated_bulk['inserted'] == 0 and repeated_bulk['duplicates'] == [1]
+        assert clash.status_code == 400
+        assert after_update['inserted'] == 1 and after_update['duplicates'] == []
+        assert after_delete['inserted'] == 1 and after_delete['duplicates'] == []
+        assert moved['inserted'] == 0 and moved['duplicates'] == [1]
+
+    def test_concurrent_write_is_caught_by_the_database(self, tmp_path):
+        """Impressão gravada por outro worker e ainda fora do índice: a chave primária recusa a carga"""
+        config['dedup'] = type('DedupConfig', (TestingConfig,), {'DEDUP_INDEX_PATH': str(tmp_path / 'duplicadas')})
+        try:
+            app = create_app('dedup')
+            with app.app_context():
+                db.create_all()
+                client = app.test_client()
+                service = DengueService()
+                values = service.validate(make_notification(id_unidade='1'))
+                DengueRepository.create(DengueNotification(**values), service._claim([values], 'reject')[0])
+
+                body = '\n'.join(json.dumps(make_notification(id_unidade=unit)) for unit in ('1', '2'))
+                rejected = client.post('/api/dengue-notifications/bulk', data=body,
+                                       content_type='application/x-ndjson').get_json()['data']
+                flagged = client.post('/api/dengue-notifications/bulk?duplicates=flag',
+                                      data=json.dumps(make_notification(id_unidade='1')),
+                                      content_type='application/x-ndjson').get_json()['data']
+                total = DengueNotification.query.count()
+                db.drop_all()
+        finally:
+            del config['dedup']
+
+        assert rejected['inserted'] == 1 and rejected['duplicates'] == [1]
+        assert 'duplicada' in rejected['errors'][0]['error']
+        assert flagged['inserted'] == 1 and flagged['duplicates'] == [1]
+        assert total == 3
+
+    def test_cli_indexes_parquet_files(self, tmp_path, capsys):
+        table = pa.table({'ID_AGRAVO': ['A90'] * 4, 'DT_NOTIFIC': ['2024-01-05'] * 4,
+                          'ID_UNIDADE': ['1', '2', '1', '3'], 'EVOLUCAO': ['1'] * 4})
+        pq.write_table(table, tmp_path / 'DENGBR24.parquet')
+
+        assert quality_main(['dedup', str(tmp_path / 'DENGBR24.parquet'), '--index', str(tmp_path / 'idx')]) == 0
+        assert '4 linhas de 1 arquivos, 1 duplicadas' in capsys.readouterr().out
+        assert len(DedupIndex(str(tmp_path / 'idx'))) == 3
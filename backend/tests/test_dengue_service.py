@@ -0,0 +1,142 @@
+"""
+Testes para o serviço de notificações de dengue
+"""
+import pytest
+
+from src.services.dengue_service import DengueService
+from tests.conftest import make_notification
+
+
+class TestDengueService:
+    """Testes para a classe DengueService"""
+
+    def setup_method(self):
+        """Configuração executada antes de cada teste"""
+        self.dengue_service = DengueService()
+
+    def test_create_notification_success(self, app, notification_data):
+        """Teste de criação de notificação com sucesso"""
+        with app.app_context():
+            result = self.dengue_service.create_notification(notification_data)
+
+            assert 'id' in result
+            assert result['dt_notific'] == '2024-01-05'
+            assert result['nu_idade_n'] == 4030
+            assert result['febre'] == 1
+            assert result['cs_gestant'] is None
+
+    def test_create_notification_nested_payload(self, app):
+        """O formato aninhado do CasoDengue também deve ser aceito"""
+        with app.app_context():
+            flat = make_notification()
+            nested = DengueService.nest(flat)
+
+            result = self.dengue_service.create_notification(nested)
+
+            assert result['id_municip'] == '130260'
+            assert result['classi_fin'] == '10'
+
+    def test_create_notification_invalid_data(self, app):
+        """Campos obrigatórios, datas e municípios inválidos devem ser rejeitados"""
+        with app.app_context():
+            with pytest.raises(ValueError, match="dt_notific"):
+                self.dengue_service.create_notification(make_notification(dt_notific=''))
+
+            with pytest.raises(ValueError, match="Município '999999' não encontrado"):
+                self.dengue_service.create_notification(make_notification(id_mn_resi='999999'))
+
+    def test_keyset_pagination(self, app):
+        """As páginas devem cobrir todas as notificações, sem repetição, da mais recente para a mais antiga"""
+        with app.app_context():
+            for day in range(1, 8):
+                self.dengue_service.create_notification(make_notification(dt_notific=f'2024-01-0{day}'))
+
+            seen = []
+            cursor = None
+            while True:
+                page, cursor = self.dengue_service.list_notifications({'limit': '3', 'cursor': cursor})
+                seen.extend(page)
+                if cursor is None:
+                    break
+
+            dates = [notification['dt_notific'] for notification in seen]
+            assert len(seen) == 7
+            assert len({notification['id'] for notification in seen}) == 7
+            assert dates == sorted(dates, reverse=True)
+
+    def test_list_filters(self, app):
+        """Os filtros de igualdade e de período devem ser aplicados"""
+        with app.app_context():
+            self.dengue_service.create_notification(make_notification(dt_notific='2024-01-05', evolucao='1'))
+            self.dengue_service.create_notification(make_notification(dt_notific='2024-02-05', evolucao='2'))
+            self.dengue_service.create_notification(make_notification(sg_uf_not='53', id_municip='530010'))
+
+            by_evolucao, _ = self.dengue_service.list_notifications({'evolucao': '2'})
+            by_period, _ = self.dengue_service.list_notifications({'dt_inicio': '2024-02-01', 'dt_fim': '2024-02-28'})
+            by_uf, _ = self.dengue_service.list_notifications({'sg_uf_not': '53'})
+
+            assert [n['dt_notific'] for n in by_evolucao] == ['2024-02-05']
+            assert [n['dt_notific'] for n in by_period] == ['2024-02-05']
+            assert [n['id_municip'] for n in by_uf] == ['530010']
+
+    def test_invalid_list_params(self, app):
+        """Parâmetros de listagem inválidos devem gerar ValueError"""
+        with app.app_context():
+            with pytest.raises(ValueError, match="Cursor de paginação inválido"):
+                self.dengue_service.list_notifications({'cursor': 'nao-e-cursor'})
+
+            with pytest.raises(ValueError, match="limit deve estar entre 1 e 500"):
+                self.dengue_service.list_notifications({'limit': '0'})
+
+    def test_update_notification_keeps_other_fields(self, app, notification_data):
+        """Teste de atualização parcial de notificação"""
+        with app.app_context():
+            created = self.dengue_service.create_notification(notification_data)
+
+            result = self.dengue_service.update_notification(created['id'], {'evolucao': '2'})
+
+            assert result['evolucao'] == '2'
+            assert result['febre'] == 1
+
+    def test_delete_notification(self, app, notification_data):
+        """Teste de remoção de notificação"""
+        with app.app_context():
+            created = self.dengue_service.create_notification(notification_data)
+
+            assert self.dengue_service.delete_notification(created['id']) is True
+            assert self.dengue_service.get_notification_by_id(created['id']) is None
+            assert self.dengue_service.delete_notification(created['id']) is False
+
+    def test_bulk_create_reports_errors_per_record(self, app):
+        """Registros inválidos são reportados sem interromper a carga"""
+        with app.app_context():
+            records = [
+                (1, make_notification()),
+                (2, make_notification(dt_notific='')),
+                (3, ValueError("JSON inválido")),
+                (4, make_notification(id_municip='999999')),
+                (5, make_notification(dt_notific='2024-01-06')),
+            ]
+
+            report = self.dengue_service.bulk_create(records)
+
+            assert report['received'] == 5
+            assert report['inserted'] == 2
+            assert report['rejected'] == 3
+            assert [error['row'] for error in report['errors']] == [2, 3, 4]
+            notifications, _ = self.dengue_service.list_notifications({})
+            assert len(notifications) == 2
+
+    def test_bulk_create_in_chunks(self, app, monkeypatch):
+        """A carga é inserida em transações de BULK_CHUNK_SIZE registros"""
+        monkeypatch.setattr(DengueService, 'BULK_CHUNK_SIZE', 3)
+        with app.app_context():
+            calls = []
+            create_many = self.dengue_service.dengue_repository.create_many
+            monkeypatch.setattr(self.dengue_service.dengue_repository, 'create_many',
+                                lambda values, *args: calls.append(len(values)) or create_many(values, *args))
+
+            report = self.dengue_service.bulk_create((row, make_notification()) for row in range(1, 8))
+
+            assert report['inserted'] == 7
+            assert calls == [3, 3, 1]
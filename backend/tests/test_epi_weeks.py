@@ -0,0 +1,67 @@
+"""
+Testes para o calendário de semanas epidemiológicas
+"""
+import datetime
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.epi.weeks import check_weeks, epi_week, parse_dates, week_matches, week_start, weeks_in_year
+from src.quality.__main__ import main as quality_main
+
+
+def reference_week(day: datetime.date) -> int:
+    """Semana calculada data a data: domingo a sábado, semana 1 contendo 4 de janeiro"""
+    for year in (day.year + 1, day.year, day.year - 1):
+        january_4 = datetime.date(year, 1, 4)
+        start = january_4 - datetime.timedelta(days=(january_4.weekday() + 1) % 7)
+        if day >= start:
+            return year * 100 + (day - start).days // 7 + 1
+    raise AssertionError(day)
+
+
+class TestEpiWeeks:
+    """Testes da tabela de semanas, da leitura de datas e da conferência de sem_not"""
+
+    def test_table_matches_reference(self):
+        days = [datetime.date(2012, 12, 1) + datetime.timedelta(days=i) for i in range(0, 365 * 14)]
+
+        assert epi_week(pa.array(days)).to_pylist() == [reference_week(day) for day in days]
+
+    def test_year_boundaries(self):
+        dates = pa.array([datetime.date(2023, 12, 31), datetime.date(2021, 1, 2), datetime.date(2024, 12, 29), None])
+
+        assert epi_week(dates).to_pylist() == [202401, 202053, 202501, None]
+        assert weeks_in_year([2014, 2015, 2020, 2024]).tolist() == [53, 52, 53, 52]
+        assert week_start(['202401', '202053', '202453', '202400', None]).to_pylist() == \
+            [datetime.date(2023, 12, 31), datetime.date(2020, 12, 27), None, None, None]
+
+    def test_week_start_round_trip(self):
+        codes = np.array([year * 100 + week for year in range(2000, 2031) for week in range(1, 54)])
+        codes = codes[(codes % 100) <= weeks_in_year(codes // 100)]
+
+        assert epi_week(week_start(pa.array(codes))).to_pylist() == codes.tolist()
+
+    def test_parse_dates(self):
+        """AAAAMMDD e AAAA-MM-DD viram date32; datas inexistentes, vazias ou em outro formato viram nulas"""
+        parsed = parse_dates(pa.array(['20240105', ' 2024-01-05 ', '20240229', '20230229', ' ', None,
+                                       '05/01/2024', '2024O105']).slice(0))
+
+        assert parsed.type == pa.date32()
+        assert parsed.to_pylist() == [datetime.date(2024, 1, 5)] * 2 + [datetime.date(2024, 2, 29)] + [None] * 5
+        assert parse_dates(pa.array(['x', '20240105']).slice(1)).to_pylist() == [datetime.date(2024, 1, 5)]
+
+    def test_sem_not_consistency(self, tmp_path, capsys):
+        batch = pa.record_batch({
+            'DT_NOTIFIC': ['20240105', '20240112', '20240105', ' '],
+            'SEM_NOT': ['202401', '202401', '202460', '202401'],
+        })
+
+        assert week_matches(batch.column(0), batch.column(1)).to_pylist() == [True, False, None, None]
+        assert check_weeks(batch)['SEM_NOT'] == {'checked': 2, 'mismatched': 1, 'invalid': 1,
+                                                 'samples': [['2024-01-12', 202401, 202402]]}
+
+        pq.write_table(pa.Table.from_batches([batch]), tmp_path / 'DENGBR24.parquet')
+        assert quality_main(['weeks', str(tmp_path / 'DENGBR24.parquet')]) == 0
+        assert '2024-01-12 202401→202402' in capsys.readouterr().out
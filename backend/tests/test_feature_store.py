@@ -0,0 +1,137 @@
+"""
+Testes para o armazenamento versionado das matrizes de atributos
+"""
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+import scipy.sparse as sp
+
+from src.ml import feature_store
+from src.ml.__main__ import main
+from src.ml.feature_store import FeatureStore, resolve_matrix
+from src.store.case_store import CaseStore
+from tests.test_training import is_mapped
+
+
+CONFIG = {'vocabulary': 'abc', 'columns': ['FEBRE'], 'year': None}
+
+
+@pytest.fixture
+def sources(tmp_path):
+    """Duas partições de origem quaisquer (só o conteúdo importa para o hash)"""
+    paths = []
+    for name in ('year=2023', 'year=2024'):
+        path = tmp_path / 'casos' / name / 'part-0.parquet'
+        path.parent.mkdir(parents=True)
+        path.write_bytes(name.encode() * 10)
+        paths.append(str(path))
+    return paths
+
+
+class Builds:
+    """Montagem contada da matriz, para verificar o reaproveitamento"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        X = sp.csr_matrix(np.eye(4, 3, dtype=np.float32) * self.calls)
+        return X, np.array([1, 2, 1, 2], dtype=np.int8)
+
+
+class TestFeatureStore:
+    """Testes do endereçamento por conteúdo, do reaproveitamento e do manifesto"""
+
+    def test_unchanged_inputs_are_reused(self, tmp_path, sources):
+        build = Builds()
+        store = FeatureStore(str(tmp_path / 'matriz'))
+
+        key, directory, reused = store.get_or_build(sources, CONFIG, build, base=str(tmp_path / 'casos'))
+        again = FeatureStore(str(tmp_path / 'matriz')).get_or_build(sources, CONFIG, build,
+                                                                    base=str(tmp_path / 'casos'))
+
+        assert reused is False
+        assert again == (key, directory, True)
+        assert build.calls == 1
+        X, y = FeatureStore(str(tmp_path / 'matriz')).load()
+        assert X.shape == (4, 3) and y.tolist() == [1, 2, 1, 2]
+        assert is_mapped(X.data) and is_mapped(y)
+        entry = store.manifest['versions'][key]
+        assert [source['path'] for source in entry['sources']] == ['year=2023/part-0.parquet',
+                                                                   'year=2024/part-0.parquet']
+        assert entry['config'] == CONFIG
+
+    def test_changed_inputs_make_new_version(self, tmp_path, sources):
+        """Outro conteúdo de partição ou outra configuração geram outra versão, que vira a atual"""
+        build = Builds()
+        store = FeatureStore(str(tmp_path / 'matriz'))
+        first, _, _ = store.get_or_build(sources, CONFIG, build)
+
+        with open(sources[0], 'ab') as f:
+            f.write(b'linha nova')
+        second, _, reused = store.get_or_build(sources, CONFIG, build)
+        third, _, _ = store.get_or_build(sources, {**CONFIG, 'year': [2024]}, build)
+
+        assert reused is False
+        assert len({first, second, third}) == 3
+        assert build.calls == 3
+        assert store.manifest['current'] == third
+        assert [entry['key'] for entry in store.versions()] == [third, second, first]
+        assert resolve_matrix(store.root) == store.path(third)
+
+    def test_hashes_cached_by_size_and_mtime(self, tmp_path, sources, monkeypatch):
+        store = FeatureStore(str(tmp_path / 'matriz'))
+        store.get_or_build(sources, CONFIG, Builds())
+        hashed = []
+        monkeypatch.setattr(feature_store, 'file_digest', lambda path: hashed.append(path) or 'x')
+
+        FeatureStore(str(tmp_path / 'matriz')).get_or_build(sources, CONFIG, Builds())
+
+        assert hashed == []
+
+    def test_incomplete_version_is_rebuilt(self, tmp_path, sources):
+        build = Builds()
+        store = FeatureStore(str(tmp_path / 'matriz'))
+        key, directory, _ = store.get_or_build(sources, CONFIG, build)
+        os.remove(os.path.join(directory, 'data.npy'))
+
+        assert store.get(key) is None
+        assert store.get_or_build(sources, CONFIG, build)[2] is False
+        assert build.calls == 2
+
+    def test_prune_keeps_current(self, tmp_path, sources):
+        store = FeatureStore(str(tmp_path / 'matriz'))
+        keys = [store.get_or_build(sources, {**CONFIG, 'vocabulary': str(i)}, Builds())[0] for i in range(3)]
+        store.get_or_build(sources, {**CONFIG, 'vocabulary': '0'}, Builds())
+
+        removed = store.prune(keep=1)
+
+        assert removed == [keys[1]]
+        assert not os.path.exists(store.path(keys[1]))
+        assert {entry['key'] for entry in store.versions()} == {keys[0], keys[2]}
+
+    def test_cli_reuses_matrix(self, tmp_path, capsys):
+        """matrix --save grava a versão uma vez; train/export leem a versão atual"""
+        rows = 60
+        table = pa.table({
+            'NU_ANO': ['2024'] * rows,
+            'SG_UF_NOT': [['13', '53'][i % 2] for i in range(rows)],
+            'CS_SEXO': [['M', 'F', 'I'][i % 3] for i in range(rows)],
+            'EVOLUCAO': [['1', '2', '9'][i % 3] for i in range(rows)],
+        })
+        pq.write_table(table, tmp_path / 'dengue_preprocessado.parquet')
+        CaseStore(str(tmp_path / 'casos')).write([str(tmp_path / 'dengue_preprocessado.parquet')])
+        arguments = ['--root', str(tmp_path / 'casos'), '--vocabulary', str(tmp_path / 'vocabulario.json')]
+        assert main(['vocabulary'] + arguments) == 0
+
+        assert main(['matrix'] + arguments + ['--save', str(tmp_path / 'matriz')]) == 0
+        assert 'gravada' in capsys.readouterr().out
+        assert main(['matrix'] + arguments + ['--save', str(tmp_path / 'matriz')]) == 0
+        assert 'reaproveitada' in capsys.readouterr().out
+
+        X, y = FeatureStore(str(tmp_path / 'matriz')).load()
+        assert X.shape[0] == len(y) == 40
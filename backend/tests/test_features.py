@@ -0,0 +1,122 @@
+"""
+Testes para a matriz esparsa de atributos do modelo de desfecho
+"""
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.ml.features import FeatureBuilder
+from src.schema.registry import categories
+from src.store.case_store import CaseStore
+
+
+def make_batch(rows: int, offset: int = 0) -> pa.RecordBatch:
+    """Lote com colunas no formato do CaseStore (dicionários e flags int8)"""
+    positions = range(offset, offset + rows)
+    return pa.record_batch({
+        'CS_SEXO': pa.array([['M', 'F', 'I', None][i % 4] for i in positions]).dictionary_encode(),
+        'FEBRE': pa.array([[1, 2, None][i % 3] for i in positions], pa.int8()),
+        'HOSPITALIZ': pa.array([['1', '2', ' '][i % 3] for i in positions]),
+        'EVOLUCAO': pa.array([['1', '2', '9', None][i % 4] for i in positions]),
+    })
+
+
+def reference(batches, columns):
+    """OneHotEncoder + StandardScaler(with_mean=False) do scikit-learn, com a matriz densa"""
+    pd = pytest.importorskip('pandas')
+    preprocessing = pytest.importorskip('sklearn.preprocessing')
+
+    table = pa.Table.from_batches(batches)
+    frame = pd.DataFrame({column: categories(table.column(column)).to_pylist() for column in columns})
+    encoded = preprocessing.OneHotEncoder(sparse_output=False).fit_transform(frame)
+    return preprocessing.StandardScaler(with_mean=False).fit_transform(encoded)
+
+
+class TestFeatureBuilder:
+    """Testes do vocabulário, da codificação esparsa e do escalonamento"""
+
+    COLUMNS = ['CS_SEXO', 'FEBRE', 'HOSPITALIZ']
+
+    def test_matches_dense_reference(self):
+        """Ajustado lote a lote, o resultado é o mesmo do OneHotEncoder + StandardScaler"""
+        batches = [make_batch(50), make_batch(70, offset=50)]
+        builder = FeatureBuilder(self.COLUMNS).fit(batches)
+
+        matrix = pa.concat_batches(batches)
+        sparse = builder.transform(matrix)
+
+        assert sparse.dtype == np.float32
+        assert sparse.shape == (120, 10)
+        assert sparse.nnz == 120 * 3
+        np.testing.assert_allclose(sparse.toarray(), reference(batches, self.COLUMNS), rtol=1e-6)
+
+    def test_vocabulary_and_feature_names(self):
+        """Texto em branco vira nulo e os nulos são uma categoria própria"""
+        builder = FeatureBuilder(self.COLUMNS).fit([make_batch(12)])
+
+        assert builder.vocabulary['CS_SEXO'] == ['F', 'I', 'M', None]
+        assert builder.vocabulary['HOSPITALIZ'] == ['1', '2', None]
+        assert builder.get_feature_names_out()[:4] == ['CS_SEXO_F', 'CS_SEXO_I', 'CS_SEXO_M', 'CS_SEXO_nan']
+
+    def test_unknown_categories_are_ignored(self):
+        """Categorias fora do vocabulário não geram atributo; colunas ausentes contam como nulas"""
+        builder = FeatureBuilder(self.COLUMNS, scale=False).fit([make_batch(12)])
+        batch = pa.record_batch({'cs_sexo': ['X', 'M'], 'FEBRE': pa.array([3, 1], pa.int8())})
+
+        sparse = builder.transform(batch)
+
+        assert sparse.toarray().sum(axis=1).tolist() == [1.0, 3.0]
+        names = builder.get_feature_names_out()
+        assert [names[i] for i in sparse[1].indices] == ['CS_SEXO_M', 'FEBRE_1', 'HOSPITALIZ_nan']
+
+    def test_build_filters_target_classes(self):
+        """build descarta os desfechos fora de 1/2 e alinha as classes às linhas"""
+        batches = [make_batch(40), make_batch(40, offset=40)]
+        builder = FeatureBuilder(self.COLUMNS).fit(batches)
+
+        matrix, y = builder.build(batches)
+
+        assert matrix.shape == (40, builder.n_features)
+        assert y.dtype == np.int8
+        assert set(y.tolist()) == {1, 2}
+        expected = builder.transform(make_batch(4)).toarray()[:2]
+        np.testing.assert_allclose(matrix.toarray()[:2], expected)
+
+    def test_save_and_load(self, tmp_path):
+        """O vocabulário persistido reproduz a mesma matriz"""
+        builder = FeatureBuilder(self.COLUMNS).fit([make_batch(30)])
+        path = tmp_path / 'vocabulario.json'
+        builder.save(str(path))
+
+        loaded = FeatureBuilder.load(str(path))
+
+        assert loaded.vocabulary == builder.vocabulary
+        assert (loaded.transform(make_batch(30)) != builder.transform(make_batch(30))).nnz == 0
+
+    def test_transform_requires_vocabulary(self):
+        with pytest.raises(ValueError):
+            FeatureBuilder(self.COLUMNS).transform(make_batch(3))
+
+    def test_streams_case_store_partitions(self, tmp_path):
+        """Vocabulário e matriz montados a partir das partições do CaseStore"""
+        rows = 90
+        table = pa.table({
+            'NU_ANO': [str(2023 + i % 2) for i in range(rows)],
+            'SG_UF_NOT': [['13', '53', '35'][i % 3] for i in range(rows)],
+            'CS_SEXO': [['M', 'F'][i % 2] for i in range(rows)],
+            'FEBRE': [['1', '2', ''][i % 3] for i in range(rows)],
+            'EVOLUCAO': [['1', '2', '1', '9'][i % 4] for i in range(rows)],
+        })
+        source = tmp_path / 'dengue_preprocessado.parquet'
+        pq.write_table(table, source)
+        store = CaseStore(str(tmp_path / 'casos'))
+        store.write([str(source)], batch_size=10)
+
+        builder = FeatureBuilder(['SG_UF_NOT', 'CS_SEXO', 'FEBRE'])
+        builder.fit(store.iter_batches(columns=builder.columns, where={'EVOLUCAO': ['1', '2']}))
+        matrix, y = builder.build(store.iter_batches(columns=builder.columns + ['EVOLUCAO'], batch_size=7))
+
+        assert builder.rows == 68
+        assert matrix.shape == (68, 3 + 2 + 3)
+        assert y.tolist().count(2) == 23
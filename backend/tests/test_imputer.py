@@ -0,0 +1,125 @@
+"""
+Testes para a imputação pela moda em streaming
+"""
+import json
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.config import TestingConfig, config
+from src.main import create_app
+from src.ml.__main__ import main as ml_main
+from src.ml.features import FeatureBuilder
+from src.ml.imputer import ModeImputer
+from src.ml.model import OutcomeModel
+from src.ml.training import build_estimator
+from src.models.user import db
+from src.store.case_store import CaseStore
+from tests.conftest import make_notification
+
+
+def make_batch(rows: int, offset: int = 0) -> pa.RecordBatch:
+    """Lote com texto bruto (' ' nos vazios), dicionário e flags int8"""
+    positions = range(offset, offset + rows)
+    return pa.record_batch({
+        'CS_SEXO': pa.array([['F', 'M', 'F', ' '][i % 4] for i in positions]).dictionary_encode(),
+        'FEBRE': pa.array([[1, 2, 1, None][i % 4] for i in positions], pa.int8()),
+        'HOSPITALIZ': [['2', None, '2', '1'][i % 4] for i in positions],
+    })
+
+
+class TestModeImputer:
+    """Testes das tabelas de frequência, do preenchimento e da atualização incremental"""
+
+    def test_modes_and_transform_keep_types(self):
+        imputer = ModeImputer(['CS_SEXO', 'FEBRE', 'HOSPITALIZ', 'EVOLUCAO']).fit([make_batch(8)])
+        filled = imputer.transform(make_batch(8))
+
+        assert imputer.modes == {'CS_SEXO': 'F', 'FEBRE': '1', 'HOSPITALIZ': '2', 'EVOLUCAO': None}
+        assert filled.schema == make_batch(8).schema
+        assert filled.column(0).to_pylist() == ['F', 'M', 'F', 'F'] * 2
+        assert filled.column(1).to_pylist() == [1, 2, 1, 1] * 2
+        assert filled.column(2).to_pylist() == ['2', '2', '2', '1'] * 2
+
+    def test_streaming_equals_single_pass(self):
+        """Contar lote a lote (e gravar no meio do caminho) dá as mesmas tabelas da passada única"""
+        whole = ModeImputer().fit([pa.concat_batches([make_batch(30), make_batch(50, 30)])])
+        first = ModeImputer().partial_fit(make_batch(30))
+        resumed = ModeImputer.from_dict(json.loads(json.dumps(first.to_dict()))).partial_fit(make_batch(50, 30))
+
+        assert resumed.rows == whole.rows == 80
+        assert resumed.counts == whole.counts
+        assert resumed.modes == whole.modes
+
+    def test_accumulate_appended_week(self, tmp_path):
+        """Uma semana nova só soma contagens e grava uma nova revisão"""
+        path = str(tmp_path / 'imputacao.json')
+        ModeImputer().fit([make_batch(8)]).save(path)
+
+        week = [make_notification(cs_sexo='M', hospitaliz='1') for _ in range(10)]
+        updated = ModeImputer.accumulate(path, week, source='semana 202402')
+        saved = ModeImputer.load(path)
+
+        assert saved.revision == updated.revision == 2
+        assert saved.rows == 18
+        assert saved.counts['CS_SEXO'] == {'F': 4, 'M': 12}
+        assert saved.modes['CS_SEXO'] == 'M' and saved.modes['HOSPITALIZ'] == '1'
+        assert saved.sources == ['semana 202402']
+
+    def test_cli_full_pass_and_append(self, tmp_path):
+        """impute conta as partições; --append soma só o arquivo novo, sem reler o dataset"""
+        pq.write_table(pa.Table.from_batches([make_batch(40)]).append_column('NU_ANO', pa.array(['2024'] * 40))
+                       .append_column('SG_UF_NOT', pa.array(['13'] * 40)),
+                       tmp_path / 'dengue_preprocessado.parquet')
+        store = CaseStore(str(tmp_path / 'casos'))
+        store.write([str(tmp_path / 'dengue_preprocessado.parquet')])
+        path = str(tmp_path / 'imputacao.json')
+
+        assert ml_main(['impute', '--root', store.root, '--output', path]) == 0
+        assert ModeImputer.load(path).modes['HOSPITALIZ'] == '2'
+
+        pq.write_table(pa.table({'HOSPITALIZ': ['1'] * 30}), tmp_path / 'semana.parquet')
+        assert ml_main(['impute', '--append', str(tmp_path / 'semana.parquet'), '--output', path]) == 0
+        saved = ModeImputer.load(path)
+        assert saved.rows == 70 and saved.revision == 2
+        assert saved.modes['HOSPITALIZ'] == '1' and saved.modes['CS_SEXO'] == 'F'
+
+    def test_bulk_ingest_updates_counts(self, tmp_path):
+        path = str(tmp_path / 'imputacao.json')
+        ModeImputer().save(path)
+        config['imputer'] = type('ImputerConfig', (TestingConfig,), {'IMPUTER_PATH': path})
+        try:
+            app = create_app('imputer')
+            with app.app_context():
+                db.create_all()
+                body = '\n'.join(json.dumps(make_notification(cs_sexo=sexo)) for sexo in ('M', 'M', 'F'))
+                response = app.test_client().post('/api/dengue-notifications/bulk', data=body,
+                                                  content_type='application/x-ndjson')
+                db.drop_all()
+        finally:
+            del config['imputer']
+
+        assert response.get_json()['data']['inserted'] == 3
+        saved = ModeImputer.load(path)
+        assert saved.rows == 3 and saved.revision == 2
+        assert saved.counts['CS_SEXO'] == {'F': 1, 'M': 2}
+        assert saved.counts['FEBRE'] == {'1': 3}
+
+    def test_model_scores_with_training_modes(self):
+        """O modelo exportado com a imputação preenche os vazios da pontuação com as modas do treino"""
+        records = [make_notification(hospitaliz=['1', '2', '1'][i % 3], evolucao=['2', '1', '2'][i % 3])
+                   for i in range(90)]
+        builder = FeatureBuilder(['HOSPITALIZ'])
+        batch = OutcomeModel(builder, None).records_batch(records)
+        imputer = ModeImputer(['HOSPITALIZ']).fit([batch])
+        builder.fit([batch])
+        estimator = build_estimator('LinearSVM_SGD', {'alpha': 1e-3})
+        estimator.fit(builder.transform(batch), np.array([int(record['evolucao']) for record in records]))
+
+        plain = OutcomeModel(builder, estimator).score([make_notification(hospitaliz=None)])
+        imputed = OutcomeModel(builder, estimator, imputer=imputer).score([make_notification(hospitaliz=None)])
+        hospitalized = OutcomeModel(builder, estimator).score([make_notification(hospitaliz='1')])
+
+        assert imputed == hospitalized
+        assert plain != imputed
@@ -0,0 +1,214 @@
+"""
+Testes para o motor de incidência
+"""
+import json
+
+import numpy as np
+import pytest
+
+from src.analytics.incidence import IncidenceEngine, clear_default_engine, split_sem_not
+from src.config import TestingConfig, config
+from src.geo.municipios import get_default_index
+from src.main import create_app
+from src.models.dengue_notification import DengueNotification
+from src.models.user import db
+from src.repositories.dengue_repository import DengueRepository
+from src.repositories.stats_repository import StatsRepository
+from src.services.dengue_service import DengueService
+from src.services.stats_service import StatsService
+from tests.conftest import make_notification
+
+
+POPULACAO = {'130260': 2_000_000, '530010': 3_000_000}
+
+
+@pytest.fixture
+def engine():
+    """Motor sobre o índice padrão com população de dois municípios"""
+    return IncidenceEngine(get_default_index(), populacao=POPULACAO)
+
+
+@pytest.fixture(autouse=True)
+def fresh_default_engine():
+    """O motor padrão é por processo; cada teste começa sem contagens carregadas"""
+    clear_default_engine()
+    yield
+    clear_default_engine()
+
+
+def _record(result, code):
+    return next(record for record in result.to_records() if record['codigo'] == code)
+
+
+class TestIncidenceEngine:
+    """Testes dos indicadores e da memoização"""
+
+    def test_split_sem_not(self):
+        """Semana epidemiológica AAAASS"""
+        assert split_sem_not('202405') == (2024, 5)
+        with pytest.raises(ValueError):
+            split_sem_not('202460')
+
+    def test_indicators(self, engine):
+        """Incidência, acumulada e variação semanal por município"""
+        engine.add_cases(['202401'] * 4 + ['202402'] * 2, ['130260'] * 6)
+
+        manaus = _record(engine.week(2024, 2), '130260')
+
+        assert manaus['casos'] == 2
+        assert manaus['incidencia'] == pytest.approx(0.1)
+        assert manaus['incidencia_acumulada'] == pytest.approx(0.3)
+        assert manaus['variacao_semanal'] == pytest.approx(-50.0)
+
+    def test_week_one_compares_with_previous_year(self, engine):
+        """A semana 1 compara com a última semana do ano anterior (53 em 2020, 52 em 2023)"""
+        engine.add_cases(['202053', '202101', '202101', '202352', '202352', '202401'], ['130260'] * 6)
+
+        assert _record(engine.week(2021, 1), '130260')['variacao_semanal'] == pytest.approx(100.0)
+        assert _record(engine.week(2024, 1), '130260')['variacao_semanal'] == pytest.approx(-50.0)
+        assert np.array_equal(engine.compute_year(2024)[0].variacao_semanal, engine.week(2024, 1).variacao_semanal,
+                              equal_nan=True)
+        assert _record(engine.week(2023, 1), '130260')['variacao_semanal'] is None
+
+        engine.set_week(2023, 52, ['130260'], [1])
+        assert (2024, 1, 'municipio') not in engine.cached_keys()
+        assert _record(engine.week(2024, 1), '130260')['variacao_semanal'] == pytest.approx(0.0)
+
+    def test_unknown_population_is_none(self, engine):
+        """Sem população, a taxa fica indefinida em vez de usar um denominador errado"""
+        engine.add_cases(['202401'], ['110001'])
+
+        record = _record(engine.week(2024, 1), '110001')
+        assert record['casos'] == 1
+        assert record['populacao'] is None
+        assert record['incidencia'] is None
+
+    def test_levels(self, engine):
+        """Agregação por UF e Brasil; códigos fora do índice são contados à parte"""
+        engine.add_cases(['202401', '202401', '202401'], ['530010', '530010', '999999'])
+
+        df = _record(engine.week(2024, 1, 'uf'), '53')
+        brasil = engine.week(2024, 1, 'brasil').to_records()[0]
+
+        assert df['nome'] == 'DF'
+        assert df['incidencia'] == pytest.approx(2 / 3_000_000 * 100_000, rel=1e-3)
+        assert brasil['casos'] == 2
+        assert engine.ignored == 1
+        with pytest.raises(ValueError, match="Nível inválido"):
+            engine.week(2024, 1, 'bairro')
+
+    def test_compute_year_matches_week(self, engine):
+        """A passada vetorizada do ano coincide com o cálculo semana a semana"""
+        rng = np.random.default_rng(1)
+        weeks = [f'2024{week:02d}' for week in rng.integers(1, 54, 500)]
+        engine.add_cases(weeks, ['130260'] * 500)
+
+        single = engine.week(2024, 30)
+        engine.set_week(2024, 30, ['130260'], [int(single.casos[single.codes == 130260][0])])
+        year = engine.compute_year(2024)
+
+        assert len(year) == 53
+        assert np.array_equal(year[29].casos, single.casos)
+        assert np.allclose(year[29].incidencia_acumulada, single.incidencia_acumulada, equal_nan=True)
+
+    def test_memoization_and_invalidation(self, engine):
+        """Uma semana nova só descarta a memoização dela mesma"""
+        engine.add_cases(['202401', '202402'], ['130260', '130260'])
+        first = engine.week(2024, 1)
+        engine.week(2024, 2)
+
+        assert engine.week(2024, 1) is first
+
+        engine.set_week(2024, 3, ['130260'], [5])
+        assert engine.cached_keys() == [(2024, 1, 'municipio'), (2024, 2, 'municipio')]
+
+        engine.add_cases(['202401'], ['130260'])
+        assert engine.cached_keys() == []
+        assert _record(engine.week(2024, 3), '130260')['incidencia_acumulada'] == pytest.approx(0.4)
+
+
+class TestIncidenceEndpoint:
+    """Testes para o endpoint GET /api/stats/incidence"""
+
+    def _create(self, client, **overrides):
+        client.post('/api/dengue-notifications', data=json.dumps(make_notification(**overrides)),
+                    content_type='application/json')
+
+    def test_incidence_follows_writes(self, client):
+        """O motor carrega o ano do cubo e recarrega só as semanas alteradas"""
+        self._create(client)
+        self._create(client, sem_not='202402')
+
+        response = client.get('/api/stats/incidence?sem_not=202402&level=uf&with_cases=true')
+        data = json.loads(response.data)['data']
+        assert response.status_code == 200
+        assert data['units'][0]['codigo'] == '13'
+        assert data['units'][0]['casos'] == 1
+
+        self._create(client, sem_not='202402')
+        data = json.loads(client.get('/api/stats/incidence?sem_not=202402&with_cases=true').data)['data']
+        assert data['units'] == [{
+            'codigo': '130260', 'nome': 'Manaus', 'casos': 2, 'populacao': None,
+            'incidencia': None, 'incidencia_acumulada': None, 'variacao_semanal': 100.0,
+        }]
+
+    def test_incidence_week_one_loads_previous_year(self, client):
+        """Na semana 1, o ano anterior também é carregado do cubo para a variação semanal"""
+        self._create(client, sem_not='202352')
+        self._create(client, sem_not='202352')
+        self._create(client)
+
+        data = json.loads(client.get('/api/stats/incidence?sem_not=202401&with_cases=true').data)['data']
+        assert data['units'][0]['variacao_semanal'] == -50.0
+
+    def test_incidence_with_population_file(self, tmp_path):
+        """Com POPULACAO_PATH, as taxas saem da tabela de população; sem ela, ficam null"""
+        path = tmp_path / 'populacao.csv'
+        path.write_text('COD_IBGE,POPULACAO\n1302603,2000000\n', encoding='utf-8')
+        config['populacao'] = type('PopulacaoConfig', (TestingConfig,), {'POPULACAO_PATH': str(path)})
+        try:
+            app = create_app('populacao')
+            with app.app_context():
+                db.create_all()
+                client = app.test_client()
+                self._create(client)
+                self._create(client, sem_not='202402')
+                self._create(client, sem_not='202402')
+                municipios = client.get('/api/stats/incidence?sem_not=202402&with_cases=true')
+                brasil = client.get('/api/stats/incidence?sem_not=202402&level=brasil')
+                db.drop_all()
+        finally:
+            del config['populacao']
+
+        assert municipios.get_json()['data']['units'] == [{
+            'codigo': '130260', 'nome': 'Manaus', 'casos': 2, 'populacao': 2_000_000,
+            'incidencia': 0.1, 'incidencia_acumulada': 0.15, 'variacao_semanal': 100.0,
+        }]
+        # Os demais municípios continuam sem população: o agregado não usa denominador parcial
+        brasil = brasil.get_json()['data']['units'][0]
+        assert brasil['casos'] == 2 and brasil['incidencia'] is None
+
+    def test_incidence_follows_other_processes(self, app):
+        """Escritas de outro worker e o rebuild-stats chegam ao motor pela revisão do cubo no banco"""
+        service = StatsService()
+        DengueService().create_notification(make_notification())
+        assert service.get_incidence({'sem_not': '202401', 'with_cases': 'true'})['units'][0]['casos'] == 1
+
+        # Outro worker: cubo e notificação na mesma transação, sem acesso ao motor deste processo
+        values = DengueService().validate(make_notification(sem_not='202402'))
+        StatsRepository.apply(StatsRepository.deltas(added=[values]))
+        DengueRepository.create(DengueNotification(**values))
+        assert service.get_incidence({'sem_not': '202402', 'with_cases': 'true'})['units'][0]['casos'] == 1
+
+        # rebuild-stats em outro processo, depois de uma remoção direta no banco
+        db.session.execute(DengueNotification.__table__.delete().where(DengueNotification.sem_not == '202401'))
+        db.session.commit()
+        StatsRepository.rebuild()
+        assert service.get_incidence({'sem_not': '202401', 'with_cases': 'true'})['units'] == []
+        assert service.get_incidence({'sem_not': '202402', 'with_cases': 'true'})['units'][0]['casos'] == 1
+
+    def test_incidence_invalid_params(self, client):
+        """Semana ausente ou inválida e nível inexistente"""
+        assert client.get('/api/stats/incidence').status_code == 400
+        assert client.get('/api/stats/incidence?sem_not=2024-1').status_code == 400
+        assert client.get('/api/stats/incidence?sem_not=202401&level=bairro').status_code == 400
@@ -0,0 +1,167 @@
+"""
+Testes para a ingestão DBF → Parquet
+"""
+import datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.geo.municipios import DEFAULT_SOURCE_PATH, MunicipioIndex
+from src.ingest.dbf_reader import DBFBatchReader
+from src.ingest.pipeline import convert_file, convert_many
+from src.ml.imputer import ModeImputer
+from tests.conftest import write_dbf
+
+
+FIELDS = [
+    ('TP_NOT', 'C', 1, 0),
+    ('DT_NOTIFIC', 'D', 8, 0),
+    ('ID_MUNICIP', 'C', 6, 0),
+    ('NU_IDADE_N', 'N', 4, 0),
+    ('CS_SEXO', 'C', 1, 0),
+]
+
+
+def make_records(count):
+    return [('2', '20240105', '130260', 4000 + (i % 90), 'MF'[i % 2]) for i in range(count)]
+
+
+class TestDBFBatchReader:
+    """Testes para o leitor de DBF em lotes"""
+
+    def test_schema_from_field_descriptors(self, tmp_path):
+        """Sem o registro, o schema Arrow deve refletir os tipos do cabeçalho do DBF"""
+        path = tmp_path / 'DENGAM24.dbf'
+        write_dbf(path, FIELDS, make_records(3))
+
+        reader = DBFBatchReader(str(path), typed=False)
+
+        assert reader.schema.field('TP_NOT').type == 'string'
+        assert reader.schema.field('DT_NOTIFIC').type == 'date32[day]'
+        assert reader.schema.field('NU_IDADE_N').type == 'int64'
+
+    def test_dates_read_as_date32(self, tmp_path):
+        """Campos D viram date32; data inexistente ou em branco vira nula"""
+        path = tmp_path / 'DENGAM24.dbf'
+        write_dbf(path, FIELDS, make_records(1) + [('2', '20230229', '130260', 4000, 'M'),
+                                                   ('2', '        ', '130260', 4000, 'M')])
+
+        batch = next(iter(DBFBatchReader(str(path), typed=False)))
+
+        assert batch.column('DT_NOTIFIC').to_pylist() == [datetime.date(2024, 1, 5), None, None]
+
+    def test_typed_schema_from_registry(self, tmp_path):
+        """Por padrão, as colunas devem ser lidas já nos tipos do registro de schema"""
+        path = tmp_path / 'DENGAM24.dbf'
+        write_dbf(path, FIELDS + [('ALRM_VOM', 'C', 1, 0)], [record + ('1',) for record in make_records(3)])
+
+        reader = DBFBatchReader(str(path))
+        batch = next(iter(reader))
+
+        assert batch.schema == reader.schema
+        assert reader.schema.field('TP_NOT').type == pa.dictionary(pa.int16(), pa.string())
+        assert reader.schema.field('NU_IDADE_N').type == pa.int16()
+        assert reader.schema.field('ALRM_VOM').type == pa.dictionary(pa.int32(), pa.string())
+
+    def test_batches_are_bounded(self, tmp_path):
+        """Nenhum lote deve ultrapassar o tamanho configurado"""
+        path = tmp_path / 'DENGAM24.dbf'
+        write_dbf(path, FIELDS, make_records(25))
+
+        batches = list(DBFBatchReader(str(path), batch_size=10))
+
+        assert [batch.num_rows for batch in batches] == [10, 10, 5]
+
+    def test_decodes_values_and_blanks(self, tmp_path):
+        """Valores devem ser decodificados e campos em branco viram nulos"""
+        path = tmp_path / 'DENGAM24.dbf'
+        write_dbf(path, FIELDS, [('2', '20240105', '130260', 4030, 'F'), ('2', '', '130260', '', ' ')])
+
+        batch = next(iter(DBFBatchReader(str(path))))
+        rows = batch.to_pylist()
+
+        assert rows[0]['DT_NOTIFIC'] == datetime.date(2024, 1, 5)
+        assert rows[0]['NU_IDADE_N'] == 4030
+        assert rows[0]['CS_SEXO'] == 'F'
+        assert rows[1]['DT_NOTIFIC'] is None
+        assert rows[1]['NU_IDADE_N'] is None
+        assert rows[1]['CS_SEXO'] is None
+
+    def test_skips_deleted_records(self, tmp_path):
+        """Registros marcados como removidos não devem ser lidos"""
+        path = tmp_path / 'DENGAM24.dbf'
+        write_dbf(path, FIELDS, make_records(5), deleted={1, 3})
+
+        rows = sum(batch.num_rows for batch in DBFBatchReader(str(path), batch_size=2))
+
+        assert rows == 3
+
+    def test_invalid_batch_size(self, tmp_path):
+        """Tamanho de lote inválido deve ser rejeitado"""
+        path = tmp_path / 'DENGAM24.dbf'
+        write_dbf(path, FIELDS, make_records(1))
+
+        with pytest.raises(ValueError, match="batch_size deve ser maior que zero"):
+            DBFBatchReader(str(path), batch_size=0)
+
+
+class TestIngestPipeline:
+    """Testes para a conversão DBF → Parquet"""
+
+    def test_convert_file_writes_one_row_group_per_batch(self, tmp_path):
+        """Cada lote deve virar um row group do Parquet"""
+        source = tmp_path / 'DENGAM24.dbf'
+        destination = tmp_path / 'saida' / 'DENGAM24.parquet'
+        write_dbf(source, FIELDS, make_records(25))
+
+        report = convert_file(str(source), str(destination), batch_size=10)
+
+        metadata = pq.ParquetFile(destination).metadata
+        assert report.rows == 25
+        assert report.row_groups == 3
+        assert metadata.num_rows == 25
+        assert metadata.num_row_groups == 3
+        assert report.rows_per_second > 0
+        assert report.peak_rss_mb > 0
+
+    def test_convert_many_in_process_pool(self, tmp_path):
+        """Vários arquivos devem ser convertidos em paralelo, com relatório por arquivo"""
+        jobs = []
+        for uf, count in (('AM', 7), ('DF', 12)):
+            source = tmp_path / f'DENG{uf}24.dbf'
+            write_dbf(source, FIELDS, make_records(count))
+            jobs.append((str(source), str(tmp_path / f'DENG{uf}24.parquet')))
+
+        reports = convert_many(jobs, batch_size=5, workers=2)
+
+        assert [report.rows for report in reports] == [7, 12]
+        assert pq.read_table(jobs[1][1]).num_rows == 12
+
+    def test_convert_file_enriches_municipios(self, tmp_path):
+        """Com o índice de municípios, cada linha deve receber os dados do município"""
+        index_path = tmp_path / 'municipios.npy'
+        MunicipioIndex.from_excel(DEFAULT_SOURCE_PATH).save(str(index_path))
+        source = tmp_path / 'DENGAM24.dbf'
+        destination = tmp_path / 'DENGAM24.parquet'
+        write_dbf(source, FIELDS, make_records(3))
+
+        convert_file(str(source), str(destination), municipios=str(index_path))
+
+        table = pq.read_table(destination)
+        assert table.column('NOME_DO_MUNICIPIO').to_pylist() == ['Manaus'] * 3
+        assert table.column('COD_IBGE').to_pylist() == [1302603] * 3
+
+    def test_convert_file_imputes_modes(self, tmp_path):
+        """Com as tabelas de imputação, os campos em branco do DBF recebem a moda"""
+        imputer_path = str(tmp_path / 'imputacao.json')
+        ModeImputer(['CS_SEXO']).fit([pa.record_batch({'CS_SEXO': ['F', 'F', 'M']})]).save(imputer_path)
+        source = tmp_path / 'DENGAM24.dbf'
+        destination = tmp_path / 'DENGAM24.parquet'
+        write_dbf(source, FIELDS, [('2', '20240105', '130260', 4000, sexo) for sexo in ('M', ' ', 'M')])
+
+        convert_file(str(source), str(destination), imputer=imputer_path)
+
+        table = pq.read_table(destination)
+        assert table.column('CS_SEXO').to_pylist() == ['M', 'F', 'M']
+        assert table.schema.field('CS_SEXO').type == DBFBatchReader(str(source)).schema.field('CS_SEXO').type
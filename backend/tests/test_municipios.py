@@ -0,0 +1,90 @@
+"""
+Testes para o índice compilado de municípios
+"""
+import pytest
+from pydantic import ValidationError
+
+from src.geo.municipios import DEFAULT_SOURCE_PATH, MunicipioIndex, read_populacao
+from src.models.identificacao_notificacao import IdentificacaoNotificacao
+from src.models.residencia import Residencia
+
+
+@pytest.fixture(scope='module')
+def index():
+    """Índice compilado a partir da planilha do repositório"""
+    return MunicipioIndex.from_excel(DEFAULT_SOURCE_PATH)
+
+
+class TestMunicipioIndex:
+    """Testes de consulta ao índice"""
+
+    def test_lookup_by_sinan_and_ibge(self, index):
+        """Consultas por código SINAN e IBGE devem retornar o mesmo município"""
+        by_sinan = index.by_sinan('130260')
+        by_ibge = index.by_ibge('1302603')
+
+        assert by_sinan == by_ibge
+        assert by_sinan['nome'] == 'Manaus'
+        assert by_sinan['uf'] == 'AM'
+        assert by_sinan['cod_ibge'] == '1302603'
+
+    def test_lookup_misses(self, index):
+        """Códigos inexistentes ou com dígito verificador errado não devem ser encontrados"""
+        assert index.by_sinan('999999') is None
+        assert index.by_ibge('1302604') is None
+        assert index.by_sinan('abc') is None
+        assert not index.contains_sinan(None)
+
+    def test_lookup_by_name(self, index):
+        """Consulta por nome ignora acentos e caixa, e pode filtrar pela UF"""
+        assert [m['cod_sinan'] for m in index.by_nome('sao paulo')] == ['355030']
+        assert len(index.by_nome('Buritis')) == 2
+        assert [m['uf'] for m in index.by_nome('Buritis', uf='mg')] == ['MG']
+
+    def test_save_and_load_memory_mapped(self, index, tmp_path):
+        """O índice gravado deve ser carregado por memory map com o mesmo conteúdo"""
+        path = tmp_path / 'municipios.npy'
+        index.save(str(path))
+
+        loaded = MunicipioIndex.load(str(path))
+
+        assert len(loaded) == len(index)
+        assert loaded.by_sinan('530010')['nome'] == 'Brasília'
+
+    def test_vectorized_join(self, index):
+        """A junção vetorizada deve alinhar os dados do município a cada linha"""
+        joined = index.join(['130260', '999999', None, '530010'], ['13', '13', '13', '52'])
+
+        assert joined.num_rows == 4
+        assert joined.column('NOME_DO_MUNICIPIO').to_pylist() == ['Manaus', None, None, None]
+        assert joined.column('COD_IBGE').to_pylist() == [1302603, None, None, None]
+
+    def test_read_populacao(self, tmp_path):
+        """Códigos IBGE viram SINAN; separador ';', milhares com ponto e linhas incompletas"""
+        path = tmp_path / 'populacao.csv'
+        path.write_text('COD. MUNIC;NOME;POPULAÇÃO ESTIMADA\n1302603;Manaus;2.063.547\n530010;Brasília;2817068\n'
+                        '5300108;;\n', encoding='utf-8')
+
+        assert read_populacao(str(path)) == {130260: 2063547, 530010: 2817068}
+
+        path.write_text('municipio,habitantes\n130260,1\n', encoding='utf-8')
+        with pytest.raises(ValueError, match="colunas de código e de população"):
+            read_populacao(str(path))
+
+
+class TestMunicipioValidation:
+    """Validação de municípios nos modelos de notificação"""
+
+    def test_valid_municipio(self):
+        """Códigos existentes devem ser aceitos"""
+        residencia = Residencia(sg_uf='13', id_mn_resi='130260', id_rg_resi=None,
+                                id_pais=None, dt_invest=None, id_ocupa_n=None)
+
+        assert residencia.id_mn_resi == '130260'
+
+    def test_invalid_municipio(self):
+        """Códigos inexistentes devem ser rejeitados sem consulta ao banco"""
+        with pytest.raises(ValidationError, match="Município '999999' não encontrado"):
+            IdentificacaoNotificacao(tp_not='2', id_agravo='A90', dt_notific='2024-01-05', sem_not='202401',
+                                     nu_ano='2024', sg_uf_not='13', id_municip='999999',
+                                     id_regiona=None, id_unidade=None)
@@ -0,0 +1,176 @@
+"""
+Testes para o motor de alertas de surto
+"""
+import json
+
+import numpy as np
+import pytest
+
+from src.analytics.outbreak import OutbreakEngine, clear_default_engine
+from src.geo.municipios import get_default_index
+from src.models.dengue_notification import DengueNotification
+from src.repositories.dengue_repository import DengueRepository
+from src.repositories.stats_repository import StatsRepository
+from src.services.dengue_service import DengueService
+from src.services.stats_service import StatsService
+from tests.conftest import make_notification
+
+
+@pytest.fixture
+def engine():
+    """Motor sobre o índice padrão com janela curta para o limiar móvel"""
+    return OutbreakEngine(get_default_index(), years=4, window=4)
+
+
+@pytest.fixture(autouse=True)
+def fresh_default_engine():
+    """O motor padrão é por processo; cada teste começa sem contagens carregadas"""
+    clear_default_engine()
+    yield
+    clear_default_engine()
+
+
+def _record(result, code):
+    return _unit(result.to_records(), code)
+
+
+def _unit(units, code):
+    return next(unit for unit in units if unit['codigo'] == code)
+
+
+def _random_counts(engine, years):
+    """Mesmas contagens aleatórias para qualquer motor (semente fixa)"""
+    rng = np.random.default_rng(3)
+    codes = np.asarray(engine.index.table['sinan'])
+    for year in years:
+        positions = rng.integers(0, len(codes), 20_000)
+        weeks = rng.integers(1, 53, 20_000)
+        engine.add_cases([f'{year}{week:02d}' for week in weeks], codes[positions].astype(str))
+
+
+class TestOutbreakEngine:
+    """Testes dos limiares, da passada do ano e da atualização incremental"""
+
+    def test_endemic_channel_quartiles(self, engine):
+        """Quartis da mesma semana nos anos anteriores; acima do 3º quartil é zona epidêmica"""
+        for year, casos in zip(range(2020, 2024), (2, 4, 6, 8)):
+            engine.set_week(year, 10, ['130260'], [casos])
+        engine.set_week(2024, 10, ['130260', '530010'], [9, 1])
+
+        result = engine.alerts(2024, 10)
+        manaus = _record(result, '130260')
+
+        assert (manaus['inferior'], manaus['centro'], manaus['superior']) == (3.5, 5.0, 6.5)
+        assert manaus['zona'] == 'epidemia' and manaus['alerta']
+        assert [record['codigo'] for record in result.to_records(only_alerts=True)] == ['130260', '530010']
+
+    def test_moving_threshold(self, engine):
+        """Média e desvio-padrão das semanas anteriores, atravessando a virada do ano"""
+        engine.add_cases(['202351', '202352', '202401', '202401', '202402'], ['130260'] * 5)
+        engine.set_week(2024, 3, ['130260'], [3])
+
+        manaus = _record(engine.alerts(2024, 3, 'media'), '130260')
+
+        history = np.array([1, 1, 2, 1])
+        assert manaus['centro'] == pytest.approx(history.mean())
+        assert manaus['superior'] == pytest.approx(history.mean() + 2 * history.std(ddof=1), abs=1e-4)
+        assert manaus['alerta']
+
+    def test_compute_year_matches_alerts(self, engine):
+        """A passada vetorizada do ano coincide com o cálculo semana a semana, nos dois métodos"""
+        single = OutbreakEngine(engine.index, years=4, window=4)
+        _random_counts(engine, range(2019, 2025))
+        _random_counts(single, range(2019, 2025))
+
+        for method in ('quartis', 'media'):
+            year = engine.compute_year(2024, method)
+            assert len(year) == 52
+            for week in (1, 5, 52):
+                expected = single.alerts(2024, week, method)
+                assert np.allclose(year[week - 1].superior, expected.superior)
+                assert np.array_equal(year[week - 1].alerta, expected.alerta)
+
+    def test_new_week_updates_incrementally(self, engine):
+        """Uma semana nova avança as somas móveis e só descarta a memoização a partir dela"""
+        _random_counts(engine, range(2023, 2025))
+        engine.alerts(2024, 20, 'media')
+        first = engine.alerts(2024, 21, 'media')
+
+        engine.set_week(2024, 22, ['130260'], [40])
+        assert engine.alerts(2024, 21, 'media') is first
+        incremental = engine.alerts(2024, 22, 'media')
+        engine.set_week(2024, 23, ['130260'], [1])
+        following = engine.alerts(2024, 23, 'media')
+
+        fresh = OutbreakEngine(engine.index, years=4, window=4)
+        _random_counts(fresh, range(2023, 2025))
+        fresh.set_week(2024, 22, ['130260'], [40])
+        fresh.set_week(2024, 23, ['130260'], [1])
+        assert _record(incremental, '130260')['alerta']
+        assert np.allclose(incremental.superior, fresh.alerts(2024, 22, 'media').superior)
+        assert np.allclose(following.superior, fresh.alerts(2024, 23, 'media').superior)
+
+    def test_invalid_week_and_method(self, engine):
+        with pytest.raises(ValueError, match="Semana epidemiológica inválida"):
+            engine.alerts(2024, 53)
+        with pytest.raises(ValueError, match="Método inválido"):
+            engine.alerts(2024, 1, 'percentil')
+        assert len(engine.alerts(2020, 53).casos) == len(engine.index)
+
+
+class TestAlertsEndpoint:
+    """Testes para o endpoint GET /api/stats/alerts"""
+
+    def _create(self, client, **overrides):
+        client.post('/api/dengue-notifications', data=json.dumps(make_notification(**overrides)),
+                    content_type='application/json')
+
+    def test_alerts_follow_writes(self, client):
+        """O motor carrega os anos do histórico do cubo e recarrega só as semanas alteradas"""
+        self._create(client, sem_not='202302')
+        self._create(client, sem_not='202402')
+
+        data = json.loads(client.get('/api/stats/alerts?sem_not=202402').data)['data']
+        assert data['alerts'] == 1
+        assert data['units'] == [{
+            'codigo': '130260', 'nome': 'Manaus', 'casos': 1, 'inferior': 0.0, 'centro': 0.0,
+            'superior': 0.0, 'zona': 'epidemia', 'alerta': True,
+        }]
+
+        for sem_not in ('202001', '202101', '202201', '202301'):
+            self._create(client, sem_not=sem_not)
+        data = json.loads(client.get('/api/stats/alerts?sem_not=202402&method=media').data)['data']
+        assert data['method'] == 'media' and data['alerts'] == 1
+
+        response = client.get('/api/stats/alerts?sem_not=202401&alerts_only=false')
+        data = json.loads(response.data)['data']
+        assert response.status_code == 200
+        assert data['alerts'] == 0
+        assert len(data['units']) == len(get_default_index())
+        assert _unit(data['units'], '130260')['superior'] == 1.0
+
+    def test_alerts_follow_other_processes(self, app):
+        """Escrita de outro worker em um ano do histórico muda os limiares e descarta as somas móveis"""
+        service = StatsService()
+        DengueService().create_notification(make_notification(sem_not='202402'))
+        assert service.get_alerts({'sem_not': '202402', 'method': 'media'})['alerts'] == 1
+
+        # Outro worker grava casos na janela do limiar móvel, sem acesso ao motor deste processo
+        for _ in range(3):
+            values = DengueService().validate(make_notification(sem_not='202350'))
+            StatsRepository.apply(StatsRepository.deltas(added=[values]))
+            DengueRepository.create(DengueNotification(**values))
+
+        manaus = _unit(service.get_alerts({'sem_not': '202402', 'method': 'media', 'alerts_only': 'false'})['units'],
+                       '130260')
+        window = np.zeros(52)
+        window[-4] = 3
+        assert manaus['centro'] == pytest.approx(window.mean(), abs=1e-4)
+        assert manaus['superior'] == pytest.approx(window.mean() + 2 * window.std(ddof=1), abs=1e-4)
+
+    def test_alerts_invalid_params(self, client):
+        """Semana ausente, inválida ou inexistente no ano e método desconhecido"""
+        assert client.get('/api/stats/alerts').status_code == 400
+        assert client.get('/api/stats/alerts?sem_not=2024-1').status_code == 400
+        assert client.get('/api/stats/alerts?sem_not=202453').status_code == 400
+        assert client.get('/api/stats/alerts?sem_not=202401&method=percentil').status_code == 400
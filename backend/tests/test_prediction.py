@@ -0,0 +1,125 @@
+"""
+Testes para a pontuação do risco de desfecho
+"""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.config import TestingConfig, config
+from src.main import create_app
+from src.ml.batching import MicroBatcher
+from src.ml.features import FeatureBuilder
+from src.ml.model import OutcomeModel
+from src.ml.training import build_estimator
+from tests.conftest import make_notification
+
+
+def training_records(rows: int = 120):
+    """Notificações em que a hospitalização decide o desfecho (2 = óbito)"""
+    return [make_notification(hospitaliz=['1', '2'][i % 2], febre=['1', '2', None][i % 3],
+                              evolucao=['2', '1'][i % 2])
+            for i in range(rows)]
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    """Modelo exportado como por python -m src.ml export, em um arquivo temporário"""
+    builder = FeatureBuilder(['CS_SEXO', 'FEBRE', 'HOSPITALIZ'])
+    records = training_records()
+    empty = OutcomeModel(builder, None)
+    builder.fit([empty.records_batch(records)])
+    estimator = build_estimator('LinearSVM_SGD', {'alpha': 1e-3})
+    estimator.fit(builder.transform(empty.records_batch(records)),
+                  np.array([int(record['evolucao']) for record in records]))
+    path = str(tmp_path / 'modelo.pkl')
+    OutcomeModel(builder, estimator, {'model': 'LinearSVM_SGD', 'dense': False}).save(path)
+    return path
+
+
+@pytest.fixture
+def prediction_client(model_path):
+    config['prediction'] = type('PredictionConfig', (TestingConfig,), {'PREDICTION_MODEL_PATH': model_path,
+                                                                       'PREDICTION_MAX_RECORDS': 5})
+    try:
+        yield create_app('prediction').test_client()
+    finally:
+        del config['prediction']
+
+
+class TestPrediction:
+    """Testes dos endpoints de pontuação e do micro-lote"""
+
+    def test_predict_single(self, prediction_client):
+        response = prediction_client.post('/api/dengue-notifications/predict',
+                                          json=make_notification(hospitaliz='1'))
+
+        assert response.status_code == 200
+        data = response.get_json()['data']
+        assert data['evolucao_prevista'] == '2'
+        assert data['risco_obito'] > 0.5
+        assert data['modelo'] == 'LinearSVM_SGD'
+
+    def test_predict_batch_matches_single(self, prediction_client):
+        """O lote aplica a mesma transformação: cada item pontua como a requisição individual"""
+        notifications = [make_notification(hospitaliz='2'), make_notification(hospitaliz='1', febre=None)]
+
+        response = prediction_client.post('/api/dengue-notifications/predict/batch',
+                                          json={'notifications': notifications})
+
+        assert response.status_code == 200
+        scores = response.get_json()['data']
+        assert [score['evolucao_prevista'] for score in scores] == ['1', '2']
+        for notification, score in zip(notifications, scores):
+            single = prediction_client.post('/api/dengue-notifications/predict', json=notification)
+            assert single.get_json()['data'] == score
+
+    def test_predict_batch_limit(self, prediction_client):
+        response = prediction_client.post('/api/dengue-notifications/predict/batch',
+                                          json=[make_notification()] * 6)
+
+        assert response.status_code == 400
+        assert '5' in response.get_json()['error']
+
+    def test_latency(self, prediction_client):
+        prediction_client.post('/api/dengue-notifications/predict', json=make_notification())
+        prediction_client.post('/api/dengue-notifications/predict/batch', json=[make_notification()])
+
+        response = prediction_client.get('/api/dengue-notifications/predict/latency')
+
+        data = response.get_json()['data']
+        assert data['predict']['count'] == 1
+        assert data['predict']['p50_ms'] is not None and data['predict']['p99_ms'] is not None
+        assert data['batch']['count'] == 1
+
+    def test_missing_model(self, client, notification_data):
+        response = client.post('/api/dengue-notifications/predict', json=notification_data)
+
+        assert response.status_code == 503
+
+    def test_micro_batcher_coalesces_concurrent_requests(self):
+        """Requisições concorrentes são pontuadas juntas; uma requisição sozinha não espera"""
+        sizes = []
+
+        def handler(items):
+            sizes.append(len(items))
+            time.sleep(0.01)
+            return [item * 2 for item in items]
+
+        batcher = MicroBatcher(handler, max_batch_size=8, max_wait=0.05)
+        assert batcher.submit(1) == 2
+
+        results = {}
+        threads = [threading.Thread(target=lambda i=i: results.__setitem__(i, batcher.submit(i)))
+                   for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == {i: i * 2 for i in range(20)}
+        assert sum(sizes) == 21
+        assert max(sizes) <= 8
+        assert len(sizes) < 21
+        assert batcher.stats()['count'] == 21
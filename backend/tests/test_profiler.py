@@ -0,0 +1,113 @@
+"""
+Testes para o perfil de qualidade em uma passada
+"""
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.ml.__main__ import main as ml_main
+from src.ml.features import FeatureBuilder
+from src.quality.profiler import TOP_CAPACITY, HyperLogLog, Profile, hash64, profile_files
+from src.store.case_store import CaseStore
+
+
+def make_batch(rows: int, offset: int = 0) -> pa.RecordBatch:
+    """Lote com texto bruto (' ' nos vazios), dicionário e flags int8, com códigos fora do domínio"""
+    positions = range(offset, offset + rows)
+    return pa.record_batch({
+        'NU_NOTIFIC': [f'{i:07d}' for i in positions],
+        'CS_SEXO': pa.array([['M', 'F', ' ', 'X'][i % 4] for i in positions]).dictionary_encode(),
+        'FEBRE': pa.array([[1, 2, None, 1, 7][i % 5] for i in positions], pa.int8()),
+        'DT_OBITO': [' ' if i % 10 else '2024-03-01' for i in positions],
+    })
+
+
+class TestProfiler:
+    """Testes das contagens, do HyperLogLog, da combinação de perfis e do descarte de colunas"""
+
+    def test_blank_null_and_domain(self):
+        profile = Profile().update(make_batch(100))
+        lines = {line['column']: line for line in profile.summary()}
+
+        assert lines['CS_SEXO']['blanks'] == 25 and lines['CS_SEXO']['nulls'] == 0
+        assert lines['CS_SEXO']['violations'] == 25
+        assert lines['CS_SEXO']['violation_samples'] == ['X']
+        assert lines['FEBRE']['nulls'] == 20
+        assert lines['FEBRE']['violations'] == 20
+        assert lines['FEBRE']['top'][0] == ['1', 40]
+        assert lines['NU_NOTIFIC']['violations'] is None
+        assert lines['DT_OBITO']['empty_rate'] == 0.9
+        assert profile.columns_to_drop() == ['DT_OBITO']
+        assert profile.columns_to_drop(0.95) == []
+
+    def test_hyperloglog_estimate_and_merge(self):
+        first, second = HyperLogLog(), HyperLogLog()
+        first.add_hashes(hash64(pa.array([str(i) for i in range(30_000)])))
+        second.add_hashes(hash64(pa.array([str(i) for i in range(20_000, 50_000)])))
+
+        assert abs(first.count() - 30_000) / 30_000 < 0.05
+        assert abs(first.merge(second).count() - 50_000) / 50_000 < 0.05
+        assert hash64(pa.array(['1', 'abc' * 9])).tolist() == hash64(pa.array(['x', '1', 'abc' * 9]).slice(1)).tolist()
+
+    def test_partition_profiles_merge(self):
+        """Perfis de partições combinados dão o mesmo perfil da passada única; coluna ausente conta como nula"""
+        batches = [make_batch(300), make_batch(200, offset=300).drop_columns(['DT_OBITO'])]
+        whole = Profile().fit(batches)
+
+        parts = [Profile().update(batch) for batch in batches]
+        merged = Profile.from_dict(json.loads(json.dumps(parts[0].to_dict())))
+        merged.merge(Profile.from_dict(json.loads(json.dumps(parts[1].to_dict()))))
+
+        assert merged.rows == whole.rows == 500
+        for expected, line in zip(whole.summary(), merged.summary()):
+            assert line == expected
+        assert merged.columns['DT_OBITO'].nulls == 200
+        assert merged.summary()[0]['column'] == 'DT_OBITO'
+
+    def test_top_values_beyond_capacity(self):
+        """Com mais distintos que o resumo comporta, os valores frequentes continuam no topo"""
+        values = ['comum'] * 5000 + ['raro'] * 3000 + [str(i) for i in range(TOP_CAPACITY * 4)]
+        profile = Profile()
+        for start in range(0, len(values), 1000):
+            profile.update(pa.record_batch({'ID_UNIDADE': values[start:start + 1000]}))
+
+        line = profile.summary()[0]
+        assert [value for value, _ in line['top'][:2]] == ['comum', 'raro']
+        assert line['top_exact'] is False
+        assert abs(line['distinct'] - (TOP_CAPACITY * 4 + 2)) / (TOP_CAPACITY * 4) < 0.05
+
+    def test_profile_files_in_parallel(self, tmp_path):
+        paths = []
+        for year, offset in ((2023, 0), (2024, 400)):
+            path = tmp_path / f'DENGBR{year % 100}.parquet'
+            pq.write_table(pa.Table.from_batches([make_batch(400, offset)]), path)
+            paths.append(str(path))
+
+        parallel = profile_files(paths, batch_size=400, workers=2)
+        sequential = Profile().fit([make_batch(400), make_batch(400, 400)])
+
+        assert parallel.sources == paths
+        assert parallel.summary() == sequential.summary()
+
+    def test_vocabulary_drops_blank_columns(self, tmp_path):
+        """vocabulary --profile descarta do vocabulário as colunas com mais de 50% de vazios"""
+        rows = 60
+        table = pa.table({
+            'NU_ANO': ['2024'] * rows,
+            'SG_UF_NOT': [['13', '53'][i % 2] for i in range(rows)],
+            'CS_SEXO': [['M', 'F'][i % 2] for i in range(rows)],
+            'HOSPITALIZ': [' ' if i % 4 else '1' for i in range(rows)],
+            'EVOLUCAO': [['1', '2'][i % 2] for i in range(rows)],
+        })
+        pq.write_table(table, tmp_path / 'dengue_preprocessado.parquet')
+        store = CaseStore(str(tmp_path / 'casos'))
+        store.write([str(tmp_path / 'dengue_preprocessado.parquet')])
+        Profile().fit(store.iter_batches()).save(str(tmp_path / 'perfil.json'))
+
+        assert ml_main(['vocabulary', '--root', str(tmp_path / 'casos'), '--profile', str(tmp_path / 'perfil.json'),
+                        '--vocabulary', str(tmp_path / 'vocabulario.json')]) == 0
+
+        columns = FeatureBuilder.load(str(tmp_path / 'vocabulario.json')).columns
+        assert 'HOSPITALIZ' not in columns
+        assert 'CS_SEXO' in columns and 'SG_UF_NOT' in columns
@@ -0,0 +1,164 @@
+"""
+Testes para o cache de respostas HTTP
+"""
+import json
+
+import pytest
+
+from src.cache.response_cache import ResponseCache
+from src.models.dengue_notification import DengueNotification
+from src.repositories.dengue_repository import DengueRepository
+from src.repositories.stats_repository import StatsRepository
+from src.repositories.user_repository import UserRepository
+from src.services.dengue_service import DengueService
+from tests.conftest import make_notification
+
+
+class FakeClock:
+    """Relógio controlado pelos testes"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _key(path, **params):
+    return path, tuple(sorted(params.items())), None
+
+
+class TestResponseCache:
+    """Testes do cache LRU com TTL"""
+
+    def test_lru_bound(self):
+        """A entrada menos usada é descartada ao passar do limite"""
+        cache = ResponseCache(max_entries=2)
+        cache.put(_key('/a'), b'a', 200, 'application/json', frozenset({'users'}))
+        cache.put(_key('/b'), b'b', 200, 'application/json', frozenset({'users'}))
+        cache.get(_key('/a'))
+        cache.put(_key('/c'), b'c', 200, 'application/json', frozenset({'users'}))
+
+        assert cache.get(_key('/a')) is not None
+        assert cache.get(_key('/b')) is None
+        assert len(cache) == 2
+
+    def test_ttl(self):
+        """Entradas expiram depois do TTL"""
+        clock = FakeClock()
+        cache = ResponseCache(ttl=10, clock=clock)
+        cache.put(_key('/a'), b'a', 200, 'application/json', frozenset())
+
+        clock.now = 9.9
+        assert cache.get(_key('/a')) is not None
+        clock.now = 10.0
+        assert cache.get(_key('/a')) is None
+
+    def test_invalidate_by_tag(self):
+        """A invalidação remove só as entradas das tags informadas"""
+        cache = ResponseCache()
+        cache.put(_key('/users'), b'u', 200, 'application/json', frozenset({'users'}))
+        cache.put(_key('/stats/weeks'), b's', 200, 'application/json', frozenset({'stats'}))
+
+        assert cache.invalidate('users') == 1
+        assert cache.get(_key('/users')) is None
+        assert cache.get(_key('/stats/weeks')) is not None
+
+    def test_write_during_computation_is_not_cached(self):
+        """Uma resposta calculada antes de uma escrita não é guardada depois dela"""
+        cache = ResponseCache()
+        generations = cache.generations(frozenset({'users'}))
+        cache.invalidate('users')
+
+        cache.put(_key('/users'), b'antigo', 200, 'application/json', frozenset({'users'}), generations)
+
+        assert cache.get(_key('/users')) is None
+
+    def test_invalid_size(self):
+        """Limite de entradas inválido"""
+        with pytest.raises(ValueError):
+            ResponseCache(max_entries=0)
+
+
+class TestCachedEndpoints:
+    """Testes do cache nos endpoints"""
+
+    def _create_user(self, client, username='joao', email='joao@example.com'):
+        return client.post('/api/users', data=json.dumps({'username': username, 'email': email}),
+                           content_type='application/json')
+
+    def test_etag_and_not_modified(self, client):
+        """Respostas trazem ETag forte e If-None-Match responde 304 sem corpo"""
+        self._create_user(client)
+        first = client.get('/api/users')
+        etag = first.headers['ETag']
+
+        assert not etag.startswith('W/')
+        second = client.get('/api/users', headers={'If-None-Match': etag})
+        assert second.status_code == 304
+        assert second.data == b''
+
+    def test_writes_invalidate(self, client):
+        """Escritas nos serviços invalidam as respostas afetadas"""
+        self._create_user(client)
+        etag = client.get('/api/users').headers['ETag']
+
+        self._create_user(client, 'maria', 'maria@example.com')
+        response = client.get('/api/users', headers={'If-None-Match': etag})
+
+        assert response.status_code == 200
+        assert len(json.loads(response.data)['data']) == 2
+
+    def test_dengue_writes_invalidate_stats(self, client):
+        """Notificações novas invalidam as listagens e as estatísticas"""
+        notification = json.dumps(make_notification())
+        client.post('/api/dengue-notifications', data=notification, content_type='application/json')
+        assert json.loads(client.get('/api/stats/weeks').data)['data'][0]['total'] == 1
+
+        client.post('/api/dengue-notifications', data=notification, content_type='application/json')
+
+        assert json.loads(client.get('/api/stats/weeks').data)['data'][0]['total'] == 2
+        assert json.loads(client.get('/api/dengue-notifications').data)['pagination']['count'] == 2
+
+    def test_other_process_writes_change_the_key(self, client):
+        """Escrita de outro worker não invalida este cache, mas avança a revisão do cubo na chave"""
+        notification = json.dumps(make_notification())
+        client.post('/api/dengue-notifications', data=notification, content_type='application/json')
+        etag = client.get('/api/stats/weeks').headers['ETag']
+        client.get('/api/dengue-notifications')
+
+        # Outro worker grava direto nos repositórios, sem passar pelo cache deste processo
+        with client.application.app_context():
+            values = DengueService().validate(make_notification())
+            StatsRepository.apply(StatsRepository.deltas(added=[values]))
+            DengueRepository.create(DengueNotification(**values))
+
+        response = client.get('/api/stats/weeks', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert json.loads(response.data)['data'][0]['total'] == 2
+        assert json.loads(client.get('/api/dengue-notifications').data)['pagination']['count'] == 2
+
+    def test_other_process_user_writes_change_the_key(self, client):
+        """Usuário removido por outro worker deixa de ser servido pelo cache deste processo"""
+        user_id = json.loads(self._create_user(client).data)['data']['id']
+        etag = client.get('/api/users').headers['ETag']
+        assert client.get(f'/api/users/{user_id}').status_code == 200
+
+        # Outro worker remove direto no repositório, sem passar pelo cache deste processo
+        with client.application.app_context():
+            UserRepository.delete(UserRepository.get_by_id(user_id))
+
+        response = client.get('/api/users', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert json.loads(response.data)['data'] == []
+        assert client.get(f'/api/users/{user_id}').status_code == 404
+
+    def test_key_includes_query_params(self, client):
+        """Parâmetros diferentes são entradas diferentes; erros não são guardados"""
+        cache = client.application.extensions['response_cache']
+
+        client.get('/api/dengue-notifications?limit=1')
+        client.get('/api/dengue-notifications?limit=2')
+        client.get('/api/dengue-notifications?limit=0')
+
+        assert len(cache) == 2
@@ -0,0 +1,76 @@
+"""
+Testes para o registro de schema colunar do CasoDengue
+"""
+import datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.ingest.parquet_reader import iter_typed_batches, read_typed_table
+from src.schema.registry import SchemaRegistry, get_registry
+
+
+class TestSchemaRegistry:
+    """Testes da geração do schema a partir dos modelos"""
+
+    def test_columns_follow_models(self):
+        """Todas as colunas dos sub-modelos devem estar no registro, agrupadas"""
+        registry = get_registry()
+
+        assert registry.groups['identificacao'][:3] == ['tp_not', 'id_agravo', 'dt_notific']
+        assert 'dor_retro' in registry.groups['sinais']
+        assert registry.spec('EVOLUCAO').group == 'encerramento'
+        assert len(registry.arrow_schema()) == sum(len(fields) for fields in registry.groups.values())
+
+    def test_narrow_types(self):
+        """Inteiros estreitos, dicionários e date32 conforme o tipo do campo"""
+        schema = SchemaRegistry().arrow_schema()
+
+        assert schema.field('FEBRE').type == pa.int8()
+        assert schema.field('NU_IDADE_N').type == pa.int16()
+        assert schema.field('NU_ANO').type == pa.int16()
+        assert schema.field('DT_NOTIFIC').type == pa.date32()
+        assert schema.field('CS_SEXO').type == pa.dictionary(pa.int16(), pa.string())
+        assert schema.field('ID_MUNICIP').type == pa.dictionary(pa.int32(), pa.string())
+        assert not schema.field('DT_NOTIFIC').nullable
+        assert schema.field('DT_OBITO').nullable
+
+    def test_cast_batch_tolerates_dirty_values(self):
+        """Brancos, códigos não numéricos e valores fora da faixa viram nulos"""
+        batch = pa.RecordBatch.from_pydict({
+            'FEBRE': ['1', ' ', 'X'],
+            'NU_IDADE_N': [4020, 70000, None],
+            'DT_NOTIFIC': ['20240105', '2024-01-06', ''],
+            'CS_SEXO': ['F', 'M', ' '],
+            'GRAV_PULSO': ['1', '2', ' '],
+        })
+
+        result = get_registry().cast_batch(batch)
+
+        assert result.column('FEBRE').to_pylist() == [1, None, None]
+        assert result.column('NU_IDADE_N').to_pylist() == [4020, None, None]
+        assert result.column('DT_NOTIFIC').to_pylist() == [datetime.date(2024, 1, 5), datetime.date(2024, 1, 6), None]
+        assert result.column('CS_SEXO').to_pylist() == ['F', 'M', None]
+        assert pa.types.is_dictionary(result.schema.field('GRAV_PULSO').type)
+
+
+class TestTypedParquetReader:
+    """Testes da leitura tipada de Parquet"""
+
+    def test_untyped_parquet_is_typed_while_reading(self, tmp_path):
+        """Parquet gravado como texto deve chegar tipado, lote a lote"""
+        path = tmp_path / 'dengue_preprocessado.parquet'
+        pq.write_table(pa.table({
+            'NU_ANO': ['2024'] * 5,
+            'FEBRE': ['1', '2', '1', ' ', '2'],
+            'DT_NOTIFIC': ['20240105'] * 5,
+        }), path)
+
+        batches = list(iter_typed_batches(str(path), batch_size=2))
+        table = read_typed_table(str(path), columns=['NU_ANO', 'FEBRE'])
+
+        assert [batch.num_rows for batch in batches] == [2, 2, 1]
+        assert batches[0].schema.field('DT_NOTIFIC').type == pa.date32()
+        assert table.schema.names == ['NU_ANO', 'FEBRE']
+        assert table.column('NU_ANO').type == pa.int16()
+        assert table.column('FEBRE').to_pylist() == [1, 2, 1, None, 2]
@@ -0,0 +1,90 @@
+"""
+Testes para a serialização JSON e as respostas em streaming
+"""
+import json
+
+from src.models.user import User
+from src.serialization.encoders import dumps, get_encoder, iter_json_array, iter_ndjson
+from src.services.dengue_service import DengueService
+from tests.conftest import make_notification
+
+
+class TestEncoders:
+    """Testes dos codificadores pré-computados"""
+
+    def test_user_encoder_matches_to_dict(self, app):
+        """O codificador gera o mesmo dicionário que User.to_dict"""
+        user = User(id=1, username='joao', email='joao@example.com')
+
+        assert get_encoder(User).to_dict(user) == user.to_dict()
+
+    def test_nested_layout_follows_caso_dengue(self, app):
+        """O formato aninhado agrupa os campos como os sub-modelos do CasoDengue"""
+        with app.app_context():
+            created = DengueService().create_notification(make_notification())
+
+            nested = DengueService.ENCODER.nested(created)
+
+            assert nested['id'] == created['id']
+            assert list(nested)[1:] == list(DengueService.GROUPS)
+            assert nested['identificacao']['dt_notific'] == '2024-01-05'
+            assert DengueService().validate(nested)['id_municip'] == '130260'
+
+    def test_iter_json_array(self):
+        """O documento gerado em pedaços é o mesmo que o envelope completo"""
+        rows = [{'id': i, 'nome': 'São Paulo'} for i in range(5)]
+
+        chunks = list(iter_json_array(iter(rows), {'success': True}, chunk_rows=2))
+
+        assert len(chunks) == 5
+        assert json.loads(''.join(chunks)) == {'data': rows, 'success': True}
+        assert json.loads(''.join(iter_json_array(iter([]), {}))) == {'data': []}
+
+    def test_compact_output(self):
+        """Saída sem espaços e sem escapar acentos"""
+        assert dumps({'a': [1, 2], 'nome': 'Brasília'}) == '{"a":[1,2],"nome":"Brasília"}'
+        assert list(iter_ndjson([{'a': 1}, {'a': 2}])) == ['{"a":1}\n{"a":2}\n']
+
+
+class TestExportEndpoint:
+    """Testes para o endpoint GET /api/dengue-notifications/export"""
+
+    def _create(self, client, **overrides):
+        client.post('/api/dengue-notifications', data=json.dumps(make_notification(**overrides)),
+                    content_type='application/json')
+
+    def test_export_json_stream(self, client):
+        """Exportação em streaming com filtros, mais recente primeiro"""
+        self._create(client, dt_notific='2024-01-05')
+        self._create(client, dt_notific='2024-01-06')
+        self._create(client, dt_notific='2024-01-07', evolucao='2')
+
+        response = client.get('/api/dengue-notifications/export?evolucao=1')
+
+        assert response.is_streamed
+        data = json.loads(response.data)
+        assert data['success'] is True
+        assert [row['dt_notific'] for row in data['data']] == ['2024-01-06', '2024-01-05']
+
+    def test_export_ndjson_nested(self, client):
+        """Exportação em NDJSON no formato aninhado"""
+        self._create(client)
+
+        response = client.get('/api/dengue-notifications/export?format=ndjson&layout=nested')
+        lines = response.data.decode('utf-8').splitlines()
+
+        assert response.mimetype == 'application/x-ndjson'
+        assert json.loads(lines[0])['encerramento']['classi_fin'] == '10'
+
+    def test_export_invalid_params(self, client):
+        """Parâmetros inválidos respondem 400 antes do streaming"""
+        assert client.get('/api/dengue-notifications/export?format=xml').status_code == 400
+        assert client.get('/api/dengue-notifications/export?layout=arvore').status_code == 400
+        assert client.get('/api/dengue-notifications/export?dt_inicio=ontem').status_code == 400
+
+    def test_compact_responses(self, client):
+        """Fora do ambiente de desenvolvimento as respostas saem compactas"""
+        response = client.get('/api/users')
+
+        assert b'\n ' not in response.data
+        assert response.data.startswith(b'{"success":true')
@@ -0,0 +1,37 @@
+"""
+Testes para a configuração de produção (Gunicorn)
+"""
+import multiprocessing
+import os
+import runpy
+
+from src.database.engine import dispose_engines
+from src.models.user import db
+
+GUNICORN_CONF = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'gunicorn.conf.py')
+
+
+class TestGunicornConfig:
+    """Testes para o gunicorn.conf.py"""
+
+    def test_workers_and_preload(self, monkeypatch):
+        """Workers pela quantidade de CPUs (ou WEB_CONCURRENCY) e aplicação pré-carregada"""
+        monkeypatch.setenv('FLASK_ENV', 'testing')
+        monkeypatch.delenv('WEB_CONCURRENCY', raising=False)
+
+        settings = runpy.run_path(GUNICORN_CONF)
+
+        assert settings['preload_app'] is True
+        assert settings['workers'] == multiprocessing.cpu_count() * 2 + 1
+        assert callable(settings['post_fork'])
+
+        monkeypatch.setenv('WEB_CONCURRENCY', '3')
+        assert runpy.run_path(GUNICORN_CONF)['workers'] == 3
+
+    def test_dispose_engines(self, app):
+        """Após o fork, o worker troca o pool herdado por um novo"""
+        inherited = db.engine.pool
+
+        dispose_engines(app)
+
+        assert db.engine.pool is not inherited
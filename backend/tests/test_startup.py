@@ -0,0 +1,47 @@
+"""
+Testes para a inicialização da aplicação (imports sob demanda e init-db)
+"""
+import os
+import subprocess
+import sys
+
+from sqlalchemy import inspect
+
+from src.config import TestingConfig, config
+from src.main import create_app
+from src.models.user import db
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(__file__))
+
+
+class TestStartup:
+    """Testes para a inicialização enxuta"""
+
+    def test_heavy_modules_not_imported_at_startup(self):
+        """Importar src.main não carrega NumPy, PyArrow nem pandas"""
+        script = "import sys, src.main; print(','.join(m for m in ('numpy', 'pyarrow', 'pandas') if m in sys.modules))"
+        env = dict(os.environ, DATABASE_URL='sqlite:///:memory:')
+
+        result = subprocess.run([sys.executable, '-c', script], cwd=BACKEND_DIR, env=env,
+                                capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == ''
+
+    def test_schema_created_only_by_init_db(self, tmp_path):
+        """create_app não cria tabelas; o comando init-db cria"""
+        config['startup'] = type('StartupConfig', (TestingConfig,), {
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'startup.db'}"
+        })
+        try:
+            app = create_app('startup')
+            with app.app_context():
+                assert inspect(db.engine).get_table_names() == []
+
+            result = app.test_cli_runner().invoke(args=['init-db'])
+
+            assert result.exit_code == 0
+            with app.app_context():
+                assert 'dengue_notifications' in inspect(db.engine).get_table_names()
+                db.engine.dispose()
+        finally:
+            del config['startup']
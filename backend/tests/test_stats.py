@@ -0,0 +1,113 @@
+"""
+Testes para o cubo de estatísticas de notificações
+"""
+import json
+
+import pytest
+
+from src.repositories.stats_repository import StatsRepository
+from src.services.dengue_service import DengueService
+from src.services.stats_service import StatsService
+from tests.conftest import make_notification
+
+
+class TestStatsService:
+    """Testes da manutenção incremental do cubo"""
+
+    def setup_method(self):
+        """Configuração executada antes de cada teste"""
+        self.dengue_service = DengueService()
+        self.stats_service = StatsService()
+
+    def _counts(self, group_by, **params):
+        return self.stats_service.get_counts(params, group_by)
+
+    def test_cube_follows_create_update_delete(self, app):
+        """Criação, atualização e remoção movem as contagens do cubo"""
+        with app.app_context():
+            first = self.dengue_service.create_notification(make_notification(evolucao='1'))
+            self.dengue_service.create_notification(make_notification(evolucao='1'))
+            self.dengue_service.create_notification(make_notification(sem_not='202402', classi_fin=None, evolucao=None))
+
+            assert self._counts([]) == [{'total': 3}]
+            assert self._counts(['sem_not']) == [{'sem_not': '202401', 'total': 2}, {'sem_not': '202402', 'total': 1}]
+            assert self._counts(['classi_fin', 'evolucao'], sem_not='202402') == [
+                {'classi_fin': None, 'evolucao': None, 'total': 1}
+            ]
+
+            self.dengue_service.update_notification(first['id'], {'evolucao': '2'})
+            assert self._counts(['evolucao'], sem_not='202401') == [
+                {'evolucao': '1', 'total': 1}, {'evolucao': '2', 'total': 1}
+            ]
+
+            self.dengue_service.delete_notification(first['id'])
+            assert self._counts(['evolucao'], sem_not='202401') == [{'evolucao': '1', 'total': 1}]
+
+    def test_cube_follows_bulk_create(self, app):
+        """A carga em massa atualiza o cubo só com os registros inseridos"""
+        with app.app_context():
+            records = [(1, make_notification()), (2, make_notification(dt_notific='')),
+                       (3, make_notification(id_municip='530010', sg_uf_not='53'))]
+
+            self.dengue_service.bulk_create(records)
+
+            assert self._counts(['id_municip']) == [
+                {'id_municip': '130260', 'total': 1}, {'id_municip': '530010', 'total': 1}
+            ]
+
+    def test_rebuild_matches_incremental(self, app):
+        """O cubo recalculado é igual ao mantido incrementalmente"""
+        with app.app_context():
+            for week in ('202401', '202401', '202403'):
+                self.dengue_service.create_notification(make_notification(sem_not=week))
+            incremental = self._counts(list(StatsRepository.DIMENSIONS))
+
+            assert self.stats_service.rebuild() == 2
+            assert self._counts(list(StatsRepository.DIMENSIONS)) == incremental
+
+    def test_week_range_and_invalid_params(self, app):
+        """Intervalo de semanas e parâmetros inválidos"""
+        with app.app_context():
+            for week in ('202401', '202402', '202403'):
+                self.dengue_service.create_notification(make_notification(sem_not=week))
+
+            weeks = self._counts(['sem_not'], sem_inicio='202402', sem_fim='202403')
+            assert [row['sem_not'] for row in weeks] == ['202402', '202403']
+
+            with pytest.raises(ValueError, match="Dimensões inválidas"):
+                self._counts(['cs_sexo'])
+            with pytest.raises(ValueError, match="sem_inicio"):
+                self._counts([], sem_inicio='2024-01')
+
+
+class TestStatsEndpoints:
+    """Testes para os endpoints /api/stats"""
+
+    def test_stats_endpoints(self, client):
+        """Contagens por semana, município e dimensões livres"""
+        for week in ('202401', '202401', '202402'):
+            client.post('/api/dengue-notifications', data=json.dumps(make_notification(sem_not=week)),
+                        content_type='application/json')
+
+        weeks = json.loads(client.get('/api/stats/weeks').data)
+        assert weeks['data'] == [{'sem_not': '202401', 'total': 2}, {'sem_not': '202402', 'total': 1}]
+
+        municipalities = json.loads(client.get('/api/stats/municipalities?sem_not=202402').data)
+        assert municipalities['data'] == [{'id_municip': '130260', 'total': 1}]
+
+        grouped = json.loads(client.get('/api/stats/notifications?group_by=classi_fin,evolucao').data)
+        assert grouped['data'] == [{'classi_fin': '10', 'evolucao': '1', 'total': 3}]
+
+    def test_rebuild_stats_command(self, client, runner):
+        """Comando de linha de comando que recalcula o cubo"""
+        client.post('/api/dengue-notifications', data=json.dumps(make_notification()),
+                    content_type='application/json')
+
+        result = runner.invoke(args=['rebuild-stats'])
+
+        assert '1 células' in result.output
+
+    def test_stats_invalid_group_by(self, client):
+        """Dimensão inexistente"""
+        response = client.get('/api/stats/notifications?group_by=cs_sexo')
+        assert response.status_code == 400
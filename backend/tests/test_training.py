@@ -0,0 +1,128 @@
+"""
+Testes para a varredura de modelos do desfecho
+"""
+import csv
+import json
+import mmap
+import os
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from src.ml.training import (FoldCache, expand_grid, load_matrix, random_over_sample, read_results, run_sweep,
+                             save_matrix, tomek_links)
+
+
+GRIDS = {'NaiveBayes': {'var_smoothing': [1e-9]}, 'LinearSVM_SGD': {'alpha': [1e-3, 1e-4]}}
+
+
+def is_mapped(array) -> bool:
+    """Se o array (ou algum array de que ele é visão) está sobre um arquivo mapeado"""
+    while array is not None:
+        if isinstance(array, (np.memmap, mmap.mmap)):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+
+@pytest.fixture
+def matrix_dir(tmp_path):
+    """Matriz one-hot sintética (600 linhas, 1 em cada 6 da classe minoritária) gravada para o treino"""
+    rng = np.random.default_rng(0)
+    rows = 600
+    y = np.where(np.arange(rows) % 6 == 0, 2, 1).astype(np.int8)
+    active = np.column_stack([rng.integers(0, 3, rows), 3 + (y == 2) * rng.integers(0, 2, rows)])
+    X = sp.csr_matrix((np.ones(active.size, dtype=np.float32), active.ravel(), np.arange(0, active.size + 1, 2)),
+                      shape=(rows, 5))
+    directory = str(tmp_path / 'matriz')
+    save_matrix(directory, X, y)
+    return directory
+
+
+class TestTraining:
+    """Testes da matriz mapeada, do balanceamento, das partições e da retomada"""
+
+    def test_matrix_is_memory_mapped(self, matrix_dir):
+        """A matriz lida aponta para as páginas dos arquivos, sem cópia"""
+        X, y = load_matrix(matrix_dir)
+
+        assert X.shape == (600, 5)
+        assert is_mapped(y)
+        assert all(is_mapped(getattr(X, name)) for name in ('data', 'indices', 'indptr'))
+
+    def test_random_over_sample_balances_with_indices(self):
+        y = np.array([1] * 8 + [2] * 2)
+        rows = np.arange(10)
+
+        resampled = random_over_sample(y, rows)
+
+        assert len(resampled) == 16
+        assert np.bincount(y[resampled])[1:].tolist() == [8, 8]
+        assert set(resampled.tolist()) == set(rows.tolist())
+
+    def test_tomek_links_removes_majority_side(self):
+        """Um par de vizinhos mútuos de classes diferentes perde só o lado majoritário"""
+        X = sp.csr_matrix(np.array([[0.0], [0.1], [5.0], [5.2], [9.0], [9.1]], dtype=np.float32))
+        y = np.array([1, 2, 1, 1, 1, 1])
+
+        kept = tomek_links(X, y, np.arange(6))
+
+        assert kept.tolist() == [1, 2, 3, 4, 5]
+
+    def test_folds_are_cached(self, tmp_path):
+        y = np.array([1, 2] * 50)
+        folds = FoldCache(str(tmp_path / 'particoes'), n_splits=3)
+
+        assert folds.prepare(y) is True
+        assert folds.prepare(y) is False
+        train, valid = np.asarray(folds.load('fold-0-train')), np.asarray(folds.load('fold-0-valid'))
+        assert not set(train) & set(valid)
+        assert not set(np.asarray(folds.load('teste-valid'))) & set(train)
+        assert FoldCache(str(tmp_path / 'particoes'), n_splits=4).prepare(y) is True
+
+    def test_sweep_writes_table_and_resumes(self, matrix_dir, tmp_path):
+        """A tabela tem cv_* e test_* por combinação; a retomada refaz só as partições que faltam"""
+        output = str(tmp_path / 'treino')
+        combinations = expand_grid(['NaiveBayes', 'LinearSVM_SGD'], ['nenhum', 'ros'], grids=GRIDS)
+
+        table = run_sweep(matrix_dir, output, combinations, workers=1, n_splits=3)
+
+        assert len(combinations) == 6
+        assert len(table) == 6
+        assert all(line['cv_f1_macro'] is not None and line['test_f1_macro'] is not None for line in table)
+        assert len(read_results(os.path.join(output, 'resultados.jsonl'))) == 6 * 4
+        with open(os.path.join(output, 'resultados.csv'), encoding='utf-8') as f:
+            assert len(list(csv.DictReader(f))) == 6
+
+        # Simula uma interrupção: a última partição concluída se perde (e uma linha ficou truncada)
+        path = os.path.join(output, 'resultados.jsonl')
+        with open(path, encoding='utf-8') as f:
+            lines = f.readlines()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(lines[:-1] + [lines[-1][:10]])
+        missing = json.loads(lines[-1])
+
+        run_sweep(matrix_dir, output, combinations, workers=1, n_splits=3)
+
+        results = read_results(path)
+        assert len(results) == 6 * 4
+        assert sum((result['key'], result['split']) == (missing['key'], missing['split']) for result in results) == 1
+
+    def test_sweep_restarts_on_changed_matrix(self, matrix_dir, tmp_path):
+        """Outra matriz com as mesmas classes refaz as partições e descarta os resultados anteriores"""
+        output = str(tmp_path / 'treino')
+        combinations = expand_grid(['NaiveBayes'], ['tomek'], grids=GRIDS)
+        before = run_sweep(matrix_dir, output, combinations, workers=1, n_splits=3)
+
+        X, y = load_matrix(matrix_dir, mmap_mode=None)
+        changed = str(tmp_path / 'matriz-nova')
+        save_matrix(changed, sp.csr_matrix(X.shape, dtype=np.float32), y)
+        after = run_sweep(changed, output, combinations, workers=1, n_splits=3)
+
+        assert len(read_results(os.path.join(output, 'resultados.jsonl'))) == 4
+        assert after[0]['cv_f1_macro'] != before[0]['cv_f1_macro']
+
+    def test_unknown_model(self):
+        with pytest.raises(ValueError):
+            expand_grid(['SVC'])
@@ -0,0 +1,72 @@
+"""
+Testes para a validação em lote (TypeAdapter) e colunar (Arrow) do CasoDengue
+"""
+import pyarrow as pa
+
+from src.services.validation_service import ValidationService
+from tests.conftest import make_notification
+
+
+class TestValidationService:
+    """Testes para o ValidationService"""
+
+    def setup_method(self):
+        self.service = ValidationService()
+
+    def test_validate_many(self):
+        """Erros ficam na posição do registro e os válidos saem como na validação unitária"""
+        records = [make_notification(), make_notification(dt_notific='05/01/2024'), make_notification(tp_not=None)]
+
+        values, errors = self.service.validate_many(records)
+
+        assert values[0] == ValidationService.validate(records[0])
+        assert values[1] is None and values[2] is None
+        assert sorted(errors) == [1, 2]
+        assert errors[1].startswith('dt_notific:')
+        assert errors[2].startswith('tp_not:')
+
+    def test_validate_batch_matches_model(self):
+        """Linhas válidas do lote colunar têm os mesmos valores da validação pelo modelo"""
+        records = [make_notification(), make_notification(dt_notific='2024-02-10', febre=None, nu_ano='2024')]
+        batch = pa.RecordBatch.from_pylist(records)
+
+        values, errors = self.service.validate_batch(batch)
+
+        assert errors == {}
+        assert values == [ValidationService.validate(record) for record in records]
+
+    def test_validate_batch_rejects(self):
+        """Obrigatório ausente, data inválida em campo opcional e município desconhecido"""
+        records = [
+            make_notification(),
+            make_notification(sem_not=None),
+            make_notification(dt_sin_pri='2024-13-45'),
+            make_notification(id_mn_resi='999999'),
+        ]
+        batch = pa.RecordBatch.from_pylist([{key.upper(): value for key, value in record.items()}
+                                            for record in records])
+
+        values, errors = self.service.validate_batch(batch)
+
+        assert values[0] is not None
+        assert values[1:] == [None, None, None]
+        assert errors[1].startswith('sem_not:')
+        assert errors[2].startswith('dt_sin_pri:')
+        assert errors[3].startswith('id_mn_resi:')
+
+    def test_validate_batch_missing_column(self):
+        """Sem a coluna de um campo obrigatório, todas as linhas são reprovadas"""
+        batch = pa.RecordBatch.from_pylist([make_notification()]).drop_columns(['tp_not'])
+
+        values, errors = self.service.validate_batch(batch)
+
+        assert values == [None]
+        assert errors[0].startswith('tp_not:')
+
+    def test_validate_batch_matches_validate_many(self):
+        """Texto lido como inteiro é recusado nos dois caminhos, com a mesma mensagem"""
+        records = [make_notification(sem_not=202401), make_notification(sem_not=None), make_notification(sem_not=202402)]
+        batch = pa.RecordBatch.from_pylist(records)
+
+        assert batch.schema.field('sem_not').type == pa.int64()
+        assert self.service.validate_batch(batch) == self.service.validate_many(records)